@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Coût des analyses transversales des journées
+
+Crée des journées synthétiques dans un dossier temporaire et chronomètre :
+le premier passage (toutes les journées lues), un passage sans changement,
+un passage après modification d'une journée, l'ouverture depuis le cache
+disque et la construction d'une table. Vérifie que l'actualisation
+incrémentale donne les mêmes tables qu'une relecture complète.
+
+Usage: python benchmarks/benchmark_analytique.py [nb_journees] [nb_vehicules]  (défaut : 200, 150)
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+from services.analytique_journees import AnalytiqueJournees, DIMENSIONS
+
+MARQUES = {"Renault": ["Clio", "Megane"], "Peugeot": ["208", "308"], "BMW": ["Serie 1", "X3"], "Audi": ["A3"]}
+
+def generer_journee(index, nb_vehicules, aleatoire):
+    achetes, reperage = [], []
+    for i in range(nb_vehicules):
+        marque = aleatoire.choice(list(MARQUES))
+        vehicule = {
+            'lot': str(i + 1), 'marque': marque, 'modele': aleatoire.choice(MARQUES[marque]),
+            'prix_revente': str(aleatoire.randint(3000, 20000)), 'cout_reparations': str(aleatoire.randint(0, 2000)),
+            'temps_reparations': str(aleatoire.randint(0, 20)), 'prix_max_achat': f"{aleatoire.randint(1000, 15000)}€"
+        }
+        if aleatoire.random() < 0.3:
+            vehicule['prix_achat'] = str(aleatoire.randint(1000, 15000))
+            if aleatoire.random() < 0.6:
+                vehicule['prix_vente_final'] = str(aleatoire.randint(2000, 22000))
+            achetes.append(vehicule)
+        else:
+            reperage.append(vehicule)
+    return {
+        'id': str(index), 'nom': f"Journée {index}",
+        'date': f"202{aleatoire.randint(3, 5)}-{aleatoire.randint(1, 12):02d}-{aleatoire.randint(1, 28):02d}",
+        'lieu': aleatoire.choice(["Rungis", "Lyon", "Nantes"]),
+        'parametres': {'tarif_horaire': 45.0, 'commission_vente': 8.5, 'marge_securite': 200.0},
+        'vehicules_reperage': reperage, 'vehicules_achetes': achetes
+    }
+
+def ecrire(dossier, index, donnees):
+    with open(os.path.join(dossier, f"journee_{index}.json"), 'w', encoding='utf-8') as f:
+        json.dump(donnees, f, indent=2, ensure_ascii=False)
+
+def chrono(libelle, fonction):
+    debut = time.perf_counter()
+    resultat = fonction()
+    print(f"   {libelle:<44} {(time.perf_counter() - debut) * 1000:9.1f} ms")
+    return resultat
+
+def main():
+    nb_journees = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    nb_vehicules = int(sys.argv[2]) if len(sys.argv) > 2 else 150
+    aleatoire = random.Random(42)
+
+    with tempfile.TemporaryDirectory() as dossier:
+        for index in range(nb_journees):
+            ecrire(dossier, index, generer_journee(index, nb_vehicules, aleatoire))
+        print(f"📊 {nb_journees} journées × {nb_vehicules} véhicules")
+
+        analytique = AnalytiqueJournees(dossier)
+        chrono("Premier passage (toutes les journées)", analytique.actualiser)
+        chrono("Passage sans changement", analytique.actualiser)
+        ecrire(dossier, 7, generer_journee(7, nb_vehicules, aleatoire))
+        chrono("Passage après modification d'une journée", analytique.actualiser)
+        reouverte = chrono("Ouverture depuis le cache disque", lambda: AnalytiqueJournees(dossier))
+        chrono("Premier passage depuis le cache", reouverte.actualiser)
+        chrono("Table par modèle", lambda: reouverte.table('modele'))
+
+        os.remove(os.path.join(dossier, "analytique.cache"))
+        complete = AnalytiqueJournees(dossier)
+        complete.actualiser()
+        for dimension in DIMENSIONS:
+            attendu, obtenu = complete.table(dimension), reouverte.table(dimension)
+            if len(attendu) != len(obtenu) or any(
+                    a['groupe'] != o['groupe'] or abs(a['marge'] - o['marge']) > 1e-6 or a['achetes'] != o['achetes']
+                    for a, o in zip(attendu, obtenu)):
+                print(f"❌ Table '{dimension}' différente d'une relecture complète")
+                return 1
+        print("✅ Tables incrémentales identiques à une relecture complète")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Durée du balayage de sensibilité des paramètres
+
+Génère des lots synthétiques et une grille d'environ 10 000 combinaisons
+(tarif × commission × marge), chronomètre le balayage et vérifie quelques
+combinaisons contre le calcul direct de MoteurPrix.
+
+Usage: python benchmarks/benchmark_balayage.py [nb_lots]  (défaut : 2 000)
+"""
+
+import os
+import random
+import sys
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+from services import balayage_parametres
+from services.balayage_parametres import balayer, plage_valeurs
+from services.moteur_prix import MoteurPrix
+
+def generer_colonnes(nombre):
+    aleatoire = random.Random(42)
+    return {
+        'prix_revente': [float(aleatoire.randint(1000, 30000)) for _ in range(nombre)],
+        'cout_reparations': [float(aleatoire.randint(0, 3000)) for _ in range(nombre)],
+        'temps_reparations': [aleatoire.randint(0, 40) / 2 for _ in range(nombre)]
+    }
+
+def main():
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    colonnes = generer_colonnes(nombre)
+    tarifs = plage_valeurs(30, 70, 2)           # 21 valeurs
+    commissions = plage_valeurs(5, 15, 0.5)     # 21 valeurs
+    marges = plage_valeurs(0, 1150, 50)         # 24 valeurs
+    nb_combinaisons = len(tarifs) * len(commissions) * len(marges)
+
+    print(f"📊 {nombre:,} lots × {nb_combinaisons:,} combinaisons, "
+          f"NumPy {'actif' if balayage_parametres.np is not None else 'absent (pur Python)'}")
+    debut = time.perf_counter()
+    resultats = balayer(colonnes, tarifs, commissions, marges)
+    duree = time.perf_counter() - debut
+    print(f"   Balayage complet {duree * 1000:8.1f} ms")
+
+    # Contrôle contre le calcul direct sur quelques combinaisons
+    aleatoire = random.Random(7)
+    for index in aleatoire.sample(range(nb_combinaisons), 20):
+        moteur = MoteurPrix({
+            'tarif_horaire': resultats['tarif_horaire'][index],
+            'commission_vente': resultats['commission_vente'][index],
+            'marge_securite': resultats['marge_securite'][index]
+        })
+        prix_max = [float(p) for p in moteur.calculer_lot(colonnes)['prix_max']]
+        viables = sum(1 for p in prix_max if p > 0)
+        if viables != resultats['lots_viables'][index] or abs(sum(prix_max) - resultats['budget_total'][index]) > 1e-3:
+            print(f"❌ Écart sur la combinaison {index} : {viables} / {resultats['lots_viables'][index]}, "
+                  f"{sum(prix_max):.2f} / {resultats['budget_total'][index]:.2f}")
+            return 1
+    print("✅ Balayage concordant avec MoteurPrix")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Passage d'une journée à l'autre avec le cache des journées ouvertes
+
+Chronomètre l'ouverture d'une journée depuis le disque et depuis le cache
+(aller-retour entre la vente en cours et une vente comparable), le
+préchargement en arrière-plan, et vérifie qu'une journée modifiée par un
+autre poste est relue et que les limites de nombre et de mémoire sont tenues.
+
+Usage: python benchmarks/benchmark_cache_journees.py [nb_vehicules] [allers_retours]  (défaut : 1500, 20)
+"""
+
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_analytique import ecrire, generer_journee
+from services.cache_journees import CacheJournees
+from services.journees_manager import JourneesManager
+
+def alterner(manager, noms, allers_retours):
+    """Ouvre les journées à tour de rôle, retourne la durée moyenne d'une ouverture (ms)"""
+    debut = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(allers_retours):
+            journee = manager.charger_journee_fichier(noms[i % len(noms)])
+            assert journee is not None
+    return (time.perf_counter() - debut) * 1000 / allers_retours
+
+def main():
+    nb_vehicules = int(sys.argv[1]) if len(sys.argv) > 1 else 1500
+    allers_retours = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    aleatoire = random.Random(42)
+
+    with tempfile.TemporaryDirectory() as dossier:
+        for index in range(4):
+            ecrire(dossier, index, generer_journee(index, nb_vehicules, aleatoire))
+        noms = ["journee_0.json", "journee_1.json"]
+        taille = os.path.getsize(os.path.join(dossier, noms[0]))
+        print(f"🗂️ Journées de {nb_vehicules} véhicules ({taille / 1024:.0f} Ko)")
+
+        sans_cache = alterner(JourneesManager(dossier, migrer=False), noms, allers_retours)
+        cache = CacheJournees(nombre_max=5, memoire_max_mo=200)
+        avec_cache = alterner(JourneesManager(dossier, migrer=False, cache=cache), noms, allers_retours)
+        print(f"   Ouverture depuis le disque          {sans_cache:8.2f} ms")
+        print(f"   Ouverture depuis le cache           {avec_cache:8.2f} ms "
+              f"({cache.succes} succès, {cache.echecs} lectures)")
+
+        # Préchargement pendant que l'utilisateur choisit
+        os.utime(os.path.join(dossier, "journee_3.json"))
+        cache_prechargement = CacheJournees()
+        debut = time.perf_counter()
+        cache_prechargement.precharger_recente(dossier).join()
+        duree_prechargement = (time.perf_counter() - debut) * 1000
+        manager = JourneesManager(dossier, migrer=False, cache=cache_prechargement)
+        debut = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager.charger_journee_fichier("journee_3.json")
+        print(f"   Préchargement (arrière-plan)        {duree_prechargement:8.2f} ms, "
+              f"puis ouverture en {(time.perf_counter() - debut) * 1000:.2f} ms")
+
+        # Journée réécrite par un autre poste : l'entrée n'est plus valable
+        manager = JourneesManager(dossier, migrer=False, cache=cache)
+        with contextlib.redirect_stdout(io.StringIO()):
+            journee = manager.charger_journee_fichier(noms[0])
+            autre = JourneesManager(dossier, migrer=False)
+            copie = autre.charger_journee_fichier(noms[0])
+            copie.nom = "Modifiée ailleurs"
+            autre.sauvegarder_journee_fichier(copie, noms[0])
+            relue = manager.charger_journee_fichier(noms[0])
+        print(f"   Modification d'un autre poste relue : {'✅' if relue.nom == 'Modifiée ailleurs' and relue is not journee else '❌'}")
+
+        # Sauvegarde locale : l'objet reste en cache avec la nouvelle signature
+        with contextlib.redirect_stdout(io.StringIO()):
+            relue.lieu = "Rungis"
+            manager.sauvegarder_journee_fichier(relue, noms[0])
+            apres = manager.charger_journee_fichier(noms[0])
+        with open(os.path.join(dossier, noms[0]), 'r', encoding='utf-8') as f:
+            sur_disque = json.load(f)
+        print(f"   Journée sauvegardée gardée en cache : {'✅' if apres is relue and sur_disque['lieu'] == 'Rungis' else '❌'}")
+
+        # Limites
+        petit = CacheJournees(nombre_max=2, memoire_max_mo=taille * 12 / (1024 * 1024))
+        manager = JourneesManager(dossier, migrer=False, cache=petit)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for index in range(4):
+                manager.charger_journee_fichier(f"journee_{index}.json")
+        gardees = [os.path.basename(c) for c in petit.entrees]
+        print(f"   Limites (2 journées, {taille * 12 / (1024 * 1024):.1f} Mo) : {gardees}, "
+              f"{petit.memoire / (1024 * 1024):.1f} Mo estimés "
+              f"{'✅' if gardees == ['journee_2.json', 'journee_3.json'] and petit.memoire <= petit.memoire_max else '❌'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mise à jour d'une journée avec un catalogue réédité (JourneesManager.mettre_a_jour_catalogue)
+
+Crée une journée dont les lots ont nos estimations et couleurs, puis un
+catalogue CSV réédité (kilométrages corrigés, lots ajoutés et retirés,
+numéros écrits « 0012 »). Chronomètre la lecture du catalogue, la fusion par
+lot et la sauvegarde, et vérifie les compteurs et que nos estimations sont
+conservées. Vérifie aussi qu'un catalogue PDF sans colonne de lot (numéros
+inventés d'après la position des lignes), réédité avec une ligne de décalage,
+ne réattribue pas les estimations d'un véhicule à un autre.
+
+Usage: python benchmarks/benchmark_catalogue.py [nb_lots]  (défaut : 20000)
+"""
+
+import contextlib
+import csv
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+from models.journee_enchere import JourneeEnchere
+from models.vehicule import Vehicule
+from services.fusion_journees import fusionner_catalogue
+from services.journees_manager import JourneesManager
+
+MARQUES = ["Renault", "Peugeot", "BMW", "Audi", "Citroen"]
+
+def verifier_catalogue_decale(manager) -> bool:
+    """Catalogue PDF sans numéros de lot, réédité avec une ligne de plus en tête"""
+    journee = JourneeEnchere()
+    journee.vehicules_reperage = [
+        Vehicule({'lot': "L3", 'marque': "Peugeot", 'modele': "208", 'prix_revente': "9000", 'chose_a_faire': "embrayage HS"}),
+        Vehicule({'lot': "L4", 'marque': "Renault", 'modele': "Clio", 'prix_revente': "7000"})
+    ]
+    texte = ("Vente aux enchères du 12 juin\nConditions générales de vente\nFrais de vente 14,4 % TTC\n"
+             "Peugeot 208 2015 85000 km\nRenault Clio 2016 60000 km")
+    tableau = [["Marque", "Modèle", "Année"], ["Citroen", "C3", "2014"], ["Peugeot", "208", "2015"],
+               ["Renault", "Clio", "2016"]]
+    bilans = []
+    for lignes in (manager._analyser_texte_pdf(texte), manager._analyser_tableau_pdf(tableau, 0, 0)):
+        bilans.append(fusionner_catalogue(journee, lignes))
+    vehicules = {v.lot: (v.marque, v.modele, v.prix_revente, v.chose_a_faire) for v in journee.vehicules_reperage}
+    attendu = {'inseres': 0, 'mis_a_jour': 0, 'inchanges': 0, 'absents': 2}
+    ok = (all({c: b[c] for c in attendu} == attendu and b['ignores'] >= 2 for b in bilans)
+          and vehicules == {"L3": ("Peugeot", "208", "9000", "embrayage HS"), "L4": ("Renault", "Clio", "7000", "")})
+    print(f"\n📄 Catalogue PDF sans colonne de lot, décalé d'une ligne")
+    print(f"   Bilans : {bilans}")
+    print(f"   Lots inventés ignorés, véhicules inchangés : {'✅' if ok else '❌ ' + str(vehicules)}")
+    return ok
+
+def main():
+    nb_lots = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    aleatoire = random.Random(42)
+
+    with tempfile.TemporaryDirectory() as dossier:
+        catalogue = [{'lot': str(i + 1), 'marque': aleatoire.choice(MARQUES), 'modele': f"Modèle {i % 40}",
+                      'annee': str(aleatoire.randint(2005, 2022)), 'kilometrage': str(aleatoire.randint(10000, 250000))}
+                     for i in range(nb_lots)]
+
+        # Journée saisie à partir du premier catalogue, avec nos estimations
+        journee = JourneeEnchere()
+        journee.nom = "Rungis"
+        for ligne in catalogue:
+            vehicule = Vehicule({**ligne, 'prix_revente': str(aleatoire.randint(3000, 20000)),
+                                 'cout_reparations': str(aleatoire.randint(0, 2000)), 'couleur': 'vert'})
+            journee.vehicules_reperage.append(vehicule)
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager = JourneesManager(dossier, migrer=False)
+            manager.sauvegarder_journee_fichier(journee, "rungis.json")
+            journee = manager.charger_journee_fichier("rungis.json")
+
+        # Catalogue réédité
+        corriges = aleatoire.sample(range(nb_lots), nb_lots // 20)
+        for i in corriges:
+            catalogue[i]['kilometrage'] = str(int(catalogue[i]['kilometrage']) + 1000)
+        retires = set(aleatoire.sample(range(nb_lots), nb_lots // 100))
+        reedite = [{**ligne, 'lot': ligne['lot'].zfill(4)} for i, ligne in enumerate(catalogue) if i not in retires]
+        nouveaux = nb_lots // 50
+        reedite += [{'lot': str(nb_lots + i + 1), 'marque': "Dacia", 'modele': "Sandero", 'annee': "2019",
+                     'kilometrage': "80000"} for i in range(nouveaux)]
+        chemin_csv = os.path.join(dossier, "catalogue_v2.csv")
+        with open(chemin_csv, 'w', encoding='utf-8', newline='') as f:
+            ecrivain = csv.writer(f, delimiter=';')
+            ecrivain.writerow(["N° LOT", "Marque", "Modèle", "Année", "Kilométrage"])
+            for ligne in reedite:
+                ecrivain.writerow([ligne['lot'], ligne['marque'], ligne['modele'], ligne['annee'], ligne['kilometrage']])
+
+        print(f"📚 Journée de {nb_lots} lots, catalogue réédité de {len(reedite)} lignes")
+        debut = time.perf_counter()
+        lignes = manager.lire_catalogue_csv(chemin_csv)
+        lecture = time.perf_counter() - debut
+        estimations = {v.lot: (v.prix_revente, v.cout_reparations, v.couleur) for v in journee.vehicules_reperage}
+
+        debut = time.perf_counter()
+        bilan = fusionner_catalogue(journee, lignes)
+        fusion = time.perf_counter() - debut
+        debut = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager.sauvegarder_journee_fichier(journee, "rungis.json")
+        sauvegarde = time.perf_counter() - debut
+
+        print(f"   Lecture du CSV               {lecture * 1000:8.0f} ms")
+        print(f"   Fusion par lot               {fusion * 1000:8.0f} ms")
+        print(f"   Sauvegarde                   {sauvegarde * 1000:8.0f} ms")
+        print(f"   Total                        {(lecture + fusion + sauvegarde) * 1000:8.0f} ms")
+        print(f"   Bilan : {bilan}")
+
+        attendu = {'inseres': nouveaux, 'mis_a_jour': len(set(corriges) - retires),
+                   'inchanges': nb_lots - len(retires) - len(set(corriges) - retires), 'absents': len(retires),
+                   'ignores': 0}
+        conservees = all((v.prix_revente, v.cout_reparations, v.couleur) == estimations[v.lot]
+                         for v in journee.vehicules_reperage if v.lot in estimations)
+        print(f"   Compteurs attendus : {'✅' if bilan == attendu else '❌ ' + str(attendu)}")
+        print(f"   Estimations et couleurs conservées : {'✅' if conservees else '❌'}")
+
+        decale = verifier_catalogue_decale(manager)
+    return 0 if bilan == attendu and conservees and decale else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
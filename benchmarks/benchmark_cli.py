@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Traitements par lot sans interface (services/service_journees.py, cli.py --jobs)
+
+Crée des journées synthétiques puis chronomètre les statistiques, le recalcul
+des prix max et l'export CSV de toutes les journées, dans le processus courant
+puis réparti sur plusieurs processus. Vérifie que les résultats sont identiques.
+
+Usage: python benchmarks/benchmark_cli.py [nb_journees] [nb_vehicules] [processus]  (défaut : 200, 150, nb cœurs)
+"""
+
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_analytique import ecrire, generer_journee
+from services.service_journees import (
+    executer_en_parallele, exporter_journee, recalculer_prix_max, resoudre_journees, statistiques_journee
+)
+
+def chrono(fonction, appels, processus):
+    debut = time.perf_counter()
+    # Les messages de chargement de chaque journée ne sont pas affichés
+    with contextlib.redirect_stdout(io.StringIO()):
+        resultats = executer_en_parallele(fonction, appels, processus)
+    return resultats, (time.perf_counter() - debut) * 1000
+
+def main():
+    nb_journees = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    nb_vehicules = int(sys.argv[2]) if len(sys.argv) > 2 else 150
+    # Au moins 2 processus pour mesurer le coût de la répartition même sur un seul cœur
+    processus = int(sys.argv[3]) if len(sys.argv) > 3 else max(2, os.cpu_count() or 1)
+    aleatoire = random.Random(42)
+
+    with tempfile.TemporaryDirectory() as dossier:
+        for index in range(nb_journees):
+            ecrire(dossier, index, generer_journee(index, nb_vehicules, aleatoire))
+        noms = resoudre_journees(dossier, ["*"])
+        print(f"🗂️ {nb_journees} journées × {nb_vehicules} véhicules, {os.cpu_count()} cœur(s)")
+        print(f"   {'Traitement':<24} {'1 processus':>12} {f'{processus} processus':>14}")
+
+        identiques = True
+        operations = [
+            ("Statistiques", statistiques_journee, [(dossier, nom) for nom in noms]),
+            ("Export CSV", exporter_journee,
+             [(dossier, nom, 'csv', os.path.join(dossier, "exports"), 'reperage') for nom in noms]),
+            ("Recalcul des prix max", recalculer_prix_max, [(dossier, nom) for nom in noms]),
+        ]
+        for libelle, fonction, appels in operations:
+            resultats_serie, duree_serie = chrono(fonction, appels, 1)
+            if fonction is recalculer_prix_max:
+                # Journées remises dans leur état initial : le second passage modifie et sauvegarde autant
+                aleatoire.seed(42)
+                for index in range(nb_journees):
+                    ecrire(dossier, index, generer_journee(index, nb_vehicules, aleatoire))
+            resultats_parallele, duree_parallele = chrono(fonction, appels, processus)
+            identiques &= resultats_serie == resultats_parallele
+            print(f"   {libelle:<24} {duree_serie:>10.0f}ms {duree_parallele:>12.0f}ms")
+
+    print(f"\n   Résultats identiques en série et en parallèle : {'✅' if identiques else '❌'}")
+
+if __name__ == "__main__":
+    main()
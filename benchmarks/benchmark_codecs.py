@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Formats d'enregistrement des journées (services/codecs_journee.py)
+
+Pour des journées synthétiques de 1 000, 10 000 et 100 000 véhicules,
+mesure la taille du fichier, la durée d'écriture (encodage) et de lecture
+(décodage) de chaque format, en comparaison de json.dump(indent=2) utilisé
+auparavant. Vérifie que chaque format est reconnu à la lecture et redonne
+exactement la même journée.
+
+Usage: python benchmarks/benchmark_codecs.py [nb_vehicules ...]  (défaut : 1000 10000 100000)
+"""
+
+import json
+import os
+import random
+import sys
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_analytique import generer_journee
+from models.journee_enchere import JourneeEnchere
+from services.codecs_journee import CODECS, codecs_disponibles, decoder_journee, detecter_codec, encoder_journee
+
+def meilleur_temps(fonction, repetitions):
+    """Meilleure durée (ms) sur plusieurs exécutions, et le dernier résultat"""
+    meilleur = float('inf')
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        resultat = fonction()
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    return meilleur * 1000, resultat
+
+def main():
+    tailles = [int(n) for n in sys.argv[1:]] or [1000, 10000, 100000]
+    aleatoire = random.Random(42)
+    indisponibles = [codec for codec in CODECS if codec not in codecs_disponibles()]
+    if indisponibles:
+        print(f"ℹ️ Formats indisponibles ici : {', '.join(indisponibles)} (module manquant)")
+
+    for nb_vehicules in tailles:
+        # Dictionnaire tel que sauvegardé : tous les champs de Vehicule.to_dict
+        donnees = JourneeEnchere(generer_journee(0, nb_vehicules, aleatoire)).to_dict()
+        repetitions = 5 if nb_vehicules <= 10000 else 2
+        print(f"\n📦 Journée de {nb_vehicules} véhicules")
+        print(f"   {'Format':<22} {'Taille':>10} {'Écriture':>11} {'Lecture':>11}")
+
+        ecriture, contenu = meilleur_temps(
+            lambda: json.dumps(donnees, indent=2, ensure_ascii=False).encode('utf-8'), repetitions)
+        lecture, _ = meilleur_temps(lambda: json.loads(contenu), repetitions)
+        reference = len(contenu)
+        print(f"   {'json indent=2 (avant)':<22} {reference / 1024:8.0f} Ko {ecriture:8.1f} ms {lecture:8.1f} ms")
+
+        for codec in codecs_disponibles():
+            ecriture, contenu = meilleur_temps(lambda: encoder_journee(donnees, codec), repetitions)
+            lecture, relue = meilleur_temps(lambda: decoder_journee(contenu), repetitions)
+            identique = relue == donnees and detecter_codec(contenu) == codec
+            print(f"   {codec:<22} {len(contenu) / 1024:8.0f} Ko {ecriture:8.1f} ms {lecture:8.1f} ms  "
+                  f"{len(contenu) / reference:5.0%} {'✅' if identique else '❌'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Latence de l'estimation du prix de revente (plus proches voisins)
+
+Remplit un historique temporaire avec des annonces synthétiques puis mesure :
+la construction de la grille d'un modèle (première frappe), une estimation sur
+grille déjà construite (frappes suivantes) et l'erreur moyenne de l'estimation
+sur des véhicules synthétiques dont le prix « réel » est connu.
+
+Usage: python benchmarks/benchmark_estimateur.py [nb_annonces]  (défaut : 200 000)
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+sys.path.insert(0, os.path.join(RACINE, "benchmarks"))
+
+from benchmark_historique import remplir
+from services.estimateur_revente import EstimateurRevente
+from price_history import PriceHistory
+
+def prix_reel(annee, km):
+    """Prix sans bruit du générateur d'annonces synthétiques"""
+    return 30000 - (2024 - annee) * 1200 - km * 0.03
+
+def main():
+    nb_annonces = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as dossier:
+        historique = PriceHistory(os.path.join(dossier, "historique.sqlite"))
+        remplir(historique, nb_annonces)
+        print(f"📥 {nb_annonces:,} annonces synthétiques ({historique.get_stats()})")
+
+        estimateur = EstimateurRevente(historique)
+        debut = time.perf_counter()
+        estimateur.estimer("Renault Clio", 2014, 120000)
+        print(f"   Première estimation (construction de la grille) {(time.perf_counter() - debut) * 1000:8.2f} ms")
+
+        aleatoire = random.Random(7)
+        vehicules = [(aleatoire.randint(2006, 2022), aleatoire.randint(10000, 280000)) for _ in range(2000)]
+        debut = time.perf_counter()
+        estimations = [estimateur.estimer("Renault Clio", annee, km) for annee, km in vehicules]
+        duree_ms = (time.perf_counter() - debut) * 1000 / len(vehicules)
+        print(f"   Estimation sur grille construite               {duree_ms:8.3f} ms")
+
+        erreurs = [abs(e['prix'] - prix_reel(annee, km)) for e, (annee, km) in zip(estimations, vehicules) if e]
+        couverts = sum(1 for e, (annee, km) in zip(estimations, vehicules)
+                       if e and e['bas'] <= prix_reel(annee, km) <= e['haut'])
+        print(f"📊 Erreur absolue moyenne : {sum(erreurs) / len(erreurs):,.0f} € "
+              f"({len(erreurs)}/{len(vehicules)} véhicules estimés, prix réel dans l'intervalle : "
+              f"{couverts / len(erreurs):.0%})")
+        historique.fermer()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sauvegardes concurrentes d'une même journée (verrou + fusion à trois voies)
+
+Chronomètre une sauvegarde sans concurrence et une sauvegarde qui doit
+fusionner avec une version réécrite entre-temps, puis lance plusieurs
+processus qui modifient chacun leurs propres véhicules d'une journée commune
+et la sauvegardent sans jamais la recharger. Vérifie qu'aucune modification
+n'est perdue (l'ancien comportement gardait seulement la dernière sauvegarde).
+
+Usage: python benchmarks/benchmark_fusion.py [nb_vehicules] [processus] [sauvegardes]  (défaut : 150, 4, 20)
+"""
+
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_analytique import ecrire, generer_journee
+from services.journees_manager import JourneesManager
+
+NOM_FICHIER = "journee_0.json"
+
+def poste(dossier, numero, processus, sauvegardes):
+    """Un poste : charge la journée une fois puis modifie et sauvegarde ses véhicules (lot % processus)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager = JourneesManager(dossier, migrer=False)
+        journee = manager.charger_journee_fichier(NOM_FICHIER)
+        for tour in range(sauvegardes):
+            for vehicule in journee.vehicules_reperage + journee.vehicules_achetes:
+                if int(vehicule.lot) % processus == numero:
+                    vehicule.champ_libre = f"poste {numero} tour {tour}"
+            manager.sauvegarder_journee_fichier(journee, NOM_FICHIER)
+
+def chrono(libelle, fonction, repetitions=20):
+    debut = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repetitions):
+            fonction()
+    print(f"   {libelle:<44} {(time.perf_counter() - debut) * 1000 / repetitions:9.1f} ms")
+
+def main():
+    nb_vehicules = int(sys.argv[1]) if len(sys.argv) > 1 else 150
+    processus = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    sauvegardes = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+
+    with tempfile.TemporaryDirectory() as dossier:
+        ecrire(dossier, 0, generer_journee(0, nb_vehicules, random.Random(42)))
+        print(f"💾 Journée de {nb_vehicules} véhicules")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager = JourneesManager(dossier, migrer=False)
+            autre = JourneesManager(dossier, migrer=False)
+            journee = manager.charger_journee_fichier(NOM_FICHIER)
+            journee_autre = autre.charger_journee_fichier(NOM_FICHIER)
+        chemin = os.path.join(dossier, NOM_FICHIER)
+
+        def ancienne_sauvegarde():
+            with open(chemin, 'w', encoding='utf-8') as f:
+                json.dump(journee.to_dict(), f, indent=2, ensure_ascii=False)
+
+        def sauvegarde_avec_fusion():
+            # L'autre poste a sauvegardé depuis notre dernier chargement
+            journee_autre.vehicules_reperage[0].champ_libre = str(time.perf_counter())
+            autre.sauvegarder_journee_fichier(journee_autre, NOM_FICHIER)
+            manager.sauvegarder_journee_fichier(journee, NOM_FICHIER)
+
+        chrono("Écriture directe (ancien comportement)", ancienne_sauvegarde)
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager.charger_journee_fichier(NOM_FICHIER)
+        chrono("Sauvegarde verrouillée sans concurrence", lambda: manager.sauvegarder_journee_fichier(journee, NOM_FICHIER))
+        chrono("Sauvegarde concurrente + sauvegarde fusionnée", sauvegarde_avec_fusion)
+
+        # Plusieurs processus sur la même journée
+        ecrire(dossier, 0, generer_journee(0, nb_vehicules, random.Random(42)))
+        debut = time.perf_counter()
+        postes = [multiprocessing.Process(target=poste, args=(dossier, numero, processus, sauvegardes))
+                  for numero in range(processus)]
+        for p in postes:
+            p.start()
+        for p in postes:
+            p.join()
+        duree = time.perf_counter() - debut
+
+        with open(chemin, 'r', encoding='utf-8') as f:
+            finale = json.load(f)
+        vehicules = finale['vehicules_reperage'] + finale['vehicules_achetes']
+        perdus = [v['lot'] for v in vehicules
+                  if v.get('champ_libre') != f"poste {int(v['lot']) % processus} tour {sauvegardes - 1}"]
+        print(f"\n   {processus} processus × {sauvegardes} sauvegardes : {duree:.2f} s, révision {finale['revision']}")
+        print(f"   Véhicules : {len(vehicules)}/{nb_vehicules}, modifications perdues : {len(perdus)} "
+              f"{'✅' if not perdus and len(vehicules) == nb_vehicules else '❌'}")
+
+if __name__ == "__main__":
+    main()
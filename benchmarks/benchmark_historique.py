@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Temps de réponse de l'historique des prix sur un grand volume d'annonces
+
+Remplit un historique temporaire avec des annonces synthétiques (plusieurs
+modèles, années, kilométrages et dates) puis chronomètre les requêtes utilisées
+par l'application.
+
+Usage: python benchmarks/benchmark_historique.py [nb_annonces]  (défaut : 1 000 000)
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RACINE, "script_scraping_leboncoin"))
+
+from price_history import PriceHistory, SECONDES_PAR_JOUR
+
+MODELES = [f"{marque} {modele}" for marque, modeles in {
+    'Renault': ['Clio', 'Megane', 'Captur', 'Kangoo', 'Scenic'],
+    'Peugeot': ['208', '308', '2008', '3008', 'Partner'],
+    'BMW': ['118d', '320d', 'X1', 'X3', '520d'],
+    'Volkswagen': ['Golf', 'Polo', 'Passat', 'Tiguan', 'Touran'],
+}.items() for modele in modeles]
+
+def remplir(historique, nb_annonces, taille_lot=500):
+    """Enregistre nb_annonces annonces réparties sur 180 jours"""
+    aleatoire = random.Random(42)
+    maintenant = time.time()
+    for debut in range(0, nb_annonces, taille_lot):
+        modele = aleatoire.choice(MODELES)
+        date = maintenant - aleatoire.uniform(0, 180) * SECONDES_PAR_JOUR
+        annonces = []
+        for i in range(debut, min(nb_annonces, debut + taille_lot)):
+            annee = aleatoire.randint(2005, 2023)
+            km = aleatoire.randint(5000, 300000)
+            annonces.append({
+                'titre': f"{modele} {annee}",
+                'prix': int(30000 - (2024 - annee) * 1200 - km * 0.03 + aleatoire.gauss(0, 1500)) or 500,
+                'annee': annee,
+                'kilometrage': km,
+                'lien': f"https://www.leboncoin.fr/ad/voitures/{i}"
+            })
+        historique.enregistrer(modele, annonces, date=date)
+
+def chronometrer(nom, fonction, repetitions=20):
+    debut = time.perf_counter()
+    for _ in range(repetitions):
+        resultat = fonction()
+    duree_ms = (time.perf_counter() - debut) * 1000 / repetitions
+    print(f"   {nom:<45} {duree_ms:8.2f} ms  ({len(resultat)} lignes)")
+
+def main():
+    nb_annonces = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as dossier:
+        historique = PriceHistory(os.path.join(dossier, "historique.sqlite"))
+
+        debut = time.perf_counter()
+        remplir(historique, nb_annonces)
+        duree = time.perf_counter() - debut
+        print(f"📥 {nb_annonces:,} annonces enregistrées en {duree:.1f}s ({nb_annonces / duree:,.0f} annonces/s)")
+        print(f"   {historique.get_stats()}")
+
+        print("📊 Requêtes")
+        chronometrer("annonces (modèle, 2012-2014, 80-120k km, 30j)",
+                     lambda: historique.annonces("Renault Clio", 2012, 2014, 80000, 120000, jours=30, limite=50))
+        chronometrer("recherche_recente (50 annonces, 12h)",
+                     lambda: historique.recherche_recente("Renault Clio", 2012, 2014, 80000, 120000, 50, 12 * 3600) or [])
+        chronometrer("mediane_par_tranche (modèle, 30 jours)",
+                     lambda: historique.mediane_par_tranche("Renault Clio", jours=30), repetitions=5)
+        chronometrer("serie_temporelle (modèle, 2012-2014, 180 jours)",
+                     lambda: historique.serie_temporelle("Renault Clio", 2012, 2014, jours=180), repetitions=5)
+        historique.fermer()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Migration en lot des anciens fichiers de données (services/migration_donnees.py)
+
+Crée une arborescence d'anciens postes (donnees_encheres.json, quelques
+journees_encheres.json multi-journées, un fichier illisible et un fichier
+avec des lignes invalides) et chronomètre la migration en un processus et en
+parallèle, puis une seconde passe (tout est sauté grâce au manifeste) et une
+passe après modification d'un seul fichier. Vérifie les journées créées et la
+vérification de démarrage faite une seule fois.
+
+Usage: python benchmarks/benchmark_migration.py [nb_fichiers] [nb_vehicules] [processus]  (défaut : 40, 1500, 4)
+"""
+
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_analytique import generer_journee
+from services.journees_manager import JourneesManager
+from services.migration_donnees import lire_manifeste, migrer_arborescence
+
+def creer_arborescence(racine, nb_fichiers, nb_vehicules, aleatoire):
+    """Anciens fichiers, retourne {chemin: (nb repérage, nb achetés)} des fichiers valides"""
+    attendus = {}
+    for i in range(nb_fichiers):
+        dossier = os.path.join(racine, f"poste_{i % 5}", f"sauvegarde_{i}")
+        os.makedirs(dossier)
+        if i % 10 == 9:
+            journees = [generer_journee(j, nb_vehicules // 3, aleatoire) for j in range(3)]
+            chemin = os.path.join(dossier, "journees_encheres.json")
+            contenu = {'journees': journees}
+            attendus[chemin] = (sum(len(j['vehicules_reperage']) for j in journees),
+                                sum(len(j['vehicules_achetes']) for j in journees))
+        else:
+            journee = generer_journee(i, nb_vehicules, aleatoire)
+            chemin = os.path.join(dossier, "donnees_encheres.json")
+            contenu = {'vehicules_reperage': journee['vehicules_reperage'],
+                       'vehicules_achetes': journee['vehicules_achetes']}
+            attendus[chemin] = (len(journee['vehicules_reperage']), len(journee['vehicules_achetes']))
+            if i == 0:
+                # Lignes invalides : rejetées ou signalées, sans bloquer le fichier
+                contenu['vehicules_reperage'] += ["ligne corrompue", {'marque': "Dacia", 'prix_revente': "abc"}]
+                attendus[chemin] = (attendus[chemin][0] + 1, attendus[chemin][1])
+            with open(os.path.join(dossier, "parametres_encheres.json"), 'w', encoding='utf-8') as f:
+                json.dump({'tarif_horaire': 50.0 + i}, f)
+        with open(chemin, 'w', encoding='utf-8') as f:
+            json.dump(contenu, f, indent=2, ensure_ascii=False)
+    illisible = os.path.join(racine, "poste_0", "donnees_encheres_copie.json")
+    with open(illisible, 'w', encoding='utf-8') as f:
+        f.write('{"vehicules_reperage": [')
+    return attendus
+
+def migrer(racine, dossier, processus):
+    debut = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        bilans = migrer_arborescence([racine], dossier, processus)
+    return bilans, time.perf_counter() - debut
+
+def main():
+    nb_fichiers = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    nb_vehicules = int(sys.argv[2]) if len(sys.argv) > 2 else 1500
+    processus = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    aleatoire = random.Random(42)
+
+    with tempfile.TemporaryDirectory() as temporaire:
+        racine = os.path.join(temporaire, "anciens")
+        attendus = creer_arborescence(racine, nb_fichiers, nb_vehicules, aleatoire)
+        print(f"🗃️ {len(attendus) + 1} anciens fichiers de {nb_vehicules} véhicules "
+              f"({os.cpu_count()} cœur(s) disponibles)")
+
+        _, duree_serie = migrer(racine, os.path.join(temporaire, "serie"), 1)
+        dossier = os.path.join(temporaire, "journees_data")
+        bilans, duree_parallele = migrer(racine, dossier, processus)
+        print(f"   Migration, 1 processus             {duree_serie * 1000:8.0f} ms")
+        print(f"   Migration, {processus} processus             {duree_parallele * 1000:8.0f} ms")
+
+        bilans_relance, duree_relance = migrer(racine, dossier, processus)
+        print(f"   Seconde passe (manifeste)          {duree_relance * 1000:8.0f} ms")
+
+        modifie = sorted(attendus)[1]
+        with open(modifie, 'r', encoding='utf-8') as f:
+            contenu = json.load(f)
+        contenu['vehicules_achetes'].append({'lot': "9999", 'marque': "Audi", 'prix_achat': "5000"})
+        with open(modifie, 'w', encoding='utf-8') as f:
+            json.dump(contenu, f)
+        attendus[modifie] = (attendus[modifie][0], attendus[modifie][1] + 1)
+        bilans_modif, duree_modif = migrer(racine, dossier, processus)
+        print(f"   Passe après modification d'un fichier {duree_modif * 1000:5.0f} ms")
+
+        # Contrôles
+        par_source = {b['source']: b for b in bilans}
+        erreurs = [b for b in bilans if b['statut'] == 'erreur']
+        comptes_ok = all(par_source[c]['statut'] == 'migre' and (par_source[c]['reperage'], par_source[c]['achetes']) == n
+                         for c, n in attendus.items() if c != modifie)
+        avertissements = par_source[sorted(attendus)[0]]['avertissements'] if sorted(attendus)[0] in par_source else []
+        print(f"   Bilans par fichier : {len(bilans) - len(erreurs)} migrés, {len(erreurs)} en erreur "
+              f"{'✅' if comptes_ok and len(erreurs) == 1 else '❌'}")
+        print(f"   Lignes invalides signalées : {len(avertissements)} avertissement(s) "
+              f"{'✅' if len(avertissements) >= 3 else '❌'}")
+        sautes = [b for b in bilans_relance if b['statut'] == 'deja_migre']
+        print(f"   Seconde passe : {len(sautes)} fichiers sautés {'✅' if len(sautes) == len(attendus) else '❌'}")
+        remigres = [b['source'] for b in bilans_modif if b['statut'] == 'migre']
+        print(f"   Après modification : {len(remigres)} fichier remigré "
+              f"{'✅' if remigres == [modifie] else '❌'}")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager = JourneesManager(dossier, migrer=False)
+            journees = manager.get_journees_disponibles()
+        total_attendu = sum(r + a for r, a in attendus.values())
+        total = sum(j['nb_reperage'] + j['nb_achetes'] for j in journees)
+        nb_journees = sum(3 if 'journees_encheres' in c else 1 for c in attendus)
+        print(f"   Journées créées : {len(journees)}, {total} véhicules "
+              f"{'✅' if len(journees) == nb_journees and total == total_attendu else '❌'}")
+        manifeste = lire_manifeste(dossier)
+        print(f"   Manifeste : {len(manifeste['fichiers'])} fichiers suivis, hors liste des journées "
+              f"{'✅' if len(manifeste['fichiers']) == len(attendus) + 1 else '❌'}")
+
+        # Vérification de démarrage : une fois par dossier
+        repertoire = os.getcwd()
+        os.chdir(temporaire)
+        try:
+            debut = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                JourneesManager(dossier)
+            premiere = time.perf_counter() - debut
+            faite = lire_manifeste(dossier)['verification_demarrage']
+            debut = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(100):
+                    JourneesManager(dossier)
+            suivantes = (time.perf_counter() - debut) * 1000 / 100
+        finally:
+            os.chdir(repertoire)
+        print(f"   Démarrage : première vérification {premiere * 1000:.1f} ms, puis {suivantes:.2f} ms "
+              f"{'✅' if faite and lire_manifeste(dossier)['verification_demarrage'] == faite else '❌'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Latence d'enregistrement d'un achat en mode direct
+
+Dans un dossier temporaire, crée une journée de lots synthétiques puis compare,
+pour chaque achat :
+- l'ancien chemin : transfert puis sauvegarde complète de la journée ;
+- le mode direct : une ligne de journal écrite avec fsync puis transfert en mémoire.
+Vérifie ensuite qu'un rechargement sans sauvegarde complète (arrêt brutal)
+rejoue bien tous les achats du journal, et qu'aucun achat journalisé par un
+autre poste pendant nos sauvegardes n'est perdu (la journée en mémoire garde
+ses objets véhicules quand ces achats y sont fusionnés).
+
+Usage: python benchmarks/benchmark_mode_direct.py [nb_lots]  (défaut : 300)
+"""
+
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+from models.journee_enchere import JourneeEnchere
+from models.vehicule import Vehicule
+from services.journees_manager import JourneesManager
+
+def creer_journee(nombre, aleatoire):
+    journee = JourneeEnchere()
+    for i in range(nombre):
+        journee.ajouter_vehicule_reperage(Vehicule({
+            'lot': str(i + 1), 'marque': aleatoire.choice(["Renault", "Peugeot", "BMW"]), 'modele': "Modèle",
+            'annee': str(aleatoire.randint(2005, 2020)), 'kilometrage': str(aleatoire.randint(20000, 250000)),
+            'prix_revente': str(aleatoire.randint(3000, 20000)), 'cout_reparations': str(aleatoire.randint(0, 2000)),
+            'temps_reparations': str(aleatoire.randint(0, 20)), 'chose_a_faire': "Carrosserie, pneus, vidange"
+        }))
+    return journee
+
+def centiles(durees):
+    durees = sorted(durees)
+    return (f"médiane {durees[len(durees) // 2] * 1000:6.2f} ms, p99 {durees[int(len(durees) * 0.99)] * 1000:6.2f} ms, "
+            f"max {durees[-1] * 1000:6.2f} ms")
+
+def main():
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    aleatoire = random.Random(42)
+    nb_achats = nombre // 3
+
+    with tempfile.TemporaryDirectory() as dossier:
+        os.chdir(dossier)
+        manager = JourneesManager()
+
+        # Ancien chemin : sauvegarde complète à chaque achat
+        journee = creer_journee(nombre, aleatoire)
+        manager.sauvegarder_journee_fichier(journee, "complete.json")
+        durees = []
+        for _ in range(nb_achats):
+            debut = time.perf_counter()
+            journee.marquer_vehicule_achete(0, "5000")
+            manager.sauvegarder_journee_fichier(journee, "complete.json")
+            durees.append(time.perf_counter() - debut)
+        print(f"📊 {nombre} lots, {nb_achats} achats")
+        print(f"   Sauvegarde complète : {centiles(durees)}")
+
+        # Mode direct : journal + transfert en mémoire
+        journee = creer_journee(nombre, aleatoire)
+        manager.sauvegarder_journee_fichier(journee, "direct.json")
+        manager.charger_journee_fichier("direct.json")
+        journee = manager.journee_active
+        lots = [v.lot for v in aleatoire.sample(journee.vehicules_reperage, nb_achats)]
+        durees = []
+        for lot in lots:
+            operation = {'op': 'achat', 'lot': lot, 'prix_achat': "5000", 'date_achat': "01/01/2025"}
+            debut = time.perf_counter()
+            if not manager.journaliser_operation(operation) or not journee.appliquer_operation(operation):
+                print(f"❌ Achat du lot {lot} non enregistré")
+                return 1
+            durees.append(time.perf_counter() - debut)
+        print(f"   Journal (fsync)     : {centiles(durees)}")
+
+        # Arrêt brutal : pas de sauvegarde complète, le rechargement rejoue le journal
+        rechargee = JourneesManager().charger_journee_fichier("direct.json")
+        achetes = {v.lot for v in rechargee.vehicules_achetes}
+        if achetes != set(lots) or len(rechargee.vehicules_reperage) != nombre - nb_achats:
+            print(f"❌ Rejeu incomplet : {len(achetes)}/{nb_achats} achats retrouvés")
+            return 1
+        if os.path.exists(manager.chemin_journal("direct.json")):
+            print("❌ Journal non vidé après la sauvegarde du rejeu")
+            return 1
+        print(f"✅ {nb_achats} achats retrouvés après rechargement sans sauvegarde complète")
+
+        # Un autre poste journalise des achats pendant que nous sauvegardons en boucle
+        journee = creer_journee(nombre, aleatoire)
+        manager.sauvegarder_journee_fichier(journee, "partage.json")
+        journee = manager.charger_journee_fichier("partage.json")
+        autre = JourneesManager()
+        autre.charger_journee_fichier("partage.json")
+        objets = {v.lot: v for v in journee.vehicules_reperage}
+        lots = [v.lot for v in aleatoire.sample(journee.vehicules_reperage, nb_achats)]
+
+        def autre_poste():
+            for lot in lots:
+                autre.journaliser_operation({'op': 'achat', 'lot': lot, 'prix_achat': "5000", 'date_achat': "01/01/2025"})
+
+        fil = threading.Thread(target=autre_poste)
+        fil.start()
+        sauvegardes = 0
+        while fil.is_alive():
+            manager.sauvegarder_journee_fichier(journee, "partage.json")
+            sauvegardes += 1
+        fil.join()
+        manager.sauvegarder_journee_fichier(journee, "partage.json")
+        rechargee = JourneesManager().charger_journee_fichier("partage.json")
+        perdus = set(lots) - {v.lot for v in rechargee.vehicules_achetes}
+        if perdus or {v.lot for v in journee.vehicules_achetes} != set(lots):
+            print(f"❌ {len(perdus)} achat(s) de l'autre poste perdu(s) pendant {sauvegardes} sauvegardes")
+            return 1
+        if not all(objets[v.lot] is v for v in journee.vehicules_reperage + journee.vehicules_achetes):
+            print("❌ Véhicules remplacés par de nouveaux objets lors de la fusion des achats")
+            return 1
+        print(f"✅ {nb_achats} achats d'un autre poste conservés pendant {sauvegardes} sauvegardes, "
+              f"véhicules en mémoire mis à jour sur place")
+        os.chdir(RACINE)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
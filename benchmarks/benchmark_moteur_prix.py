@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Coût par véhicule du moteur de prix : appels unitaires contre calcul en lot
+
+Génère des véhicules synthétiques (champs texte comme dans les journées) et
+chronomètre :
+- le recalcul unitaire des prix max (mettre_a_jour_prix_max_avec_parametres) ;
+- l'API scalaire (calculer_vehicule) ;
+- l'API en lot sur les véhicules (conversion des champs comprise) ;
+- l'API en lot sur des colonnes déjà numériques (calcul seul).
+Vérifie aussi que les deux API donnent les mêmes montants.
+
+Usage: python benchmarks/benchmark_moteur_prix.py [nb_vehicules]  (défaut : 100 000)
+"""
+
+import os
+import random
+import sys
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+from models.vehicule import Vehicule
+from services import moteur_prix
+from services.moteur_prix import MoteurPrix, COLONNES_SORTIE
+
+PARAMETRES = {'tarif_horaire': 45.0, 'commission_vente': 8.5, 'marge_securite': 200.0}
+
+def generer_vehicules(nombre):
+    aleatoire = random.Random(42)
+    vehicules = []
+    for i in range(nombre):
+        achete = aleatoire.random() < 0.4
+        vendu = achete and aleatoire.random() < 0.5
+        vehicules.append(Vehicule({
+            'lot': str(i),
+            'prix_revente': str(aleatoire.randint(1000, 30000)),
+            'cout_reparations': str(aleatoire.randint(0, 3000)) if aleatoire.random() < 0.8 else '',
+            'temps_reparations': f"{aleatoire.randint(0, 40) / 2}".replace('.', ','),
+            'prix_achat': str(aleatoire.randint(500, 20000)) if achete else '',
+            'prix_vente_final': str(aleatoire.randint(1000, 32000)) if vendu else '',
+            'prix_max_achat': f"{aleatoire.randint(0, 25000)}€"
+        }))
+    return vehicules
+
+def chronometrer(nom, fonction, nombre, repetitions=3):
+    meilleur = min(_duree(fonction) for _ in range(repetitions))
+    print(f"   {nom:<48} {meilleur * 1e6 / nombre:8.3f} µs/véhicule  ({meilleur * 1000:8.1f} ms)")
+    return meilleur
+
+def _duree(fonction):
+    debut = time.perf_counter()
+    fonction()
+    return time.perf_counter() - debut
+
+def main():
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    vehicules = generer_vehicules(nombre)
+    moteur = MoteurPrix(PARAMETRES)
+    colonnes = MoteurPrix.colonnes_vehicules(vehicules)
+
+    # Les deux API doivent s'accorder
+    lot = moteur.calculer_lot(colonnes)
+    for index in range(0, nombre, max(1, nombre // 1000)):
+        unitaire = moteur.calculer_vehicule(vehicules[index])
+        for colonne in COLONNES_SORTIE:
+            if abs(unitaire[colonne] - float(lot[colonne][index])) > 1e-6:
+                print(f"❌ Écart sur '{colonne}' (véhicule {index}) : {unitaire[colonne]} / {lot[colonne][index]}")
+                return 1
+
+    print(f"📊 {nombre:,} véhicules, NumPy {'actif' if moteur_prix.np is not None else 'absent (lot en pur Python)'}")
+    chronometrer("Prix max unitaires (avec_parametres)",
+                 lambda: [v.mettre_a_jour_prix_max_avec_parametres(PARAMETRES) for v in vehicules], nombre)
+    chronometrer("API scalaire (calculer_vehicule)",
+                 lambda: [moteur.calculer_vehicule(v) for v in vehicules], nombre)
+    chronometrer("Prix max en lot (mettre_a_jour_prix_max)",
+                 lambda: moteur.mettre_a_jour_prix_max(vehicules), nombre)
+    chronometrer("API en lot sur véhicules (calculer_vehicules)",
+                 lambda: moteur.calculer_vehicules(vehicules), nombre)
+    chronometrer("API en lot sur colonnes (calculer_lot)",
+                 lambda: moteur.calculer_lot(colonnes), nombre)
+    print("✅ API scalaire et API en lot concordantes")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
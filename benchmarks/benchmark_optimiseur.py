@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Durée de l'optimisation des lots à viser (séparation et évaluation)
+
+Vérifie l'optimum contre une énumération exhaustive sur de petites instances,
+puis chronomètre des journées synthétiques de taille réaliste, avec et sans
+contrainte d'heures d'atelier, et une série de recalculs « en direct » où les
+lots partent un à un.
+
+Usage: python benchmarks/benchmark_optimiseur.py [nb_lots]  (défaut : 200)
+"""
+
+import itertools
+import os
+import random
+import sys
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+from services.optimiseur_lots import optimiser_selection
+
+def generer_candidats(nombre, aleatoire):
+    candidats = []
+    for i in range(nombre):
+        prix_max = aleatoire.randint(800, 15000)
+        candidats.append({
+            'index': i, 'lot': str(i), 'libelle': f"Lot {i}",
+            'prix_max': prix_max, 'prix_attendu': prix_max * 0.87,
+            'engagement': prix_max * 1.085,
+            'marge_attendue': prix_max * aleatoire.uniform(0.05, 0.5),
+            'heures': aleatoire.randint(0, 20)
+        })
+    return candidats
+
+def exhaustif(candidats, budget, heures_max):
+    meilleure = 0.0
+    for taille in range(len(candidats) + 1):
+        for combinaison in itertools.combinations(candidats, taille):
+            if (sum(c['engagement'] for c in combinaison) <= budget
+                    and sum(c['heures'] for c in combinaison) <= heures_max):
+                meilleure = max(meilleure, sum(c['marge_attendue'] for c in combinaison))
+    return meilleure
+
+def main():
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    aleatoire = random.Random(42)
+
+    for essai in range(30):
+        candidats = generer_candidats(14, aleatoire)
+        budget = sum(c['engagement'] for c in candidats) * aleatoire.uniform(0.2, 0.6)
+        heures_max = aleatoire.randint(20, 80)
+        attendu = exhaustif(candidats, budget, heures_max)
+        obtenu = optimiser_selection(candidats, budget, heures_max)['marge_totale']
+        if abs(attendu - obtenu) > 1e-6:
+            print(f"❌ Instance {essai} : optimum {attendu:.2f}, obtenu {obtenu:.2f}")
+            return 1
+    print("✅ Optimum identique à l'énumération exhaustive (30 instances de 14 lots)")
+
+    candidats = generer_candidats(nombre, aleatoire)
+    budget = sum(c['engagement'] for c in candidats) * 0.15
+    for libelle, heures_max in (("budget seul", None), ("budget + 150 h", 150)):
+        debut = time.perf_counter()
+        resultat = optimiser_selection(candidats, budget, heures_max)
+        print(f"   {nombre} lots, {libelle:<16} {(time.perf_counter() - debut) * 1000:8.1f} ms  "
+              f"({len(resultat['selection'])} lots, {resultat['noeuds']:,} nœuds, "
+              f"{'optimal' if resultat['optimal'] else 'limite atteinte'})")
+
+    # En direct : un lot part à chaque recalcul
+    restants = list(candidats)
+    durees = []
+    while len(restants) > nombre // 2:
+        debut = time.perf_counter()
+        optimiser_selection(restants, budget, 150)
+        durees.append(time.perf_counter() - debut)
+        restants.pop(aleatoire.randrange(len(restants)))
+    print(f"   Recalcul en direct : médiane {sorted(durees)[len(durees) // 2] * 1000:.1f} ms, "
+          f"max {max(durees) * 1000:.1f} ms sur {len(durees)} recalculs")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Débit des analyseurs de pages Leboncoin sur un corpus de pages enregistrées
+
+Chaque analyseur disponible (json, lxml, beautifulsoup) analyse toutes les pages
+du corpus ; on affiche les annonces par seconde et les millisecondes par page,
+et on vérifie que les analyseurs qui reconnaissent une page en tirent les mêmes annonces.
+Pour chaque page, on indique l'analyseur retenu par la chaîne du scraper (le
+premier qui la reconnaît) et tous ceux qui la reconnaissent.
+
+Usage: python benchmarks/benchmark_parsers.py [fichiers ou motifs .html ...] [--repetitions N]
+Par défaut : script_scraping_leboncoin/debug_sample.html et les pages enregistrées
+script_scraping_leboncoin/fixtures/pages/*.html (cartes HTML, JSON __NEXT_DATA__, sans résultat)
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOSSIER_SCRAPER = os.path.join(RACINE, "script_scraping_leboncoin")
+sys.path.insert(0, DOSSIER_SCRAPER)
+
+import parsers
+
+def charger_corpus(motifs):
+    """Lit les pages du corpus (contenu brut, comme reçu du réseau)"""
+    if not motifs:
+        motifs = [os.path.join(DOSSIER_SCRAPER, "debug_sample.html"),
+                  os.path.join(DOSSIER_SCRAPER, "fixtures", "pages", "*.html")]
+    fichiers = []
+    for motif in motifs:
+        fichiers.extend(sorted(glob.glob(motif)) or ([motif] if os.path.isfile(motif) else []))
+    pages = []
+    for fichier in fichiers:
+        with open(fichier, "rb") as f:
+            pages.append((os.path.basename(fichier), f.read()))
+    return pages
+
+def mesurer(parser, pages, repetitions):
+    """Retourne (ms par page, annonces par seconde, résultats par page)"""
+    resultats = {nom: parser.parse(contenu) for nom, contenu in pages}
+    reconnues = [(nom, contenu) for nom, contenu in pages if resultats[nom] is not None]
+    if not reconnues:
+        return None, None, resultats
+
+    nb_annonces = 0
+    debut = time.perf_counter()
+    for _ in range(repetitions):
+        for _, contenu in reconnues:
+            nb_annonces += len(parser.parse(contenu))
+    duree = time.perf_counter() - debut
+
+    ms_par_page = duree * 1000 / (repetitions * len(reconnues))
+    annonces_par_s = nb_annonces / duree if duree > 0 else 0
+    return ms_par_page, annonces_par_s, resultats
+
+def main():
+    arguments = argparse.ArgumentParser(description="Benchmark des analyseurs de pages Leboncoin")
+    arguments.add_argument("corpus", nargs="*", help="Fichiers ou motifs glob de pages HTML")
+    arguments.add_argument("--repetitions", type=int, default=20)
+    args = arguments.parse_args()
+
+    pages = charger_corpus(args.corpus)
+    if not pages:
+        print("❌ Aucune page dans le corpus")
+        return 1
+
+    print(f"📊 Corpus : {len(pages)} page(s), {args.repetitions} répétition(s)")
+    references = {}     # page -> (analyseur, annonces) : premières annonces trouvées
+    coherent = True
+    reconnaissances = {nom: [] for nom, _ in pages}
+    for cls in parsers.PARSERS:
+        if not cls.available():
+            print(f"   {cls.name:<14} indisponible (dépendance manquante)")
+            continue
+        ms_par_page, annonces_par_s, resultats = mesurer(cls(), pages, args.repetitions)
+        for nom, annonces in resultats.items():
+            if annonces is not None:
+                reconnaissances[nom].append((cls.name, len(annonces)))
+        if ms_par_page is None:
+            print(f"   {cls.name:<14} format non reconnu sur ce corpus")
+            continue
+        nb = sum(len(r) for r in resultats.values() if r is not None)
+        print(f"   {cls.name:<14} {ms_par_page:8.2f} ms/page  {annonces_par_s:10.0f} annonces/s  ({nb} annonces)")
+
+        # Les analyseurs qui trouvent des annonces sur une même page doivent trouver les mêmes
+        # (beautifulsoup, dernier recours, « reconnaît » toute page, sans annonce si pas de cartes)
+        for nom, annonces in resultats.items():
+            if not annonces:
+                continue
+            if nom not in references:
+                references[nom] = (cls.name, annonces)
+            elif annonces != references[nom][1]:
+                print(f"⚠️  {cls.name} : annonces différentes de {references[nom][0]} sur {nom}")
+                coherent = False
+
+    # Analyseur retenu par ParserChain : le premier disponible qui reconnaît la page
+    print("\n🧩 Analyseur par page")
+    for nom, analyseurs in reconnaissances.items():
+        retenu = analyseurs[0][0] if analyseurs else "aucun"
+        detail = ", ".join(f"{analyseur} ({nb})" for analyseur, nb in analyseurs) or "-"
+        print(f"   {nom:<24} → {retenu:<14} reconnue par : {detail}")
+
+    if coherent:
+        print("✅ Résultats identiques entre analyseurs")
+    return 0 if coherent else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
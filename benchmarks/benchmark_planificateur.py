@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Planificateur de requêtes du scraper Leboncoin contre un serveur local
+
+Un serveur http.server (dans un thread) imite les pages de recherche : pages
+numérotées d'annonces en JSON __NEXT_DATA__, réponses 429 avec Retry-After
+sur demande. Vérifie sur les requêtes réellement reçues par le serveur :
+- qu'aucune page n'est demandée au-delà de celles nécessaires à l'objectif ;
+- qu'après un 429, le nouvel essai part après Retry-After, et pas deux fois plus tard ;
+- que le débit demandé est respecté, et les annonces livrées dans l'ordre des pages ;
+- qu'une page captcha (réponse 200 sans annonce) n'est pas mise en cache.
+
+Usage: python benchmarks/benchmark_planificateur.py
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RACINE, "script_scraping_leboncoin"))
+
+from leboncoin_scraper import LeboncoinScraper
+from response_cache import ResponseCache
+
+class ServeurFactice:
+    """Serveur local imitant les pages de recherche Leboncoin"""
+
+    def __init__(self, annonces_par_page: int = 35, nb_pages: int = 10, refus=None, retry_after: float = 1.0,
+                 latence: float = 0.0, captchas=None):
+        """
+        Args:
+            annonces_par_page: Annonces de chaque page
+            nb_pages: Pages de résultats (les suivantes sont vides)
+            refus: {page: nombre de 429 avant la réponse normale}, pour chaque recherche
+            retry_after: Valeur de l'en-tête Retry-After (secondes)
+            latence: Durée de traitement de chaque requête (secondes)
+            captchas: {page: nombre de pages captcha (200 sans annonce) avant la page normale}
+        """
+        self.annonces_par_page = annonces_par_page
+        self.nb_pages = nb_pages
+        self.refus = dict(refus or {})
+        self.retry_after = retry_after
+        self.latence = latence
+        self.captchas = dict(captchas or {})
+        self.requetes = []  # (instant, recherche, page, statut)
+        self.en_cours = 0
+        self.simultanees_max = 0
+        self.verrou = threading.Lock()
+        self.serveur = None
+
+    def page(self, texte: str, page: int) -> bytes:
+        annonces = []
+        if page <= self.nb_pages:
+            for i in range(self.annonces_par_page):
+                annonces.append({
+                    'list_id': page * 1000 + i,
+                    'subject': f"{texte} p{page}-{i}",
+                    'url': f"/ad/voitures/{page * 1000 + i}",
+                    'price': 10000 + page * 100 + i,
+                    'attributes': [{'key': 'regdate', 'value': '2015'}, {'key': 'mileage', 'value': '100000'}]
+                })
+        donnees = {'props': {'pageProps': {'searchData': {'total': len(annonces), 'ads': annonces}}}}
+        return (f'<html><body><script id="__NEXT_DATA__" type="application/json">'
+                f'{json.dumps(donnees, ensure_ascii=False)}</script></body></html>').encode('utf-8')
+
+    def demarrer(self) -> str:
+        """Démarre le serveur ; retourne l'URL de recherche"""
+        factice = self
+
+        class Gestionnaire(BaseHTTPRequestHandler):
+            def do_GET(self):
+                params = parse_qs(urlparse(self.path).query)
+                texte = params.get('text', [''])[0]
+                page = int(params.get('page', ['1'])[0])
+                with factice.verrou:
+                    deja = sum(1 for _, t, p, _ in factice.requetes if (t, p) == (texte, page))
+                    statut = 429 if deja < factice.refus.get(page, 0) else 200
+                    if statut == 200 and deja < factice.refus.get(page, 0) + factice.captchas.get(page, 0):
+                        statut = 'captcha'
+                    factice.requetes.append((time.monotonic(), texte, page, statut))
+                    factice.en_cours += 1
+                    factice.simultanees_max = max(factice.simultanees_max, factice.en_cours)
+                try:
+                    time.sleep(factice.latence)
+                    self.repondre(texte, page, statut)
+                finally:
+                    with factice.verrou:
+                        factice.en_cours -= 1
+
+            def repondre(self, texte, page, statut):
+                if statut == 429:
+                    self.send_response(429)
+                    self.send_header('Retry-After', str(factice.retry_after))
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                if statut == 'captcha':
+                    contenu = "<html><body><h1>Vérification de sécurité</h1></body></html>".encode('utf-8')
+                else:
+                    contenu = factice.page(texte, page)
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(contenu)))
+                self.end_headers()
+                self.wfile.write(contenu)
+
+            def log_message(self, *args):
+                pass
+
+        self.serveur = ThreadingHTTPServer(('127.0.0.1', 0), Gestionnaire)
+        self.serveur.daemon_threads = True
+        threading.Thread(target=self.serveur.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self.serveur.server_address[1]}/recherche"
+
+    def arreter(self):
+        self.serveur.shutdown()
+        self.serveur.server_close()
+
+def rechercher(factice: ServeurFactice, nb_annonces: int, rate: float, burst: int = 1, max_workers: int = 3,
+               cache=None, recherches: int = 1):
+    """Recherche « Peugeot 308 » contre le serveur local ; retourne (annonces de la dernière recherche, durée en s)"""
+    url = factice.demarrer()
+    try:
+        scraper = LeboncoinScraper(base_url=url, rate=rate, burst=burst, max_workers=max_workers, cache=cache)
+        debut = time.monotonic()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(recherches):
+                annonces = scraper.search_ads("Peugeot 308", 2010, 2020, 0, 200000, nb_annonces=nb_annonces)
+        duree = time.monotonic() - debut
+        # Laisser arriver au serveur les requêtes parties d'avance
+        time.sleep(0.5)
+        return annonces, duree
+    finally:
+        factice.arreter()
+
+def dans_l_ordre(annonces) -> bool:
+    """Annonces dans l'ordre des pages, puis de la page"""
+    cles = [tuple(int(n) for n in a['titre'].rsplit(' p', 1)[1].split('-')) for a in annonces]
+    return cles == sorted(cles)
+
+def verifier(ok: bool, message: str) -> bool:
+    print(f"   {'✅' if ok else '❌'} {message}")
+    return ok
+
+def main() -> int:
+    resultats = []
+
+    print("\n🎯 Objectif de 50 annonces, 35 par page, 3 requêtes simultanées")
+    factice = ServeurFactice()
+    annonces, duree = rechercher(factice, 50, rate=20, burst=3)
+    pages = sorted(p for _, _, p, _ in factice.requetes)
+    resultats.append(verifier(len(annonces) == 50 and dans_l_ordre(annonces),
+                              f"{len(annonces)} annonces dans l'ordre des pages ({duree:.2f}s)"))
+    resultats.append(verifier(pages == [1, 2], f"pages demandées au serveur : {pages} (attendu [1, 2])"))
+
+    print("\n🐢 Page 1 refusée une fois (429, Retry-After: 1)")
+    factice = ServeurFactice(refus={1: 1}, retry_after=1)
+    annonces, duree = rechercher(factice, 35, rate=20)
+    instants = [t for t, _, p, _ in factice.requetes if p == 1]
+    ecart = instants[1] - instants[0] if len(instants) == 2 else float('nan')
+    resultats.append(verifier(len(annonces) == 35, f"{len(annonces)} annonces après le nouvel essai"))
+    resultats.append(verifier(1.0 <= ecart < 1.5, f"nouvel essai {ecart:.2f}s après le 429 (attendu 1 à 1,5 s)"))
+
+    print("\n⏱️ Débit de 4 requêtes/s, 6 pages")
+    factice = ServeurFactice()
+    annonces, duree = rechercher(factice, 6 * 35, rate=4)
+    instants = sorted(t for t, _, _, _ in factice.requetes)
+    # Premier jeton immédiat (capacité 1), puis un toutes les 0,25 s
+    trop_tot = [k for k, t in enumerate(instants) if t - instants[0] < k / 4 - 0.05]
+    resultats.append(verifier(len(annonces) == 6 * 35 and dans_l_ordre(annonces),
+                              f"{len(annonces)} annonces dans l'ordre des pages ({duree:.2f}s)"))
+    resultats.append(verifier(len(instants) == 6 and not trop_tot,
+                              f"{len(instants)} requêtes, aucune en avance sur le débit"
+                              + (f" (en avance : {trop_tot})" if trop_tot else "")))
+
+    print("\n🤖 Page 1 remplacée une fois par un captcha, cache activé, deux recherches")
+    with tempfile.TemporaryDirectory() as dossier:
+        cache = ResponseCache(os.path.join(dossier, "reponses.sqlite"))
+        factice = ServeurFactice(captchas={1: 1})
+        annonces, duree = rechercher(factice, 35, rate=20, cache=cache, recherches=2)
+        cache.fermer()
+    statuts = [statut for _, _, p, statut in factice.requetes if p == 1]
+    resultats.append(verifier(len(annonces) == 35 and statuts == ['captcha', 200],
+                              f"{len(annonces)} annonces à la deuxième recherche, page 1 demandée "
+                              f"{len(statuts)} fois (attendu 2 : captcha non mis en cache)"))
+
+    print(f"\n{'✅ Tout est conforme' if all(resultats) else '❌ Écarts constatés'}")
+    return 0 if all(resultats) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
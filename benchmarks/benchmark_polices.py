@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mesure du temps d'application d'un changement de polices
+
+Compare l'ancienne méthode (parcours récursif de l'arbre des widgets avec un
+nouveau CTkFont par widget) et le registre de polices partagées.
+
+Usage: python benchmarks/benchmark_polices.py [nb_widgets]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import customtkinter as ctk
+
+from utils.polices import registre_polices
+
+def construire_interface(parent, nb_widgets, avec_registre):
+    """Crée un formulaire de labels/champs/boutons comparable à l'onglet repérage"""
+    for i in range(nb_widgets // 3):
+        ligne = ctk.CTkFrame(parent)
+        ligne.pack(fill="x")
+        if avec_registre:
+            polices = [registre_polices.police(t) for t in ('labels', 'champs', 'boutons')]
+        else:
+            polices = [ctk.CTkFont(size=12, weight="bold"), ctk.CTkFont(size=12), ctk.CTkFont(size=12, weight="bold")]
+        ctk.CTkLabel(ligne, text=f"Label {i}", font=polices[0]).pack(side="left")
+        ctk.CTkEntry(ligne, font=polices[1]).pack(side="left")
+        ctk.CTkButton(ligne, text=f"Bouton {i}", font=polices[2]).pack(side="left")
+
+def parcours_recursif(widget, params):
+    """Reproduction de l'ancien ReperageTab.mettre_a_jour_polices_recursive"""
+    if isinstance(widget, ctk.CTkLabel):
+        widget.configure(font=ctk.CTkFont(size=params['taille_police_labels'], weight="bold"))
+    elif isinstance(widget, ctk.CTkButton):
+        widget.configure(font=ctk.CTkFont(size=params['taille_police_boutons'], weight="bold"))
+    elif isinstance(widget, ctk.CTkEntry):
+        widget.configure(font=ctk.CTkFont(size=params['taille_police_champs']))
+    for child in widget.winfo_children():
+        parcours_recursif(child, params)
+
+def mesurer(root, fonction):
+    """Chronomètre une application de polices, rendu compris"""
+    debut = time.perf_counter()
+    fonction()
+    root.update_idletasks()
+    return (time.perf_counter() - debut) * 1000
+
+def main():
+    nb_widgets = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    root = ctk.CTk()
+    tailles = [
+        {'taille_police_labels': t, 'taille_police_champs': t, 'taille_police_boutons': t}
+        for t in (14, 16, 12, 18, 13)
+    ]
+
+    # Avant : parcours récursif
+    cadre = ctk.CTkFrame(root)
+    cadre.pack()
+    construire_interface(cadre, nb_widgets, avec_registre=False)
+    root.update_idletasks()
+    avant = [mesurer(root, lambda p=p: parcours_recursif(cadre, p)) for p in tailles]
+    cadre.destroy()
+
+    # Après : registre de polices partagées
+    cadre = ctk.CTkFrame(root)
+    cadre.pack()
+    construire_interface(cadre, nb_widgets, avec_registre=True)
+    root.update_idletasks()
+    apres = [mesurer(root, lambda p=p: registre_polices.appliquer(p)) for p in tailles]
+
+    print(f"📊 Application des polices sur {nb_widgets} widgets")
+    print(f"   Avant (parcours récursif) : {sum(avant) / len(avant):.1f} ms en moyenne")
+    print(f"   Après (registre partagé)  : {sum(apres) / len(apres):.1f} ms en moyenne")
+    root.destroy()
+
+if __name__ == "__main__":
+    main()
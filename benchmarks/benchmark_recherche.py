@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Coût de la recherche plein texte dans toutes les journées
+
+Indexe des journées synthétiques (notes « chose à faire » / champ libre tirées
+d'un vocabulaire d'atelier) puis chronomètre : la construction de l'index, la
+réindexation d'une journée sauvegardée (textes changés ou non) et des requêtes
+(mot exact, début de mot, plusieurs mots, mot très fréquent), comparées à un
+parcours de tous les véhicules. Vérifie que l'index trouve exactement les
+mêmes véhicules que le parcours.
+
+Usage: python benchmarks/benchmark_recherche.py [nb_journees] [nb_vehicules]  (défaut : 1000, 150)
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+from models.journee_enchere import JourneeEnchere
+from services.index_recherche import IndexRecherche, decouper_termes, CHAMPS_INDEXES
+
+MARQUES = {"Renault": ["Clio", "Mégane"], "Peugeot": ["208", "308"], "Citroën": ["C3", "Berlingo"], "BMW": ["Série 1"]}
+NOTES = [
+    "boîte qui craque", "embrayage HS", "courroie de distribution à faire", "pneus avant usés",
+    "carrosserie rayée côté gauche", "voyant moteur allumé", "fuite d'huile", "freins arrière à changer",
+    "démarreur faible", "climatisation à recharger", "pare-brise fendu", "batterie morte", "RAS",
+    "bruit de roulement", "turbo siffle", "vidange à prévoir", "rétroviseur cassé", "jantes abîmées"
+]
+REQUETES = ["embrayage", "embray", "boite craque", "Boîte", "distrib courroie", "turbo", "ras", "clio pneus"]
+
+def generer_journee(index, nb_vehicules, aleatoire):
+    vehicules = []
+    for i in range(nb_vehicules):
+        marque = aleatoire.choice(list(MARQUES))
+        vehicules.append({
+            'lot': str(i + 1), 'marque': marque, 'modele': aleatoire.choice(MARQUES[marque]),
+            'chose_a_faire': ", ".join(aleatoire.sample(NOTES, aleatoire.randint(0, 3))),
+            'champ_libre': aleatoire.choice(["", "", "clés manquantes", "carnet d'entretien", "2 propriétaires"])
+        })
+    coupure = int(nb_vehicules * 0.7)
+    return JourneeEnchere({
+        'id': str(index), 'nom': f"Journée {index}", 'date': f"2025-{index % 12 + 1:02d}-15",
+        'vehicules_reperage': vehicules[:coupure], 'vehicules_achetes': vehicules[coupure:]
+    })
+
+def parcours(journees, requete):
+    """Référence : tous les véhicules dont les termes commencent par chaque mot de la requête"""
+    mots = set(decouper_termes(requete))
+    trouves = set()
+    for nom, journee in journees.items():
+        for statut, vehicules in (('Repérage', journee.vehicules_reperage), ('Acheté', journee.vehicules_achetes)):
+            for position, vehicule in enumerate(vehicules):
+                termes = set()
+                for champ in CHAMPS_INDEXES:
+                    termes.update(decouper_termes(getattr(vehicule, champ, "")))
+                if all(any(t.startswith(m) for t in termes) for m in mots):
+                    trouves.add((nom, statut, position))
+    return trouves
+
+def chrono_ms(fonction, repetitions=1):
+    durees = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        resultat = fonction()
+        durees.append((time.perf_counter() - debut) * 1000)
+    return resultat, statistics.median(durees)
+
+def main():
+    nb_journees = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    nb_vehicules = int(sys.argv[2]) if len(sys.argv) > 2 else 150
+    aleatoire = random.Random(42)
+    journees = {f"journee_{i}.json": generer_journee(i, nb_vehicules, aleatoire) for i in range(nb_journees)}
+    print(f"🔎 {nb_journees} journées × {nb_vehicules} véhicules = {nb_journees * nb_vehicules} documents")
+
+    with tempfile.TemporaryDirectory() as dossier:
+        index = IndexRecherche(dossier)
+        _, duree = chrono_ms(lambda: [index.indexer_journee(nom, j) for nom, j in journees.items()])
+        print(f"   Construction de l'index                    {duree:9.0f} ms  "
+              f"({os.path.getsize(index.chemin) / 1e6:.1f} Mo)")
+
+        journee = journees["journee_7.json"]
+        _, duree = chrono_ms(lambda: index.indexer_journee("journee_7.json", journee), 5)
+        print(f"   Sauvegarde sans changement de texte        {duree:9.2f} ms")
+        journee.vehicules_reperage[0].chose_a_faire = "injecteurs encrassés"
+        _, duree = chrono_ms(lambda: index.indexer_journee("journee_7.json", journee))
+        print(f"   Sauvegarde avec une note modifiée          {duree:9.2f} ms")
+
+        print(f"\n   {'Requête':<20} {'Résultats':>10} {'Index':>10} {'Parcours':>10}")
+        identiques = True
+        for requete in REQUETES:
+            resultats, duree_index = chrono_ms(lambda: index.rechercher(requete, limite=10 ** 9), 5)
+            reference, duree_parcours = chrono_ms(lambda: parcours(journees, requete))
+            trouves = {(r['fichier'], r['statut'], r['position']) for r in resultats}
+            identiques &= trouves == reference
+            print(f"   {requete:<20} {len(resultats):>10} {duree_index:>8.1f}ms {duree_parcours:>8.0f}ms")
+            _, duree_top = chrono_ms(lambda: index.rechercher(requete), 5)
+            print(f"   {'  (100 premiers)':<20} {'':>10} {duree_top:>8.1f}ms")
+        index.fermer()
+
+    print(f"\n   Mêmes véhicules que le parcours complet : {'✅' if identiques else '❌'}")
+
+if __name__ == "__main__":
+    main()
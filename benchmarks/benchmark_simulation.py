@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Durée de la simulation Monte Carlo d'une journée d'enchères
+
+Ajuste le modèle sur un historique synthétique (ratios Prix achat / Prix max
+lognormaux connus), simule une journée de lots synthétiques avec 1 processus
+puis avec tous les cœurs, et vérifie que les deux exécutions donnent le même
+résultat pour une même graine. Vérifie aussi qu'aucun lot n'est remporté
+au-dessus de son prix max, et que la dépense moyenne simulée correspond au
+prix attendu de l'optimiseur (loi tronquée à 1).
+
+Usage: python benchmarks/benchmark_simulation.py [nb_scenarios] [nb_lots]  (défaut : 50 000, 150)
+"""
+
+import math
+import os
+import random
+import statistics
+import sys
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+from models.vehicule import Vehicule
+from services import simulation_enchere
+from services.optimiseur_lots import preparer_candidats
+from services.simulation_enchere import construire_modele, preparer_lots, simuler_journee
+
+PARAMETRES = {'tarif_horaire': 45.0, 'commission_vente': 8.5, 'marge_securite': 200.0}
+MARQUES = ["Renault", "Peugeot", "Citroën", "BMW", "Audi", "Volkswagen"]
+
+def generer_historique(nb_journees, aleatoire):
+    """Journées passées : ratios lognormaux (mu = log 0.85, sigma = 0.2), un lot sur trois acheté"""
+    journees = []
+    for _ in range(nb_journees):
+        achetes, reperage = [], []
+        for _ in range(60):
+            vehicule = {'marque': aleatoire.choice(MARQUES), 'prix_max_achat': f"{aleatoire.randint(1000, 15000)}€"}
+            if aleatoire.random() < 1 / 3:
+                prix_max = float(vehicule['prix_max_achat'].rstrip('€'))
+                vehicule['prix_achat'] = f"{prix_max * math.exp(aleatoire.gauss(math.log(0.85), 0.2)):.0f}"
+                achetes.append(vehicule)
+            else:
+                reperage.append(vehicule)
+        journees.append({'vehicules_achetes': achetes, 'vehicules_reperage': reperage})
+    return journees
+
+def generer_lots(nombre, aleatoire):
+    vehicules = []
+    for i in range(nombre):
+        vehicule = Vehicule({
+            'lot': str(i), 'marque': aleatoire.choice(MARQUES),
+            'prix_revente': str(aleatoire.randint(3000, 20000)),
+            'cout_reparations': str(aleatoire.randint(0, 2000)),
+            'temps_reparations': str(aleatoire.randint(0, 20))
+        })
+        vehicule.mettre_a_jour_prix_max_avec_parametres(PARAMETRES)
+        vehicules.append(vehicule)
+    return vehicules
+
+def verifier_plafond(nb_scenarios: int) -> bool:
+    """Lot unique adjugé vers 95 % du prix max (sigma 0.2) : environ 40 % des ratios tirés dépassent 1"""
+    loi = {'mu': math.log(0.95), 'sigma': 0.2, 'p_gain': 1.0, 'echantillon': 0}
+    vehicule = Vehicule({'lot': "1", 'marque': "Renault", 'prix_revente': "12000", 'prix_max_achat': "10000"})
+    modele = {'global': loi, 'marques': {}}
+    lots = preparer_lots([vehicule], PARAMETRES, modele)
+    depenses = simulation_enchere._simuler_bloc(lots, 0.0, nb_scenarios, 1234, 0)[0]
+    gagnees = [d for d in depenses if d > 0]
+    prix_attendu = preparer_candidats([vehicule], PARAMETRES, modele)[0]['prix_attendu']
+    moyenne = statistics.fmean(gagnees) if gagnees else 0.0
+    ecart = abs(moyenne - prix_attendu) / prix_attendu
+    print(f"   Lot remporté dans {len(gagnees) / nb_scenarios:.1%} des scénarios, dépense max {max(depenses):,.0f} € "
+          f"(prix max 10 000 €), moyenne {moyenne:,.0f} € / optimiseur {prix_attendu:,.0f} €")
+    if max(depenses) > 10000 or ecart > 0.01:
+        print("❌ Lot remporté au-dessus du prix max ou prix attendu incohérent avec la simulation")
+        return False
+    print("✅ Aucun lot au-dessus du prix max, prix attendu de l'optimiseur = moyenne simulée")
+    return True
+
+def main():
+    nb_scenarios = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    nb_lots = int(sys.argv[2]) if len(sys.argv) > 2 else 150
+    aleatoire = random.Random(42)
+
+    modele = construire_modele(generer_historique(20, aleatoire))
+    loi = modele['global']
+    print(f"📐 Modèle ajusté : ratio médian {math.exp(loi['mu']):.3f} (attendu 0.850), "
+          f"sigma {loi['sigma']:.3f} (attendu 0.200), p_gain {loi['p_gain']:.2f} (attendu 0.33), "
+          f"{len(modele['marques'])} marque(s)")
+
+    lots = preparer_lots(generer_lots(nb_lots, aleatoire), PARAMETRES, modele)
+    budget = sum(lots['prix_max']) * 0.3
+    print(f"📊 {nb_scenarios:,} scénarios × {len(lots['prix_max'])} lots, "
+          f"NumPy {'actif' if simulation_enchere.np is not None else 'absent (pur Python)'}, {os.cpu_count()} cœur(s)")
+
+    resultats = {}
+    for processus in sorted({1, max(2, os.cpu_count() or 1)}):
+        debut = time.perf_counter()
+        resultats[processus] = simuler_journee(lots, PARAMETRES, budget, nb_scenarios, graine=1234, processus=processus)
+        print(f"   {processus} processus {(time.perf_counter() - debut) * 1000:10.1f} ms")
+
+    r = resultats[1]
+    print(f"   Dépense moyenne {r['depense_moyenne']:,.0f} € (P5 {r['depense_p5']:,.0f} / P95 {r['depense_p95']:,.0f}), "
+          f"marge moyenne {r['marge_moyenne']:,.0f} €, P(dépense > {budget:,.0f} €) = {r['proba_depassement']:.1%}")
+    if any(resultat != r for resultat in resultats.values()):
+        print("❌ Résultats différents selon le nombre de processus")
+        return 1
+    print("✅ Résultat identique quel que soit le nombre de processus")
+    return 0 if verifier_plafond(min(nb_scenarios, 20000)) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Synchronisation d'une journée entre plusieurs postes (services/synchro_journee.py)
+
+Lance un serveur sur localhost et plusieurs clients qui modifient chacun
+leurs lots (plus quelques champs communs en conflit) au rythme d'une saisie
+rapide. Mesure le délai de propagation d'une modification vers les autres
+postes, le volume échangé (compressé et non compressé) et vérifie que tous
+les postes finissent avec la même journée que le serveur.
+
+Usage: python benchmarks/benchmark_synchro.py [nb_vehicules] [postes] [modifications]  (défaut : 150, 3, 300)
+"""
+
+import contextlib
+import gzip
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_analytique import ecrire, generer_journee
+from services.synchro_journee import ClientSynchro, ServeurSynchro
+
+def main():
+    nb_vehicules = int(sys.argv[1]) if len(sys.argv) > 1 else 150
+    nb_postes = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    nb_modifications = int(sys.argv[3]) if len(sys.argv) > 3 else 300
+    aleatoire = random.Random(42)
+
+    with tempfile.TemporaryDirectory() as dossier:
+        ecrire(dossier, 0, generer_journee(0, nb_vehicules, aleatoire))
+        with contextlib.redirect_stdout(io.StringIO()):
+            serveur = ServeurSynchro(dossier, "journee_0.json", "127.0.0.1", 0, intervalle_sauvegarde=1.0)
+            serveur.demarrer()
+        url = f"http://127.0.0.1:{serveur.port}"
+
+        # Délai de propagation : chaque poste note quand il voit les valeurs uniques des autres
+        vues = {}
+        verrou = threading.Lock()
+
+        def observateur(poste):
+            def on_changement(operations):
+                maintenant = time.perf_counter()
+                with verrou:
+                    for operation in operations or []:
+                        valeur = operation.get('champs', {}).get('champ_libre', '')
+                        if valeur.startswith('p') and not valeur.startswith(f"p{poste} "):
+                            vues.setdefault(valeur, maintenant)
+            return on_changement
+
+        postes = [ClientSynchro(url, delai_envoi=0.1, attente=5.0) for _ in range(nb_postes)]
+        for numero, client in enumerate(postes):
+            client.demarrer(observateur(numero))
+
+        envois = {}
+        lots = [v.lot for v in postes[0].journee.vehicules_reperage + postes[0].journee.vehicules_achetes]
+        debut = time.perf_counter()
+        for i in range(nb_modifications):
+            numero = i % nb_postes
+            client = postes[numero]
+            lot = aleatoire.choice(lots)
+            valeur = f"p{numero} m{i}"
+            envois[valeur] = time.perf_counter()
+            client.modifier(lot, champ_libre=valeur, prix_revente=str(aleatoire.randint(3000, 20000)))
+            if i % 10 == 0:
+                # Deux postes sur le même champ au même moment
+                postes[(numero + 1) % nb_postes].modifier(lot, cout_reparations=str(aleatoire.randint(0, 2000)))
+            time.sleep(0.01)
+        duree_saisie = time.perf_counter() - debut
+
+        for client in postes:
+            client.envoyer()
+        # Laisse les derniers long-pollings revenir
+        time.sleep(1.0)
+        for client in postes:
+            client.arreter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            serveur.arreter()
+
+        reference = serveur.journee.to_dict()
+        identiques = all(client.journee.to_dict()['vehicules_reperage'] == reference['vehicules_reperage']
+                         and client.journee.to_dict()['vehicules_achetes'] == reference['vehicules_achetes']
+                         for client in postes)
+        delais = sorted((vues[v] - envois[v]) * 1000 for v in vues if v in envois)
+        envoyes = sum(c.octets_envoyes for c in postes)
+        recus = sum(c.octets_recus for c in postes)
+        brut = len(json.dumps(reference, separators=(',', ':')).encode('utf-8'))
+
+        print(f"🌐 {nb_postes} postes, {nb_modifications} modifications en {duree_saisie:.1f} s "
+              f"sur une journée de {nb_vehicules} véhicules")
+        if delais:
+            print(f"   Propagation vers les autres postes : médiane {statistics.median(delais):.0f} ms, "
+                  f"95e centile {delais[int(len(delais) * 0.95) - 1]:.0f} ms")
+        print(f"   Journée complète : {brut / 1024:.0f} Ko en JSON, "
+              f"{len(gzip.compress(json.dumps(reference).encode('utf-8'))) / 1024:.0f} Ko compressée")
+        print(f"   Échangé par les postes : {envoyes / 1024:.0f} Ko envoyés, {recus / 1024:.0f} Ko reçus "
+              f"(chargement initial compris)")
+        with open(os.path.join(dossier, "journee_0.json"), 'r', encoding='utf-8') as f:
+            sauvegardee = json.load(f)
+        print(f"   Sauvegarde sur disque à jour : "
+              f"{'✅' if sauvegardee['vehicules_reperage'] == reference['vehicules_reperage'] else '❌'}")
+        print(f"   Tous les postes identiques au serveur : {'✅' if identiques else '❌'}")
+        # Code de sortie non nul : une divergence entre postes ne passe pas inaperçue
+        return 0 if identiques and sauvegardee['vehicules_reperage'] == reference['vehicules_reperage'] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Valorisation marché en lot (services/valorisation_marche.py) contre un serveur local
+
+Plusieurs véhicules sont valorisés en même temps, chacun par une recherche
+du scraper, contre le serveur factice de benchmark_planificateur. Vérifie sur
+les requêtes reçues par le serveur :
+- que les résultats sortent dans l'ordre des véhicules, chacun avec ses annonces ;
+- que le débit du scraper est respecté, toutes recherches confondues ;
+- que les requêtes simultanées ne dépassent pas le pool de connexions de la
+  session (aucune connexion jetée par urllib3, « Connection pool is full ») ;
+- qu'avec l'historique, l'échantillon enregistré sur le véhicule est celui de
+  l'estimation par plus proches voisins, pas le nombre d'annonces récupérées.
+
+Usage: python benchmarks/benchmark_valorisation.py [nb_vehicules]  (défaut : 8)
+"""
+
+import contextlib
+import io
+import logging
+import os
+import sys
+import tempfile
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_planificateur import ServeurFactice, verifier
+from leboncoin_scraper import LeboncoinScraper
+from price_history import PriceHistory
+from models.vehicule import Vehicule
+from services.valorisation_marche import appliquer_valorisation, valoriser_vehicules
+
+MODELES = ["Clio", "Megane", "Scenic", "Twingo", "Kangoo", "Captur", "Kadjar", "Zoe", "Laguna", "Espace"]
+
+class CompteurPoolPlein(logging.Handler):
+    """Compte les connexions jetées par urllib3 faute de place dans le pool"""
+
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.nombre = 0
+
+    def emit(self, record):
+        if "Connection pool is full" in record.getMessage():
+            self.nombre += 1
+
+def valoriser(vehicules, nb_annonces: int, rate: float, burst: int, latence: float, max_workers: int = 3,
+              paralleles: int = 2, history=None):
+    """Valorise les véhicules contre un serveur local ; retourne (résultats, serveur, connexions jetées, durée)"""
+    factice = ServeurFactice(latence=latence)
+    url = factice.demarrer()
+    compteur = CompteurPoolPlein()
+    logging.getLogger("urllib3").addHandler(compteur)
+    try:
+        scraper = LeboncoinScraper(base_url=url, rate=rate, burst=burst, max_workers=max_workers, history=history)
+        debut = time.monotonic()
+        with contextlib.redirect_stdout(io.StringIO()):
+            resultats = valoriser_vehicules(vehicules, scraper, nb_annonces=nb_annonces,
+                                             vehicules_paralleles=paralleles)
+        duree = time.monotonic() - debut
+        time.sleep(0.5)
+        return resultats, factice, compteur.nombre, duree
+    finally:
+        logging.getLogger("urllib3").removeHandler(compteur)
+        factice.arreter()
+
+def dans_l_ordre(vehicules, resultats, nb_annonces: int) -> bool:
+    """Un résultat par véhicule, dans l'ordre, calculé sur les annonces de sa propre recherche"""
+    return (len(resultats) == len(vehicules)
+            and all(r['lot'] == v.lot and r['criteres']['modele'] == f"Renault {v.modele}"
+                    and r['annonces'] == nb_annonces and not r['erreur'] for v, r in zip(vehicules, resultats)))
+
+def main() -> int:
+    nb_vehicules = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    vehicules = [Vehicule({'lot': str(100 + i), 'marque': "Renault", 'modele': MODELES[i % len(MODELES)] + f" {i}",
+                           'annee': "2015", 'kilometrage': "100000"}) for i in range(nb_vehicules)]
+    resultats = []
+
+    print(f"\n⏱️ {nb_vehicules} véhicules, 2 en parallèle, débit de 5 requêtes/s")
+    valorises, factice, jetees, duree = valoriser(vehicules, 30, rate=5, burst=1, latence=0.02)
+    instants = sorted(t for t, _, _, _ in factice.requetes)
+    trop_tot = [k for k, t in enumerate(instants) if t - instants[0] < k / 5 - 0.05]
+    resultats.append(verifier(dans_l_ordre(vehicules, valorises, 30),
+                              f"{len(valorises)} résultats dans l'ordre des véhicules ({duree:.2f}s)"))
+    resultats.append(verifier(len(instants) == nb_vehicules and not trop_tot,
+                              f"{len(instants)} requêtes, aucune en avance sur le débit"
+                              + (f" (en avance : {trop_tot})" if trop_tot else "")))
+
+    # 150 annonces : 5 pages par véhicule, 3 requêtes en vol par recherche
+    print(f"\n🔌 {nb_vehicules} véhicules × 150 annonces, 2 en parallèle, serveur lent (0,3 s), pool de 3 connexions")
+    valorises, factice, jetees, duree = valoriser(vehicules, 150, rate=50, burst=6, latence=0.3)
+    resultats.append(verifier(dans_l_ordre(vehicules, valorises, 150),
+                              f"{len(valorises)} résultats dans l'ordre des véhicules ({duree:.2f}s)"))
+    resultats.append(verifier(factice.simultanees_max <= 3 and jetees == 0,
+                              f"{factice.simultanees_max} requêtes simultanées au plus, "
+                              f"{jetees} connexion(s) jetée(s) (attendu ≤ 3 et 0)"))
+
+    print(f"\n📚 {nb_vehicules} véhicules avec l'historique des annonces (estimation par plus proches voisins)")
+    with tempfile.TemporaryDirectory() as dossier:
+        historique = PriceHistory(os.path.join(dossier, "historique_prix.sqlite"))
+        valorises, factice, jetees, duree = valoriser(vehicules, 30, rate=50, burst=6, latence=0.0, history=historique)
+        historique.fermer()
+    for vehicule, resultat in zip(vehicules, valorises):
+        appliquer_valorisation(vehicule, resultat)
+    coherents = all(r['methode'].endswith("plus proches") and r['echantillon'] == int(r['methode'].split()[0])
+                    and v.echantillon_marche == r['echantillon'] for v, r in zip(vehicules, valorises))
+    resultats.append(verifier(dans_l_ordre(vehicules, valorises, 30) and coherents,
+                              f"échantillon enregistré = voisins de l'estimation "
+                              f"({valorises[0]['echantillon']} sur {valorises[0]['annonces']} annonces)"))
+
+    print(f"\n{'✅ Tout est conforme' if all(resultats) else '❌ Écarts constatés'}")
+    return 0 if all(resultats) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gestionnaire d'Enchères Véhicules - Ligne de commande
+
+Mêmes traitements que l'application, sans affichage (serveur, tâches de nuit).
+Les commandes portant sur plusieurs journées peuvent les traiter en parallèle
+(--jobs).
+
+Exemples :
+    python cli.py lister
+    python cli.py importer catalogue_rungis.pdf --nom "Rungis 12/03"
+    python cli.py importer catalogue_rungis_v2.csv --dans "20250312*"
+    python cli.py --jobs 8 recalculer "*"
+    python cli.py exporter "2025*" --format pdf --liste achetes --sortie exports
+    python cli.py stats "*" --json
+    python cli.py serveur "20250312*" --port 8765
+    python cli.py --jobs 0 migrer sauvegardes/ anciens_postes/
+    python cli.py convertir "2024*" --codec gzip
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from services.journees_manager import JourneesManager
+from services.codecs_journee import CODECS
+from services.service_journees import (
+    FORMATS_EXPORT, LISTES_EXPORT, convertir_journee, executer_en_parallele, exporter_journee, importer_fichier,
+    recalculer_prix_max, resoudre_journees, statistiques_journee
+)
+
+def afficher_resultats(resultats) -> int:
+    """Affiche les (succès, message) et retourne le code de sortie"""
+    echecs = 0
+    for succes, message in resultats:
+        print(f"{'✅' if succes else '❌'} {message}")
+        echecs += not succes
+    return 1 if echecs else 0
+
+def commande_lister(args) -> int:
+    for info in JourneesManager(args.dossier).get_journees_disponibles():
+        print(f"{info['fichier']:<45} {info['nom'][:30]:<30} {info['date']:<10} "
+              f"{info['nb_reperage']:>4} repérage {info['nb_achetes']:>4} achetés {info['investissement']:>10,.0f} €")
+    return 0
+
+def commande_importer(args) -> int:
+    dans = None
+    if args.dans:
+        noms = resoudre_journees(args.dossier, [args.dans])
+        if len(noms) != 1:
+            print(f"❌ Une seule journée attendue, {len(noms)} trouvée(s)")
+            return 1
+        dans = noms[0]
+        # Mises à jour successives de la même journée : dans l'ordre, pas en parallèle
+        args.jobs = 1
+    appels = [(args.dossier, fichier, args.nom, dans) for fichier in args.fichiers]
+    return afficher_resultats(executer_en_parallele(importer_fichier, appels, args.jobs))
+
+def commande_recalculer(args) -> int:
+    appels = [(args.dossier, nom) for nom in resoudre_journees(args.dossier, args.journees)]
+    return afficher_resultats(executer_en_parallele(recalculer_prix_max, appels, args.jobs))
+
+def commande_exporter(args) -> int:
+    appels = [(args.dossier, nom, args.format, args.sortie, args.liste)
+              for nom in resoudre_journees(args.dossier, args.journees)]
+    return afficher_resultats(executer_en_parallele(exporter_journee, appels, args.jobs))
+
+def commande_convertir(args) -> int:
+    appels = [(args.dossier, nom, args.codec) for nom in resoudre_journees(args.dossier, args.journees)]
+    return afficher_resultats(executer_en_parallele(convertir_journee, appels, args.jobs))
+
+def commande_stats(args) -> int:
+    appels = [(args.dossier, nom) for nom in resoudre_journees(args.dossier, args.journees)]
+    statistiques = executer_en_parallele(statistiques_journee, appels, args.jobs)
+    if args.json:
+        print(json.dumps(statistiques, indent=2, ensure_ascii=False))
+        return 0
+
+    for stats in statistiques:
+        if 'erreur' in stats:
+            print(f"❌ {stats['fichier']} : {stats['erreur']}")
+            continue
+        print(f"📊 {stats['nom']} ({stats['date'] or 'sans date'}) : {stats['reperage']} en repérage, "
+              f"{stats['achetes']} acheté(s) pour {stats['investissement']:,.0f} €, {stats['vendus']} vendu(s) "
+              f"— marge réalisée {stats['marge_realisee']:+,.0f} €, marge prévue {stats['marge_prevue']:+,.0f} €")
+    valides = [s for s in statistiques if 'erreur' not in s]
+    if len(valides) > 1:
+        print(f"\nTotal {len(valides)} journées : {sum(s['achetes'] for s in valides)} acheté(s) pour "
+              f"{sum(s['investissement'] for s in valides):,.0f} €, marge réalisée "
+              f"{sum(s['marge_realisee'] for s in valides):+,.0f} €")
+    return 1 if len(valides) < len(statistiques) else 0
+
+def commande_serveur(args) -> int:
+    from services.synchro_journee import ServeurSynchro
+
+    noms = resoudre_journees(args.dossier, [args.journee])
+    if len(noms) != 1:
+        print(f"❌ Une seule journée attendue, {len(noms)} trouvée(s)")
+        return 1
+    serveur = ServeurSynchro(args.dossier, noms[0], args.hote, args.port)
+    serveur.demarrer()
+    print(f"   Postes : ClientSynchro(\"http://<adresse de ce poste>:{serveur.port}\") — Ctrl+C pour arrêter")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        serveur.arreter()
+    return 0
+
+def commande_migrer(args) -> int:
+    from services.migration_donnees import migrer_arborescence
+
+    bilans = migrer_arborescence(args.racines, args.dossier, args.jobs, args.forcer)
+    if not bilans:
+        print("ℹ️ Aucun ancien fichier de données trouvé")
+        return 0
+    for bilan in bilans:
+        if bilan['statut'] == 'deja_migre':
+            print(f"⏭️ {bilan['source']} : déjà migré ({', '.join(bilan.get('journees', []))})")
+        elif bilan['statut'] == 'migre':
+            print(f"✅ {bilan['source']} : {bilan['reperage']} repérage, {bilan['achetes']} achetés "
+                  f"→ {', '.join(bilan['journees'])}")
+        else:
+            print(f"❌ {bilan['source']} : {bilan['erreur']}")
+        for avertissement in bilan.get('avertissements', [])[:args.avertissements]:
+            print(f"   ⚠️ {avertissement}")
+        if len(bilan.get('avertissements', [])) > args.avertissements:
+            print(f"   ⚠️ ... {len(bilan['avertissements']) - args.avertissements} autre(s) avertissement(s)")
+    return 1 if any(b['statut'] == 'erreur' for b in bilans) else 0
+
+def creer_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Gestionnaire d'Enchères Véhicules - ligne de commande")
+    parser.add_argument('--dossier', default="journees_data", help="Dossier des journées (défaut : journees_data)")
+    parser.add_argument('--jobs', type=int, default=1, help="Processus en parallèle (0 = nombre de cœurs)")
+    commandes = parser.add_subparsers(dest='commande', required=True)
+
+    commandes.add_parser('lister', help="Liste les journées").set_defaults(fonction=commande_lister)
+
+    importer = commandes.add_parser('importer', help="Importe des fichiers CSV ou PDF (une journée par fichier)")
+    importer.add_argument('fichiers', nargs='+')
+    importer.add_argument('--nom', help="Nom de la journée créée (défaut : nom du fichier)")
+    importer.add_argument('--dans', help="Met à jour cette journée par numéro de lot (catalogue réédité) "
+                                         "au lieu d'en créer une")
+    importer.set_defaults(fonction=commande_importer)
+
+    aide_journees = "Fichiers de journées ou motifs (« * », « 2025*.json »)"
+    recalculer = commandes.add_parser('recalculer', help="Recalcule les prix max avec les paramètres de chaque journée")
+    recalculer.add_argument('journees', nargs='+', help=aide_journees)
+    recalculer.set_defaults(fonction=commande_recalculer)
+
+    exporter = commandes.add_parser('exporter', help="Exporte des journées en CSV, PDF ou JSON")
+    exporter.add_argument('journees', nargs='+', help=aide_journees)
+    exporter.add_argument('--format', choices=FORMATS_EXPORT, default='csv')
+    exporter.add_argument('--liste', choices=LISTES_EXPORT, default='reperage',
+                          help="Véhicules exportés en CSV / PDF (défaut : reperage)")
+    exporter.add_argument('--sortie', default="exports", help="Dossier de destination (défaut : exports)")
+    exporter.set_defaults(fonction=commande_exporter)
+
+    convertir = commandes.add_parser('convertir', help="Réenregistre des journées dans un autre format")
+    convertir.add_argument('journees', nargs='+', help=aide_journees)
+    convertir.add_argument('--codec', choices=CODECS, required=True,
+                           help="lisible (JSON indenté), compact, gzip, zstd (module zstandard) ou binaire")
+    convertir.set_defaults(fonction=commande_convertir)
+
+    stats = commandes.add_parser('stats', help="Chiffres clés des journées")
+    stats.add_argument('journees', nargs='+', help=aide_journees)
+    stats.add_argument('--json', action='store_true', help="Sortie JSON")
+    stats.set_defaults(fonction=commande_stats)
+
+    serveur = commandes.add_parser('serveur', help="Partage une journée avec d'autres postes en temps réel")
+    serveur.add_argument('journee', help="Fichier de la journée ou motif")
+    serveur.add_argument('--hote', default="0.0.0.0", help="Adresse d'écoute (défaut : toutes)")
+    serveur.add_argument('--port', type=int, default=8765)
+    serveur.set_defaults(fonction=commande_serveur)
+
+    migrer = commandes.add_parser('migrer', help="Convertit les anciens fichiers de données (donnees_encheres*.json, "
+                                                 "journees_encheres*.json) d'une arborescence en journées")
+    migrer.add_argument('racines', nargs='+', help="Dossiers parcourus récursivement, ou fichiers")
+    migrer.add_argument('--forcer', action='store_true', help="Migre aussi les fichiers déjà migrés et inchangés")
+    migrer.add_argument('--avertissements', type=int, default=5, help="Avertissements affichés par fichier (défaut : 5)")
+    migrer.set_defaults(fonction=commande_migrer)
+
+    return parser
+
+def main() -> int:
+    args = creer_parser().parse_args()
+    debut = time.perf_counter()
+    code = args.fonction(args)
+    print(f"⏱️ {time.perf_counter() - debut:.2f} s", file=sys.stderr)
+    return code
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,8 @@ Configuration et paramètres de l'application
 import json
 import os
 
+from services.moteur_prix import MoteurPrix
+
 class AppSettings:
     """Gestionnaire de configuration de l'application"""
     
@@ -32,6 +34,12 @@ class AppSettings:
             'taille_police_champs': 12,  # Taille de police des champs de saisie
             'taille_police_tooltips': 11,  # NOUVEAU : Taille de police des tooltips
             'largeur_colonnes_auto': True,  # Ajustement automatique des colonnes
+            
+            # Journées gardées en mémoire pour y revenir sans relecture (services/cache_journees.py)
+            'cache_journees_nombre': 5,  # Nombre de journées (0 = désactivé)
+            'cache_journees_memoire_mo': 200,  # Mémoire estimée maximale (Mo)
+            # Format des nouvelles journées : lisible, compact, gzip, zstd ou binaire (services/codecs_journee.py)
+            'codec_journees': 'lisible',
         }
         
         # Couleurs du thème
@@ -104,20 +112,7 @@ class AppSettings:
         Prix Max = Prix Revente - (Coût Réparations + Main d'Œuvre) - Commission Vente - Marge Sécurité
         """
         try:
-            # Main d'œuvre = Temps × Tarif horaire
-            main_oeuvre = temps_reparations * self.parametres.get('tarif_horaire', 45.0)
-            
-            # Commission vente = pourcentage du prix de revente
-            commission_vente = prix_revente * (self.parametres.get('commission_vente', 8.5) / 100)
-            
-            # Marge de sécurité
-            marge_securite = self.parametres.get('marge_securite', 200.0)
-            
-            # Calcul final
-            prix_max = prix_revente - (cout_reparations + main_oeuvre) - commission_vente - marge_securite
-            
-            # Ne pas retourner de valeur négative
-            return max(0, prix_max)
+            return MoteurPrix(self.parametres).prix_max(prix_revente, cout_reparations, temps_reparations)
             
         except Exception as e:
             print(f"⚠️ Erreur calcul prix max: {e}")
@@ -7,20 +7,14 @@ Onglet véhicules achetés - CustomTkinter
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import csv
-from datetime import datetime
 import os
 
-# Imports pour l'export PDF
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-from reportlab.lib.units import inch
-from reportlab.pdfgen import canvas
-
 from config.settings import AppSettings
-from utils.tooltips import ajouter_tooltip, TOOLTIPS, set_tooltip_font_size, ajouter_tooltips_colonnes_achetes
+from services.exports_journee import exporter_csv_achetes, exporter_pdf_achetes
+from services.index_recherche import CHAMPS_INDEXES, normaliser_texte
+from services.moteur_prix import MoteurPrix
+from utils.tooltips import ajouter_tooltip, TOOLTIPS, set_tooltip_font_size, ajouter_tooltips_colonnes_achetes, cacher_tooltips
+from utils.polices import registre_polices
 
 class AchetesTab:
     """Onglet véhicules achetés avec CustomTkinter"""
@@ -394,51 +388,60 @@ class AchetesTab:
         vehicules_achetes = self.filtrer_vehicules(self.data_adapter.vehicules_achetes)
         vehicules_achetes = self.appliquer_tri(vehicules_achetes)
         
-        for vehicule in vehicules_achetes:
-            # Calculer la marge COMPLÈTE (seulement si prix vente final renseigné)
-            if hasattr(self.data_adapter, 'journee') and self.data_adapter.journee:
-                # Utiliser le calcul complet avec les paramètres de la journée
-                marge_euros = vehicule.calculer_marge_complete(self.data_adapter.journee.parametres)
-                marge_pourcentage = vehicule.calculer_marge_pourcentage_complete(self.data_adapter.journee.parametres)
-            else:
-                # Fallback vers le calcul simple
-                marge_euros = vehicule.calculer_marge()
-                marge_pourcentage = vehicule.calculer_marge_pourcentage()
-            
-            # Formatage des marges
-            if vehicule.get_prix_numerique('prix_vente_final') > 0:
-                # Véhicule vendu - vraie marge complète
-                marge_euro_str = f"{marge_euros:+.0f}€"
-                marge_pourcent_str = f"{marge_pourcentage:+.1f}%"
-                tag_rentabilite = "rentable" if marge_euros >= 0 else "non_rentable"
-            else:
-                # Véhicule pas encore vendu
-                marge_euro_str = "En attente"
-                marge_pourcent_str = "En attente"
-                tag_rentabilite = "en_attente"
-            
-            # Utiliser la couleur choisie par l'utilisateur avec indication de rentabilité
-            tag_couleur = vehicule.get_tag_couleur()
-            tags = (tag_couleur, tag_rentabilite)
-            
+        # Marges COMPLÈTES calculées en un lot (non nulles seulement si prix vente final renseigné)
+        calculs = self.get_moteur_prix().calculer_vehicules(vehicules_achetes)
+        for index, vehicule in enumerate(vehicules_achetes):
+            valeurs, tags = self.ligne_vehicule(
+                vehicule, float(calculs['marge_complete'][index]), float(calculs['marge_pourcentage'][index])
+            )
             if self.tree_achetes and self.tree_achetes.winfo_exists():
-                self.tree_achetes.insert("", "end", values=(
-                    vehicule.lot,
-                    vehicule.marque,
-                    vehicule.modele,
-                    vehicule.annee,
-                    f"{vehicule.prix_achat}€" if vehicule.prix_achat else "0€",
-                    vehicule.prix_max_achat or "N/A",
-                    f"{vehicule.prix_vente_final}€" if vehicule.prix_vente_final else "",
-                    marge_euro_str,
-                    marge_pourcent_str,
-                    vehicule.date_achat,
-                    vehicule.couleur
-                ), tags=tags)
+                self.tree_achetes.insert("", "end", values=valeurs, tags=tags)
         
         # Mettre à jour les statistiques
         self.mettre_a_jour_stats()
     
+    def ligne_vehicule(self, vehicule, marge_euros: float, marge_pourcentage: float):
+        """Valeurs et tags de la ligne d'un véhicule acheté"""
+        # Formatage des marges
+        if vehicule.get_prix_numerique('prix_vente_final') > 0:
+            # Véhicule vendu - vraie marge complète
+            marge_euro_str = f"{marge_euros:+.0f}€"
+            marge_pourcent_str = f"{marge_pourcentage:+.1f}%"
+            tag_rentabilite = "rentable" if marge_euros >= 0 else "non_rentable"
+        else:
+            # Véhicule pas encore vendu
+            marge_euro_str = "En attente"
+            marge_pourcent_str = "En attente"
+            tag_rentabilite = "en_attente"
+        
+        # Utiliser la couleur choisie par l'utilisateur avec indication de rentabilité
+        tags = (vehicule.get_tag_couleur(), tag_rentabilite)
+        
+        valeurs = (
+            vehicule.lot,
+            vehicule.marque,
+            vehicule.modele,
+            vehicule.annee,
+            f"{vehicule.prix_achat}€" if vehicule.prix_achat else "0€",
+            vehicule.prix_max_achat or "N/A",
+            f"{vehicule.prix_vente_final}€" if vehicule.prix_vente_final else "",
+            marge_euro_str,
+            marge_pourcent_str,
+            vehicule.date_achat,
+            vehicule.couleur
+        )
+        return valeurs, tags
+    
+    def ajouter_ligne_vehicule(self, vehicule):
+        """Ajoute la ligne d'un véhicule acheté sans redessiner le tableau (mode direct)"""
+        if self.filtrer_vehicules([vehicule]):
+            calcul = self.get_moteur_prix().calculer_vehicule(vehicule)
+            valeurs, tags = self.ligne_vehicule(vehicule, calcul['marge_complete'], calcul['marge_pourcentage'])
+            self.tree_achetes.insert("", "end", values=valeurs, tags=tags)
+        
+        self.mettre_a_jour_stats()
+        self.last_data_hash = self.calculer_hash_donnees()
+    
     def arreter_auto_refresh(self):
         """Arrête l'actualisation automatique"""
         self.auto_refresh_enabled = False
@@ -453,46 +456,13 @@ class AchetesTab:
         vehicules_achetes = self.filtrer_vehicules(self.data_adapter.vehicules_achetes)
         vehicules_achetes = self.appliquer_tri(vehicules_achetes)
         
-        for vehicule in vehicules_achetes:
-            # Calculer la marge COMPLÈTE (seulement si prix vente final renseigné)
-            if hasattr(self.data_adapter, 'journee') and self.data_adapter.journee:
-                # Utiliser le calcul complet avec les paramètres de la journée
-                marge_euros = vehicule.calculer_marge_complete(self.data_adapter.journee.parametres)
-                marge_pourcentage = vehicule.calculer_marge_pourcentage_complete(self.data_adapter.journee.parametres)
-            else:
-                # Fallback vers le calcul simple
-                marge_euros = vehicule.calculer_marge()
-                marge_pourcentage = vehicule.calculer_marge_pourcentage()
-            
-            # Formatage des marges
-            if vehicule.get_prix_numerique('prix_vente_final') > 0:
-                # Véhicule vendu - vraie marge complète
-                marge_euro_str = f"{marge_euros:+.0f}€"
-                marge_pourcent_str = f"{marge_pourcentage:+.1f}%"
-                tag_rentabilite = "rentable" if marge_euros >= 0 else "non_rentable"
-            else:
-                # Véhicule pas encore vendu
-                marge_euro_str = "En attente"
-                marge_pourcent_str = "En attente"
-                tag_rentabilite = "en_attente"
-            
-            # Utiliser la couleur choisie par l'utilisateur avec indication de rentabilité
-            tag_couleur = vehicule.get_tag_couleur()
-            tags = (tag_couleur, tag_rentabilite)
-            
-            self.tree_achetes.insert("", "end", values=(
-                vehicule.lot,
-                vehicule.marque,
-                vehicule.modele,
-                vehicule.annee,
-                f"{vehicule.prix_achat}€" if vehicule.prix_achat else "0€",
-                vehicule.prix_max_achat or "N/A",
-                f"{vehicule.prix_vente_final}€" if vehicule.prix_vente_final else "",
-                marge_euro_str,
-                marge_pourcent_str,
-                vehicule.date_achat,
-                vehicule.couleur
-            ), tags=tags)
+        # Marges COMPLÈTES calculées en un lot (non nulles seulement si prix vente final renseigné)
+        calculs = self.get_moteur_prix().calculer_vehicules(vehicules_achetes)
+        for index, vehicule in enumerate(vehicules_achetes):
+            valeurs, tags = self.ligne_vehicule(
+                vehicule, float(calculs['marge_complete'][index]), float(calculs['marge_pourcentage'][index])
+            )
+            self.tree_achetes.insert("", "end", values=valeurs, tags=tags)
         
         # Configuration des couleurs pour les tags de couleurs utilisateur
         self.tree_achetes.tag_configure('couleur_turquoise', background='#1ABC9C', foreground='white')
@@ -513,246 +483,37 @@ class AchetesTab:
 
     def exporter_csv(self):
         """Exporte les données vers un fichier CSV"""
-        try:
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".csv",
-                filetypes=[("Fichiers CSV", "*.csv")],
-                title="Exporter les véhicules achetés"
-            )
-            
-            if filename:
-                with open(filename, 'w', newline='', encoding='utf-8-sig') as csvfile:
-                    writer = csv.writer(csvfile, delimiter=';')
-                    
-                    # En-têtes
-                    writer.writerow([
-                        "N° LOT", "MARQUE", "MODÈLE", "ANNÉE", "PRIX ACHAT", 
-                        "PRIX MAX", "PRIX VENTE", "MARGE €", "MARGE %", "DATE ACHAT", "KM", "MOTORISATION"
-                    ])
-                    
-                    # Données
-                    for vehicule in self.data_adapter.vehicules_achetes:
-                        marge_euros = vehicule.calculer_marge()
-                        marge_pourcentage = vehicule.calculer_marge_pourcentage()
-                        
-                        writer.writerow([
-                            vehicule.lot,
-                            vehicule.marque,
-                            vehicule.modele,
-                            vehicule.annee,
-                            vehicule.prix_achat,
-                            vehicule.prix_max_achat,
-                            vehicule.prix_revente,
-                            f"{marge_euros:+.0f}",
-                            f"{marge_pourcentage:+.1f}",
-                            vehicule.date_achat if vehicule.date_achat else "",
-                            vehicule.kilometrage,
-                            vehicule.motorisation
-                        ])
-                
-                messagebox.showinfo("✅ Succès", f"Export réussi vers:\n{filename}")
-                
-        except Exception as e:
-            messagebox.showerror("❌ Erreur", f"Erreur lors de l'export: {e}")
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("Fichiers CSV", "*.csv")],
+            title="Exporter les véhicules achetés"
+        )
+        if not filename:
+            return
+        
+        succes, message = exporter_csv_achetes(filename, self.data_adapter.vehicules_achetes, self.get_parametres())
+        if succes:
+            messagebox.showinfo("✅ Succès", message)
+        else:
+            messagebox.showerror("❌ Erreur", message)
 
     def exporter_pdf(self):
         """Exporte les données vers un fichier PDF professionnel"""
-        try:
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".pdf",
-                filetypes=[("Fichiers PDF", "*.pdf")],
-                title="Exporter les véhicules achetés en PDF"
-            )
-            
-            if filename:
-                # Créer le document PDF avec marges
-                doc = SimpleDocTemplate(
-                    filename, 
-                    pagesize=A4,
-                    rightMargin=50,
-                    leftMargin=50,
-                    topMargin=50,
-                    bottomMargin=50
-                )
-                elements = []
-                styles = getSampleStyleSheet()
-                
-                # Style personnalisé pour le titre
-                title_style = ParagraphStyle(
-                    'CustomTitle',
-                    parent=styles['Heading1'],
-                    fontSize=18,
-                    textColor=colors.HexColor('#2E86AB'),
-                    spaceAfter=30,
-                    alignment=1  # Centré
-                )
-                
-                # Récupérer le nom de la journée
-                journee_nom = "Enchère"
-                if hasattr(self.data_adapter, 'journee') and self.data_adapter.journee:
-                    journee_nom = self.data_adapter.journee.nom
-                
-                # Titre principal
-                titre = f"🏆 RAPPORT VÉHICULES ACHETÉS - {journee_nom.upper()}"
-                elements.append(Paragraph(titre, title_style))
-                
-                # Date du rapport
-                date_rapport = datetime.now().strftime("%d/%m/%Y à %H:%M")
-                date_style = ParagraphStyle(
-                    'DateStyle',
-                    parent=styles['Normal'],
-                    fontSize=10,
-                    textColor=colors.grey,
-                    alignment=1,
-                    spaceAfter=20
-                )
-                elements.append(Paragraph(f"Rapport généré le {date_rapport}", date_style))
-                
-                # Statistiques
-                nb_achetes = len(self.data_adapter.vehicules_achetes)
-                total_investissement = sum(v.get_prix_numerique('prix_achat') for v in self.data_adapter.vehicules_achetes)
-                total_marge = sum(v.get_prix_numerique('prix_revente') - v.get_prix_numerique('prix_achat') - v.get_prix_numerique('cout_reparations') 
-                                for v in self.data_adapter.vehicules_achetes if v.prix_revente and v.prix_revente.strip())
-                marge_moyenne = total_marge / nb_achetes if nb_achetes > 0 else 0
-                
-                stats_text = f"""
-                <b>📊 STATISTIQUES</b><br/>
-                • Nombre de véhicules achetés : <b>{nb_achetes}</b><br/>
-                • Investissement total : <b>{total_investissement:,.0f}€</b><br/>
-                • Marge totale : <b>{total_marge:+,.0f}€</b><br/>
-                • Marge moyenne : <b>{marge_moyenne:+,.0f}€</b>
-                """
-                
-                stats_style = ParagraphStyle(
-                    'StatsStyle',
-                    parent=styles['Normal'],
-                    fontSize=12,
-                    spaceAfter=30,
-                    backColor=colors.HexColor('#F5F5F5'),
-                    borderColor=colors.HexColor('#2E86AB'),
-                    borderWidth=1,
-                    borderPadding=10
-                )
-                elements.append(Paragraph(stats_text, stats_style))
-                elements.append(Spacer(1, 20))
-                
-                # Titre du tableau
-                table_title = Paragraph("<b>📋 DÉTAIL DES VÉHICULES</b>", styles['Heading2'])
-                elements.append(table_title)
-                elements.append(Spacer(1, 10))
-                
-                # Données du tableau
-                data = [
-                    ["LOT", "MARQUE", "MODÈLE", "ANNÉE", "PRIX ACHAT", "PRIX VENTE", "MARGE", "DATE"]
-                ]
-                
-                for vehicule in self.data_adapter.vehicules_achetes:
-                    prix_achat = vehicule.get_prix_numerique('prix_achat')
-                    prix_revente = vehicule.get_prix_numerique('prix_revente')
-                    cout_reparations = vehicule.get_prix_numerique('cout_reparations')
-                    
-                    # Fonction pour formater avec retour à la ligne
-                    def formater_cellule(texte, max_chars=12):
-                        """Formate une cellule en ajoutant des retours à la ligne"""
-                        if not texte or len(str(texte)) <= max_chars:
-                            return str(texte)
-                        
-                        mots = str(texte).split()
-                        lignes = []
-                        ligne_actuelle = ""
-                        
-                        for mot in mots:
-                            if len(ligne_actuelle + " " + mot) <= max_chars:
-                                ligne_actuelle = ligne_actuelle + " " + mot if ligne_actuelle else mot
-                            else:
-                                if ligne_actuelle:
-                                    lignes.append(ligne_actuelle)
-                                ligne_actuelle = mot
-                        
-                        if ligne_actuelle:
-                            lignes.append(ligne_actuelle)
-                        
-                        return "\n".join(lignes)
-                    
-                    # Calcul de la marge
-                    if prix_revente > 0:
-                        marge = prix_revente - prix_achat - cout_reparations
-                        marge_str = f"{marge:+.0f}€"
-                        prix_revente_str = f"{prix_revente:.0f}€"
-                    else:
-                        marge_str = "En attente"
-                        prix_revente_str = "-"
-                    
-                    # Formater la date
-                    date_formatee = vehicule.date_achat if vehicule.date_achat else "N/A"
-                    if len(date_formatee) > 8:
-                        date_formatee = date_formatee[:8] + "..."
-                    
-                    data.append([
-                        vehicule.lot,
-                        formater_cellule(vehicule.marque, 10),
-                        formater_cellule(vehicule.modele, 10),
-                        vehicule.annee,
-                        f"{prix_achat:.0f}€",
-                        prix_revente_str,
-                        marge_str,
-                        date_formatee
-                    ])
-                
-                # Créer le tableau avec largeurs adaptées
-                table = Table(data, colWidths=[
-                    0.6*inch,  # LOT
-                    0.9*inch,  # MARQUE  
-                    0.9*inch,  # MODÈLE
-                    0.6*inch,  # ANNÉE
-                    0.8*inch,  # PRIX ACHAT
-                    0.8*inch,  # PRIX VENTE
-                    0.8*inch,  # MARGE
-                    0.7*inch   # DATE
-                ])
-                
-                # Style du tableau
-                table.setStyle(TableStyle([
-                    # En-tête
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E86AB')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 8),  # Police plus petite pour en-têtes
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                    
-                    # Corps du tableau
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                    ('FONTSIZE', (0, 1), (-1, -1), 7),  # Police plus petite pour contenu
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.black),  # Grille plus fine
-                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),  # Alignement vertical en haut
-                    
-                    # Alternance de couleurs pour les lignes
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F8F9FA')])
-                ]))
-                
-                elements.append(table)
-                
-                # Pied de page
-                elements.append(Spacer(1, 30))
-                footer_style = ParagraphStyle(
-                    'FooterStyle',
-                    parent=styles['Normal'],
-                    fontSize=8,
-                    textColor=colors.grey,
-                    alignment=1
-                )
-                footer_text = f"Gestionnaire d'Enchères - Rapport généré automatiquement - {date_rapport}"
-                elements.append(Paragraph(footer_text, footer_style))
-                
-                # Construire le document
-                doc.build(elements)
-                
-                messagebox.showinfo("✅ Succès", f"Export PDF réussi vers:\n{filename}")
-                
-        except Exception as e:
-            messagebox.showerror("❌ Erreur", f"Erreur lors de l'export PDF: {e}")
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".pdf",
+            filetypes=[("Fichiers PDF", "*.pdf")],
+            title="Exporter les véhicules achetés en PDF"
+        )
+        if not filename:
+            return
+        
+        succes, message = exporter_pdf_achetes(
+            filename, self.data_adapter.vehicules_achetes, self.get_parametres(), self.get_nom_journee()
+        )
+        if succes:
+            messagebox.showinfo("✅ Succès", message)
+        else:
+            messagebox.showerror("❌ Erreur", message)
 
     def on_recherche_change(self, *args):
         """Déclenché quand le texte de recherche change"""
@@ -764,16 +525,15 @@ class AchetesTab:
 
     def filtrer_vehicules(self, vehicules):
         """Filtre les véhicules selon le terme de recherche"""
-        terme = self.var_recherche.get().lower().strip()
+        terme = normaliser_texte(self.var_recherche.get()).strip()
         if not terme:
             return vehicules
         
         vehicules_filtres = []
         for vehicule in vehicules:
-            # Recherche dans lot, marque et modèle
-            if (terme in vehicule.lot.lower() or 
-                terme in vehicule.marque.lower() or 
-                terme in vehicule.modele.lower()):
+            # Recherche dans lot, marque, modèle et notes (sans tenir compte des accents)
+            texte = normaliser_texte(" ".join(str(getattr(vehicule, champ, "") or "") for champ in CHAMPS_INDEXES))
+            if terme in texte:
                 vehicules_filtres.append(vehicule)
         
         return vehicules_filtres 
@@ -943,9 +703,25 @@ class AchetesTab:
         except Exception as e:
             print(f"⚠️ Erreur mise à jour stats: {e}")
     
+    def get_parametres(self) -> dict:
+        """Paramètres de la journée (paramètres globaux à défaut)"""
+        if hasattr(self.data_adapter, 'journee') and self.data_adapter.journee:
+            return self.data_adapter.journee.parametres
+        return self.settings.parametres
+    
+    def get_nom_journee(self) -> str:
+        """Nom de la journée (titre des exports)"""
+        if hasattr(self.data_adapter, 'journee') and self.data_adapter.journee:
+            return self.data_adapter.journee.nom
+        return ""
+    
+    def get_moteur_prix(self) -> MoteurPrix:
+        """Moteur de prix avec les paramètres de la journée (paramètres globaux à défaut)"""
+        return MoteurPrix(self.get_parametres())
+    
     def calculer_marge_totale(self, vehicules):
-        """Calcule la marge totale des véhicules achetés"""
-        return sum(v.calculer_marge() for v in vehicules)
+        """Calcule la marge totale (complète) des véhicules achetés"""
+        return float(sum(self.get_moteur_prix().calculer_vehicules(vehicules)['marge_complete']))
     
     def calculer_marge_moyenne(self, vehicules):
         """Calcule la marge moyenne des véhicules achetés"""
@@ -959,19 +735,14 @@ class AchetesTab:
     
     def configurer_style_tableau(self):
         """Configure le style du tableau selon les paramètres de la journée"""
-        style = ttk.Style()
-        
-        # Récupérer les tailles depuis les paramètres de la journée
-        taille_contenu = self.get_param_from_journee('taille_police_tableau', 14)
-        taille_entetes = self.get_param_from_journee('taille_police_entetes', 16) 
-        hauteur_lignes = self.get_param_from_journee('hauteur_lignes_tableau', 30)
-        
-        # Configurer les styles
-        style.configure("Treeview", 
-                       font=('Segoe UI', taille_contenu), 
-                       rowheight=hauteur_lignes)
-        style.configure("Treeview.Heading", 
-                       font=('Segoe UI', taille_entetes, 'bold'))
+        # Les styles ttk référencent les polices nommées du registre :
+        # un changement de taille ne nécessite qu'un configure() sur la police
+        registre_polices.appliquer({
+            'taille_police_tableau': self.get_param_from_journee('taille_police_tableau', 14),
+            'taille_police_entetes': self.get_param_from_journee('taille_police_entetes', 16),
+            'hauteur_lignes_tableau': self.get_param_from_journee('hauteur_lignes_tableau', 30)
+        })
+        registre_polices.lier_styles_ttk()
     
     def get_param_from_journee(self, param_name, default_value):
         """Récupère un paramètre depuis la journée ou fallback vers les settings puis valeur par défaut"""
@@ -996,30 +767,16 @@ class AchetesTab:
         # Mettre à jour les tooltips contextuels avec les nouveaux paramètres
         self.mettre_a_jour_tooltips_contextuels()
         
-        # Reconfigurer le style du tableau
+        # Polices partagées du tableau (un configure() par police modifiée)
+        registre_polices.appliquer(params)
         if hasattr(self, 'tree_achetes') and self.tree_achetes.winfo_exists():
-            self.configurer_style_tableau()
+            registre_polices.lier_styles_ttk()
     
     def mettre_a_jour_tooltips_contextuels(self):
         """Met à jour les tooltips contextuels avec les paramètres actuels"""
-        if self.column_tooltips and hasattr(self, 'tree_achetes'):
-            # Nettoyer l'ancien gestionnaire de tooltips
-            try:
-                self.column_tooltips.cleanup()
-            except:
-                pass
-            
-            # Forcer un petit délai avant de recréer pour éviter les conflits
-            self.tree_achetes.after(100, lambda: self._recreer_tooltips_contextuels())
-    
-    def _recreer_tooltips_contextuels(self):
-        """Recrée les tooltips contextuels après nettoyage"""
-        try:
-            # Recréer les tooltips avec les paramètres mis à jour
-            self.column_tooltips = ajouter_tooltips_colonnes_achetes(self.tree_achetes, self.data_adapter)
-        except Exception as e:
-            print(f"Erreur recréation tooltips: {e}")
-            self.column_tooltips = None
+        # Les textes des colonnes sont générés à l'affichage avec les paramètres
+        # courants : il suffit de cacher le tooltip éventuellement affiché
+        cacher_tooltips()
 
     def trier_par_colonne(self, colonne):
         """Trie le tableau par la colonne sélectionnée"""
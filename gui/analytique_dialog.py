@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dialog des analyses transversales (toutes les journées)
+"""
+
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from services.analytique_journees import DIMENSIONS, get_analytique_partagee
+
+class DialogAnalytique:
+    """Marges, dépenses et taux de réussite par marque, modèle, mois ou lieu"""
+
+    COLONNES = ("groupe", "lots", "achetes", "taux_reussite", "depense", "vendus", "marge", "marge_moyenne", "ecart_moyen")
+
+    def __init__(self, parent, dossier="journees_data"):
+        self.parent = parent
+        self.analytique = get_analytique_partagee(dossier)
+        self.var_dimension = tk.StringVar(value='marque')
+        self.tri = ('marge', True)
+
+        # Créer la fenêtre dialog
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Analyses de toutes les bases")
+        self.dialog.geometry("1050x600")
+        self.dialog.minsize(850, 400)
+        self.dialog.transient(parent)
+        self.dialog.bind('<Escape>', lambda e: self.dialog.destroy())
+
+        self.create_interface()
+        self.actualiser()
+
+    def create_interface(self):
+        """Crée l'interface de la dialog"""
+        main_frame = tk.Frame(self.dialog, bg='white', padx=20, pady=20)
+        main_frame.pack(fill='both', expand=True)
+
+        tk.Label(
+            main_frame,
+            text="📈 ANALYSES DE TOUTES LES BASES",
+            font=('Segoe UI', 20, 'bold'),
+            bg='white',
+            fg='#2E86AB'
+        ).pack(pady=(0, 10))
+
+        # Choix du regroupement
+        choix_frame = tk.Frame(main_frame, bg='white')
+        choix_frame.pack(pady=(0, 5))
+        tk.Label(choix_frame, text="Regrouper par :", font=('Segoe UI', 11, 'bold'), bg='white').pack(side='left')
+        for dimension, libelle in DIMENSIONS.items():
+            tk.Radiobutton(
+                choix_frame, text=libelle, value=dimension, variable=self.var_dimension,
+                command=self.afficher, font=('Segoe UI', 11), bg='white'
+            ).pack(side='left', padx=8)
+        tk.Button(
+            choix_frame, text="🔄 Actualiser", font=('Segoe UI', 10),
+            command=self.actualiser, relief='flat', padx=10
+        ).pack(side='left', padx=(20, 0))
+
+        self.label_statut = tk.Label(main_frame, text="", font=('Segoe UI', 10), bg='white', fg='#666666')
+        self.label_statut.pack(pady=(0, 10))
+
+        # Tableau
+        tableau_frame = tk.Frame(main_frame, bg='white')
+        tableau_frame.pack(fill='both', expand=True)
+
+        self.tree = ttk.Treeview(tableau_frame, columns=self.COLONNES, show="headings", height=18)
+        entetes = {
+            "groupe": ("", 200), "lots": ("Lots", 70), "achetes": ("Achetés", 70),
+            "taux_reussite": ("Taux de réussite", 110), "depense": ("Dépense", 110), "vendus": ("Vendus", 70),
+            "marge": ("Marge réalisée", 120), "marge_moyenne": ("Marge / vente", 110),
+            "ecart_moyen": ("Écart moyen au prix max", 160)
+        }
+        for col in self.COLONNES:
+            texte, largeur = entetes[col]
+            self.tree.heading(col, text=texte, command=lambda c=col: self.trier(c))
+            self.tree.column(col, width=largeur, anchor="w" if col == "groupe" else "center")
+        self.tree.tag_configure('perte', foreground='#F44336')
+
+        scrollbar = ttk.Scrollbar(tableau_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        tk.Button(
+            main_frame, text="Fermer", font=('Segoe UI', 11),
+            command=self.dialog.destroy, relief='flat', padx=15, pady=5
+        ).pack(side='right', pady=(15, 0))
+
+    def actualiser(self):
+        """Relit les journées modifiées depuis le dernier passage puis réaffiche"""
+        debut = time.perf_counter()
+        relues = self.analytique.actualiser()
+        duree_ms = (time.perf_counter() - debut) * 1000
+        self.label_statut.config(
+            text=f"{len(self.analytique.fichiers)} base(s) analysée(s) — {relues} relue(s) en {duree_ms:.0f} ms "
+                 f"(les autres depuis le cache). Marge réalisée : véhicules vendus, tous coûts déduits."
+        )
+        self.afficher()
+
+    def trier(self, colonne):
+        """Trie sur une colonne (second clic : ordre inverse)"""
+        decroissant = not self.tri[1] if self.tri[0] == colonne else colonne != 'groupe'
+        self.tri = (colonne, decroissant)
+        self.afficher()
+
+    def afficher(self):
+        """Affiche la table de la dimension choisie"""
+        dimension = self.var_dimension.get()
+        self.tree.heading("groupe", text=DIMENSIONS[dimension])
+        lignes = self.analytique.table(dimension)
+        colonne, decroissant = self.tri
+        lignes.sort(key=lambda l: l[colonne], reverse=decroissant)
+
+        self.tree.delete(*self.tree.get_children())
+        for ligne in lignes:
+            self.tree.insert("", "end", tags=('perte',) if ligne['marge'] < 0 else (), values=(
+                ligne['groupe'], ligne['lots'], ligne['achetes'], f"{ligne['taux_reussite']:.0%}",
+                f"{ligne['depense']:,.0f} €", ligne['vendus'], f"{ligne['marge']:+,.0f} €",
+                f"{ligne['marge_moyenne']:+,.0f} €" if ligne['vendus'] else "—",
+                f"{ligne['ecart_moyen']:+,.0f} €" if ligne['achetes'] else "—"
+            ))
+
+def ouvrir_analytique(parent, dossier="journees_data"):
+    """Fonction utilitaire pour ouvrir les analyses"""
+    return DialogAnalytique(parent, dossier)
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dialog de balayage de sensibilité des paramètres de prix
+"""
+
+import time
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from services.balayage_parametres import balayer, colonnes_lots, plage_valeurs
+from services.moteur_prix import PARAMETRES_PRIX_DEFAUT, valeur_numerique
+
+class DialogBalayage:
+    """Évalue une grille de paramètres sur tous les lots en repérage de la journée"""
+
+    COLONNES = ("tarif_horaire", "commission_vente", "marge_securite", "lots_viables", "budget_total", "ecart_budget")
+
+    # Nombre maximum de lignes affichées (le tri porte sur toute la grille)
+    MAX_LIGNES = 1000
+
+    # Plages proposées autour des paramètres courants : (écart, pas)
+    PLAGES_DEFAUT = {
+        'tarif_horaire': (20.0, 2.0),
+        'commission_vente': (5.0, 0.5),
+        'marge_securite': (500.0, 50.0)
+    }
+
+    def __init__(self, parent, journee, on_choisir=None):
+        self.parent = parent
+        self.journee = journee
+        self.on_choisir = on_choisir
+
+        self.colonnes = colonnes_lots(journee.vehicules_reperage)
+        self.nb_lots = len(self.colonnes['prix_revente'])
+        self.resultats = None
+        self.ordre = []          # index des combinaisons dans l'ordre d'affichage
+        self.tri = ('budget_total', True)
+        self.reference = None    # (lots viables, budget) avec les paramètres courants
+
+        self.vars_plages = {}
+
+        # Créer la fenêtre dialog
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Sensibilité des paramètres")
+        self.dialog.geometry("900x620")
+        self.dialog.minsize(750, 450)
+        self.dialog.transient(parent)
+        self.dialog.bind('<Escape>', lambda e: self.dialog.destroy())
+
+        self.create_interface()
+        self.lancer()
+
+    def create_interface(self):
+        """Crée l'interface de la dialog"""
+        main_frame = tk.Frame(self.dialog, bg='white', padx=20, pady=20)
+        main_frame.pack(fill='both', expand=True)
+
+        tk.Label(
+            main_frame,
+            text="🎚️ SENSIBILITÉ DES PARAMÈTRES",
+            font=('Segoe UI', 20, 'bold'),
+            bg='white',
+            fg='#2E86AB'
+        ).pack(pady=(0, 5))
+
+        tk.Label(
+            main_frame,
+            text=f"{self.nb_lots} lot(s) en repérage avec un prix de revente — "
+                 f"lot viable : prix max > 0, budget : somme des prix max",
+            font=('Segoe UI', 11),
+            bg='white',
+            fg='#666666'
+        ).pack(pady=(0, 10))
+
+        # Plages de la grille
+        plages_frame = tk.Frame(main_frame, bg='white')
+        plages_frame.pack(fill='x', pady=(0, 10))
+
+        libelles = {
+            'tarif_horaire': "Tarif horaire (€/h)",
+            'commission_vente': "Commission vente (%)",
+            'marge_securite': "Marge de sécurité (€)"
+        }
+        for colonne, texte in enumerate(("", "Début", "Fin", "Pas")):
+            tk.Label(plages_frame, text=texte, font=('Segoe UI', 10, 'bold'), bg='white').grid(
+                row=0, column=colonne, padx=5, sticky='w')
+
+        for ligne, (nom, libelle) in enumerate(libelles.items(), start=1):
+            courant = self.parametre_courant(nom)
+            ecart, pas = self.PLAGES_DEFAUT[nom]
+            variables = (
+                tk.StringVar(value=f"{max(0.0, courant - ecart):g}"),
+                tk.StringVar(value=f"{courant + ecart:g}"),
+                tk.StringVar(value=f"{pas:g}")
+            )
+            self.vars_plages[nom] = variables
+            tk.Label(plages_frame, text=libelle, font=('Segoe UI', 10), bg='white').grid(
+                row=ligne, column=0, padx=5, pady=2, sticky='w')
+            for colonne, variable in enumerate(variables, start=1):
+                entry = tk.Entry(plages_frame, textvariable=variable, width=10, font=('Segoe UI', 10))
+                entry.grid(row=ligne, column=colonne, padx=5, pady=2)
+                entry.bind('<Return>', lambda e: self.lancer())
+
+        tk.Button(
+            plages_frame, text="▶️ Calculer", font=('Segoe UI', 11, 'bold'),
+            command=self.lancer, bg='#2E86AB', fg='white', relief='flat', padx=15, pady=5
+        ).grid(row=1, column=4, rowspan=3, padx=20)
+
+        self.label_statut = tk.Label(main_frame, text="", font=('Segoe UI', 11), bg='white', fg='#333333')
+        self.label_statut.pack(pady=(0, 10))
+
+        # Tableau des combinaisons
+        tableau_frame = tk.Frame(main_frame, bg='white')
+        tableau_frame.pack(fill='both', expand=True)
+
+        self.tree = ttk.Treeview(tableau_frame, columns=self.COLONNES, show="headings", height=15)
+        entetes = {
+            "tarif_horaire": ("Tarif (€/h)", 100), "commission_vente": ("Commission (%)", 110),
+            "marge_securite": ("Marge sécurité (€)", 130), "lots_viables": ("Lots viables", 110),
+            "budget_total": ("Budget total", 140), "ecart_budget": ("Écart / paramètres actuels", 180)
+        }
+        for col in self.COLONNES:
+            texte, largeur = entetes[col]
+            self.tree.heading(col, text=texte, command=lambda c=col: self.trier(c))
+            self.tree.column(col, width=largeur, anchor="center")
+
+        scrollbar = ttk.Scrollbar(tableau_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        # Double-clic : reprendre la combinaison dans l'onglet paramètres
+        self.tree.bind("<Double-1>", self.choisir)
+
+        # Boutons
+        boutons_frame = tk.Frame(main_frame, bg='white')
+        boutons_frame.pack(fill='x', pady=(15, 0))
+
+        tk.Button(
+            boutons_frame, text="Fermer", font=('Segoe UI', 11),
+            command=self.dialog.destroy, relief='flat', padx=15, pady=5
+        ).pack(side='right')
+
+        if self.on_choisir:
+            tk.Button(
+                boutons_frame, text="📥 Reprendre la combinaison", font=('Segoe UI', 11, 'bold'),
+                command=self.choisir, bg='#4CAF50', fg='white', relief='flat', padx=15, pady=5
+            ).pack(side='right', padx=10)
+
+    def parametre_courant(self, nom):
+        """Valeur actuelle d'un paramètre de la journée"""
+        return valeur_numerique(self.journee.parametres.get(nom, PARAMETRES_PRIX_DEFAUT[nom]))
+
+    def lire_plage(self, nom):
+        """Valeurs d'une plage saisie (ValueError si invalide)"""
+        debut, fin, pas = (float(v.get().replace(',', '.')) for v in self.vars_plages[nom])
+        return plage_valeurs(debut, fin, pas)
+
+    def lancer(self):
+        """Calcule la grille saisie et rafraîchit le tableau"""
+        try:
+            tarifs = self.lire_plage('tarif_horaire')
+            commissions = self.lire_plage('commission_vente')
+            marges = self.lire_plage('marge_securite')
+
+            debut = time.perf_counter()
+            self.resultats = balayer(self.colonnes, tarifs, commissions, marges)
+            duree_ms = (time.perf_counter() - debut) * 1000
+
+            # Référence : paramètres actuels de la journée
+            courants = [[self.parametre_courant(nom)] for nom in self.PLAGES_DEFAUT]
+            reference = balayer(self.colonnes, *courants)
+            self.reference = (reference['lots_viables'][0], reference['budget_total'][0])
+        except ValueError as e:
+            messagebox.showerror("❌ Erreur", f"Plage invalide : {e}", parent=self.dialog)
+            return
+
+        nb_combinaisons = len(self.resultats['lots_viables'])
+        print(f"🎚️ Balayage : {nb_combinaisons} combinaison(s) × {self.nb_lots} lot(s) en {duree_ms:.0f} ms")
+        self.label_statut.config(
+            text=f"{nb_combinaisons:,} combinaison(s) calculée(s) en {duree_ms:.0f} ms — "
+                 f"paramètres actuels : {self.reference[0]}/{self.nb_lots} lot(s), {self.reference[1]:,.0f} € "
+                 f"(clic sur un en-tête pour trier)"
+        )
+        self.afficher()
+
+    def trier(self, colonne):
+        """Trie sur une colonne (second clic : ordre inverse)"""
+        if not self.resultats:
+            return
+        colonne_tri = 'budget_total' if colonne == 'ecart_budget' else colonne
+        decroissant = not self.tri[1] if self.tri[0] == colonne_tri else True
+        self.tri = (colonne_tri, decroissant)
+        self.afficher()
+
+    def afficher(self):
+        """Affiche les MAX_LIGNES premières combinaisons selon le tri courant"""
+        colonne, decroissant = self.tri
+        valeurs = self.resultats[colonne]
+        self.ordre = sorted(range(len(valeurs)), key=valeurs.__getitem__, reverse=decroissant)[:self.MAX_LIGNES]
+
+        self.tree.delete(*self.tree.get_children())
+        for index in self.ordre:
+            budget = self.resultats['budget_total'][index]
+            ecart = budget - self.reference[1]
+            self.tree.insert("", "end", iid=str(index), values=(
+                f"{self.resultats['tarif_horaire'][index]:g}",
+                f"{self.resultats['commission_vente'][index]:g}",
+                f"{self.resultats['marge_securite'][index]:g}",
+                f"{self.resultats['lots_viables'][index]}/{self.nb_lots}",
+                f"{budget:,.0f} €",
+                f"{ecart:+,.0f} €"
+            ))
+
+    def choisir(self, event=None):
+        """Reprend la combinaison sélectionnée dans les champs de l'onglet paramètres"""
+        selection = self.tree.selection()
+        if not selection or not self.on_choisir:
+            return
+        index = int(selection[0])
+        self.on_choisir({nom: self.resultats[nom][index] for nom in self.PLAGES_DEFAUT})
+        self.dialog.destroy()
+
+def ouvrir_balayage_parametres(parent, journee, on_choisir=None):
+    """Fonction utilitaire pour ouvrir la dialog de balayage"""
+    return DialogBalayage(parent, journee, on_choisir)
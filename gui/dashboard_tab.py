@@ -179,8 +179,8 @@ class DashboardTab:
         if not self.data_manager.vehicules_achetes:
             return {'texte': 'N/A', 'description': 'Aucun achat réalisé'}
         
-        meilleur = max(self.data_manager.vehicules_achetes, key=lambda v: v.calculer_marge())
-        marge = meilleur.calculer_marge()
+        marges = self.data_manager.calculer_marges(self.data_manager.vehicules_achetes)
+        marge, meilleur = max(zip(marges, self.data_manager.vehicules_achetes), key=lambda paire: paire[0])
         return {
             'texte': f"+{marge:.0f}€",
             'description': f"{meilleur.marque} {meilleur.modele}"
@@ -191,8 +191,8 @@ class DashboardTab:
         if not self.data_manager.vehicules_achetes:
             return {'texte': 'N/A', 'description': 'Aucun achat réalisé'}
         
-        pire = min(self.data_manager.vehicules_achetes, key=lambda v: v.calculer_marge())
-        marge = pire.calculer_marge()
+        marges = self.data_manager.calculer_marges(self.data_manager.vehicules_achetes)
+        marge, pire = min(zip(marges, self.data_manager.vehicules_achetes), key=lambda paire: paire[0])
         if marge >= 0:
             return {'texte': 'Aucune perte', 'description': 'Tous les achats sont rentables !'}
         return {
@@ -12,6 +12,8 @@ from datetime import datetime
 import locale
 import os
 
+from config.settings import AppSettings
+from services.cache_journees import get_cache_partage
 from services.journees_manager import JourneesManager
 from utils.tooltips import ajouter_tooltip
 
@@ -467,8 +469,13 @@ class JourneesSelector:
         self.parent = parent
         self.on_journee_selected = on_journee_selected
         
-        # Gestionnaire des journées
-        self.journees_manager = JourneesManager()
+        # Gestionnaire des journées, avec les journées déjà ouvertes gardées en mémoire
+        parametres = AppSettings().parametres
+        cache = get_cache_partage(int(parametres.get('cache_journees_nombre', 5)),
+                                  float(parametres.get('cache_journees_memoire_mo', 200)))
+        self.journees_manager = JourneesManager(cache=cache, codec=parametres.get('codec_journees'))
+        # La dernière journée modifiée est lue pendant que l'utilisateur choisit
+        cache.precharger_recente(self.journees_manager.dossier_journees)
         
         # Frame principal
         self.frame = ctk.CTkFrame(parent)
@@ -577,12 +584,40 @@ class JourneesSelector:
         )
         export_btn.pack(side="right", padx=(12, 15))  # AMÉLIORATION: margin interne augmenté
         
+        # Bouton Analyses - BLEU FONCÉ (consultation transversale)
+        analyses_btn = ctk.CTkButton(
+            actions_frame,
+            text="📈 Analyses",
+            command=self.ouvrir_analyses,
+            font=ctk.CTkFont(size=14, weight="bold"),
+            width=150,
+            height=40,
+            fg_color="#2E86AB",
+            hover_color="#256D8C"
+        )
+        analyses_btn.pack(side="right", padx=12)
+        
+        # Bouton Rechercher - BLEU FONCÉ (consultation transversale)
+        recherche_btn = ctk.CTkButton(
+            actions_frame,
+            text="🔍 Rechercher",
+            command=self.ouvrir_recherche_globale,
+            font=ctk.CTkFont(size=14, weight="bold"),
+            width=150,
+            height=40,
+            fg_color="#2E86AB",
+            hover_color="#256D8C"
+        )
+        recherche_btn.pack(side="right", padx=12)
+        
         # Tooltips
         ajouter_tooltip(nouvelle_btn, "Créer une nouvelle base de données vide")
         ajouter_tooltip(import_csv_btn, "Importer des données depuis un fichier CSV exporté de l'ancienne version")
         ajouter_tooltip(import_pdf_btn, "Importer des données depuis un fichier PDF avec reconnaissance automatique")
         ajouter_tooltip(import_btn, "Importer une base de données depuis un fichier JSON")
         ajouter_tooltip(export_btn, "Exporter toutes les bases vers un dossier")
+        ajouter_tooltip(analyses_btn, "Marges, dépenses et taux de réussite par marque, modèle, mois ou lieu sur toutes les bases")
+        ajouter_tooltip(recherche_btn, "Rechercher un mot (panne, remarque, modèle...) dans les notes de toutes les bases")
         
         # Container scrollable pour les cartes - AMÉLIORATION DU PADDING
         self.cartes_container = ctk.CTkScrollableFrame(self.frame)
@@ -851,6 +886,17 @@ class JourneesSelector:
             else:
                 messagebox.showerror("❌ Erreur d'import", message)
     
+    def ouvrir_analyses(self):
+        """Ouvre les analyses transversales de toutes les bases"""
+        from gui.analytique_dialog import ouvrir_analytique
+        ouvrir_analytique(self.frame.winfo_toplevel(), self.journees_manager.dossier_journees)
+    
+    def ouvrir_recherche_globale(self):
+        """Ouvre la recherche plein texte dans toutes les bases"""
+        from gui.recherche_globale_dialog import ouvrir_recherche_globale
+        ouvrir_recherche_globale(self.frame.winfo_toplevel(), self.journees_manager.dossier_journees,
+                                 on_ouvrir=self.selectionner_journee)
+    
     def exporter_toutes_journees(self):
         """Exporte toutes les journées vers un dossier"""
         from tkinter import filedialog
@@ -4,8 +4,10 @@
 Fenêtre principale de l'application avec CustomTkinter
 """
 
+import time
+from datetime import datetime
 import customtkinter as ctk
-from tkinter import messagebox
+from tkinter import filedialog, messagebox
 
 from config.settings import AppSettings
 from gui.reperage_tab import ReperageTab
@@ -14,7 +16,9 @@ from gui.achetes_tab import AchetesTab
 from gui.parametres_tab import ParametresTab
 from models.journee_enchere import JourneeEnchere
 from services.journees_manager import JourneesManager
-from utils.tooltips import set_tooltip_font_size
+from services.moteur_prix import MoteurPrix
+from utils.tooltips import ajouter_tooltip, set_tooltip_font_size
+from utils.polices import appliquer_parametres_polices
 
 class MainWindow:
     """Fenêtre principale avec onglets CustomTkinter - Version par journée d'enchère"""
@@ -39,6 +43,9 @@ class MainWindow:
         mode = "dark" if journee.parametres.get('mode_sombre', False) else "light"
         ctk.set_appearance_mode(mode)
         
+        # Initialiser les polices partagées avec les tailles de la journée
+        appliquer_parametres_polices(journee.parametres)
+        
         # Initialiser la taille de police des tooltips
         taille_tooltips = journee.parametres.get('taille_police_tooltips', 11)
         set_tooltip_font_size(taille_tooltips)
@@ -121,6 +128,30 @@ class MainWindow:
         )
         retour_btn.pack(side="left", padx=15, pady=22)
         
+        # Bouton mode direct (saisie des adjudications pendant la vente)
+        direct_btn = ctk.CTkButton(
+            nav_frame,
+            text="⚡ Mode direct",
+            command=self.ouvrir_mode_direct,
+            font=ctk.CTkFont(size=12, weight="bold"),
+            width=140,
+            height=35
+        )
+        direct_btn.pack(side="left", padx=(0, 15), pady=22)
+        
+        # Bouton mise à jour depuis un catalogue réédité
+        catalogue_btn = ctk.CTkButton(
+            nav_frame,
+            text="🔄 Catalogue",
+            command=self.mettre_a_jour_catalogue,
+            font=ctk.CTkFont(size=12, weight="bold"),
+            width=130,
+            height=35
+        )
+        catalogue_btn.pack(side="left", padx=(0, 15), pady=22)
+        ajouter_tooltip(catalogue_btn, "Met à jour les lots depuis un catalogue CSV ou PDF réédité\n"
+                                       "(estimations, notes et couleurs conservées)")
+        
         # Informations de la journée au centre
         info_frame = ctk.CTkFrame(nav_frame)
         info_frame.pack(side="left", expand=True, fill="both", padx=10, pady=15)
@@ -205,21 +236,68 @@ class MainWindow:
         # Mettre à jour la barre de navigation
         self.actualiser_barre_navigation()
     
+    def ouvrir_mode_direct(self):
+        """Ouvre le panneau clavier de saisie des adjudications"""
+        if not self.journee.vehicules_reperage:
+            messagebox.showinfo("Mode direct", "Aucun véhicule en repérage.")
+            return
+        
+        from gui.mode_direct import ouvrir_mode_direct
+        ouvrir_mode_direct(
+            self.root, self.data_adapter,
+            on_achat=self.on_achat_direct,
+            on_annulation=self.on_annulation_direct,
+            on_fermeture=self.on_data_changed
+        )
+    
+    def mettre_a_jour_catalogue(self):
+        """Fusionne un catalogue réédité dans la journée, par numéro de lot"""
+        fichier = filedialog.askopenfilename(
+            title="Catalogue réédité (CSV ou PDF)",
+            filetypes=[("Catalogues", "*.csv *.pdf"), ("Fichiers CSV", "*.csv"), ("Fichiers PDF", "*.pdf")]
+        )
+        if not fichier:
+            return
+        
+        succes, message = self.journees_manager.mettre_a_jour_catalogue(
+            self.journee, self.journees_manager.fichier_actif, fichier)
+        if succes:
+            self.reperage_tab.actualiser()
+            self.achetes_tab.actualiser()
+            messagebox.showinfo("Catalogue", message)
+        else:
+            messagebox.showerror("Catalogue", message)
+    
+    def on_achat_direct(self, vehicule):
+        """Achat du mode direct : lignes déplacées sur place, sans redessiner les tableaux"""
+        self.reperage_tab.retirer_ligne_lot(vehicule.lot)
+        self.achetes_tab.ajouter_ligne_vehicule(vehicule)
+    
+    def on_annulation_direct(self, vehicule):
+        """Annulation du mode direct (rare) : actualisation complète des deux onglets"""
+        self.reperage_tab.actualiser()
+        self.achetes_tab.actualiser()
+    
     def on_parametres_changed(self, parametres_temp=None):
         """Callback appelé quand les paramètres changent"""
         # Recalculer tous les prix max des véhicules avec les nouveaux paramètres
         parametres_actuels = parametres_temp if parametres_temp else self.journee.parametres
         
-        for vehicule in self.journee.vehicules_reperage:
-            vehicule.mettre_a_jour_prix_max_avec_parametres(parametres_actuels)
+        MoteurPrix(parametres_actuels).mettre_a_jour_prix_max(self.journee.vehicules_reperage)
+        
+        # Appliquer les changements d'interface aux onglets (chronométré)
+        debut = time.perf_counter()
         
-        # Appliquer les changements d'interface aux onglets
         if hasattr(self, 'reperage_tab') and hasattr(self.reperage_tab, 'appliquer_parametres_interface'):
             self.reperage_tab.appliquer_parametres_interface(parametres_temp)
         
         if hasattr(self, 'achetes_tab') and hasattr(self.achetes_tab, 'appliquer_parametres_interface'):
             self.achetes_tab.appliquer_parametres_interface(parametres_temp)
         
+        self.root.update_idletasks()
+        duree_ms = (time.perf_counter() - debut) * 1000
+        print(f"⏱️ Paramètres d'interface appliqués en {duree_ms:.1f} ms")
+        
         # Sauvegarder seulement si ce ne sont pas des paramètres temporaires
         if not parametres_temp:
             self.journees_manager.sauvegarder_journee_active()
@@ -307,6 +385,31 @@ class JourneeDataAdapter:
             return True
         return False
     
+    def enregistrer_achat_direct(self, vehicule, prix_achat: str):
+        """
+        Achat saisi en mode direct : journalisé sur disque puis appliqué en mémoire,
+        sans réécrire toute la journée (sauvegarde complète à la sortie du mode direct)
+        
+        Returns:
+            Le véhicule transféré, None en cas d'échec
+        """
+        operation = {
+            'op': 'achat',
+            'lot': vehicule.lot,
+            'prix_achat': prix_achat,
+            'date_achat': datetime.now().strftime("%d/%m/%Y")
+        }
+        if not self.journees_manager.journaliser_operation(operation):
+            return None
+        return self.journee.appliquer_operation(operation)
+    
+    def annuler_achat_direct(self, vehicule):
+        """Remet en repérage un véhicule acheté en mode direct (journalisé)"""
+        operation = {'op': 'annulation', 'lot': vehicule.lot}
+        if not self.journees_manager.journaliser_operation(operation):
+            return None
+        return self.journee.appliquer_operation(operation)
+    
     def sauvegarder_donnees(self):
         """Sauvegarde les données de la journée"""
         return self.journees_manager.sauvegarder_journee_active()
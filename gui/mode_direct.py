@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mode direct : saisie des adjudications au clavier pendant la vente
+"""
+
+import time
+import tkinter as tk
+
+# Raccourcis rappelés dans le panneau
+AIDE_CLAVIER = "Entrée : acheté au prix saisi  •  ↓ / ↑ : lot suivant / précédent  •  Ctrl+Z : annuler le dernier achat  •  Échap : quitter"
+
+def cle_lot(vehicule):
+    """Tri naturel des numéros de lot (2 avant 10)"""
+    lot = str(vehicule.lot).strip()
+    return (0, int(lot), "") if lot.isdigit() else (1, 0, lot)
+
+class PanneauDirect:
+    """Panneau clavier : lot courant, lots suivants et saisie du prix d'adjudication"""
+
+    def __init__(self, parent, data_adapter, on_achat=None, on_annulation=None, on_fermeture=None,
+                 nb_suivants=5):
+        self.parent = parent
+        self.data_adapter = data_adapter
+        self.on_achat = on_achat
+        self.on_annulation = on_annulation
+        self.on_fermeture = on_fermeture
+        self.nb_suivants = nb_suivants
+
+        self.lots = sorted(data_adapter.vehicules_reperage, key=cle_lot)
+        self.position = 0
+        self.fiches = {}          # id(véhicule) -> textes préparés
+        self.achats = []          # véhicules achetés pendant la session (pour Ctrl+Z)
+
+        # Créer la fenêtre
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("⚡ Mode direct")
+        self.dialog.geometry("820x560")
+        self.dialog.minsize(700, 480)
+        self.dialog.configure(bg='white')
+        self.dialog.transient(parent)
+        self.dialog.protocol("WM_DELETE_WINDOW", self.fermer)
+
+        self.var_prix = tk.StringVar()
+        self.create_interface()
+
+        self.dialog.bind('<Escape>', self.fermer)
+        self.dialog.bind('<Down>', lambda e: self.deplacer(1))
+        self.dialog.bind('<Next>', lambda e: self.deplacer(1))
+        self.dialog.bind('<Up>', lambda e: self.deplacer(-1))
+        self.dialog.bind('<Prior>', lambda e: self.deplacer(-1))
+        self.dialog.bind('<Control-z>', self.annuler_dernier_achat)
+        self.dialog.bind('<FocusIn>', self.on_focus)
+        self.entry_prix.bind('<Return>', self.valider)
+        self.entry_prix.bind('<KP_Enter>', self.valider)
+
+        self.afficher()
+        self.entry_prix.focus_set()
+
+    def create_interface(self):
+        """Crée l'interface du panneau"""
+        main_frame = tk.Frame(self.dialog, bg='white', padx=25, pady=20)
+        main_frame.pack(fill='both', expand=True)
+
+        tk.Label(main_frame, text="⚡ MODE DIRECT", font=('Segoe UI', 14, 'bold'), bg='white',
+                 fg='#2E86AB').pack(anchor='w')
+
+        # Lot courant
+        self.label_lot = tk.Label(main_frame, text="", font=('Segoe UI', 26, 'bold'), bg='white', fg='#222222',
+                                  anchor='w', justify='left')
+        self.label_lot.pack(fill='x', pady=(10, 0))
+        self.label_details = tk.Label(main_frame, text="", font=('Segoe UI', 13), bg='white', fg='#444444',
+                                      anchor='w', justify='left')
+        self.label_details.pack(fill='x')
+        self.label_prix_max = tk.Label(main_frame, text="", font=('Segoe UI', 16, 'bold'), bg='white',
+                                       fg='#2E7D32', anchor='w', justify='left')
+        self.label_prix_max.pack(fill='x', pady=(8, 0))
+
+        # Saisie du prix
+        saisie_frame = tk.Frame(main_frame, bg='white')
+        saisie_frame.pack(fill='x', pady=15)
+        tk.Label(saisie_frame, text="Adjugé à (€) :", font=('Segoe UI', 16), bg='white').pack(side='left')
+        self.entry_prix = tk.Entry(saisie_frame, textvariable=self.var_prix, font=('Segoe UI', 22, 'bold'),
+                                   width=10, justify='center')
+        self.entry_prix.pack(side='left', padx=15)
+
+        self.label_statut = tk.Label(main_frame, text="", font=('Segoe UI', 12), bg='white', fg='#333333',
+                                     anchor='w')
+        self.label_statut.pack(fill='x')
+
+        # Lots suivants
+        tk.Label(main_frame, text="À suivre", font=('Segoe UI', 12, 'bold'), bg='white',
+                 fg='#666666').pack(anchor='w', pady=(15, 2))
+        self.label_suivants = tk.Label(main_frame, text="", font=('Consolas', 12), bg='#f8f8f8', fg='#333333',
+                                       anchor='nw', justify='left', padx=10, pady=8)
+        self.label_suivants.pack(fill='both', expand=True)
+
+        tk.Label(main_frame, text=AIDE_CLAVIER, font=('Segoe UI', 9), bg='white', fg='#888888').pack(pady=(10, 0))
+
+    # ------------------------------------------------------------------
+    # Affichage
+    # ------------------------------------------------------------------
+
+    def fiche(self, vehicule):
+        """Textes affichés pour un lot (préparés à l'avance pour les lots suivants)"""
+        fiche = self.fiches.get(id(vehicule))
+        if fiche is None:
+            details = " · ".join(str(v) for v in (vehicule.annee, vehicule.kilometrage, vehicule.motorisation) if v)
+            reparations = f"Réparations : {vehicule.cout_reparations or 0}€ / {vehicule.temps_reparations or 0} h"
+            if vehicule.chose_a_faire:
+                reparations += f" ({vehicule.chose_a_faire})"
+            fiche = {
+                'titre': f"Lot {vehicule.lot} — {vehicule.marque} {vehicule.modele}".strip(),
+                'details': f"{details}\n{reparations}" if details else reparations,
+                'prix_max': f"Prix max : {vehicule.prix_max_achat or 'N/A'}    Revente estimée : "
+                            f"{vehicule.prix_revente or 'N/A'}€",
+                'ligne': f"Lot {str(vehicule.lot):<6} {f'{vehicule.marque} {vehicule.modele}'.strip()[:34]:<34} "
+                         f"max {vehicule.prix_max_achat or 'N/A'}"
+            }
+            self.fiches[id(vehicule)] = fiche
+        return fiche
+
+    def afficher(self):
+        """Affiche le lot courant et les suivants"""
+        if not self.lots:
+            self.label_lot.config(text="Plus aucun lot en repérage")
+            self.label_details.config(text="")
+            self.label_prix_max.config(text="")
+            self.label_suivants.config(text="")
+            return
+
+        self.position = max(0, min(self.position, len(self.lots) - 1))
+        fiche = self.fiche(self.lots[self.position])
+        self.label_lot.config(text=fiche['titre'])
+        self.label_details.config(text=fiche['details'])
+        self.label_prix_max.config(text=fiche['prix_max'])
+
+        suivants = self.lots[self.position + 1:self.position + 1 + self.nb_suivants]
+        self.label_suivants.config(text="\n".join(self.fiche(v)['ligne'] for v in suivants) or "—")
+
+        # Préparer les fiches des lots qui suivent pendant que la vente avance
+        self.dialog.after_idle(self.precharger)
+
+    def precharger(self):
+        """Prépare les fiches des prochains lots"""
+        if self.dialog.winfo_exists():
+            for vehicule in self.lots[self.position:self.position + 2 * self.nb_suivants + 1]:
+                self.fiche(vehicule)
+
+    def deplacer(self, pas):
+        """Passe au lot suivant / précédent"""
+        if self.lots:
+            self.position = max(0, min(self.position + pas, len(self.lots) - 1))
+            self.var_prix.set("")
+            self.afficher()
+        return "break"
+
+    def on_focus(self, event=None):
+        """Reprend les lots modifiés dans les onglets pendant que le panneau était en arrière-plan"""
+        if event is not None and event.widget is not self.dialog:
+            return
+        actuel = self.lots[self.position] if self.lots else None
+        lots = sorted(self.data_adapter.vehicules_reperage, key=cle_lot)
+        if [id(v) for v in lots] != [id(v) for v in self.lots]:
+            self.lots = lots
+            self.position = next((i for i, v in enumerate(lots) if v is actuel), self.position)
+        self.fiches.clear()
+        self.afficher()
+
+    # ------------------------------------------------------------------
+    # Saisie
+    # ------------------------------------------------------------------
+
+    def valider(self, event=None):
+        """Entrée : enregistre l'adjudication du lot courant au prix saisi"""
+        if not self.lots:
+            return "break"
+        texte = self.var_prix.get().replace('€', '').replace(' ', '').replace(',', '.').strip()
+        try:
+            prix = float(texte)
+            if prix <= 0:
+                raise ValueError
+        except ValueError:
+            self.label_statut.config(text="Saisissez un prix d'adjudication (↓ pour passer le lot)", fg='#F44336')
+            return "break"
+
+        vehicule = self.lots[self.position]
+        prix_achat = f"{prix:.0f}" if prix.is_integer() else f"{prix:.2f}"
+
+        debut = time.perf_counter()
+        transfere = self.data_adapter.enregistrer_achat_direct(vehicule, prix_achat)
+        duree_ms = (time.perf_counter() - debut) * 1000
+        if transfere is None:
+            self.label_statut.config(text=f"❌ Lot {vehicule.lot} non enregistré (voir la console)", fg='#F44336')
+            return "break"
+
+        self.achats.append(transfere)
+        del self.lots[self.position]
+        self.fiches.pop(id(vehicule), None)
+        self.var_prix.set("")
+
+        if self.on_achat:
+            self.on_achat(transfere)
+
+        depassement = prix - transfere.get_prix_numerique('prix_max_achat')
+        alerte = f"  ⚠️ {depassement:+.0f}€ au-dessus du prix max" if depassement > 0 else ""
+        total = sum(v.get_prix_numerique('prix_achat') for v in self.achats)
+        self.label_statut.config(
+            text=f"✅ Lot {transfere.lot} acheté {prix_achat}€ — enregistré en {duree_ms:.1f} ms{alerte}   "
+                 f"({len(self.achats)} achat(s), {total:,.0f}€)",
+            fg='#F57C00' if alerte else '#2E7D32'
+        )
+        print(f"⚡ Lot {transfere.lot} acheté {prix_achat}€ (journal {duree_ms:.1f} ms)")
+        self.afficher()
+        return "break"
+
+    def annuler_dernier_achat(self, event=None):
+        """Ctrl+Z : remet en repérage le dernier véhicule acheté dans la session"""
+        if not self.achats:
+            self.label_statut.config(text="Aucun achat à annuler", fg='#666666')
+            return "break"
+
+        vehicule = self.achats[-1]
+        if self.data_adapter.annuler_achat_direct(vehicule) is None:
+            self.label_statut.config(text=f"❌ Annulation du lot {vehicule.lot} impossible", fg='#F44336')
+            return "break"
+
+        self.achats.pop()
+        self.lots.append(vehicule)
+        self.lots.sort(key=cle_lot)
+        self.position = self.lots.index(vehicule)
+        self.label_statut.config(text=f"↩️ Achat du lot {vehicule.lot} annulé", fg='#666666')
+
+        if self.on_annulation:
+            self.on_annulation(vehicule)
+
+        self.afficher()
+        return "break"
+
+    def fermer(self, event=None):
+        """Quitte le mode direct (sauvegarde complète de la journée)"""
+        if self.on_fermeture:
+            self.on_fermeture()
+        self.dialog.destroy()
+
+def ouvrir_mode_direct(parent, data_adapter, on_achat=None, on_annulation=None, on_fermeture=None):
+    """Fonction utilitaire pour ouvrir le mode direct"""
+    return PanneauDirect(parent, data_adapter, on_achat, on_annulation, on_fermeture)
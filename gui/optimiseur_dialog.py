@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dialog des lots à viser sous contrainte de budget et d'heures d'atelier
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+from services.moteur_prix import MoteurPrix
+from services.optimiseur_lots import optimiser_selection, preparer_candidats
+from services.simulation_enchere import charger_historique, construire_modele
+
+class DialogOptimiseur:
+    """Liste classée des lots à viser, recalculée à chaque achat ou lot parti"""
+
+    COLONNES = ("rang", "lot", "vehicule", "prix_max", "prix_attendu", "marge_attendue", "heures")
+
+    def __init__(self, parent, data_adapter):
+        self.parent = parent
+        self.data_adapter = data_adapter
+        self.journee = data_adapter.journee
+
+        manager = data_adapter.journees_manager
+        self.modele = construire_modele(charger_historique(manager.dossier_journees, manager.fichier_actif))
+
+        self.lots_partis = set()   # lots adjugés à d'autres pendant la vente
+        self.signature = None      # état des listes au dernier calcul
+        self.recalcul_prevu = None
+
+        # Créer la fenêtre dialog
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Lots à viser")
+        self.dialog.geometry("950x620")
+        self.dialog.minsize(750, 450)
+        self.dialog.transient(parent)
+        self.dialog.bind('<Escape>', lambda e: self.dialog.destroy())
+
+        self.var_budget = tk.StringVar(value="")
+        self.var_heures = tk.StringVar(value="")
+        self.var_deduire_achats = tk.BooleanVar(value=True)
+
+        self.create_interface()
+        for variable in (self.var_budget, self.var_heures, self.var_deduire_achats):
+            variable.trace_add('write', lambda *args: self.planifier_recalcul())
+        self.surveiller()
+
+    def create_interface(self):
+        """Crée l'interface de la dialog"""
+        main_frame = tk.Frame(self.dialog, bg='white', padx=20, pady=20)
+        main_frame.pack(fill='both', expand=True)
+
+        tk.Label(
+            main_frame,
+            text="🎯 LOTS À VISER",
+            font=('Segoe UI', 20, 'bold'),
+            bg='white',
+            fg='#2E86AB'
+        ).pack(pady=(0, 5))
+
+        tk.Label(
+            main_frame,
+            text="Maximise la marge attendue (prix d'adjudication estimé d'après les journées passées) sans que "
+                 "les prix max des lots visés, commission comprise, dépassent le budget",
+            font=('Segoe UI', 10), bg='white', fg='#666666', wraplength=880
+        ).pack(pady=(0, 10))
+
+        # Contraintes
+        saisie_frame = tk.Frame(main_frame, bg='white')
+        saisie_frame.pack(pady=(0, 10))
+
+        tk.Label(saisie_frame, text="Budget de la journée (€) :", font=('Segoe UI', 11), bg='white').grid(
+            row=0, column=0, padx=5, pady=3, sticky='e')
+        tk.Entry(saisie_frame, textvariable=self.var_budget, width=12, font=('Segoe UI', 11)).grid(
+            row=0, column=1, padx=5, pady=3)
+        tk.Label(saisie_frame, text="Heures d'atelier disponibles :", font=('Segoe UI', 11), bg='white').grid(
+            row=0, column=2, padx=(20, 5), pady=3, sticky='e')
+        tk.Entry(saisie_frame, textvariable=self.var_heures, width=8, font=('Segoe UI', 11)).grid(
+            row=0, column=3, padx=5, pady=3)
+        tk.Checkbutton(
+            saisie_frame, text="Déduire les véhicules déjà achetés aujourd'hui",
+            variable=self.var_deduire_achats, font=('Segoe UI', 10), bg='white'
+        ).grid(row=1, column=0, columnspan=4, pady=3)
+
+        self.label_statut = tk.Label(main_frame, text="Saisissez un budget", font=('Segoe UI', 11),
+                                     bg='white', fg='#333333')
+        self.label_statut.pack(pady=(0, 10))
+
+        # Tableau classé
+        tableau_frame = tk.Frame(main_frame, bg='white')
+        tableau_frame.pack(fill='both', expand=True)
+
+        self.tree = ttk.Treeview(tableau_frame, columns=self.COLONNES, show="headings", height=15)
+        entetes = {
+            "rang": ("Rang", 50), "lot": ("Lot", 60), "vehicule": ("Véhicule", 240),
+            "prix_max": ("Prix max", 100), "prix_attendu": ("Prix attendu", 110),
+            "marge_attendue": ("Marge attendue", 120), "heures": ("Heures", 70)
+        }
+        for col in self.COLONNES:
+            texte, largeur = entetes[col]
+            self.tree.heading(col, text=texte)
+            self.tree.column(col, width=largeur, anchor="w" if col == "vehicule" else "center")
+        self.tree.tag_configure('parti', foreground='#999999')
+
+        scrollbar = ttk.Scrollbar(tableau_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        # Double-clic : lot parti chez un autre acheteur (ou de nouveau disponible)
+        self.tree.bind("<Double-1>", self.basculer_parti)
+
+        tk.Label(
+            main_frame, text="Double-clic sur un lot adjugé à un autre acheteur pour le retirer (ou le remettre).",
+            font=('Segoe UI', 9), bg='white', fg='#666666'
+        ).pack(anchor='w', pady=(5, 0))
+
+        tk.Button(
+            main_frame, text="Fermer", font=('Segoe UI', 11),
+            command=self.dialog.destroy, relief='flat', padx=15, pady=5
+        ).pack(side='right', pady=(10, 0))
+
+    def planifier_recalcul(self):
+        """Recalcule peu après la dernière frappe"""
+        if self.recalcul_prevu:
+            self.dialog.after_cancel(self.recalcul_prevu)
+        self.recalcul_prevu = self.dialog.after(300, self.recalculer)
+
+    def surveiller(self):
+        """Recalcule dès qu'un lot est acheté, ajouté ou modifié dans la journée"""
+        if not self.dialog.winfo_exists():
+            return
+        signature = (
+            tuple((v.lot, v.prix_max_achat, v.prix_revente, v.temps_reparations) for v in self.journee.vehicules_reperage),
+            tuple((v.lot, v.prix_achat) for v in self.journee.vehicules_achetes)
+        )
+        if signature != self.signature:
+            self.signature = signature
+            self.recalculer()
+        self.dialog.after(1000, self.surveiller)
+
+    def lire_nombre(self, variable):
+        """Nombre saisi (None si vide ou invalide)"""
+        texte = variable.get().replace(',', '.').replace('€', '').replace(' ', '')
+        try:
+            return float(texte) if texte else None
+        except ValueError:
+            return None
+
+    def recalculer(self):
+        """Relance l'optimisation sur les lots encore disponibles"""
+        self.recalcul_prevu = None
+        budget = self.lire_nombre(self.var_budget)
+        heures_max = self.lire_nombre(self.var_heures)
+        if budget is None:
+            self.label_statut.config(text="Saisissez un budget")
+            self.tree.delete(*self.tree.get_children())
+            return
+
+        # Trésorerie et heures déjà engagées par les achats du jour
+        if self.var_deduire_achats.get():
+            moteur = MoteurPrix(self.journee.parametres)
+            for vehicule in self.journee.vehicules_achetes:
+                budget -= vehicule.get_prix_numerique('prix_achat') * (1 + moteur.taux_commission)
+                if heures_max is not None:
+                    heures_max -= vehicule.get_prix_numerique('temps_reparations')
+        budget = max(0.0, budget)
+        if heures_max is not None:
+            heures_max = max(0.0, heures_max)
+
+        candidats = preparer_candidats(self.journee.vehicules_reperage, self.journee.parametres, self.modele)
+        disponibles = [c for c in candidats if c['lot'] not in self.lots_partis]
+        resultat = optimiser_selection(disponibles, budget, heures_max)
+        self.afficher(resultat, candidats, budget, heures_max)
+
+    def afficher(self, resultat, candidats, budget, heures_max):
+        """Lots visés par rang, puis les autres candidats"""
+        self.tree.delete(*self.tree.get_children())
+        retenus = {c['index'] for c in resultat['selection']}
+        for rang, candidat in enumerate(resultat['selection'], start=1):
+            self.inserer(str(rang), candidat, ())
+        for candidat in sorted(candidats, key=lambda c: c['marge_attendue'], reverse=True):
+            if candidat['index'] not in retenus:
+                parti = candidat['lot'] in self.lots_partis
+                self.inserer("parti" if parti else "—", candidat, ('parti',) if parti else ())
+
+        heures = f", {resultat['heures_totales']:g} h / {heures_max:g} h" if heures_max is not None else ""
+        self.label_statut.config(text=(
+            f"{len(resultat['selection'])} lot(s) visé(s) : marge attendue {resultat['marge_totale']:,.0f} €, "
+            f"engagement max {resultat['engagement_total']:,.0f} € / {budget:,.0f} €{heures}"
+            + ("" if resultat['optimal'] else " (meilleure sélection trouvée, recherche limitée)")
+        ))
+
+    def inserer(self, rang, candidat, tags):
+        """Ajoute la ligne d'un candidat"""
+        self.tree.insert("", "end", iid=str(candidat['index']), tags=tags, values=(
+            rang, candidat['lot'], candidat['libelle'],
+            f"{candidat['prix_max']:,.0f} €", f"{candidat['prix_attendu']:,.0f} €",
+            f"{candidat['marge_attendue']:,.0f} €", f"{candidat['heures']:g}"
+        ))
+
+    def basculer_parti(self, event=None):
+        """Retire (ou remet) le lot sélectionné et recalcule"""
+        for iid in self.tree.selection():
+            lot = self.tree.set(iid, "lot")
+            if lot in self.lots_partis:
+                self.lots_partis.discard(lot)
+            else:
+                self.lots_partis.add(lot)
+        self.recalculer()
+
+def ouvrir_optimiseur_lots(parent, data_adapter):
+    """Fonction utilitaire pour ouvrir la dialog des lots à viser"""
+    return DialogOptimiseur(parent, data_adapter)
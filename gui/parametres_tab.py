@@ -750,6 +750,17 @@ Où Main d'Œuvre = Temps Réparations × Tarif Horaire"""
         )
         reset_button.pack(side="left", padx=10, pady=15)
         
+        # Bouton sensibilité des paramètres
+        balayage_button = ctk.CTkButton(
+            buttons_frame,
+            text="🎚️ Sensibilité",
+            command=self.ouvrir_balayage,
+            font=ctk.CTkFont(size=12, weight="bold"),
+            width=150,
+            height=40
+        )
+        balayage_button.pack(side="left", padx=10, pady=15)
+        
         # Bouton aide
         help_button = ctk.CTkButton(
             buttons_frame,
@@ -765,6 +776,22 @@ Où Main d'Œuvre = Temps Réparations × Tarif Horaire"""
         ajouter_tooltip(save_button, TOOLTIPS['btn_sauvegarder_param'])
         ajouter_tooltip(reset_button, TOOLTIPS['btn_reinitialiser_param'])
         ajouter_tooltip(help_button, TOOLTIPS['btn_aide_param'])
+        ajouter_tooltip(balayage_button, TOOLTIPS['btn_balayage_param'])
+    
+    def ouvrir_balayage(self):
+        """Ouvre le balayage de sensibilité (tarif, commission, marge) sur les lots de la journée"""
+        if not self.journee.vehicules_reperage:
+            messagebox.showinfo("Sensibilité des paramètres", "Aucun véhicule en repérage dans cette journée.")
+            return
+        
+        from gui.balayage_dialog import ouvrir_balayage_parametres
+        
+        def on_choisir(parametres):
+            # Pré-remplit les champs, l'utilisateur sauvegarde s'il le souhaite
+            for nom, valeur in parametres.items():
+                self.vars_parametres[nom].set(f"{valeur:g}")
+        
+        ouvrir_balayage_parametres(self.parent.winfo_toplevel(), self.journee, on_choisir)
     
     def afficher_aide(self):
         """Affiche l'aide détaillée"""
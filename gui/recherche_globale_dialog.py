@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dialog de recherche plein texte dans toutes les journées
+"""
+
+import queue
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from services.index_recherche import get_index_partage
+
+class DialogRechercheGlobale:
+    """Recherche dans les notes (chose à faire, champ libre), marques et modèles de toutes les bases"""
+
+    COLONNES = ("base", "date", "statut", "lot", "vehicule", "notes")
+
+    def __init__(self, parent, dossier="journees_data", on_ouvrir=None):
+        self.parent = parent
+        self.on_ouvrir = on_ouvrir
+        self.index = get_index_partage(dossier)
+        self.resultats = {}
+        self.recherche_prevue = None
+
+        # Créer la fenêtre dialog
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Rechercher dans toutes les bases")
+        self.dialog.geometry("1050x600")
+        self.dialog.minsize(800, 400)
+        self.dialog.transient(parent)
+        self.dialog.bind('<Escape>', lambda e: self.dialog.destroy())
+
+        self.var_requete = tk.StringVar()
+        self.create_interface()
+
+        self.var_requete.trace_add('write', lambda *args: self.planifier_recherche())
+        self.entry_requete.focus_set()
+
+        # Journées importées ou copiées depuis la dernière ouverture : rattrapées en
+        # arrière-plan (la recherche reste possible sur l'index existant pendant ce temps)
+        self.label_statut.config(text="Mise à jour de l'index...")
+        self.file_resultats = queue.Queue()
+        threading.Thread(target=self.synchroniser, daemon=True).start()
+        self.verifier_synchronisation()
+
+    def create_interface(self):
+        """Crée l'interface de la dialog"""
+        main_frame = tk.Frame(self.dialog, bg='white', padx=20, pady=20)
+        main_frame.pack(fill='both', expand=True)
+
+        tk.Label(
+            main_frame,
+            text="🔍 RECHERCHER DANS TOUTES LES BASES",
+            font=('Segoe UI', 20, 'bold'),
+            bg='white',
+            fg='#2E86AB'
+        ).pack(pady=(0, 10))
+
+        self.entry_requete = tk.Entry(main_frame, textvariable=self.var_requete, font=('Segoe UI', 14))
+        self.entry_requete.pack(fill='x', pady=(0, 5))
+        self.entry_requete.bind('<Return>', lambda e: self.rechercher())
+
+        self.label_statut = tk.Label(main_frame, text="", font=('Segoe UI', 10), bg='white', fg='#666666')
+        self.label_statut.pack(pady=(0, 10))
+
+        # Résultats
+        tableau_frame = tk.Frame(main_frame, bg='white')
+        tableau_frame.pack(fill='both', expand=True)
+
+        self.tree = ttk.Treeview(tableau_frame, columns=self.COLONNES, show="headings", height=18)
+        entetes = {
+            "base": ("Base", 180), "date": ("Date", 90), "statut": ("Statut", 80), "lot": ("Lot", 60),
+            "vehicule": ("Véhicule", 180), "notes": ("Chose à faire / notes", 400)
+        }
+        for col in self.COLONNES:
+            texte, largeur = entetes[col]
+            self.tree.heading(col, text=texte)
+            self.tree.column(col, width=largeur, anchor="center" if col in ("date", "statut", "lot") else "w")
+
+        scrollbar = ttk.Scrollbar(tableau_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        if self.on_ouvrir:
+            self.tree.bind("<Double-1>", self.ouvrir_resultat)
+            tk.Label(
+                main_frame, text="Double-clic sur un résultat pour ouvrir sa base.",
+                font=('Segoe UI', 9), bg='white', fg='#666666'
+            ).pack(anchor='w', pady=(5, 0))
+
+        tk.Button(
+            main_frame, text="Fermer", font=('Segoe UI', 11),
+            command=self.dialog.destroy, relief='flat', padx=15, pady=5
+        ).pack(side='right', pady=(10, 0))
+
+    def synchroniser(self):
+        """Rattrape l'index (thread séparé)"""
+        debut = time.perf_counter()
+        try:
+            rattrapees = self.index.synchroniser()
+        except Exception as e:
+            print(f"⚠️ Index de recherche non synchronisé: {e}")
+            rattrapees = 0
+        self.file_resultats.put((rattrapees, (time.perf_counter() - debut) * 1000))
+
+    def verifier_synchronisation(self):
+        """Affiche la fin de la mise à jour de l'index et relance la requête saisie"""
+        if not self.dialog.winfo_exists():
+            return
+        try:
+            rattrapees, duree_ms = self.file_resultats.get_nowait()
+        except queue.Empty:
+            self.dialog.after(100, self.verifier_synchronisation)
+            return
+        if self.var_requete.get().strip():
+            self.rechercher()
+        else:
+            self.label_statut.config(
+                text=f"Index à jour ({rattrapees} base(s) rattrapée(s) en {duree_ms:.0f} ms)" if rattrapees
+                else "Tapez un ou plusieurs mots, ou leur début (ex. « embray », « boite craque »)"
+            )
+
+    def planifier_recherche(self):
+        """Recherche peu après la dernière frappe"""
+        if self.recherche_prevue:
+            self.dialog.after_cancel(self.recherche_prevue)
+        self.recherche_prevue = self.dialog.after(150, self.rechercher)
+
+    def rechercher(self):
+        """Lance la requête et affiche les résultats"""
+        self.recherche_prevue = None
+        requete = self.var_requete.get().strip()
+        self.tree.delete(*self.tree.get_children())
+        self.resultats.clear()
+        if not requete:
+            return
+
+        debut = time.perf_counter()
+        resultats = self.index.rechercher(requete)
+        duree_ms = (time.perf_counter() - debut) * 1000
+
+        for numero, resultat in enumerate(resultats):
+            iid = str(numero)
+            self.resultats[iid] = resultat
+            self.tree.insert("", "end", iid=iid, values=(
+                resultat['nom_journee'], resultat['date'], resultat['statut'], resultat['lot'],
+                resultat['libelle'], resultat['extrait']
+            ))
+        self.label_statut.config(text=f"{len(resultats)} véhicule(s) trouvé(s) en {duree_ms:.1f} ms")
+
+    def ouvrir_resultat(self, event=None):
+        """Ouvre la base du résultat sélectionné"""
+        selection = self.tree.selection()
+        if selection and selection[0] in self.resultats:
+            resultat = self.resultats[selection[0]]
+            self.dialog.destroy()
+            self.on_ouvrir(resultat['fichier'])
+
+def ouvrir_recherche_globale(parent, dossier="journees_data", on_ouvrir=None):
+    """Fonction utilitaire pour ouvrir la recherche dans toutes les bases"""
+    return DialogRechercheGlobale(parent, dossier, on_ouvrir)
@@ -15,7 +15,8 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'script_scraping_leboncoin'))
 
 try:
-    from leboncoin_scraper import LeboncoinScraper, DataAnalyzer
+    from leboncoin_scraper import IncrementalPriceStats
+    from services.valorisation_marche import get_scraper_partage
 except ImportError:
     print("⚠️ Module leboncoin_scraper non trouvé. Vérifiez que le script est dans le dossier script_scraping_leboncoin")
 
@@ -36,10 +37,17 @@ class RechercheTab:
         self.recherche_en_cours = False
         self.thread_recherche = None
         self.queue_resultats = queue.Queue()
+        self.stop_recherche = threading.Event()
         
         # Variables de stockage des résultats
         self.resultats_annonces = []
         self.stats_prix = {}
+        self.stats_incrementales = None
+        self.labels_stats = {}
+        
+        # Scraper et cache partagés avec la valorisation en lot (créés à la première recherche)
+        self.scraper = None
+        self.cache_reponses = None
         
         # Interface
         self.creer_interface()
@@ -127,16 +135,42 @@ class RechercheTab:
         self.entry_nb_annonces = ctk.CTkEntry(params_grid, placeholder_text="50", width=80)
         self.entry_nb_annonces.grid(row=1, column=5, padx=5, pady=10)
         
-        # Bouton de recherche
+        # Boutons de recherche et d'annulation
+        boutons_frame = ctk.CTkFrame(params_frame, fg_color="transparent")
+        boutons_frame.pack(pady=(0, 10))
+        
         self.btn_rechercher = ctk.CTkButton(
-            params_frame,
+            boutons_frame,
             text="🔍 Lancer la recherche",
             command=self.lancer_recherche,
             font=ctk.CTkFont(size=14, weight="bold"),
             height=40,
             width=200
         )
-        self.btn_rechercher.pack(pady=(0, 20))
+        self.btn_rechercher.pack(side="left", padx=5)
+        
+        self.btn_annuler = ctk.CTkButton(
+            boutons_frame,
+            text="⏹️ Annuler",
+            command=self.annuler_recherche,
+            font=ctk.CTkFont(size=14, weight="bold"),
+            height=40,
+            width=120,
+            fg_color="red",
+            hover_color="darkred",
+            state="disabled"
+        )
+        self.btn_annuler.pack(side="left", padx=5)
+        
+        # Option pour ignorer le cache des pages déjà téléchargées
+        self.var_forcer_actualisation = ctk.BooleanVar(value=False)
+        self.check_forcer_actualisation = ctk.CTkCheckBox(
+            params_frame,
+            text="🔄 Forcer l'actualisation (ignorer le cache)",
+            variable=self.var_forcer_actualisation,
+            font=ctk.CTkFont(size=12)
+        )
+        self.check_forcer_actualisation.pack(pady=(0, 15))
         
         # Barre de progression
         self.progress_bar = ctk.CTkProgressBar(params_frame, width=400)
@@ -319,15 +353,19 @@ class RechercheTab:
             'annee_max': int(self.entry_annee_max.get()),
             'km_min': int(self.entry_km_min.get()),
             'km_max': int(self.entry_km_max.get()),
-            'nb_annonces': int(self.entry_nb_annonces.get() or "50")
+            'nb_annonces': int(self.entry_nb_annonces.get() or "50"),
+            'force_refresh': bool(self.var_forcer_actualisation.get())
         }
         
         # Effacer les résultats précédents
         self.effacer_resultats()
+        self.stats_incrementales = IncrementalPriceStats()
+        self.stop_recherche.clear()
         
         # Lancer la recherche dans un thread séparé
         self.recherche_en_cours = True
         self.btn_rechercher.configure(state="disabled", text="🔄 Recherche en cours...")
+        self.btn_annuler.configure(state="normal")
         self.progress_bar.set(0)
         self.label_statut.configure(text="Initialisation de la recherche...")
         
@@ -338,46 +376,73 @@ class RechercheTab:
         )
         self.thread_recherche.start()
     
+    def annuler_recherche(self):
+        """Interrompt la recherche en cours (les annonces déjà reçues sont conservées)"""
+        if self.recherche_en_cours and not self.stop_recherche.is_set():
+            self.stop_recherche.set()
+            self.btn_annuler.configure(state="disabled")
+            self.label_statut.configure(text="Annulation de la recherche...")
+    
     def executer_recherche(self, parametres):
         """Exécute la recherche dans un thread séparé"""
         try:
-            # Créer le scraper
-            scraper = LeboncoinScraper()
+            # Scraper partagé (cache disque et limiteur de débit communs à toutes les recherches)
+            scraper = self.get_scraper()
+            stats_avant = self.cache_reponses.get_stats() if self.cache_reponses else None
             
             # Mettre à jour le statut
             self.queue_resultats.put(("statut", "Recherche des annonces..."))
-            self.queue_resultats.put(("progress", 0.2))
+            self.queue_resultats.put(("progress", 0.05))
             
-            # Lancer la recherche
+            nb_demande = parametres['nb_annonces']
+            nb_recues = 0
+            
+            def on_batch(page, annonces):
+                """Transmet chaque page à l'interface dès sa réception"""
+                nonlocal nb_recues
+                nb_recues += len(annonces)
+                self.queue_resultats.put(("lot", annonces))
+                self.queue_resultats.put(("statut", f"Page {page} reçue - {nb_recues} annonces..."))
+                self.queue_resultats.put(("progress", 0.05 + 0.9 * min(1.0, nb_recues / nb_demande)))
+            
+            # Lancer la recherche (résultats transmis page par page)
             annonces = scraper.search_ads(
                 parametres['modele'],
                 parametres['annee_min'],
                 parametres['annee_max'],
                 parametres['km_min'],
                 parametres['km_max'],
-                parametres['nb_annonces']
+                nb_demande,
+                force_refresh=parametres.get('force_refresh', False),
+                on_batch=on_batch,
+                stop_event=self.stop_recherche
             )
             
-            # Mettre à jour le statut
-            self.queue_resultats.put(("statut", "Analyse des données..."))
-            self.queue_resultats.put(("progress", 0.7))
-            
-            # Analyser les prix
-            analyzer = DataAnalyzer()
-            stats = analyzer.analyze_prices(annonces)
-            
-            # Mettre à jour le statut
-            self.queue_resultats.put(("statut", f"Recherche terminée - {len(annonces)} annonces trouvées"))
+            # Mettre à jour le statut (avec l'utilisation du cache pour cette recherche)
+            if self.stop_recherche.is_set():
+                statut = f"Recherche annulée - {len(annonces)} annonces reçues"
+            else:
+                statut = f"Recherche terminée - {len(annonces)} annonces trouvées"
+            if stats_avant is not None:
+                stats_apres = self.cache_reponses.get_stats()
+                hits = stats_apres['hits'] - stats_avant['hits']
+                misses = stats_apres['misses'] - stats_avant['misses']
+                statut += f" | Cache : {hits} hit(s) / {misses} miss(es)"
+            self.queue_resultats.put(("statut", statut))
             self.queue_resultats.put(("progress", 1.0))
             
-            # Envoyer les résultats
-            self.queue_resultats.put(("resultats", {"annonces": annonces, "stats": stats}))
-            
         except Exception as e:
             self.queue_resultats.put(("erreur", str(e)))
         finally:
             self.queue_resultats.put(("fin", None))
     
+    def get_scraper(self):
+        """Retourne le scraper partagé de l'application (limiteur de débit et cache disque communs)"""
+        if self.scraper is None:
+            self.scraper = get_scraper_partage()
+            self.cache_reponses = self.scraper.cache
+        return self.scraper
+    
     def verifier_resultats(self):
         """Vérifie périodiquement les résultats de la recherche"""
         try:
@@ -388,8 +453,8 @@ class RechercheTab:
                     self.label_statut.configure(text=data)
                 elif type_msg == "progress":
                     self.progress_bar.set(data)
-                elif type_msg == "resultats":
-                    self.afficher_resultats(data["annonces"], data["stats"])
+                elif type_msg == "lot":
+                    self.ajouter_lot(data)
                 elif type_msg == "erreur":
                     self.afficher_erreur(data)
                 elif type_msg == "fin":
@@ -401,14 +466,9 @@ class RechercheTab:
         # Programmer la prochaine vérification
         self.parent.after(100, self.verifier_resultats)
     
-    def afficher_resultats(self, annonces, stats):
-        """Affiche les résultats de la recherche"""
-        self.resultats_annonces = annonces
-        self.stats_prix = stats
-        
-        # Effacer le tableau
-        for item in self.treeview.get_children():
-            self.treeview.delete(item)
+    def ajouter_lot(self, annonces):
+        """Ajoute les annonces d'une page au tableau et met à jour les statistiques"""
+        self.resultats_annonces.extend(annonces)
         
         # Ajouter les annonces au tableau
         for annonce in annonces:
@@ -420,18 +480,32 @@ class RechercheTab:
                 annonce['lien'][:30] + "..." if len(annonce['lien']) > 30 else annonce['lien']
             ))
         
-        # Afficher les statistiques
-        self.afficher_statistiques(stats)
+        # Statistiques courantes (min / médiane / moyenne tenues à jour sans tout recalculer)
+        if self.stats_incrementales is None:
+            self.stats_incrementales = IncrementalPriceStats()
+        self.stats_incrementales.add(annonces)
+        self.stats_prix = self.stats_incrementales.result()
+        self.afficher_statistiques(self.stats_prix)
     
     def afficher_statistiques(self, stats):
-        """Affiche les statistiques des prix"""
-        # Effacer les anciens widgets de stats
-        for widget in self.stats_frame.winfo_children():
-            widget.destroy()
-        
+        """Affiche les statistiques des prix (les valeurs sont mises à jour sur place)"""
         if not stats:
             return
         
+        valeurs = {
+            'minimum': f"{stats['minimum']:,} €",
+            'maximum': f"{stats['maximum']:,} €",
+            'moyenne': f"{stats['moyenne']:,} €",
+            'mediane': f"{stats['mediane']:,} €",
+            'nombre': f"{stats['nombre']}"
+        }
+        
+        # Widgets déjà créés : simple mise à jour des textes
+        if self.labels_stats:
+            for cle, texte in valeurs.items():
+                self.labels_stats[cle].configure(text=texte)
+            return
+        
         # Titre des stats
         stats_title = ctk.CTkLabel(
             self.stats_frame,
@@ -446,19 +520,20 @@ class RechercheTab:
         
         # Statistiques
         stat_labels = [
-            ("💰 Minimum", f"{stats['minimum']:,} €"),
-            ("💰 Maximum", f"{stats['maximum']:,} €"),
-            ("📈 Moyenne", f"{stats['moyenne']:,} €"),
-            ("📊 Médiane", f"{stats['mediane']:,} €"),
-            ("📄 Annonces", f"{stats['nombre']}")
+            ('minimum', "💰 Minimum"),
+            ('maximum', "💰 Maximum"),
+            ('moyenne', "📈 Moyenne"),
+            ('mediane', "📊 Médiane"),
+            ('nombre', "📄 Annonces")
         ]
         
-        for i, (label, value) in enumerate(stat_labels):
+        for cle, label in stat_labels:
             stat_frame = ctk.CTkFrame(stats_row)
             stat_frame.pack(side="left", fill="x", expand=True, padx=5, pady=10)
             
             ctk.CTkLabel(stat_frame, text=label, font=ctk.CTkFont(weight="bold")).pack(pady=(5, 0))
-            ctk.CTkLabel(stat_frame, text=value, font=ctk.CTkFont(size=16)).pack(pady=(0, 5))
+            self.labels_stats[cle] = ctk.CTkLabel(stat_frame, text=valeurs[cle], font=ctk.CTkFont(size=16))
+            self.labels_stats[cle].pack(pady=(0, 5))
     
     def afficher_erreur(self, erreur):
         """Affiche une erreur de recherche"""
@@ -469,8 +544,12 @@ class RechercheTab:
         """Actions à effectuer quand la recherche est terminée"""
         self.recherche_en_cours = False
         self.btn_rechercher.configure(state="normal", text="🔍 Lancer la recherche")
+        self.btn_annuler.configure(state="disabled")
         self.progress_bar.set(1)
         
+        if self.stop_recherche.is_set():
+            # Le statut d'annulation reste affiché
+            return
         if len(self.resultats_annonces) == 0:
             self.label_statut.configure(text="Aucune annonce trouvée. Essayez d'autres critères.")
         elif len(self.resultats_annonces) < 10:
@@ -575,9 +654,12 @@ class RechercheTab:
         for widget in self.stats_frame.winfo_children():
             widget.destroy()
         
+        self.labels_stats = {}
+        
         # Réinitialiser les variables
         self.resultats_annonces = []
         self.stats_prix = {}
+        self.stats_incrementales = None
         
         # Réinitialiser la barre de progression
         self.progress_bar.set(0)
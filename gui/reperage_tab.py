@@ -7,21 +7,17 @@ Onglet de repérage des véhicules - CustomTkinter
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from datetime import datetime
 import os
 
-# Imports pour l'export PDF
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-from reportlab.lib.units import inch
-from reportlab.pdfgen import canvas
-
 from config.settings import AppSettings
-from utils.tooltips import ajouter_tooltip, TOOLTIPS, set_tooltip_font_size, ajouter_tooltips_colonnes_tableau
+from utils.tooltips import ajouter_tooltip, TOOLTIPS, set_tooltip_font_size, ajouter_tooltips_colonnes_tableau, cacher_tooltips
 from utils.dialogs import demander_prix_achat, afficher_info_vehicule
+from utils.polices import registre_polices
+from utils.ajustement_colonnes import AjusteurColonnes
 from models.vehicule import Vehicule
+from services.exports_journee import exporter_pdf_reperage
+from services.index_recherche import CHAMPS_INDEXES, normaliser_texte
+from services.moteur_prix import MoteurPrix
 
 class ReperageTab:
     """Onglet principal de repérage des véhicules avec CustomTkinter"""
@@ -41,6 +37,9 @@ class ReperageTab:
         self.editing_item = None
         self.editing_column = None
         self.column_tooltips = None  # NOUVEAU : Gestionnaire de tooltips contextuels
+        self.ajusteur_colonnes = None  # Ajustement automatique des largeurs de colonnes
+        self.estimateur = None  # Estimateur de prix de revente (chargé à la première saisie)
+        self.estimation_courante = None
         
         # Variables pour le tri
         self.tri_actuel = {'colonne': None, 'sens': 'asc'}  # 'asc' ou 'desc'
@@ -307,6 +306,15 @@ class ReperageTab:
         ajouter_tooltip(prix_rev_label, TOOLTIPS['prix_revente'])
         ajouter_tooltip(prix_rev_entry, TOOLTIPS['prix_revente'])
         
+        # Estimation marché (plus proches voisins de l'historique), recalculée à chaque frappe
+        self.label_estimation = ctk.CTkLabel(row3, text="", font=self.get_font_from_settings('labels'),
+                                             text_color="gray50", cursor="hand2")
+        self.label_estimation.pack(side="left", padx=5)
+        self.label_estimation.bind("<Button-1>", self.utiliser_estimation)
+        ajouter_tooltip(self.label_estimation, TOOLTIPS['estimation_marche'])
+        for champ in ('marque', 'modele', 'annee', 'kilometrage'):
+            self.vars_saisie[champ].trace('w', self.mettre_a_jour_estimation)
+        
         # Coût réparations
         cout_rep_label = ctk.CTkLabel(row3, text="COÛT RÉPAR:", width=100, font=self.get_font_from_settings('labels'))
         cout_rep_label.pack(side="left", padx=5)
@@ -533,6 +541,16 @@ class ReperageTab:
                 else:
                     self.tree_reperage.column(col, width=120, anchor="w")
         
+        # Ajustement automatique des colonnes texte selon leur contenu
+        colonnes_auto = ["marque", "modele", "motorisation", "description_reparations", "champ_libre"]
+        self.ajusteur_colonnes = AjusteurColonnes(
+            self.tree_reperage,
+            columns,
+            colonnes_auto,
+            largeur_min={col: int(self.tree_reperage.column(col, 'width')) for col in colonnes_auto}
+        )
+        self.ajusteur_colonnes.actif = bool(self.get_param_from_journee('largeur_colonnes_auto', True))
+        
         # Configuration des tags de couleur (MODIFIÉS selon nouvelles couleurs utilisateur)
         self.tree_reperage.tag_configure('couleur_turquoise', background='#1ABC9C', foreground='white')
         self.tree_reperage.tag_configure('couleur_vert', background='#2ECC71', foreground='white')
@@ -755,19 +773,14 @@ class ReperageTab:
     
     def configurer_style_tableau(self):
         """Configure le style du tableau selon les paramètres de la journée"""
-        style = ttk.Style()
-        
-        # Récupérer les tailles depuis les paramètres de la journée
-        taille_contenu = self.get_param_from_journee('taille_police_tableau', 14)
-        taille_entetes = self.get_param_from_journee('taille_police_entetes', 16) 
-        hauteur_lignes = self.get_param_from_journee('hauteur_lignes_tableau', 30)
-        
-        # Configurer les styles
-        style.configure("Treeview", 
-                       font=('Segoe UI', taille_contenu), 
-                       rowheight=hauteur_lignes)
-        style.configure("Treeview.Heading", 
-                       font=('Segoe UI', taille_entetes, 'bold'))
+        # Les styles ttk référencent les polices nommées du registre :
+        # un changement de taille ne nécessite qu'un configure() sur la police
+        registre_polices.appliquer({
+            'taille_police_tableau': self.get_param_from_journee('taille_police_tableau', 14),
+            'taille_police_entetes': self.get_param_from_journee('taille_police_entetes', 16),
+            'hauteur_lignes_tableau': self.get_param_from_journee('hauteur_lignes_tableau', 30)
+        })
+        registre_polices.lier_styles_ttk()
     
     def get_param_from_journee(self, param_name, default_value):
         """Récupère un paramètre depuis la journée ou fallback vers les settings puis valeur par défaut"""
@@ -776,18 +789,8 @@ class ReperageTab:
         return self.settings.parametres.get(param_name, default_value)
     
     def get_font_from_settings(self, element_type):
-        """Retourne une police CTkFont configurée selon les paramètres de la journée"""
-        if hasattr(self.data_adapter, 'journee') and self.data_adapter.journee:
-            # Utiliser les paramètres de la journée
-            taille = self.data_adapter.journee.parametres.get(f'taille_police_{element_type}', 12)
-        else:
-            # Fallback vers les settings
-            taille = self.settings.parametres.get(f'taille_police_{element_type}', 12)
-        
-        if element_type in ['titres', 'entetes', 'boutons', 'labels']:
-            return ctk.CTkFont(size=taille, weight="bold")
-        else:
-            return ctk.CTkFont(size=taille)
+        """Retourne la police partagée (registre) du type d'élément demandé"""
+        return registre_polices.police(element_type)
     
     def appliquer_parametres_interface(self, parametres_temp=None):
         """Applique les paramètres d'interface (pour aperçu ou sauvegarde définitive)"""
@@ -806,68 +809,27 @@ class ReperageTab:
         # Mettre à jour les tooltips contextuels avec les nouveaux paramètres
         self.mettre_a_jour_tooltips_contextuels()
         
-        # Reconfigurer le style du tableau
+        # Polices partagées : titres, labels, boutons, champs et tableau se
+        # mettent à jour d'eux-mêmes, sans parcourir l'arbre des widgets
+        registre_polices.appliquer(params)
         if hasattr(self, 'tree_reperage') and self.tree_reperage.winfo_exists():
-            self.configurer_style_tableau()
-        
-        # Mettre à jour les titres et boutons si possible
-        try:
-            # Parcourir tous les widgets pour mettre à jour les polices
-            self.mettre_a_jour_polices_recursive(self.scrollable_frame, params)
-        except Exception as e:
-            print(f"⚠️ Erreur lors de la mise à jour des polices: {e}")
+            registre_polices.lier_styles_ttk()
+            
+            # Activer / désactiver l'ajustement automatique des colonnes
+            auto = bool(params.get('largeur_colonnes_auto', True))
+            if auto != self.ajusteur_colonnes.actif:
+                self.ajusteur_colonnes.actif = auto
+                self.ajusteur_colonnes.reinitialiser_largeurs()
+                if not auto:
+                    for col, largeur in self.ajusteur_colonnes.largeur_min.items():
+                        self.tree_reperage.column(col, width=largeur)
+            self.ajusteur_colonnes.appliquer()
     
     def mettre_a_jour_tooltips_contextuels(self):
         """Met à jour les tooltips contextuels avec les paramètres actuels"""
-        if self.column_tooltips and hasattr(self, 'tree_reperage'):
-            # Nettoyer l'ancien gestionnaire de tooltips
-            try:
-                self.column_tooltips.cleanup()
-            except:
-                pass
-            
-            # Forcer un petit délai avant de recréer pour éviter les conflits
-            self.tree_reperage.after(100, lambda: self._recreer_tooltips_contextuels())
-    
-    def _recreer_tooltips_contextuels(self):
-        """Recrée les tooltips contextuels après nettoyage"""
-        try:
-            # Recréer les tooltips avec les paramètres mis à jour
-            self.column_tooltips = ajouter_tooltips_colonnes_tableau(self.tree_reperage, self.data_adapter)
-        except Exception as e:
-            print(f"Erreur recréation tooltips: {e}")
-            self.column_tooltips = None
-    
-    def mettre_a_jour_polices_recursive(self, widget, params):
-        """Met à jour récursivement les polices des widgets selon les paramètres"""
-        try:
-            # Mettre à jour les CTkLabel (titres, labels)
-            if isinstance(widget, ctk.CTkLabel):
-                text = widget.cget("text")
-                if "📋" in text or "🔍" in text or "⚡" in text or "🔎" in text:  # Titres principaux
-                    nouvelle_taille = params.get('taille_police_titres', 20)
-                    widget.configure(font=ctk.CTkFont(size=nouvelle_taille, weight="bold"))
-                else:  # Labels normaux
-                    nouvelle_taille = params.get('taille_police_labels', 12)
-                    widget.configure(font=ctk.CTkFont(size=nouvelle_taille, weight="bold"))
-            
-            # Mettre à jour les CTkButton
-            elif isinstance(widget, ctk.CTkButton):
-                nouvelle_taille = params.get('taille_police_boutons', 12)
-                widget.configure(font=ctk.CTkFont(size=nouvelle_taille, weight="bold"))
-            
-            # Mettre à jour les CTkEntry
-            elif isinstance(widget, ctk.CTkEntry):
-                nouvelle_taille = params.get('taille_police_champs', 12)
-                widget.configure(font=ctk.CTkFont(size=nouvelle_taille))
-            
-            # Parcourir récursivement les enfants
-            for child in widget.winfo_children():
-                self.mettre_a_jour_polices_recursive(child, params)
-                
-        except Exception as e:
-            # Ignorer les erreurs pour les widgets qui n'existent plus
-            pass
+        # Les textes des colonnes sont générés à l'affichage avec les paramètres
+        # courants : il suffit de cacher le tooltip éventuellement affiché
+        cacher_tooltips()
     
     def ajouter_tooltips_colonnes(self):
         """Ajoute des tooltips aux en-têtes des colonnes"""
@@ -915,6 +877,36 @@ class ReperageTab:
         export_pdf_button.pack(side="left", padx=10, pady=15)
         ajouter_tooltip(export_pdf_button, "Exporter les véhicules en repérage vers un document PDF professionnel")
         
+        # Bouton valorisation marché en lot
+        valorisation_button = ctk.CTkButton(
+            actions_frame,
+            text="📈 Valorisation marché",
+            command=self.valoriser_marche,
+            font=self.get_font_from_settings('boutons')
+        )
+        valorisation_button.pack(side="left", padx=10, pady=15)
+        ajouter_tooltip(valorisation_button, TOOLTIPS['btn_valorisation_marche'])
+        
+        # Bouton simulation de la journée
+        simulation_button = ctk.CTkButton(
+            actions_frame,
+            text="🎲 Simulation",
+            command=self.simuler_journee,
+            font=self.get_font_from_settings('boutons')
+        )
+        simulation_button.pack(side="left", padx=10, pady=15)
+        ajouter_tooltip(simulation_button, TOOLTIPS['btn_simulation_journee'])
+        
+        # Bouton lots à viser (budget et heures d'atelier)
+        optimiseur_button = ctk.CTkButton(
+            actions_frame,
+            text="🎯 Lots à viser",
+            command=self.optimiser_lots,
+            font=self.get_font_from_settings('boutons')
+        )
+        optimiseur_button.pack(side="left", padx=10, pady=15)
+        ajouter_tooltip(optimiseur_button, TOOLTIPS['btn_optimiseur_lots'])
+        
         refresh_button = ctk.CTkButton(
             actions_frame,
             text="🔄 Actualiser",
@@ -950,6 +942,22 @@ class ReperageTab:
             if self.auto_refresh_enabled and hasattr(self.parent, 'winfo_exists') and self.parent.winfo_exists():
                 self.parent.after(self.auto_refresh_interval, self.auto_refresh)
     
+    def get_parametres(self) -> dict:
+        """Paramètres de la journée (paramètres globaux à défaut)"""
+        if hasattr(self.data_adapter, 'journee') and self.data_adapter.journee:
+            return self.data_adapter.journee.parametres
+        return self.settings.parametres
+    
+    def get_nom_journee(self) -> str:
+        """Nom de la journée (titre des exports)"""
+        if hasattr(self.data_adapter, 'journee') and self.data_adapter.journee:
+            return self.data_adapter.journee.nom
+        return ""
+    
+    def get_moteur_prix(self) -> MoteurPrix:
+        """Moteur de prix avec les paramètres de la journée (paramètres globaux à défaut)"""
+        return MoteurPrix(self.get_parametres())
+    
     def calculer_hash_donnees(self):
         """Calcule un hash des données pour détecter les changements"""
         try:
@@ -984,15 +992,10 @@ class ReperageTab:
         if self.tree_reperage and self.tree_reperage.winfo_exists():
             for item in self.tree_reperage.get_children():
                 self.tree_reperage.delete(item)
+            self.ajusteur_colonnes.vider()
         
-        # Recalculer les prix max avec les paramètres de la journée
-        for vehicule in self.data_adapter.vehicules_reperage:
-            if hasattr(self.data_adapter, 'journee') and self.data_adapter.journee:
-                # Utiliser les paramètres de la journée
-                vehicule.mettre_a_jour_prix_max_avec_parametres(self.data_adapter.journee.parametres)
-            else:
-                # Fallback vers settings
-                vehicule.mettre_a_jour_prix_max(self.settings)
+        # Recalculer les prix max avec les paramètres de la journée (en un lot)
+        self.get_moteur_prix().mettre_a_jour_prix_max(self.data_adapter.vehicules_reperage)
         
         # Remplir avec les véhicules en repérage
         vehicules_reperage = self.filtrer_vehicules(self.data_adapter.vehicules_reperage)
@@ -1001,7 +1004,7 @@ class ReperageTab:
             statut = "Repérage"
             
             if self.tree_reperage and self.tree_reperage.winfo_exists():
-                self.tree_reperage.insert("", "end", values=(
+                valeurs = (
                     vehicule.lot,
                     vehicule.marque,
                     vehicule.modele,
@@ -1019,7 +1022,13 @@ class ReperageTab:
                     vehicule.champ_libre,
                     vehicule.reserve_professionnels,
                     vehicule.get_tag_couleur()
-                ), tags=tags)
+                )
+                self.tree_reperage.insert("", "end", values=valeurs, tags=tags)
+                self.ajusteur_colonnes.ajouter_ligne(valeurs)
+        
+        # Ré-ajuster les colonnes uniquement si un maximum a changé
+        if self.tree_reperage and self.tree_reperage.winfo_exists():
+            self.ajusteur_colonnes.appliquer()
     
     def arreter_auto_refresh(self):
         """Arrête l'actualisation automatique"""
@@ -1099,6 +1108,46 @@ class ReperageTab:
             messagebox.showerror("❌ Erreur", f"Erreur lors du changement de couleur: {e}")
             print(f"Erreur détaillée: {e}")  # Pour debug
     
+    def get_estimateur(self):
+        """Estimateur partagé (False si l'historique des prix est indisponible)"""
+        if self.estimateur is None:
+            try:
+                from services.estimateur_revente import get_estimateur_partage
+                self.estimateur = get_estimateur_partage() or False
+            except ImportError as e:
+                print(f"⚠️ Estimation marché indisponible: {e}")
+                self.estimateur = False
+        return self.estimateur
+    
+    def mettre_a_jour_estimation(self, *args):
+        """Affiche l'estimation marché du véhicule en cours de saisie"""
+        estimateur = self.get_estimateur()
+        if not estimateur:
+            return
+        
+        modele = f"{self.vars_saisie['marque'].get()} {self.vars_saisie['modele'].get()}"
+        try:
+            self.estimation_courante = estimateur.estimer(
+                modele, self.vars_saisie['annee'].get(), self.vars_saisie['kilometrage'].get()
+            )
+        except Exception as e:
+            print(f"⚠️ Erreur estimation marché: {e}")
+            self.estimation_courante = None
+        
+        estimation = self.estimation_courante
+        if estimation is None:
+            self.label_estimation.configure(text="")
+        else:
+            self.label_estimation.configure(
+                text=f"💡 Marché : {estimation['prix']:,} € "
+                     f"({estimation['bas']:,} – {estimation['haut']:,} €, {estimation['nombre']} annonces)".replace(",", " ")
+            )
+    
+    def utiliser_estimation(self, event=None):
+        """Reprend l'estimation marché comme prix de revente"""
+        if self.estimation_courante is not None:
+            self.vars_saisie['prix_revente'].set(str(self.estimation_courante['prix']))
+    
     def ajouter_vehicule(self):
         """Ajoute un véhicule au repérage avec calcul automatique du prix max"""
         # Validation basique
@@ -1251,15 +1300,10 @@ class ReperageTab:
         # Effacer le tableau
         for item in self.tree_reperage.get_children():
             self.tree_reperage.delete(item)
+        self.ajusteur_colonnes.vider()
         
-        # Recalculer les prix max pour tous les véhicules avec les paramètres de la journée
-        for vehicule in self.data_adapter.vehicules_reperage:
-            if hasattr(self.data_adapter, 'journee') and self.data_adapter.journee:
-                # Utiliser les paramètres spécifiques de la journée
-                vehicule.mettre_a_jour_prix_max_avec_parametres(self.data_adapter.journee.parametres)
-            else:
-                # Fallback vers settings globaux
-                vehicule.mettre_a_jour_prix_max(self.settings)
+        # Recalculer les prix max pour tous les véhicules avec les paramètres de la journée (en un lot)
+        self.get_moteur_prix().mettre_a_jour_prix_max(self.data_adapter.vehicules_reperage)
         
         # SUPPRIMÉ : Le transfert automatique des véhicules avec prix d'achat
         # Désormais, seul le bouton "Marquer acheté" peut transférer un véhicule
@@ -1271,27 +1315,12 @@ class ReperageTab:
         for vehicule in vehicules_reperage:
             # Utiliser la couleur choisie par l'utilisateur
             tags = (vehicule.get_tag_couleur(),)
-            statut = "Repérage"
-            
-            self.tree_reperage.insert("", "end", values=(
-                vehicule.lot,
-                vehicule.marque,
-                vehicule.modele,
-                vehicule.annee,
-                vehicule.kilometrage,
-                vehicule.motorisation,  # NOUVEAU
-                vehicule.prix_revente,
-                vehicule.cout_reparations,
-                vehicule.temps_reparations,
-                vehicule.chose_a_faire,  # Description des réparations
-                vehicule.prix_max_achat,  # Prix Max calculé avec paramètres spécifiques
-                vehicule.prix_achat,
-                vehicule.get_ecart_budget_str(),
-                statut,
-                vehicule.champ_libre,  # NOUVEAU
-                "Oui" if vehicule.reserve_professionnels else "Non",  # NOUVEAU
-                vehicule.get_tag_couleur()  # NOUVEAU
-            ), tags=tags)
+            valeurs = self.valeurs_ligne(vehicule)
+            self.tree_reperage.insert("", "end", values=valeurs, tags=tags)
+            self.ajusteur_colonnes.ajouter_ligne(valeurs)
+        
+        # Ré-ajuster les colonnes uniquement si un maximum a changé
+        self.ajusteur_colonnes.appliquer()
         
         # Sauvegarder les changements (seulement si pas de recherche)
         if not hasattr(self, 'var_recherche') or not self.var_recherche.get().strip():
@@ -1300,278 +1329,105 @@ class ReperageTab:
         # Mettre à jour le hash pour l'auto-refresh
         self.last_data_hash = self.calculer_hash_donnees()
     
-    def exporter_pdf(self):
-        """Exporte les données de repérage vers un fichier PDF professionnel"""
+    def valeurs_ligne(self, vehicule):
+        """Valeurs affichées dans le tableau pour un véhicule (ordre des colonnes)"""
+        return (
+            vehicule.lot,
+            vehicule.marque,
+            vehicule.modele,
+            vehicule.annee,
+            vehicule.kilometrage,
+            vehicule.motorisation,  # NOUVEAU
+            vehicule.prix_revente,
+            vehicule.cout_reparations,
+            vehicule.temps_reparations,
+            vehicule.chose_a_faire,  # Description des réparations
+            vehicule.prix_max_achat,  # Prix Max calculé avec paramètres spécifiques
+            vehicule.prix_achat,
+            vehicule.get_ecart_budget_str(),
+            "Repérage",
+            vehicule.champ_libre,  # NOUVEAU
+            "Oui" if vehicule.reserve_professionnels else "Non",  # NOUVEAU
+            vehicule.get_tag_couleur()  # NOUVEAU
+        )
+    
+    def retirer_ligne_lot(self, lot):
+        """Retire la ligne d'un lot sans redessiner le tableau (mode direct)"""
+        for item in self.tree_reperage.get_children():
+            if self.tree_reperage.set(item, "lot") == str(lot):
+                # Textes de la ligne retirés des maxima de largeur des colonnes
+                valeurs = [self.tree_reperage.set(item, col) for col in self.tree_reperage['columns']]
+                self.ajusteur_colonnes.retirer_ligne(valeurs)
+                self.tree_reperage.delete(item)
+                self.ajusteur_colonnes.appliquer()
+                break
+        
+        self.last_data_hash = self.calculer_hash_donnees()
+    
+    def mettre_a_jour_ligne(self, item, vehicule, anciennes_valeurs):
+        """Met à jour une ligne sur place après édition, sans redessiner le tableau"""
+        valeurs = self.valeurs_ligne(vehicule)
+        for colonne, ancien, nouveau in zip(self.tree_reperage['columns'], anciennes_valeurs, valeurs):
+            if ancien != nouveau:
+                self.ajusteur_colonnes.modifier_cellule(colonne, ancien, nouveau)
+        self.tree_reperage.item(item, values=valeurs, tags=(vehicule.get_tag_couleur(),))
+        self.ajusteur_colonnes.appliquer()
+        self.last_data_hash = self.calculer_hash_donnees()
+    
+    def valoriser_marche(self):
+        """Estime le prix de revente de tous les véhicules en repérage d'après Leboncoin"""
+        if not self.data_adapter.vehicules_reperage:
+            messagebox.showinfo("Valorisation marché", "Aucun véhicule en repérage à valoriser.")
+            return
+        
         try:
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".pdf",
-                filetypes=[("Fichiers PDF", "*.pdf")],
-                title="Exporter les véhicules en repérage en PDF"
-            )
-            
-            if filename:
-                # Créer le document PDF avec marges
-                doc = SimpleDocTemplate(
-                    filename, 
-                    pagesize=A4,
-                    rightMargin=50,
-                    leftMargin=50,
-                    topMargin=50,
-                    bottomMargin=50
-                )
-                elements = []
-                styles = getSampleStyleSheet()
-                
-                # Style personnalisé pour le titre
-                title_style = ParagraphStyle(
-                    'CustomTitle',
-                    parent=styles['Heading1'],
-                    fontSize=18,
-                    textColor=colors.HexColor('#2196F3'),
-                    spaceAfter=30,
-                    alignment=1  # Centré
-                )
-                
-                # Récupérer le nom de la journée
-                journee_nom = "Enchère"
-                if hasattr(self.data_adapter, 'journee') and self.data_adapter.journee:
-                    journee_nom = self.data_adapter.journee.nom
-                
-                # Titre principal
-                titre = f"🔍 RAPPORT VÉHICULES EN REPÉRAGE - {journee_nom.upper()}"
-                elements.append(Paragraph(titre, title_style))
-                
-                # Date du rapport
-                date_rapport = datetime.now().strftime("%d/%m/%Y à %H:%M")
-                date_style = ParagraphStyle(
-                    'DateStyle',
-                    parent=styles['Normal'],
-                    fontSize=10,
-                    textColor=colors.grey,
-                    alignment=1,
-                    spaceAfter=20
-                )
-                elements.append(Paragraph(f"Rapport généré le {date_rapport}", date_style))
-                
-                # Récupérer la marge de sécurité
-                marge_securite = 200.0  # Valeur par défaut
-                if hasattr(self.data_adapter, 'journee') and self.data_adapter.journee:
-                    marge_securite = self.data_adapter.journee.parametres.get('marge_securite', 200.0)
-                elif hasattr(self, 'settings') and self.settings:
-                    marge_securite = self.settings.parametres.get('marge_securite', 200.0)
-                
-                # Statistiques avec marge de sécurité en rouge
-                nb_reperage = len(self.data_adapter.vehicules_reperage)
-                prix_max_total = sum(v.get_prix_numerique('prix_max_achat') for v in self.data_adapter.vehicules_reperage)
-                prix_revente_total = sum(v.get_prix_numerique('prix_revente') for v in self.data_adapter.vehicules_reperage if v.prix_revente and v.prix_revente.strip())
-                marge_potentielle_total = sum(
-                    v.get_prix_numerique('prix_revente') - v.get_prix_numerique('prix_max_achat') 
-                    for v in self.data_adapter.vehicules_reperage 
-                    if v.prix_revente and v.prix_revente.strip() and v.prix_max_achat and v.prix_max_achat.strip()
-                )
-                
-                stats_text = f"""
-                <b>📊 STATISTIQUES DE REPÉRAGE</b><br/>
-                • Nombre de véhicules en repérage : <b>{nb_reperage}</b><br/>
-                • Budget maximum total : <b>{prix_max_total:,.0f}€</b><br/>
-                • Potentiel de revente total : <b>{prix_revente_total:,.0f}€</b><br/>
-                • Marge potentielle totale : <b>{marge_potentielle_total:+,.0f}€</b><br/>
-                <br/>
-                <font color="red" size="14"><b>🛡️ MARGE DE SÉCURITÉ : {marge_securite:,.0f}€</b></font>
-                """
-                
-                stats_style = ParagraphStyle(
-                    'StatsStyle',
-                    parent=styles['Normal'],
-                    fontSize=12,
-                    spaceAfter=30,
-                    backColor=colors.HexColor('#F5F5F5'),
-                    borderColor=colors.HexColor('#2196F3'),
-                    borderWidth=1,
-                    borderPadding=10
-                )
-                elements.append(Paragraph(stats_text, stats_style))
-                elements.append(Spacer(1, 20))
-                
-                # Titre du tableau
-                table_title = Paragraph("<b>📋 DÉTAIL DES VÉHICULES EN REPÉRAGE</b>", styles['Heading2'])
-                elements.append(table_title)
-                elements.append(Spacer(1, 10))
-                
-                # Trier les véhicules par numéro de lot (du plus petit au plus grand)
-                vehicules_tries = sorted(
-                    self.data_adapter.vehicules_reperage, 
-                    key=lambda v: self._extraire_numero_lot(v.lot)
-                )
-                
-                # Données du tableau avec nouvelle colonne couleur et réservé pro
-                data = [
-                    ["LOT", "COULEUR", "MARQUE", "MODÈLE", "ANNÉE", "KM", "MOTORISATION", "PRIX REV", "COÛT RÉP", "TEMPS (h)", "PRIX MAX", "PRO"]
-                ]
-                
-                for vehicule in vehicules_tries:
-                    prix_revente = vehicule.get_prix_numerique('prix_revente')
-                    prix_max = vehicule.get_prix_numerique('prix_max_achat')
-                    cout_reparations = vehicule.get_prix_numerique('cout_reparations')
-                    temps_reparations = vehicule.get_prix_numerique('temps_reparations')
-                    
-                    # Formater les données avec retour à la ligne si nécessaire
-                    def formater_cellule(texte, max_chars=15):
-                        """Formate une cellule en ajoutant des retours à la ligne"""
-                        if not texte or len(str(texte)) <= max_chars:
-                            return str(texte)
-                        
-                        mots = str(texte).split()
-                        lignes = []
-                        ligne_actuelle = ""
-                        
-                        for mot in mots:
-                            if len(ligne_actuelle + " " + mot) <= max_chars:
-                                ligne_actuelle = ligne_actuelle + " " + mot if ligne_actuelle else mot
-                            else:
-                                if ligne_actuelle:
-                                    lignes.append(ligne_actuelle)
-                                ligne_actuelle = mot
-                        
-                        if ligne_actuelle:
-                            lignes.append(ligne_actuelle)
-                        
-                        return "\n".join(lignes)
-                    
-                    # Créer case couleur (carré unicode coloré)
-                    couleur_symbole = self._get_couleur_symbole(vehicule.couleur)
-                    
-                    # Réservé aux pros
-                    reserve_pro = "OUI" if vehicule.reserve_professionnels else "NON"
-                    
-                    data.append([
-                        vehicule.lot,
-                        couleur_symbole,
-                        formater_cellule(vehicule.marque, 10),
-                        formater_cellule(vehicule.modele, 10),
-                        vehicule.annee,
-                        formater_cellule(vehicule.kilometrage, 8),
-                        formater_cellule(vehicule.motorisation, 10),
-                        f"{prix_revente:.0f}€" if prix_revente > 0 else "-",
-                        f"{cout_reparations:.0f}€" if cout_reparations > 0 else "-",
-                        f"{temps_reparations:.0f}h" if temps_reparations > 0 else "-",
-                        f"{prix_max:.0f}€" if prix_max > 0 else "-",
-                        reserve_pro
-                    ])
-                
-                # Créer le tableau avec largeurs adaptées
-                table = Table(data, colWidths=[
-                    0.5*inch,  # LOT
-                    0.4*inch,  # COULEUR
-                    0.7*inch,  # MARQUE  
-                    0.7*inch,  # MODÈLE
-                    0.4*inch,  # ANNÉE
-                    0.6*inch,  # KM
-                    0.7*inch,  # MOTORISATION
-                    0.6*inch,  # PRIX REV
-                    0.6*inch,  # COÛT RÉP
-                    0.5*inch,  # TEMPS
-                    0.6*inch,  # PRIX MAX
-                    0.4*inch   # PRO
-                ])
-                
-                # Style du tableau
-                table_style = [
-                    # En-tête
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2196F3')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 7),  # Police plus petite pour en-têtes
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                    
-                    # Corps du tableau
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                    ('FONTSIZE', (0, 1), (-1, -1), 6),  # Police plus petite pour contenu
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.black),  # Grille plus fine
-                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),  # Alignement vertical en haut
-                    
-                    # Alternance de couleurs pour les lignes
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F8F9FA')])
-                ]
-                
-                # Ajouter les couleurs de fond pour les cases couleur
-                for i, vehicule in enumerate(vehicules_tries):
-                    row_idx = i + 1  # +1 car la première ligne est l'en-tête
-                    couleur_bg = self._get_couleur_bg(vehicule.couleur)
-                    table_style.append(('BACKGROUND', (1, row_idx), (1, row_idx), couleur_bg))
-                
-                table.setStyle(TableStyle(table_style))
-                elements.append(table)
-                
-                # Section descriptions si présentes
-                descriptions_avec_vehicules = [
-                    (v, v.chose_a_faire) for v in vehicules_tries  # Utiliser la liste triée
-                    if v.chose_a_faire and v.chose_a_faire.strip()
-                ]
-                
-                if descriptions_avec_vehicules:
-                    elements.append(Spacer(1, 30))
-                    desc_title = Paragraph("<b>🔧 DESCRIPTIONS DES RÉPARATIONS</b>", styles['Heading2'])
-                    elements.append(desc_title)
-                    elements.append(Spacer(1, 10))
-                    
-                    for vehicule, description in descriptions_avec_vehicules:
-                        desc_text = f"<b>Lot {vehicule.lot} ({vehicule.marque} {vehicule.modele}):</b> {description}"
-                        desc_para = Paragraph(desc_text, styles['Normal'])
-                        elements.append(desc_para)
-                        elements.append(Spacer(1, 5))
-                
-                # Pied de page
-                elements.append(Spacer(1, 30))
-                footer_style = ParagraphStyle(
-                    'FooterStyle',
-                    parent=styles['Normal'],
-                    fontSize=8,
-                    textColor=colors.grey,
-                    alignment=1
-                )
-                footer_text = f"Gestionnaire d'Enchères - Rapport de repérage généré automatiquement - {date_rapport}"
-                elements.append(Paragraph(footer_text, footer_style))
-                
-                # Construire le document
-                doc.build(elements)
-                
-                messagebox.showinfo("✅ Succès", f"Export PDF réussi vers:\n{filename}")
-                
-        except Exception as e:
-            messagebox.showerror("❌ Erreur", f"Erreur lors de l'export PDF: {e}")
+            from gui.valorisation_dialog import ouvrir_valorisation_marche
+        except ImportError as e:
+            messagebox.showerror("❌ Erreur", f"Module de recherche Leboncoin indisponible: {e}")
+            return
+        
+        def on_applique():
+            self.actualiser()
+            if self.on_data_changed:
+                self.on_data_changed()
+        
+        ouvrir_valorisation_marche(self.parent.winfo_toplevel(), self.data_adapter, on_applique)
     
-    def _extraire_numero_lot(self, lot: str) -> int:
-        """Extrait le numéro du lot pour le tri (gère les lots numériques et alphanumériques)"""
-        import re
-        # Chercher un nombre dans le lot
-        match = re.search(r'\d+', str(lot))
-        if match:
-            return int(match.group())
-        # Si pas de nombre, retourner 0 pour les lots sans numéro
-        return 0
+    def simuler_journee(self):
+        """Simule la journée (dépense, marge, dépassement de budget) d'après les journées passées"""
+        if not self.data_adapter.vehicules_reperage:
+            messagebox.showinfo("Simulation", "Aucun véhicule en repérage à simuler.")
+            return
+        
+        from gui.simulation_dialog import ouvrir_simulation_journee
+        ouvrir_simulation_journee(self.parent.winfo_toplevel(), self.data_adapter)
     
-    def _get_couleur_symbole(self, couleur: str) -> str:
-        """Retourne un symbole coloré pour la colonne couleur"""
-        symboles = {
-            'turquoise': '●',
-            'vert': '●', 
-            'orange': '●',
-            'rouge': '●'
-        }
-        return symboles.get(couleur, '●')
+    def optimiser_lots(self):
+        """Ouvre la liste classée des lots à viser pour le budget de la journée"""
+        if not self.data_adapter.vehicules_reperage:
+            messagebox.showinfo("Lots à viser", "Aucun véhicule en repérage.")
+            return
+        
+        from gui.optimiseur_dialog import ouvrir_optimiseur_lots
+        ouvrir_optimiseur_lots(self.parent.winfo_toplevel(), self.data_adapter)
     
-    def _get_couleur_bg(self, couleur: str) -> colors.Color:
-        """Retourne la couleur de fond correspondante pour le PDF"""
-        couleurs_bg = {
-            'turquoise': colors.HexColor('#1ABC9C'),
-            'vert': colors.HexColor('#2ECC71'),
-            'orange': colors.HexColor('#F39C12'), 
-            'rouge': colors.HexColor('#E74C3C')
-        }
-        return couleurs_bg.get(couleur, colors.HexColor('#1ABC9C'))
+    def exporter_pdf(self):
+        """Exporte les données de repérage vers un fichier PDF professionnel"""
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".pdf",
+            filetypes=[("Fichiers PDF", "*.pdf")],
+            title="Exporter les véhicules en repérage en PDF"
+        )
+        if not filename:
+            return
+        
+        succes, message = exporter_pdf_reperage(
+            filename, self.data_adapter.vehicules_reperage, self.get_parametres(), self.get_nom_journee()
+        )
+        if succes:
+            messagebox.showinfo("✅ Succès", message)
+        else:
+            messagebox.showerror("❌ Erreur", message)
     
     def on_double_click(self, event):
         """Gestion du double-clic : popup info pour le lot, édition pour les autres colonnes"""
@@ -1698,6 +1554,7 @@ class ReperageTab:
                 columns_names = ["lot", "marque", "modele", "annee", "kilometrage", "motorisation", "prix_revente", "cout_reparations", "temps_reparations", "description_reparations", "prix_max", "prix_achat", "marge", "statut", "champ_libre", "reserve_pro", "couleur"]
                 col_index = int(self.editing_column.replace('#', '')) - 1
                 
+                anciennes_valeurs = self.valeurs_ligne(vehicule)
                 if 0 <= col_index < len(columns_names):
                     col_name = columns_names[col_index]
                     
@@ -1738,9 +1595,13 @@ class ReperageTab:
                         else:
                             vehicule.mettre_a_jour_prix_max(self.settings)
                     
-                    # Sauvegarder et actualiser normalement
                     self.data_adapter.sauvegarder_donnees()
-                    self.actualiser()
+                    # La ligne ne change pas de place (ni colonne triée ni recherche) : mise à jour sur place
+                    recherche = self.var_recherche.get().strip() if hasattr(self, 'var_recherche') else ""
+                    if col_name != self.tri_actuel['colonne'] and not recherche:
+                        self.mettre_a_jour_ligne(self.editing_item, vehicule, anciennes_valeurs)
+                    else:
+                        self.actualiser()
                     
                     if self.on_data_changed:
                         self.on_data_changed()
@@ -1768,16 +1629,15 @@ class ReperageTab:
 
     def filtrer_vehicules(self, vehicules):
         """Filtre les véhicules selon le terme de recherche"""
-        terme = self.var_recherche.get().lower().strip()
+        terme = normaliser_texte(self.var_recherche.get()).strip()
         if not terme:
             return vehicules
         
         vehicules_filtres = []
         for vehicule in vehicules:
-            # Recherche dans lot, marque et modèle
-            if (terme in vehicule.lot.lower() or 
-                terme in vehicule.marque.lower() or 
-                terme in vehicule.modele.lower()):
+            # Recherche dans lot, marque, modèle et notes (sans tenir compte des accents)
+            texte = normaliser_texte(" ".join(str(getattr(vehicule, champ, "") or "") for champ in CHAMPS_INDEXES))
+            if terme in texte:
                 vehicules_filtres.append(vehicule)
         
         return vehicules_filtres 
\ No newline at end of file
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dialog de simulation Monte Carlo de la journée d'enchères
+"""
+
+import math
+import queue
+import threading
+import tkinter as tk
+from tkinter import messagebox
+
+from services.simulation_enchere import charger_historique, construire_modele, preparer_lots, simuler_journee
+
+class DialogSimulation:
+    """Simule la journée à partir de l'historique des journées passées"""
+
+    def __init__(self, parent, data_adapter, nb_scenarios=20000):
+        self.parent = parent
+        self.data_adapter = data_adapter
+        self.journee = data_adapter.journee
+
+        # Modèle ajusté sur les autres journées enregistrées
+        manager = data_adapter.journees_manager
+        historique = charger_historique(manager.dossier_journees, manager.fichier_actif)
+        self.modele = construire_modele(historique)
+        self.nb_journees_historique = len(historique)
+        self.lots = preparer_lots(data_adapter.vehicules_reperage, self.journee.parametres, self.modele)
+
+        self.queue_resultats = queue.Queue()
+        self.en_cours = False
+
+        # Créer la fenêtre dialog
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Simulation de la journée")
+        self.dialog.geometry("700x560")
+        self.dialog.minsize(600, 480)
+        self.dialog.transient(parent)
+        self.dialog.bind('<Escape>', lambda e: self.dialog.destroy())
+
+        self.var_budget = tk.StringVar(value=f"{sum(self.lots['prix_max']) * 0.5:.0f}")
+        self.var_scenarios = tk.StringVar(value=str(nb_scenarios))
+
+        self.create_interface()
+        self.verifier_resultats()
+
+    def create_interface(self):
+        """Crée l'interface de la dialog"""
+        main_frame = tk.Frame(self.dialog, bg='white', padx=20, pady=20)
+        main_frame.pack(fill='both', expand=True)
+
+        tk.Label(
+            main_frame,
+            text="🎲 SIMULATION DE LA JOURNÉE",
+            font=('Segoe UI', 20, 'bold'),
+            bg='white',
+            fg='#2E86AB'
+        ).pack(pady=(0, 5))
+
+        loi = self.modele['global']
+        if loi['echantillon']:
+            texte_modele = (f"Historique : {loi['echantillon']} achat(s) sur {self.nb_journees_historique} journée(s) — "
+                            f"lot remporté {loi['p_gain']:.0%} du temps, adjugé en médiane à "
+                            f"{math.exp(loi['mu']):.0%} du prix max ({len(self.modele['marques'])} marque(s) ajustée(s))")
+        else:
+            texte_modele = ("Aucun achat dans les autres journées : modèle par défaut "
+                            f"(lot remporté {loi['p_gain']:.0%} du temps, adjugé vers {math.exp(loi['mu']):.0%} du prix max)")
+        tk.Label(
+            main_frame, text=texte_modele, font=('Segoe UI', 10), bg='white', fg='#666666',
+            wraplength=640, justify='center'
+        ).pack(pady=(0, 15))
+
+        # Saisie
+        saisie_frame = tk.Frame(main_frame, bg='white')
+        saisie_frame.pack(pady=(0, 10))
+
+        tk.Label(saisie_frame, text="Budget disponible (€) :", font=('Segoe UI', 11), bg='white').grid(
+            row=0, column=0, padx=5, pady=3, sticky='e')
+        tk.Entry(saisie_frame, textvariable=self.var_budget, width=12, font=('Segoe UI', 11)).grid(
+            row=0, column=1, padx=5, pady=3)
+        tk.Label(saisie_frame, text="Scénarios :", font=('Segoe UI', 11), bg='white').grid(
+            row=1, column=0, padx=5, pady=3, sticky='e')
+        tk.Entry(saisie_frame, textvariable=self.var_scenarios, width=12, font=('Segoe UI', 11)).grid(
+            row=1, column=1, padx=5, pady=3)
+
+        self.btn_lancer = tk.Button(
+            saisie_frame, text="▶️ Simuler", font=('Segoe UI', 11, 'bold'),
+            command=self.lancer, bg='#2E86AB', fg='white', relief='flat', padx=15, pady=5
+        )
+        self.btn_lancer.grid(row=0, column=2, rowspan=2, padx=20)
+
+        self.label_statut = tk.Label(
+            main_frame, text=f"{len(self.lots['prix_max'])} lot(s) en repérage avec un prix max",
+            font=('Segoe UI', 11), bg='white', fg='#333333'
+        )
+        self.label_statut.pack(pady=(0, 10))
+
+        # Résultats
+        self.texte_resultats = tk.Label(
+            main_frame, text="", font=('Consolas', 11), bg='#f8f8f8', fg='#333333',
+            justify='left', anchor='nw', padx=15, pady=15
+        )
+        self.texte_resultats.pack(fill='both', expand=True)
+
+        tk.Button(
+            main_frame, text="Fermer", font=('Segoe UI', 11),
+            command=self.dialog.destroy, relief='flat', padx=15, pady=5
+        ).pack(side='right', pady=(15, 0))
+
+    def lancer(self):
+        """Démarre la simulation dans un thread séparé"""
+        if self.en_cours:
+            return
+        if not self.lots['prix_max']:
+            messagebox.showinfo("Simulation", "Aucun lot avec un prix max à simuler.", parent=self.dialog)
+            return
+        try:
+            budget = float(self.var_budget.get().replace(',', '.').replace('€', '').replace(' ', ''))
+            nb_scenarios = int(self.var_scenarios.get())
+            if nb_scenarios <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("❌ Erreur", "Budget ou nombre de scénarios invalide", parent=self.dialog)
+            return
+
+        self.en_cours = True
+        self.btn_lancer.config(state='disabled')
+        self.label_statut.config(text=f"Simulation de {nb_scenarios:,} scénario(s)...")
+
+        def executer():
+            try:
+                resultats = simuler_journee(self.lots, self.journee.parametres, budget, nb_scenarios)
+                self.queue_resultats.put(("resultats", resultats))
+            except Exception as e:
+                self.queue_resultats.put(("erreur", str(e)))
+
+        threading.Thread(target=executer, daemon=True).start()
+
+    def verifier_resultats(self):
+        """Récupère le résultat du thread de simulation"""
+        if not self.dialog.winfo_exists():
+            return
+        try:
+            type_msg, data = self.queue_resultats.get_nowait()
+            self.en_cours = False
+            self.btn_lancer.config(state='normal')
+            if type_msg == "resultats":
+                self.afficher_resultats(data)
+            else:
+                self.label_statut.config(text="Simulation échouée")
+                messagebox.showerror("Erreur de simulation", data, parent=self.dialog)
+        except queue.Empty:
+            pass
+
+        self.dialog.after(100, self.verifier_resultats)
+
+    def afficher_resultats(self, r):
+        """Affiche les indicateurs de la simulation"""
+        print(f"🎲 Simulation : {r['nb_scenarios']} scénario(s), dépense moyenne {r['depense_moyenne']:.0f}€, "
+              f"P(dépassement) {r['proba_depassement']:.1%}")
+        self.label_statut.config(text=f"{r['nb_scenarios']:,} scénario(s) simulé(s) (graine {r['graine']})")
+        self.texte_resultats.config(text=(
+            f"Lots remportés en moyenne   {r['lots_gagnes_moyen']:.1f} / {r['nb_lots']}\n\n"
+            f"Dépense attendue            {r['depense_moyenne']:>12,.0f} €\n"
+            f"  (5 % – 95 %)              {r['depense_p5']:>12,.0f} € – {r['depense_p95']:,.0f} €\n\n"
+            f"Marge prévue attendue       {r['marge_moyenne']:>12,.0f} €\n"
+            f"  (5 % – 95 %)              {r['marge_p5']:>12,.0f} € – {r['marge_p95']:,.0f} €\n\n"
+            f"P(dépense > {r['budget']:,.0f} €)    {r['proba_depassement']:>8.1%}\n"
+            f"P(marge négative)           {r['proba_perte']:>8.1%}"
+        ))
+
+def ouvrir_simulation_journee(parent, data_adapter):
+    """Fonction utilitaire pour ouvrir la dialog de simulation"""
+    return DialogSimulation(parent, data_adapter)
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dialog de valorisation marché en lot des véhicules en repérage
+"""
+
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from services.valorisation_marche import valoriser_vehicules, appliquer_valorisation
+
+class DialogValorisation:
+    """Lance la valorisation en arrière-plan puis propose la revue des prix suggérés"""
+
+    COLONNES = ("appliquer", "lot", "vehicule", "prix_actuel", "prix_suggere", "echantillon", "fourchette", "remarque")
+
+    def __init__(self, parent, data_adapter, on_applique=None, nb_annonces=30):
+        self.parent = parent
+        self.data_adapter = data_adapter
+        self.on_applique = on_applique
+        self.nb_annonces = nb_annonces
+
+        # Instantané des véhicules valorisés (l'ordre sert d'index aux résultats)
+        self.vehicules = list(data_adapter.vehicules_reperage)
+        self.resultats = {}      # index -> résultat
+        self.selection = set()   # index des résultats à appliquer
+
+        self.queue_progression = queue.Queue()
+        self.stop_event = threading.Event()
+        self.en_cours = False
+
+        # Créer la fenêtre dialog
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Valorisation marché")
+        self.dialog.geometry("1000x600")
+        self.dialog.minsize(800, 450)
+        self.dialog.transient(parent)
+        self.dialog.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.dialog.bind('<Escape>', self.on_close)
+
+        self.create_interface()
+        self.lancer()
+        self.verifier_progression()
+
+    def create_interface(self):
+        """Crée l'interface de la dialog"""
+        main_frame = tk.Frame(self.dialog, bg='white', padx=20, pady=20)
+        main_frame.pack(fill='both', expand=True)
+
+        tk.Label(
+            main_frame,
+            text="📈 VALORISATION MARCHÉ",
+            font=('Segoe UI', 20, 'bold'),
+            bg='white',
+            fg='#2E86AB'
+        ).pack(pady=(0, 5))
+
+        tk.Label(
+            main_frame,
+            text="Annonces Leboncoin comparables (même modèle, année ±1, kilométrage ±20 %) : estimation par plus proches voisins",
+            font=('Segoe UI', 11),
+            bg='white',
+            fg='#666666'
+        ).pack(pady=(0, 10))
+
+        # Progression
+        self.progress = ttk.Progressbar(main_frame, mode='determinate', maximum=max(1, len(self.vehicules)))
+        self.progress.pack(fill='x', pady=(0, 5))
+
+        self.label_statut = tk.Label(main_frame, text="", font=('Segoe UI', 11), bg='white', fg='#333333')
+        self.label_statut.pack(pady=(0, 10))
+
+        # Tableau de revue
+        tableau_frame = tk.Frame(main_frame, bg='white')
+        tableau_frame.pack(fill='both', expand=True)
+
+        self.tree = ttk.Treeview(tableau_frame, columns=self.COLONNES, show="headings", height=15)
+        entetes = {
+            "appliquer": ("✔", 40), "lot": ("Lot", 60), "vehicule": ("Véhicule", 220),
+            "prix_actuel": ("Prix revente actuel", 130), "prix_suggere": ("Prix suggéré", 110),
+            "echantillon": ("Échantillon", 80), "fourchette": ("Fourchette", 150), "remarque": ("Remarque", 180)
+        }
+        for col in self.COLONNES:
+            texte, largeur = entetes[col]
+            self.tree.heading(col, text=texte)
+            self.tree.column(col, width=largeur, anchor="w" if col in ("vehicule", "remarque") else "center")
+
+        scrollbar = ttk.Scrollbar(tableau_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        # Une ligne par véhicule, remplie au fil des résultats
+        for index, vehicule in enumerate(self.vehicules):
+            self.tree.insert("", "end", iid=str(index), values=(
+                "", vehicule.lot, f"{vehicule.marque} {vehicule.modele}".strip(),
+                vehicule.prix_revente, "…", "", "", "En attente"
+            ))
+
+        # Double-clic ou espace : inclure / exclure une suggestion
+        self.tree.bind("<Double-1>", self.basculer_selection)
+        self.tree.bind("<space>", self.basculer_selection)
+
+        # Boutons
+        boutons_frame = tk.Frame(main_frame, bg='white')
+        boutons_frame.pack(fill='x', pady=(15, 0))
+
+        self.btn_stop = tk.Button(
+            boutons_frame, text="⏹️ Arrêter", font=('Segoe UI', 11, 'bold'),
+            command=self.arreter, bg='#f44336', fg='white', relief='flat', padx=15, pady=5
+        )
+        self.btn_stop.pack(side='left')
+
+        tk.Button(
+            boutons_frame, text="Fermer", font=('Segoe UI', 11),
+            command=self.on_close, relief='flat', padx=15, pady=5
+        ).pack(side='right')
+
+        self.btn_appliquer = tk.Button(
+            boutons_frame, text="✅ Appliquer la sélection", font=('Segoe UI', 11, 'bold'),
+            command=self.appliquer, bg='#4CAF50', fg='white', relief='flat', padx=15, pady=5,
+            state='disabled'
+        )
+        self.btn_appliquer.pack(side='right', padx=10)
+
+    def lancer(self):
+        """Démarre la valorisation dans un thread séparé"""
+        self.en_cours = True
+        self.label_statut.config(text=f"Recherche des prix pour {len(self.vehicules)} véhicule(s)...")
+
+        def executer():
+            try:
+                valoriser_vehicules(
+                    self.vehicules,
+                    nb_annonces=self.nb_annonces,
+                    on_progress=lambda termines, total, resultat: self.queue_progression.put(
+                        ("resultat", (termines, total, resultat))
+                    ),
+                    stop_event=self.stop_event
+                )
+            except Exception as e:
+                self.queue_progression.put(("erreur", str(e)))
+            finally:
+                self.queue_progression.put(("fin", None))
+
+        threading.Thread(target=executer, daemon=True).start()
+
+    def verifier_progression(self):
+        """Traite périodiquement les messages du thread de valorisation"""
+        if not self.dialog.winfo_exists():
+            return
+        try:
+            while True:
+                type_msg, data = self.queue_progression.get_nowait()
+                if type_msg == "resultat":
+                    self.afficher_resultat(*data)
+                elif type_msg == "erreur":
+                    messagebox.showerror("Erreur de valorisation", data, parent=self.dialog)
+                elif type_msg == "fin":
+                    self.valorisation_terminee()
+        except queue.Empty:
+            pass
+
+        self.dialog.after(100, self.verifier_progression)
+
+    def afficher_resultat(self, termines, total, resultat):
+        """Met à jour la ligne d'un véhicule dès que son résultat arrive"""
+        index = resultat['index']
+        self.resultats[index] = resultat
+        vehicule = self.vehicules[index]
+
+        if resultat['prix_suggere'] is not None:
+            # Suggestion retenue par défaut, l'utilisateur peut l'exclure
+            self.selection.add(index)
+            valeurs = (
+                "✔", vehicule.lot, resultat['libelle'], vehicule.prix_revente,
+                f"{resultat['prix_suggere']:,} €", resultat['echantillon'],
+                f"{resultat['bas']:,} – {resultat['haut']:,} €",
+                "⚠️ Échantillon faible" if resultat['echantillon'] < 5 else resultat['methode']
+            )
+        else:
+            valeurs = ("", vehicule.lot, resultat['libelle'], vehicule.prix_revente, "—", 0, "", resultat['erreur'])
+        self.tree.item(str(index), values=valeurs)
+
+        self.progress['value'] = termines
+        self.label_statut.config(text=f"{termines}/{total} véhicule(s) valorisé(s)...")
+
+    def valorisation_terminee(self):
+        """Active la revue une fois toutes les recherches terminées"""
+        self.en_cours = False
+        self.btn_stop.config(state='disabled')
+        nb_suggestions = sum(1 for r in self.resultats.values() if r['prix_suggere'] is not None)
+        etat = "interrompue" if self.stop_event.is_set() else "terminée"
+        self.label_statut.config(
+            text=f"Valorisation {etat} : {nb_suggestions} suggestion(s) sur {len(self.vehicules)} véhicule(s). "
+                 f"Double-clic pour inclure/exclure une ligne."
+        )
+        self.btn_appliquer.config(state='normal' if nb_suggestions else 'disabled')
+
+    def basculer_selection(self, event=None):
+        """Inclut ou exclut la suggestion de la ligne sélectionnée"""
+        for iid in self.tree.selection():
+            index = int(iid)
+            resultat = self.resultats.get(index)
+            if not resultat or resultat['prix_suggere'] is None:
+                continue
+            if index in self.selection:
+                self.selection.discard(index)
+                self.tree.set(iid, "appliquer", "")
+            else:
+                self.selection.add(index)
+                self.tree.set(iid, "appliquer", "✔")
+
+    def appliquer(self):
+        """Écrit les prix suggérés retenus sur les véhicules"""
+        if not self.selection:
+            messagebox.showwarning("Aucune sélection", "Aucune suggestion n'est sélectionnée.", parent=self.dialog)
+            return
+
+        parametres = self.data_adapter.journee.parametres if hasattr(self.data_adapter, 'journee') else None
+        for index in sorted(self.selection):
+            appliquer_valorisation(self.vehicules[index], self.resultats[index], parametres)
+
+        self.data_adapter.sauvegarder_donnees()
+        print(f"📈 Valorisation marché appliquée à {len(self.selection)} véhicule(s)")
+
+        if self.on_applique:
+            self.on_applique()
+
+        messagebox.showinfo(
+            "Valorisation appliquée",
+            f"Prix de revente mis à jour pour {len(self.selection)} véhicule(s).",
+            parent=self.dialog
+        )
+        self.dialog.destroy()
+
+    def arreter(self):
+        """Interrompt les recherches en cours"""
+        if self.en_cours:
+            self.stop_event.set()
+            self.btn_stop.config(state='disabled')
+            self.label_statut.config(text="Arrêt en cours...")
+
+    def on_close(self, event=None):
+        """Ferme la dialog (les recherches en cours sont interrompues)"""
+        self.stop_event.set()
+        self.dialog.destroy()
+
+def ouvrir_valorisation_marche(parent, data_adapter, on_applique=None):
+    """Fonction utilitaire pour ouvrir la dialog de valorisation"""
+    return DialogValorisation(parent, data_adapter, on_applique)
@@ -7,9 +7,15 @@ Modèle pour représenter une journée d'enchère
 import json
 import os
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from models.vehicule import Vehicule
 from config.settings import AppSettings
+from services.moteur_prix import MoteurPrix
+
+# Champs d'un véhicule modifiables par une opération 'modification' (le lot identifie le véhicule)
+CHAMPS_MODIFIABLES = frozenset(Vehicule().to_dict()) - {'lot', 'statut', 'date_achat', 'prix_max_achat'}
+# Champs dont dépend le prix max
+CHAMPS_PRIX_MAX = {'prix_revente', 'cout_reparations', 'temps_reparations'}
 
 
 class JourneeEnchere:
@@ -24,6 +30,8 @@ class JourneeEnchere:
             self.description = data.get('description', '')
             self.date_creation = data.get('date_creation', datetime.now().isoformat())
             self.parametres = data.get('parametres', {})
+            # Numéro de version, incrémenté à chaque sauvegarde (détection des écritures concurrentes)
+            self.revision = data.get('revision', 0)
             
             # Charger les véhicules
             vehicules_rep_data = data.get('vehicules_reperage', [])
@@ -44,6 +52,7 @@ class JourneeEnchere:
                 'commission_vente': 8.5,
                 'marge_securite': 200.0
             }
+            self.revision = 0
             self.vehicules_reperage: List[Vehicule] = []
             self.vehicules_achetes: List[Vehicule] = []
     
@@ -57,6 +66,7 @@ class JourneeEnchere:
             'description': self.description,
             'date_creation': self.date_creation,
             'parametres': self.parametres,
+            'revision': self.revision,
             'vehicules_reperage': [v.to_dict() for v in self.vehicules_reperage],
             'vehicules_achetes': [v.to_dict() for v in self.vehicules_achetes]
         }
@@ -96,9 +106,8 @@ class JourneeEnchere:
         """Met à jour un paramètre de la journée"""
         self.parametres[nom] = valeur
         
-        # Recalculer les prix max pour tous les véhicules
-        for vehicule in self.vehicules_reperage:
-            vehicule.mettre_a_jour_prix_max_avec_parametres(self.parametres)
+        # Recalculer les prix max pour tous les véhicules (en un lot)
+        MoteurPrix(self.parametres).mettre_a_jour_prix_max(self.vehicules_reperage)
     
     def ajouter_vehicule_reperage(self, vehicule: Vehicule):
         """Ajoute un véhicule en repérage"""
@@ -115,4 +124,63 @@ class JourneeEnchere:
             
             # Transférer vers les achetés
             self.vehicules_achetes.append(vehicule)
-            del self.vehicules_reperage[index] 
\ No newline at end of file
+            del self.vehicules_reperage[index] 
+    
+    def appliquer_operation(self, operation: Dict[str, Any]) -> Optional[Vehicule]:
+        """
+        Applique une opération du mode direct (journal des achats en vente)
+        
+        Args:
+            operation: {'op': 'achat', 'lot', 'prix_achat', 'date_achat'}
+                       ou {'op': 'annulation', 'lot'}
+                       ou, pour la synchronisation entre postes (services/synchro_journee.py) :
+                       {'op': 'modification', 'lot', 'champs': {champ: valeur}},
+                       {'op': 'ajout', 'vehicule': {...}}, {'op': 'suppression', 'lot'}
+        
+        Returns:
+            Véhicule transféré, modifié, ajouté ou supprimé ; None si l'opération est déjà
+            appliquée ou le lot introuvable
+        """
+        lot = operation.get('lot')
+        if operation.get('op') == 'modification':
+            for vehicule in self.vehicules_reperage + self.vehicules_achetes:
+                if vehicule.lot == lot:
+                    champs = {c: v for c, v in operation.get('champs', {}).items()
+                              if c in CHAMPS_MODIFIABLES and getattr(vehicule, c) != v}
+                    if not champs:
+                        return None
+                    for champ, valeur in champs.items():
+                        setattr(vehicule, champ, valeur)
+                    if vehicule in self.vehicules_reperage and CHAMPS_PRIX_MAX & champs.keys():
+                        vehicule.mettre_a_jour_prix_max_avec_parametres(self.parametres)
+                    return vehicule
+        elif operation.get('op') == 'ajout':
+            vehicule = Vehicule(operation.get('vehicule', {}))
+            if not any(v.lot == vehicule.lot for v in self.vehicules_reperage + self.vehicules_achetes):
+                self.ajouter_vehicule_reperage(vehicule)
+                return vehicule
+        elif operation.get('op') == 'suppression':
+            for liste in (self.vehicules_reperage, self.vehicules_achetes):
+                for index, vehicule in enumerate(liste):
+                    if vehicule.lot == lot:
+                        del liste[index]
+                        return vehicule
+        elif operation.get('op') == 'achat':
+            for index, vehicule in enumerate(self.vehicules_reperage):
+                if vehicule.lot == lot:
+                    vehicule.prix_achat = operation.get('prix_achat', '')
+                    vehicule.statut = "Acheté"
+                    vehicule.date_achat = operation.get('date_achat', '')
+                    del self.vehicules_reperage[index]
+                    if not any(v.lot == lot for v in self.vehicules_achetes):
+                        self.vehicules_achetes.append(vehicule)
+                    return vehicule
+        elif operation.get('op') == 'annulation':
+            for index, vehicule in enumerate(self.vehicules_achetes):
+                if vehicule.lot == lot:
+                    vehicule.prix_achat = ""
+                    vehicule.remettre_en_reperage()
+                    del self.vehicules_achetes[index]
+                    self.vehicules_reperage.append(vehicule)
+                    return vehicule
+        return None
@@ -7,6 +7,8 @@ Modèles de données pour les véhicules
 from datetime import datetime
 from typing import Dict, List, Optional
 
+from services.moteur_prix import MoteurPrix, formater_prix_max
+
 class Vehicule:
     """Modèle de données pour un véhicule"""
     
@@ -35,6 +37,10 @@ class Vehicule:
         self.champ_libre = data.get('champ_libre', '')
         self.reserve_professionnels = data.get('reserve_professionnels', False)
         self.couleur = data.get('couleur', 'turquoise')  # Par défaut turquoise
+        
+        # Valorisation marché (prix médian Leboncoin et nombre d'annonces comparées)
+        self.prix_marche_suggere = data.get('prix_marche_suggere', '')
+        self.echantillon_marche = data.get('echantillon_marche', 0)
     
     def to_dict(self) -> Dict:
         """Convertit le véhicule en dictionnaire"""
@@ -57,7 +63,9 @@ class Vehicule:
             'motorisation': self.motorisation,
             'champ_libre': self.champ_libre,
             'reserve_professionnels': self.reserve_professionnels,
-            'couleur': self.couleur
+            'couleur': self.couleur,
+            'prix_marche_suggere': self.prix_marche_suggere,
+            'echantillon_marche': self.echantillon_marche
         }
     
     def est_achete(self) -> bool:
@@ -102,7 +110,7 @@ class Vehicule:
                 return ""  # Pas de calcul possible sans prix de revente
             
             prix_max = settings.calculer_prix_max(prix_revente, cout_reparations, temps_reparations)
-            return f"{prix_max:.0f}€" if prix_max > 0 else "0€"
+            return formater_prix_max(prix_revente, prix_max)
             
         except Exception as e:
             print(f"⚠️ Erreur calcul prix max automatique: {e}")
@@ -120,23 +128,9 @@ class Vehicule:
             if prix_revente <= 0:
                 return ""  # Pas de calcul possible sans prix de revente
             
-            # Récupérer les paramètres de la journée
-            tarif_horaire = parametres.get('tarif_horaire', 45.0)
-            commission_vente = parametres.get('commission_vente', 8.5)
-            marge_securite = parametres.get('marge_securite', 200.0)
-            
-            # Main d'œuvre = Temps × Tarif horaire
-            main_oeuvre = temps_reparations * tarif_horaire
-            
-            # Commission vente = pourcentage du prix de revente
-            commission = prix_revente * (commission_vente / 100)
-            
-            # Calcul final
-            prix_max = prix_revente - (cout_reparations + main_oeuvre) - commission - marge_securite
-            
-            # Ne pas retourner de valeur négative
-            prix_max = max(0, prix_max)
-            return f"{prix_max:.0f}€" if prix_max > 0 else "0€"
+            # Formule commune (services/moteur_prix.py) avec les paramètres de la journée
+            prix_max = MoteurPrix(parametres).prix_max(prix_revente, cout_reparations, temps_reparations)
+            return formater_prix_max(prix_revente, prix_max)
             
         except Exception as e:
             print(f"⚠️ Erreur calcul prix max avec paramètres: {e}")
@@ -186,28 +180,14 @@ class Vehicule:
         if prix_vente_final <= 0:
             return 0.0  # Pas encore vendu
         
-        # COÛTS DIRECTS
-        prix_achat = self.get_prix_numerique('prix_achat')
-        cout_reparations = self.get_prix_numerique('cout_reparations')
-        temps_reparations = self.get_prix_numerique('temps_reparations')
-        
-        # COÛTS CALCULÉS avec les paramètres
-        tarif_horaire = parametres.get('tarif_horaire', 45.0)
-        commission_vente = parametres.get('commission_vente', 8.5)
-        # SUPPRIMÉ : marge_securite (elle n'est que pour le prix max de repérage)
-        
-        # Main d'œuvre = Temps × Tarif horaire
-        main_oeuvre = temps_reparations * tarif_horaire
-        
-        # Commission d'enchère = pourcentage du PRIX D'ACHAT (pas prix de vente)
-        commission = prix_achat * (commission_vente / 100)
-        
-        # CALCUL COMPLET DE LA MARGE CORRIGÉ
         # Marge = Prix Vente Final - (Prix Achat + Coût Réparations + Main d'Œuvre + Commission d'Enchère)
         # NOTE: La marge de sécurité n'est QUE pour le calcul du prix max, pas pour la marge finale
-        marge_complete = prix_vente_final - (prix_achat + cout_reparations + main_oeuvre + commission)
-        
-        return marge_complete
+        return MoteurPrix(parametres).marge_complete(
+            prix_vente_final,
+            self.get_prix_numerique('prix_achat'),
+            self.get_prix_numerique('cout_reparations'),
+            self.get_prix_numerique('temps_reparations')
+        )
     
     def calculer_ecart_budget(self) -> float:
         """Calcule l'écart par rapport au budget (prix max - prix achat)"""
@@ -324,9 +304,9 @@ class Vehicule:
         
         return True, ""
     
-    def to_csv_row(self) -> List[str]:
-        """Convertit le véhicule en ligne CSV pour export (MODIFIÉE avec nouveaux champs)"""
-        marge = self.calculer_marge()
+    def to_csv_row(self, parametres: Dict = None) -> List[str]:
+        """Convertit le véhicule en ligne CSV pour export (marge complète si les paramètres sont fournis)"""
+        marge = self.calculer_marge_complete(parametres) if parametres is not None else self.calculer_marge()
         marge_str = f"{marge:.0f}€" if marge != 0 else "N/A"
         
         return [
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Planificateur de requêtes pour le scraper Leboncoin
+
+- Limitation de débit par seau à jetons (token bucket), partagé entre les threads
+- Petit pool borné de requêtes concurrentes sur la session requests partagée
+  (borne commune à toutes les recherches lancées en même temps)
+- Ralentissement adaptatif sur les réponses 403/429 (Retry-After respecté)
+- Arrêt anticipé dès que l'objectif est atteint, sans requêtes d'avance inutiles
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+class ThrottledError(Exception):
+    """Le serveur a refusé la requête (403/429) : il faut ralentir"""
+
+    def __init__(self, status: int, retry_after: Optional[float] = None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+class TokenBucket:
+    """Seau à jetons thread-safe avec débit ajustable"""
+
+    def __init__(self, rate: float, capacity: float = 1.0, min_rate: float = 0.05,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            rate: Débit nominal (jetons par seconde)
+            capacity: Nombre maximal de jetons accumulables (rafale)
+            min_rate: Débit plancher lors des ralentissements
+            clock: Horloge monotone (injectable pour les tests)
+            sleep: Fonction d'attente (injectable pour les tests)
+        """
+        self.nominal_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = capacity
+        # Dernier remplissage ; dans le futur pendant une pause (penalize)
+        self.last = clock()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        if now > self.last:
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+
+    def acquire(self, stop_event=None) -> bool:
+        """
+        Attend un jeton
+
+        Returns:
+            False si stop_event a été déclenché pendant l'attente
+        """
+        while True:
+            if stop_event is not None and stop_event.is_set():
+                return False
+            with self.lock:
+                self._refill()
+                pause = self.last - self.clock()
+                if pause <= 0 and self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait_time = max(0.0, pause) + (1 - self.tokens) / self.rate
+            # Attente par tranches pour rester réactif à l'arrêt
+            self.sleep(min(wait_time, 0.25))
+
+    def penalize(self, factor: float = 0.5, pause: float = 0.0):
+        """
+        Réduit le débit et vide le seau ; aucun jeton n'est délivré pendant
+        'pause' secondes (Retry-After), pour tous les threads. C'est la seule
+        attente appliquée après un refus : l'appelant redemande simplement un jeton.
+        """
+        with self.lock:
+            self._refill()
+            self.rate = max(self.min_rate, self.rate * factor)
+            self.tokens = min(self.tokens, 0)
+            self.last = max(self.last, self.clock() + pause)
+
+    def recover(self, factor: float = 1.1):
+        """Remonte progressivement vers le débit nominal après un succès"""
+        with self.lock:
+            self.rate = min(self.nominal_rate, self.rate * factor)
+
+class _StopFlag:
+    """Arrêt interne du planificateur, combiné à un éventuel arrêt externe"""
+
+    def __init__(self, external: Optional[threading.Event] = None):
+        self.internal = threading.Event()
+        self.external = external
+
+    def set(self):
+        self.internal.set()
+
+    def is_set(self) -> bool:
+        return self.internal.is_set() or (self.external is not None and self.external.is_set())
+
+class FetchScheduler:
+    """Exécute les récupérations de pages en parallèle, dans les limites fixées"""
+
+    def __init__(self, bucket: TokenBucket, max_workers: int = 3, max_retries: int = 3,
+                 backoff_base: float = 2.0):
+        """
+        Args:
+            bucket: Limiteur de débit partagé
+            max_workers: Nombre maximal de requêtes simultanées, toutes recherches
+                         confondues (taille du pool de connexions de la session)
+            max_retries: Nombre de nouvelles tentatives après un 403/429
+            backoff_base: Base (secondes) de l'attente exponentielle
+        """
+        self.bucket = bucket
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.stats = {'requetes': 0, 'limitees': 0, 'echecs': 0}
+        self._stats_lock = threading.Lock()
+        # Chaque run a son pool de threads : les places limitent les requêtes
+        # simultanées quand plusieurs recherches tournent en parallèle
+        self._places = threading.BoundedSemaphore(max_workers)
+
+    def _compter(self, cle: str):
+        with self._stats_lock:
+            self.stats[cle] += 1
+
+    def _prendre_place(self, stop_event: _StopFlag) -> bool:
+        """Attend une place parmi les requêtes simultanées (False si arrêt)"""
+        while not self._places.acquire(timeout=0.25):
+            if stop_event.is_set():
+                return False
+        return True
+
+    def _fetch_with_retry(self, fetch: Callable[[str], List[Dict]], url: str,
+                          stop_event: _StopFlag) -> Optional[List[Dict]]:
+        """Récupère une page en respectant le débit, avec repli exponentiel sur 403/429"""
+        for tentative in range(self.max_retries + 1):
+            if not self._prendre_place(stop_event):
+                return None
+            try:
+                # Chaque tentative consomme un jeton
+                if not self.bucket.acquire(stop_event):
+                    return None
+                self._compter('requetes')
+                resultat = fetch(url)
+                self.bucket.recover()
+                return resultat
+            except ThrottledError as e:
+                self._compter('limitees')
+                attente = e.retry_after
+                if attente is None:
+                    attente = self.backoff_base * (2 ** tentative) * random.uniform(0.8, 1.2)
+                print(f"🐢 HTTP {e.status} - ralentissement, nouvel essai dans {attente:.1f}s")
+                # L'attente se fait dans le seau (acquire interruptible de la tentative suivante)
+                self.bucket.penalize(pause=attente)
+            finally:
+                self._places.release()
+        self._compter('echecs')
+        return None
+
+    def run(self, pages: Iterable[Tuple[int, str]], fetch: Callable[[str], List[Dict]],
+            on_page: Callable[[int, List[Dict]], bool],
+            stop_event: Optional[threading.Event] = None,
+            lookup: Optional[Callable[[str], Optional[List[Dict]]]] = None,
+            pages_needed: Optional[Callable[[], int]] = None):
+        """
+        Récupère les pages et transmet les résultats DANS L'ORDRE des pages
+
+        Args:
+            pages: Itérable de (numéro de page, url)
+            fetch: Fonction url -> liste d'annonces (peut lever ThrottledError)
+            on_page: Rappel (page, annonces) ; retourne True pour arrêter
+            stop_event: Événement d'arrêt externe (annulation)
+            lookup: Fonction url -> résultat déjà connu (cache) ou None ;
+                    un résultat trouvé ne consomme ni jeton ni requête
+            pages_needed: Estimation du nombre de pages encore nécessaires pour
+                          atteindre l'objectif (appelée avant chaque envoi) ; les
+                          pages en cours ou reçues non livrées en sont déduites, pour
+                          ne pas lancer de requêtes d'avance au-delà de l'objectif
+        """
+        stop_event = _StopFlag(stop_event)
+        pages = iter(pages)
+        en_cours = {}       # future -> numéro de page
+        termines = {}       # numéro de page -> résultat (en attente de livraison)
+        prochaine_page = None
+        epuise = False
+
+        def tache(url: str):
+            if lookup is not None:
+                resultat = lookup(url)
+                if resultat is not None:
+                    return resultat
+            return self._fetch_with_retry(fetch, url, stop_event)
+
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="lbc-fetch")
+        try:
+            while not stop_event.is_set():
+                # Remplir le pool
+                while not epuise and len(en_cours) < self.max_workers:
+                    if pages_needed is not None and len(en_cours) + len(termines) >= pages_needed():
+                        break
+                    try:
+                        page, url = next(pages)
+                    except StopIteration:
+                        epuise = True
+                        break
+                    if prochaine_page is None:
+                        prochaine_page = page
+                    en_cours[pool.submit(tache, url)] = page
+
+                if not en_cours:
+                    break
+
+                # Attente courte pour rester réactif à une annulation
+                faits, _ = wait(list(en_cours), timeout=0.25, return_when=FIRST_COMPLETED)
+                for future in faits:
+                    termines[en_cours.pop(future)] = future.result()
+
+                # Livrer les pages consécutives disponibles
+                while prochaine_page in termines and not stop_event.is_set():
+                    resultat = termines.pop(prochaine_page)
+                    if not resultat:
+                        # Page vide ou en échec : fin des résultats
+                        stop_event.set()
+                        break
+                    if on_page(prochaine_page, resultat):
+                        stop_event.set()
+                        break
+                    prochaine_page += 1
+        finally:
+            # Arrêt : les tâches non démarrées sont annulées, celles en cours
+            # se terminent en arrière-plan et leurs résultats sont ignorés
+            stop_event.set()
+            pool.shutdown(wait=False, cancel_futures=True)
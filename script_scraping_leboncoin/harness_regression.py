@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Banc de non-régression hors ligne du scraper Leboncoin
+
+Rejoue un corpus de pages enregistrées (fixtures/corpus.json) à travers
+scrape_page avec une session qui sert les pages depuis le disque : aucun accès
+réseau. Pour chaque page :
+- les annonces extraites doivent être identiques à la sortie de référence
+  (fixtures/golden/<nom>.json), avec la chaîne d'analyseurs complète et avec
+  chacun des analyseurs déclarés pour la page ;
+- la latence (meilleure et médiane, en ms) et le pic mémoire Python
+  (tracemalloc, hors allocations internes de lxml) sont mesurés.
+
+Les cas de fixtures/extraction.json vérifient extract_price, extract_year et
+extract_mileage. Le débit est exprimé relativement à un étalon en pur Python
+exécuté juste avant et juste après chaque page, pour que la comparaison à
+fixtures/baseline.json tienne malgré la vitesse variable des machines : le banc
+échoue si le débit relatif chute de plus que le seuil (30 % par défaut).
+
+Usage:
+    python harness_regression.py                        # vérification complète
+    python harness_regression.py --seuil 0.5            # tolérance de débit plus large
+    python harness_regression.py --baseline             # réécrit la baseline de performance
+    python harness_regression.py --regenerer            # réécrit les sorties de référence et la baseline
+    python harness_regression.py --enregistrer URL NOM  # ajoute une page réelle au corpus
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+import requests
+
+from leboncoin_scraper import LeboncoinScraper
+import parsers
+
+DOSSIER_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+FICHIER_CORPUS = os.path.join(DOSSIER_FIXTURES, "corpus.json")
+FICHIER_EXTRACTION = os.path.join(DOSSIER_FIXTURES, "extraction.json")
+FICHIER_BASELINE = os.path.join(DOSSIER_FIXTURES, "baseline.json")
+DOSSIER_GOLDEN = os.path.join(DOSSIER_FIXTURES, "golden")
+
+# Hôte fictif : les pages du corpus ne correspondent à aucune URL réelle
+URL_CORPUS = "https://corpus.invalid/recherche?page="
+
+# Charge fixe, indépendante du scraper, qui sert à mesurer la vitesse de la machine
+_DONNEES_ETALON = [{'titre': f"Annonce {i}", 'prix': (i * 7919) % 30000, 'annee': 2000 + i % 24}
+                   for i in range(300)]
+
+def etalon() -> float:
+    """Durée (ms) de la charge étalon : sérialisation JSON et tri"""
+    debut = time.perf_counter()
+    sorted(json.loads(json.dumps(_DONNEES_ETALON)), key=lambda a: (a['prix'], a['annee']))
+    return (time.perf_counter() - debut) * 1000
+
+class SessionEnregistree(requests.Session):
+    """Session requests qui répond avec les pages du corpus (toute autre URL échoue)"""
+
+    def __init__(self, pages: Dict[str, bytes]):
+        super().__init__()
+        self.pages = pages
+        self.nb_requetes = 0
+
+    def get(self, url, **kwargs):
+        self.nb_requetes += 1
+        if url not in self.pages:
+            raise requests.ConnectionError(f"Page non enregistrée (accès réseau interdit): {url}")
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = self.pages[url]
+        response.headers['Content-Type'] = 'text/html; charset=utf-8'
+        return response
+
+def charger_json(chemin: str, defaut=None):
+    if not os.path.exists(chemin):
+        return defaut
+    with open(chemin, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def ecrire_json(chemin: str, donnees):
+    os.makedirs(os.path.dirname(chemin), exist_ok=True)
+    with open(chemin, 'w', encoding='utf-8') as f:
+        json.dump(donnees, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+def charger_corpus() -> List[Dict]:
+    """Pages du corpus avec leur contenu brut et leur URL de rejeu"""
+    corpus = []
+    for page in charger_json(FICHIER_CORPUS, {'pages': []})['pages']:
+        with open(os.path.join(DOSSIER_FIXTURES, page['fichier']), 'rb') as f:
+            contenu = f.read()
+        corpus.append(dict(page, contenu=contenu, url=f"{URL_CORPUS}{page['nom']}"))
+    return corpus
+
+def creer_scraper(corpus: List[Dict]) -> LeboncoinScraper:
+    """Scraper branché sur le corpus : sans cache, sans historique, sans limite de débit"""
+    session = SessionEnregistree({page['url']: page['contenu'] for page in corpus})
+    return LeboncoinScraper(session=session, rate=1e9, burst=1e9)
+
+def chemin_golden(nom: str) -> str:
+    return os.path.join(DOSSIER_GOLDEN, f"{nom}.json")
+
+def verifier_extraction(scraper: LeboncoinScraper) -> List[str]:
+    """Compare extract_price / extract_year / extract_mileage aux valeurs attendues"""
+    erreurs = []
+    cas = charger_json(FICHIER_EXTRACTION, {})
+    nb_cas = 0
+    for fonction, exemples in cas.items():
+        extraire = getattr(scraper, fonction)
+        for exemple in exemples:
+            nb_cas += 1
+            obtenu = extraire(exemple['texte'])
+            if obtenu != exemple['attendu']:
+                erreurs.append(f"{fonction}({exemple['texte']!r}) = {obtenu!r}, attendu {exemple['attendu']!r}")
+    print(f"🔤 Extraction : {nb_cas - len(erreurs)}/{nb_cas} cas conformes")
+    return erreurs
+
+def differences(obtenues: List[Dict], attendues: List[Dict]) -> List[str]:
+    """Décrit les écarts entre deux listes d'annonces (au plus 5)"""
+    ecarts = []
+    if len(obtenues) != len(attendues):
+        ecarts.append(f"{len(obtenues)} annonces au lieu de {len(attendues)}")
+    for index, (obtenue, attendue) in enumerate(zip(obtenues, attendues)):
+        for cle in attendue:
+            if obtenue.get(cle) != attendue[cle]:
+                ecarts.append(f"annonce {index} '{cle}': {obtenue.get(cle)!r} au lieu de {attendue[cle]!r}")
+    return ecarts[:5]
+
+def verifier_pages(scraper: LeboncoinScraper, corpus: List[Dict]) -> List[str]:
+    """Compare les annonces de chaque page à sa sortie de référence"""
+    erreurs = []
+    for page in corpus:
+        attendues = charger_json(chemin_golden(page['nom']))
+        if attendues is None:
+            erreurs.append(f"{page['nom']}: sortie de référence absente (lancer --regenerer)")
+            continue
+
+        ecarts = differences(scraper.scrape_page(page['url']), attendues)
+        for nom_analyseur in page.get('analyseurs', []):
+            try:
+                analyseur = parsers.get_parser(nom_analyseur)
+            except ImportError:
+                print(f"   {page['nom']}: analyseur {nom_analyseur} indisponible, ignoré")
+                continue
+            ecarts += [f"[{nom_analyseur}] {e}" for e in differences(analyseur.parse(page['contenu']) or [], attendues)]
+
+        if ecarts:
+            erreurs += [f"{page['nom']}: {e}" for e in ecarts]
+        else:
+            print(f"   ✅ {page['nom']:<22} {len(attendues):3d} annonces conformes")
+    return erreurs
+
+def mesurer(scraper: LeboncoinScraper, corpus: List[Dict], repetitions: int) -> Dict:
+    """
+    Latence, coût relatif et pic mémoire par page, débit global du corpus
+
+    Chaque analyse est encadrée par deux exécutions de l'étalon : le coût relatif
+    (durée de la page / durée de l'étalon, médiane des répétitions) ne dépend
+    presque plus de la vitesse de la machine ni de sa charge du moment.
+    """
+    resultats = {'pages': {}}
+    total_ms = 0.0
+    total_cout = 0.0
+    total_annonces = 0
+    for page in corpus:
+        scraper.scrape_page(page['url'])  # Préchauffage (imports, XPath compilés)
+
+        durees = []
+        couts = []
+        for _ in range(repetitions):
+            avant = etalon()
+            debut = time.perf_counter()
+            annonces = scraper.scrape_page(page['url'])
+            duree = (time.perf_counter() - debut) * 1000
+            apres = etalon()
+            durees.append(duree)
+            couts.append(duree * 2 / (avant + apres))
+
+        # Mesure mémoire séparée : tracemalloc ralentit l'exécution
+        tracemalloc.start()
+        scraper.scrape_page(page['url'])
+        _, pic = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        ms = min(durees)
+        cout = statistics.median(couts)
+        resultats['pages'][page['nom']] = {
+            'ms': round(ms, 3),
+            'ms_mediane': round(statistics.median(durees), 3),
+            'cout_relatif': round(cout, 3),
+            'memoire_ko': round(pic / 1024, 1),
+            'taille_ko': round(len(page['contenu']) / 1024, 1),
+            'annonces': len(annonces)
+        }
+        total_ms += ms
+        total_cout += cout
+        total_annonces += len(annonces)
+
+    resultats['pages_par_s'] = round(len(corpus) * 1000 / total_ms, 1) if total_ms else 0
+    resultats['annonces_par_s'] = round(total_annonces * 1000 / total_ms, 1) if total_ms else 0
+    resultats['cout_relatif'] = round(total_cout, 3)
+    return resultats
+
+def comparer_baseline(mesures: Dict, baseline: Optional[Dict], seuil: float) -> List[str]:
+    """Affiche les mesures face à la baseline ; erreur si le débit relatif régresse au-delà du seuil"""
+    pages_base = (baseline or {}).get('pages', {})
+    print(f"⏱️  Performance (meilleure / médiane, coût en étalons, seuil de régression {seuil:.0%})")
+    for nom, mesure in mesures['pages'].items():
+        ligne = (f"   {nom:<22} {mesure['ms']:7.2f} / {mesure['ms_mediane']:7.2f} ms  {mesure['cout_relatif']:7.2f} ét.  "
+                 f"{mesure['memoire_ko']:8.1f} Ko pic  ({mesure['taille_ko']} Ko, {mesure['annonces']} annonces)")
+        reference = pages_base.get(nom)
+        if reference:
+            ligne += f"  baseline {reference['cout_relatif']:.2f} ét. / {reference['memoire_ko']:.1f} Ko"
+            if mesure['cout_relatif'] > reference['cout_relatif'] * (1 + seuil):
+                ligne += "  ⚠️ plus lente"
+            if mesure['memoire_ko'] > reference['memoire_ko'] * (1 + seuil):
+                ligne += "  ⚠️ plus gourmande"
+        print(ligne)
+    print(f"   Débit : {mesures['pages_par_s']:,.1f} pages/s, {mesures['annonces_par_s']:,.0f} annonces/s "
+          f"(corpus : {mesures['cout_relatif']:.2f} étalons)")
+
+    if not baseline:
+        print("ℹ️  Aucune baseline : lancer --baseline pour l'enregistrer")
+        return []
+    debit_relatif = baseline['cout_relatif'] / mesures['cout_relatif'] if mesures['cout_relatif'] else 0
+    print(f"   Baseline : {baseline['cout_relatif']:.2f} étalons, {baseline['pages_par_s']:,.1f} pages/s "
+          f"({baseline.get('machine', '?')}, Python {baseline.get('python', '?')}) : débit relatif {debit_relatif:.0%}")
+    if debit_relatif < 1 - seuil:
+        return [f"Débit relatif {debit_relatif:.0%} de la baseline, inférieur au minimum {1 - seuil:.0%}"]
+    return []
+
+def ecrire_baseline(mesures: Dict):
+    ecrire_json(FICHIER_BASELINE, dict(
+        mesures,
+        machine=platform.machine(),
+        python=platform.python_version(),
+        date=time.strftime('%Y-%m-%d')
+    ))
+    print(f"💾 Baseline enregistrée : {FICHIER_BASELINE}")
+
+def regenerer_golden(scraper: LeboncoinScraper, corpus: List[Dict]):
+    """Réécrit les sorties de référence à partir du code actuel (à relire avant de valider)"""
+    for page in corpus:
+        annonces = scraper.scrape_page(page['url'])
+        ecrire_json(chemin_golden(page['nom']), annonces)
+        print(f"💾 {page['nom']}: {len(annonces)} annonces de référence")
+
+def enregistrer_page(url: str, nom: str):
+    """Télécharge une page réelle et l'ajoute au corpus avec sa sortie de référence"""
+    scraper = LeboncoinScraper()
+    contenu = scraper.fetch_page(url)
+    fichier = os.path.join("pages", f"{nom}.html")
+    os.makedirs(os.path.join(DOSSIER_FIXTURES, "pages"), exist_ok=True)
+    with open(os.path.join(DOSSIER_FIXTURES, fichier), 'wb') as f:
+        f.write(contenu)
+
+    analyseurs = [cls.name for cls in parsers.PARSERS if cls.available() and cls().parse(contenu)]
+    corpus = charger_json(FICHIER_CORPUS, {'pages': []})
+    corpus['pages'] = [p for p in corpus['pages'] if p['nom'] != nom]
+    corpus['pages'].append({
+        'nom': nom,
+        'fichier': fichier.replace(os.sep, '/'),
+        'description': f"Enregistrée le {time.strftime('%Y-%m-%d')} depuis {url}",
+        'analyseurs': analyseurs
+    })
+    ecrire_json(FICHIER_CORPUS, corpus)
+
+    annonces = scraper.parse_page(contenu)
+    ecrire_json(chemin_golden(nom), annonces)
+    print(f"💾 Page '{nom}' enregistrée ({len(contenu) / 1024:.0f} Ko, {len(annonces)} annonces, "
+          f"analyseurs : {', '.join(analyseurs) or 'aucun'})")
+    print("⚠️  Vérifiez la sortie de référence avant de la valider")
+
+def main() -> int:
+    arguments = argparse.ArgumentParser(description="Banc de non-régression hors ligne du scraper Leboncoin")
+    arguments.add_argument("--repetitions", type=int, default=20, help="Mesures par page (défaut : 20)")
+    arguments.add_argument("--seuil", type=float, default=0.30,
+                           help="Baisse de débit tolérée par rapport à la baseline (défaut : 0.30)")
+    arguments.add_argument("--baseline", action="store_true", help="Réécrire la baseline de performance")
+    arguments.add_argument("--regenerer", action="store_true",
+                           help="Réécrire les sorties de référence et la baseline")
+    arguments.add_argument("--enregistrer", nargs=2, metavar=("URL", "NOM"),
+                           help="Ajouter une page réelle au corpus (accès réseau)")
+    args = arguments.parse_args()
+
+    if args.enregistrer:
+        enregistrer_page(*args.enregistrer)
+        return 0
+
+    corpus = charger_corpus()
+    if not corpus:
+        print(f"❌ Corpus vide : {FICHIER_CORPUS}")
+        return 1
+    scraper = creer_scraper(corpus)
+    print(f"🧪 BANC DE NON-RÉGRESSION : {len(corpus)} page(s), {args.repetitions} répétition(s)")
+
+    if args.regenerer:
+        regenerer_golden(scraper, corpus)
+
+    erreurs = verifier_extraction(scraper)
+    print("📄 Pages")
+    erreurs += verifier_pages(scraper, corpus)
+
+    mesures = mesurer(scraper, corpus, args.repetitions)
+    if args.baseline or args.regenerer:
+        comparer_baseline(mesures, None, args.seuil)
+        ecrire_baseline(mesures)
+    else:
+        erreurs += comparer_baseline(mesures, charger_json(FICHIER_BASELINE), args.seuil)
+
+    print("=" * 60)
+    if erreurs:
+        print(f"❌ {len(erreurs)} régression(s) :")
+        for erreur in erreurs:
+            print(f"   - {erreur}")
+        return 1
+    print(f"✅ Aucune régression ({scraper.session.nb_requetes} pages rejouées, aucun accès réseau)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
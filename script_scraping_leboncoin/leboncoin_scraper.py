@@ -5,20 +5,59 @@ Script de recherche et analyse d'annonces automobiles sur Leboncoin.fr
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+import bisect
+import math
+import threading
 import time
 import random
-import re
 import statistics
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 from urllib.parse import urlencode, quote
 
+from fetch_scheduler import FetchScheduler, TokenBucket, ThrottledError
+from response_cache import ResponseCache
+from price_history import PriceHistory
+import parsers
+
 class LeboncoinScraper:
     """Classe pour scraper les annonces Leboncoin"""
     
-    def __init__(self):
-        self.base_url = "https://www.leboncoin.fr/recherche"
-        self.session = requests.Session()
+    # Annonces par page de résultats Leboncoin (estimation avant la première page reçue)
+    ANNONCES_PAR_PAGE = 35
+    
+    def __init__(self, base_url: Optional[str] = None, session: Optional[requests.Session] = None,
+                 rate: float = 0.5, burst: int = 2, max_workers: int = 3,
+                 cache: Optional[ResponseCache] = None,
+                 history: Optional[PriceHistory] = None, history_max_age: float = 12 * 3600):
+        """
+        Args:
+            base_url: URL de recherche (modifiable pour tester contre un serveur local)
+            session: Session requests à utiliser (une nouvelle par défaut)
+            rate: Débit maximal de requêtes par seconde
+            burst: Nombre de requêtes pouvant partir immédiatement
+            max_workers: Nombre maximal de requêtes simultanées
+            cache: Cache persistant des pages (aucun cache si None)
+            history: Historique des annonces (aucun historique si None)
+            history_max_age: Ancienneté maximale (secondes) pour répondre depuis l'historique
+        """
+        self.base_url = base_url or "https://www.leboncoin.fr/recherche"
+        self.session = session or requests.Session()
+        self.cache = cache
+        self.history = history
+        self.history_max_age = history_max_age
+        
+        # Pool de connexions dimensionné pour les requêtes simultanées
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
+        # Planificateur : débit limité, requêtes parallèles bornées, ralentissement adaptatif
+        self.bucket = TokenBucket(rate=rate, capacity=burst)
+        self.scheduler = FetchScheduler(self.bucket, max_workers=max_workers)
+        
+        # Analyseurs essayés dans l'ordre : JSON embarqué, lxml, BeautifulSoup
+        self.parser_chain = parsers.ParserChain()
         self.user_agents = [
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
@@ -57,115 +96,103 @@ class LeboncoinScraper:
     
     def extract_price(self, price_text: str) -> Optional[int]:
         """Extrait le prix numérique d'un texte"""
-        if not price_text:
-            return None
-        # Nettoyer le texte (espaces normaux, insécables, etc.)
-        clean_text = price_text.replace('\u00A0', ' ').replace('&nbsp;', ' ').strip()
-        # Recherche d'un nombre (avec espaces possibles) suivi de €
-        price_match = re.search(r'(\d+(?:[\s\u00A0]+\d+)*)\s*€', clean_text)
-        if price_match:
-            # Supprimer tous les espaces et caractères non-numériques sauf les chiffres
-            price_str = re.sub(r'[^\d]', '', price_match.group(1))
-            return int(price_str)
-        return None
+        return parsers.extract_price(price_text)
     
     def extract_year(self, text: str) -> Optional[int]:
         """Extrait l'année d'un texte"""
-        if not text:
-            return None
-        # Recherche d'une année (4 chiffres entre 1990 et 2030)
-        year_match = re.search(r'\b(19[9]\d|20[0-3]\d)\b', text)
-        if year_match:
-            return int(year_match.group(1))
-        return None
+        return parsers.extract_year(text)
     
     def extract_mileage(self, text: str) -> Optional[int]:
         """Extrait le kilométrage d'un texte"""
-        if not text:
-            return None
-        # Recherche de kilométrage (nombre suivi de km)
-        km_match = re.search(r'(\d+(?:\s?\d+)*)\s*km', text.replace(' ', ''), re.IGNORECASE)
-        if km_match:
-            return int(km_match.group(1).replace(' ', ''))
-        return None
+        return parsers.extract_mileage(text)
     
-    def scrape_page(self, url: str) -> List[Dict]:
-        """Scrape une page de résultats Leboncoin"""
-        # Mise à jour du User-Agent pour cette requête
-        self.session.headers.update({
+    def fetch_page(self, url: str) -> bytes:
+        """
+        Télécharge une page (sans limitation de débit)
+        
+        Raises:
+            ThrottledError: si Leboncoin répond 403 ou 429
+            requests.RequestException: pour les autres erreurs
+        """
+        # En-têtes propres à la requête (la session est partagée entre threads)
+        headers = {
             'User-Agent': self.get_random_user_agent(),
             'Referer': 'https://www.leboncoin.fr/'
-        })
+        }
+        response = self.session.get(url, headers=headers, timeout=15, allow_redirects=True)
+        
+        if response.status_code in (403, 429):
+            retry_after = response.headers.get('Retry-After')
+            try:
+                retry_after = float(retry_after) if retry_after else None
+            except ValueError:
+                retry_after = None
+            raise ThrottledError(response.status_code, retry_after)
         
+        response.raise_for_status()
+        return response.content
+    
+    def parse_page(self, content) -> List[Dict]:
+        """Extrait les annonces d'une page de résultats Leboncoin"""
+        return self.parser_chain.parse(content)
+    
+    def _cached_page(self, url: str) -> Optional[List[Dict]]:
+        """Annonces d'une page présente dans le cache (None si absente, expirée ou sans annonce)"""
+        if self.cache is None:
+            return None
+        content = self.cache.get(url)
+        if content is None:
+            return None
+        # Une page sans annonce (ancienne entrée) est retéléchargée plutôt que de finir la recherche
+        return self.parse_page(content) or None
+    
+    def _download_and_parse(self, url: str) -> List[Dict]:
+        """
+        Télécharge une page, l'analyse et la met en cache si elle contient des annonces
+        
+        Une page sans annonce (captcha, page intermédiaire, mise en page non reconnue)
+        n'est pas mise en cache : elle terminerait sinon la recherche pendant toute la
+        durée de validité du cache.
+        """
+        content = self.fetch_page(url)
+        annonces = self.parse_page(content)
+        if annonces and self.cache is not None:
+            self.cache.put(url, content)
+        return annonces
+    
+    def _fetch_and_parse(self, url: str) -> List[Dict]:
+        """Télécharge et analyse une page (utilisé par le planificateur)"""
         try:
-            response = self.session.get(url, timeout=15, allow_redirects=True)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            annonces = []
-            
-            # Recherche des annonces (sélecteurs Leboncoin actualisés)
-            ads_containers = soup.find_all('article', {'data-qa-id': 'aditem_container'})
-                
-            for container in ads_containers:
-                try:
-                    # Extraction du titre
-                    title_elem = container.find(attrs={'data-test-id': 'adcard-title'})
-                    title = title_elem.get_text(strip=True) if title_elem else ""
-                    
-                    # Extraction du prix
-                    price_elem = container.find(attrs={'data-test-id': 'price'})
-                    price_text = price_elem.get_text(strip=True) if price_elem else ""
-                    price = self.extract_price(price_text)
-                    
-                    # Extraction du lien
-                    link_elem = container.find('a', href=re.compile(r'/ad/voitures/'))
-                    link = ""
-                    if link_elem and link_elem.get('href'):
-                        link = link_elem['href']
-                        if link.startswith('/'):
-                            link = f"https://www.leboncoin.fr{link}"
-                    
-                    # Extraction des paramètres (année, kilométrage, etc.)
-                    params_elem = container.find(attrs={'data-test-id': 'ad-params-light'})
-                    params_text = params_elem.get_text(strip=True) if params_elem else ""
-                    
-                    # Alternative: recherche dans les labels détaillés
-                    if not params_text:
-                        labels_container = container.find(attrs={'data-test-id': 'ad-params-labels'})
-                        if labels_container:
-                            params_text = labels_container.get_text(strip=True)
-                    
-                    # Extraction de l'année et du kilométrage
-                    combined_text = f"{title} {params_text}"
-                    year = self.extract_year(combined_text)
-                    mileage = self.extract_mileage(combined_text)
-                    
-                    # Ajouter l'annonce si elle a des données valides ET si elle correspond au modèle recherché
-                    if title and price and year and mileage:
-                        annonces.append({
-                            'titre': title,
-                            'prix': price,
-                            'annee': year,
-                            'kilometrage': mileage,
-                            'lien': link
-                        })
-                        
-                except Exception as e:
-                    # Ignorer silencieusement les erreurs d'extraction individuelles
-                    continue
-            
-            return annonces
-            
+            return self._download_and_parse(url)
         except requests.RequestException as e:
             print(f"❌ Erreur lors de la requête: {e}")
-            if "403" in str(e) or "Forbidden" in str(e):
+            return []
+    
+    def scrape_page(self, url: str, force_refresh: bool = False) -> List[Dict]:
+        """Scrape une page de résultats Leboncoin (depuis le cache si possible)"""
+        if not force_refresh:
+            cached = self._cached_page(url)
+            if cached is not None:
+                return cached
+        
+        # Respecter la limite de débit partagée
+        self.bucket.acquire()
+        
+        try:
+            return self._download_and_parse(url)
+        except ThrottledError as e:
+            self.bucket.penalize(pause=e.retry_after or 0)
+            print(f"❌ Erreur lors de la requête: {e}")
+            if e.status == 403:
                 print("🚫 Erreur 403 - Leboncoin bloque probablement les requêtes automatisées")
                 print("💡 Suggestions:")
                 print("   - Vérifiez que l'URL fonctionne dans un navigateur")
                 print("   - Essayez avec des critères de recherche différents")
                 print("   - Attendez quelques minutes avant de relancer")
             return []
+        except requests.RequestException as e:
+            print(f"❌ Erreur lors de la requête: {e}")
+            return []
     
     def is_relevant_ad(self, title: str, modele: str) -> bool:
         """Vérifie si une annonce correspond au modèle recherché"""
@@ -179,48 +206,92 @@ class LeboncoinScraper:
         return True
     
     def search_ads(self, modele: str, annee_min: int, annee_max: int, 
-                   km_min: int, km_max: int, nb_annonces: int = 50) -> List[Dict]:
-        """Recherche des annonces selon les critères spécifiés"""
+                   km_min: int, km_max: int, nb_annonces: int = 50,
+                   force_refresh: bool = False,
+                   on_batch: Optional[Callable[[int, List[Dict]], None]] = None,
+                   stop_event: Optional[threading.Event] = None) -> List[Dict]:
+        """
+        Recherche des annonces selon les critères spécifiés
+        
+        Les pages déjà en cache (et non expirées) ne coûtent aucune requête, et
+        une recherche récente est servie depuis l'historique des annonces,
+        sauf si force_refresh est demandé. Les annonces récupérées sont
+        enregistrées dans l'historique.
+        
+        Args:
+            on_batch: Rappel (page, annonces) appelé dès qu'une page est traitée,
+                      dans l'ordre des pages, avec ses annonces pertinentes
+            stop_event: Événement d'annulation ; la recherche s'arrête dès qu'il est
+                        déclenché et retourne les annonces déjà reçues
+        """
         
         url = self.build_search_url(modele, annee_min, annee_max, km_min, km_max)
         print(f"\n🔗 Lien de recherche: {url}")
         print(f"🔎 Recherche: {modele} | {annee_min}–{annee_max} | {km_min:,}–{km_max:,} km")
-        print("⏳ Récupération en cours...")
         
-        # Attendre un peu avant la première requête
-        time.sleep(random.uniform(1, 2))
+        criteres = {'annee_min': annee_min, 'annee_max': annee_max, 'km_min': km_min, 'km_max': km_max}
+        if self.history is not None and not force_refresh:
+            historique = self.history.recherche_recente(modele, annee_min, annee_max, km_min, km_max,
+                                                        nb_annonces, self.history_max_age)
+            if historique is not None:
+                print(f"📚 {len(historique)} annonces servies depuis l'historique (aucune requête)")
+                if historique and on_batch is not None:
+                    on_batch(1, historique)
+                return historique
+        
+        print("⏳ Récupération en cours...")
         
         all_ads = []
-        page = 1
+        pages_recues = []
         max_pages = 10  # Limite pour éviter les boucles infinies
         
-        while len(all_ads) < nb_annonces and page <= max_pages:
-            # Construction de l'URL avec pagination
-            page_url = f"{url}&page={page}" if page > 1 else url
-            
-            # Scraping de la page
-            raw_ads = self.scrape_page(page_url)
-            
-            if not raw_ads:
-                break
-            
-            # Filtrer les annonces pertinentes
+        def on_page(page: int, raw_ads: List[Dict]) -> bool:
+            """Traite une page (reçue dans l'ordre) ; True pour arrêter"""
+            # Filtrer les annonces pertinentes, sans dépasser le nombre demandé
             filtered_ads = [ad for ad in raw_ads if self.is_relevant_ad(ad['titre'], modele)]
-            
+            pages_recues.append(len(filtered_ads))
+            filtered_ads = filtered_ads[:nb_annonces - len(all_ads)]
             all_ads.extend(filtered_ads)
             
             if filtered_ads:
                 print(f"📄 Page {page}: {len(filtered_ads)} annonces pertinentes récupérées (total: {len(all_ads)})")
+                if on_batch is not None:
+                    on_batch(page, filtered_ads)
             else:
                 print(f"📄 Page {page}: aucune annonce pertinente trouvée")
             
-            # Délai entre les requêtes (plus long pour éviter les blocages)
-            if page < max_pages and len(all_ads) < nb_annonces:
-                time.sleep(random.uniform(3, 6))
-            page += 1
+            # Arrêt anticipé dès que l'objectif est atteint
+            return len(all_ads) >= nb_annonces
+        
+        def pages_needed() -> int:
+            """Pages encore nécessaires, d'après le rendement des pages déjà reçues"""
+            manquantes = nb_annonces - len(all_ads)
+            if manquantes <= 0:
+                return 0
+            par_page = sum(pages_recues) / len(pages_recues) if pages_recues else self.ANNONCES_PAR_PAGE
+            return math.ceil(manquantes / max(1.0, par_page))
         
-        # Limiter au nombre demandé
-        return all_ads[:nb_annonces]
+        # Construction des URLs avec pagination
+        pages = ((page, f"{url}&page={page}" if page > 1 else url) for page in range(1, max_pages + 1))
+        
+        debut = time.monotonic()
+        lookup = None if force_refresh else self._cached_page
+        self.scheduler.run(pages, self._fetch_and_parse, on_page, stop_event=stop_event, lookup=lookup,
+                           pages_needed=pages_needed)
+        annulee = stop_event is not None and stop_event.is_set()
+        if annulee:
+            print(f"⏹️ Recherche annulée après {time.monotonic() - debut:.1f}s ({len(all_ads)} annonces reçues)")
+        else:
+            print(f"⏱️ Recherche terminée en {time.monotonic() - debut:.1f}s")
+        
+        # Conserver les annonces ; une recherche annulée n'est pas mémorisée comme complète
+        if self.history is not None and all_ads:
+            try:
+                self.history.enregistrer(modele, all_ads, None if annulee else criteres)
+            except Exception as e:
+                print(f"⚠️ Historique des prix indisponible: {e}")
+        
+        return all_ads
 
 class DataAnalyzer:
     """Classe pour analyser les données des annonces"""
@@ -280,6 +351,36 @@ class DataAnalyzer:
                 else:
                     print(f"- Annonce {i}: {ad.get('titre', 'Titre non disponible')}")
 
+class IncrementalPriceStats:
+    """Statistiques de prix tenues à jour annonce par annonce (mêmes clés que analyze_prices)"""
+    
+    def __init__(self):
+        self.prices: List[int] = []  # Toujours trié
+        self.total = 0
+    
+    def add(self, annonces: List[Dict]):
+        """Ajoute les prix d'un lot d'annonces"""
+        for ad in annonces:
+            price = ad.get('prix')
+            if price:
+                bisect.insort(self.prices, price)
+                self.total += price
+    
+    def result(self) -> Dict:
+        """Statistiques courantes ({} si aucun prix)"""
+        n = len(self.prices)
+        if not n:
+            return {}
+        milieu = n // 2
+        median = self.prices[milieu] if n % 2 else (self.prices[milieu - 1] + self.prices[milieu]) / 2
+        return {
+            'minimum': self.prices[0],
+            'maximum': self.prices[-1],
+            'moyenne': int(self.total / n),
+            'mediane': int(median),
+            'nombre': n
+        }
+
 def get_user_input():
     """Récupère les paramètres de recherche depuis la console"""
     print("🚗 RECHERCHE LEBONCOIN - VOITURES")
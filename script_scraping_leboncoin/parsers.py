@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Couche d'analyse des pages de résultats Leboncoin
+
+Les analyseurs sont essayés dans l'ordre ; le premier qui reconnaît le format
+de la page fournit les annonces :
+
+1. NextDataParser     : données JSON embarquées (<script id="__NEXT_DATA__">), sans DOM
+2. LxmlParser         : requêtes XPath sur l'arbre lxml (si lxml est installé)
+3. BeautifulSoupParser: analyse historique BeautifulSoup / html.parser (dernier recours)
+
+Chaque analyseur retourne None si le format n'est pas reconnu, sinon la liste
+(éventuellement vide) des annonces {'titre', 'prix', 'annee', 'kilometrage', 'lien'}.
+"""
+
+import json
+import re
+from typing import Dict, List, Optional
+
+BASE_LIEN = "https://www.leboncoin.fr"
+
+# Expressions compilées une seule fois
+_RE_PRIX = re.compile(r'(\d+(?:[\s\u00A0]+\d+)*)\s*€')
+_RE_NON_CHIFFRE = re.compile(r'[^\d]')
+_RE_ANNEE = re.compile(r'\b(19[9]\d|20[0-3]\d)\b')
+# Séparateurs de milliers uniquement entre groupes de 3 chiffres (« 2012 120 000 km » -> 120000)
+_RE_KM = re.compile(r'(?<!\d)(\d{1,3}(?:[ \u00A0\u202F]\d{3})+|\d+)\s*km', re.IGNORECASE)
+_RE_NEXT_DATA = re.compile(rb'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL)
+
+def extract_price(price_text: str) -> Optional[int]:
+    """Extrait le prix numérique d'un texte"""
+    if not price_text:
+        return None
+    # Nettoyer le texte (espaces normaux, insécables, etc.)
+    clean_text = price_text.replace('\u00A0', ' ').replace('&nbsp;', ' ').strip()
+    # Recherche d'un nombre (avec espaces possibles) suivi de €
+    price_match = _RE_PRIX.search(clean_text)
+    if price_match:
+        # Supprimer tous les espaces et caractères non-numériques sauf les chiffres
+        return int(_RE_NON_CHIFFRE.sub('', price_match.group(1)))
+    return None
+
+def extract_year(text: str) -> Optional[int]:
+    """Extrait l'année d'un texte"""
+    if not text:
+        return None
+    # Recherche d'une année (4 chiffres entre 1990 et 2030)
+    year_match = _RE_ANNEE.search(text)
+    if year_match:
+        return int(year_match.group(1))
+    return None
+
+def extract_mileage(text: str) -> Optional[int]:
+    """Extrait le kilométrage d'un texte"""
+    if not text:
+        return None
+    # Recherche de kilométrage (nombre suivi de km, espaces insécables compris)
+    km_match = _RE_KM.search(text)
+    if km_match:
+        return int(_RE_NON_CHIFFRE.sub('', km_match.group(1)))
+    return None
+
+def _lien_absolu(lien: str) -> str:
+    if lien and lien.startswith('/'):
+        return f"{BASE_LIEN}{lien}"
+    return lien or ""
+
+def _construire_annonce(title: str, price: Optional[int], params_text: str, link: str) -> Optional[Dict]:
+    """Assemble une annonce à partir des textes extraits du HTML (None si incomplète)"""
+    combined_text = f"{title} {params_text}"
+    year = extract_year(combined_text)
+    mileage = extract_mileage(combined_text)
+    if title and price and year and mileage:
+        return {
+            'titre': title,
+            'prix': price,
+            'annee': year,
+            'kilometrage': mileage,
+            'lien': _lien_absolu(link)
+        }
+    return None
+
+def _as_bytes(content) -> bytes:
+    return content.encode('utf-8') if isinstance(content, str) else content
+
+class BaseParser:
+    """Interface commune des analyseurs"""
+
+    name = "base"
+
+    @classmethod
+    def available(cls) -> bool:
+        """Indique si les dépendances de l'analyseur sont installées"""
+        return True
+
+    def parse(self, content) -> Optional[List[Dict]]:
+        raise NotImplementedError
+
+class NextDataParser(BaseParser):
+    """Lit les annonces dans le JSON embarqué par Next.js (aucune construction de DOM)"""
+
+    name = "json"
+
+    def parse(self, content) -> Optional[List[Dict]]:
+        match = _RE_NEXT_DATA.search(_as_bytes(content))
+        if not match:
+            return None
+        try:
+            data = json.loads(match.group(1))
+        except ValueError:
+            return None
+
+        ads = self._trouver_annonces(data)
+        if ads is None:
+            return None
+
+        annonces = []
+        for ad in ads:
+            annonce = self._convertir(ad)
+            if annonce:
+                annonces.append(annonce)
+        return annonces
+
+    @staticmethod
+    def _trouver_annonces(data) -> Optional[List[Dict]]:
+        """Localise la liste des annonces dans le payload"""
+        try:
+            page_props = data['props']['pageProps']
+        except (KeyError, TypeError):
+            return None
+        for chemin in (('searchData', 'ads'), ('initialProps', 'searchData', 'ads'), ('ads',)):
+            noeud = page_props
+            for cle in chemin:
+                noeud = noeud.get(cle) if isinstance(noeud, dict) else None
+            if isinstance(noeud, list):
+                return noeud
+        return None
+
+    @staticmethod
+    def _convertir(ad: Dict) -> Optional[Dict]:
+        """Convertit une annonce JSON au format du scraper"""
+        title = (ad.get('subject') or '').strip()
+
+        price = ad.get('price')
+        if isinstance(price, list):
+            price = price[0] if price else None
+        try:
+            price = int(price) if price else None
+        except (TypeError, ValueError):
+            price = extract_price(str(price))
+
+        attributs = {}
+        for attr in ad.get('attributes') or []:
+            if isinstance(attr, dict) and 'key' in attr:
+                attributs[attr['key']] = attr.get('value')
+
+        year = None
+        if attributs.get('regdate'):
+            year = extract_year(str(attributs['regdate']))
+        if year is None:
+            year = extract_year(title)
+
+        mileage = None
+        if attributs.get('mileage'):
+            try:
+                mileage = int(_RE_NON_CHIFFRE.sub('', str(attributs['mileage'])))
+            except ValueError:
+                mileage = None
+        if mileage is None:
+            mileage = extract_mileage(title)
+
+        if title and price and year and mileage:
+            return {
+                'titre': title,
+                'prix': price,
+                'annee': year,
+                'kilometrage': mileage,
+                'lien': _lien_absolu(ad.get('url') or '')
+            }
+        return None
+
+class LxmlParser(BaseParser):
+    """Analyse XPath via lxml (beaucoup plus rapide que BeautifulSoup/html.parser)"""
+
+    name = "lxml"
+
+    _XP_CONTENEURS = '//article[@data-qa-id="aditem_container"]'
+
+    @classmethod
+    def available(cls) -> bool:
+        try:
+            import lxml.html  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def __init__(self):
+        import lxml.html
+        from lxml import etree
+        self._html = lxml.html
+        # Sans déclaration de charset, lxml suppose du latin-1 : les pages Leboncoin sont en UTF-8
+        self._parser_html = lxml.html.HTMLParser(encoding='utf-8')
+        self._xp_titre = etree.XPath('.//*[@data-test-id="adcard-title"]')
+        self._xp_prix = etree.XPath('.//*[@data-test-id="price"]')
+        self._xp_lien = etree.XPath('.//a[contains(@href, "/ad/voitures/")]/@href')
+        self._xp_params = etree.XPath('.//*[@data-test-id="ad-params-light"]')
+        self._xp_labels = etree.XPath('.//*[@data-test-id="ad-params-labels"]')
+
+    @staticmethod
+    def _texte(elements) -> str:
+        """Équivalent de get_text(strip=True) : fragments nettoyés et concaténés"""
+        if not elements:
+            return ""
+        return "".join(t.strip() for t in elements[0].itertext())
+
+    def parse(self, content) -> Optional[List[Dict]]:
+        content = _as_bytes(content)
+        if b'aditem_container' not in content:
+            return None
+        try:
+            arbre = self._html.fromstring(content, parser=self._parser_html)
+        except Exception:
+            return None
+
+        annonces = []
+        for container in arbre.xpath(self._XP_CONTENEURS):
+            try:
+                title = self._texte(self._xp_titre(container))
+                price = extract_price(self._texte(self._xp_prix(container)))
+                liens = self._xp_lien(container)
+                params_text = self._texte(self._xp_params(container))
+                if not params_text:
+                    params_text = self._texte(self._xp_labels(container))
+                annonce = _construire_annonce(title, price, params_text, liens[0] if liens else "")
+                if annonce:
+                    annonces.append(annonce)
+            except Exception:
+                # Ignorer silencieusement les erreurs d'extraction individuelles
+                continue
+        return annonces
+
+class BeautifulSoupParser(BaseParser):
+    """Analyse historique BeautifulSoup + html.parser"""
+
+    name = "beautifulsoup"
+
+    _RE_LIEN = re.compile(r'/ad/voitures/')
+
+    @classmethod
+    def available(cls) -> bool:
+        try:
+            import bs4  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def parse(self, content) -> Optional[List[Dict]]:
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(content, 'html.parser')
+        annonces = []
+
+        # Recherche des annonces (sélecteurs Leboncoin actualisés)
+        for container in soup.find_all('article', {'data-qa-id': 'aditem_container'}):
+            try:
+                title_elem = container.find(attrs={'data-test-id': 'adcard-title'})
+                title = title_elem.get_text(strip=True) if title_elem else ""
+
+                price_elem = container.find(attrs={'data-test-id': 'price'})
+                price = extract_price(price_elem.get_text(strip=True) if price_elem else "")
+
+                link_elem = container.find('a', href=self._RE_LIEN)
+                link = link_elem['href'] if link_elem and link_elem.get('href') else ""
+
+                params_elem = container.find(attrs={'data-test-id': 'ad-params-light'})
+                params_text = params_elem.get_text(strip=True) if params_elem else ""
+
+                # Alternative: recherche dans les labels détaillés
+                if not params_text:
+                    labels_container = container.find(attrs={'data-test-id': 'ad-params-labels'})
+                    if labels_container:
+                        params_text = labels_container.get_text(strip=True)
+
+                annonce = _construire_annonce(title, price, params_text, link)
+                if annonce:
+                    annonces.append(annonce)
+            except Exception:
+                # Ignorer silencieusement les erreurs d'extraction individuelles
+                continue
+
+        return annonces
+
+# Ordre de préférence des analyseurs
+PARSERS = [NextDataParser, LxmlParser, BeautifulSoupParser]
+
+class ParserChain:
+    """Essaie les analyseurs disponibles dans l'ordre jusqu'à reconnaître la page"""
+
+    def __init__(self, parsers=None):
+        classes = parsers if parsers is not None else PARSERS
+        self.parsers = [cls() for cls in classes if cls.available()]
+        self.stats = {p.name: 0 for p in self.parsers}
+        self.stats['non_reconnu'] = 0
+
+    def parse(self, content) -> List[Dict]:
+        """Retourne les annonces de la page (liste vide si aucun format reconnu)"""
+        for parser in self.parsers:
+            annonces = parser.parse(content)
+            if annonces is not None:
+                self.stats[parser.name] += 1
+                return annonces
+        self.stats['non_reconnu'] += 1
+        return []
+
+def get_parser(name: str) -> BaseParser:
+    """Instancie un analyseur par son nom ('json', 'lxml', 'beautifulsoup')"""
+    for cls in PARSERS:
+        if cls.name == name:
+            if not cls.available():
+                raise ImportError(f"L'analyseur '{name}' n'est pas disponible (dépendance manquante)")
+            return cls()
+    raise ValueError(f"Analyseur inconnu: {name}")
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Historique local des annonces Leboncoin et de leurs prix
+
+Chaque annonce récupérée est conservée une seule fois (dédoublonnée par lien),
+avec au plus une observation de prix par jour. Les annonces sont rattachées au
+modèle recherché (texte normalisé), ce qui permet des requêtes indexées :
+
+- réponse à une recherche récente sans nouvelle requête réseau
+- prix médian par modèle, tranche d'années et tranche de kilométrage sur N jours
+- série temporelle du prix médian d'un modèle
+
+Stockage : base SQLite (bibliothèque standard), comme le cache des pages.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from itertools import groupby
+from typing import Dict, List, Optional
+
+SECONDES_PAR_JOUR = 86400
+
+def normaliser_modele(modele: str) -> str:
+    """Clé d'un modèle : minuscules, sans accents, mots triés (même logique que is_relevant_ad)"""
+    texte = unicodedata.normalize('NFKD', modele.lower())
+    texte = "".join(c for c in texte if not unicodedata.combining(c))
+    return " ".join(sorted(set(texte.split())))
+
+def _mediane(prix_tries: List[int]) -> int:
+    n = len(prix_tries)
+    milieu = n // 2
+    if n % 2:
+        return prix_tries[milieu]
+    return int((prix_tries[milieu - 1] + prix_tries[milieu]) / 2)
+
+class PriceHistory:
+    """Historique persistant des annonces, indexé par modèle, année et kilométrage"""
+
+    def __init__(self, chemin: str = os.path.join("cache_recherche", "historique_prix.sqlite")):
+        """
+        Args:
+            chemin: Fichier SQLite de l'historique
+        """
+        self.chemin = chemin
+        self.lock = threading.Lock()
+        # Incrémentée à chaque enregistrement (invalide les index construits sur l'historique)
+        self.version = 0
+
+        dossier = os.path.dirname(chemin)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+
+        self.conn = sqlite3.connect(chemin, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS annonces (
+                id INTEGER PRIMARY KEY,
+                lien TEXT NOT NULL UNIQUE,
+                titre TEXT NOT NULL,
+                prix INTEGER NOT NULL,
+                annee INTEGER NOT NULL,
+                kilometrage INTEGER NOT NULL,
+                premiere_vue REAL NOT NULL,
+                derniere_vue REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS annonces_modeles (
+                modele TEXT NOT NULL,
+                annee INTEGER NOT NULL,
+                annonce_id INTEGER NOT NULL,
+                PRIMARY KEY (modele, annee, annonce_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS observations (
+                annonce_id INTEGER NOT NULL,
+                jour INTEGER NOT NULL,
+                prix INTEGER NOT NULL,
+                PRIMARY KEY (annonce_id, jour)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS recherches (
+                cle TEXT PRIMARY KEY,
+                date REAL NOT NULL,
+                nb_resultats INTEGER NOT NULL
+            );
+        """)
+        self.conn.commit()
+
+    # ------------------------------------------------------------------
+    # Écriture
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _cle_recherche(modele: str, annee_min: int, annee_max: int, km_min: int, km_max: int) -> str:
+        texte = f"{normaliser_modele(modele)}|{annee_min}|{annee_max}|{km_min}|{km_max}"
+        return hashlib.sha1(texte.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _lien(annonce: Dict) -> str:
+        """Identifiant de dédoublonnage : le lien, sinon une empreinte du contenu"""
+        if annonce.get('lien'):
+            return annonce['lien']
+        return f"sans-lien:{annonce['titre']}|{annonce['annee']}|{annonce['kilometrage']}"
+
+    def enregistrer(self, modele: str, annonces: List[Dict], criteres: Optional[Dict] = None,
+                    date: Optional[float] = None) -> int:
+        """
+        Enregistre les annonces d'une recherche
+
+        Args:
+            modele: Texte du modèle recherché (clé de rattachement)
+            annonces: Annonces {'titre', 'prix', 'annee', 'kilometrage', 'lien'}
+            criteres: Critères complets de la recherche {annee_min, annee_max, km_min, km_max} ;
+                      si fournis, la recherche est mémorisée pour recherche_recente
+            date: Date de récupération (maintenant par défaut)
+
+        Returns:
+            Nombre de nouvelles annonces
+        """
+        date = time.time() if date is None else date
+        jour = int(date // SECONDES_PAR_JOUR)
+        cle_modele = normaliser_modele(modele)
+        nouvelles = 0
+
+        with self.lock:
+            for annonce in annonces:
+                lien = self._lien(annonce)
+                ligne = self.conn.execute("SELECT id FROM annonces WHERE lien = ?", (lien,)).fetchone()
+                if ligne is None:
+                    curseur = self.conn.execute(
+                        "INSERT INTO annonces (lien, titre, prix, annee, kilometrage, premiere_vue, derniere_vue) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (lien, annonce['titre'], annonce['prix'], annonce['annee'],
+                         annonce['kilometrage'], date, date)
+                    )
+                    annonce_id = curseur.lastrowid
+                    nouvelles += 1
+                else:
+                    annonce_id = ligne[0]
+                    self.conn.execute(
+                        "UPDATE annonces SET prix = ?, titre = ?, kilometrage = ?, "
+                        "derniere_vue = MAX(derniere_vue, ?) WHERE id = ?",
+                        (annonce['prix'], annonce['titre'], annonce['kilometrage'], date, annonce_id)
+                    )
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO annonces_modeles (modele, annee, annonce_id) VALUES (?, ?, ?)",
+                    (cle_modele, annonce['annee'], annonce_id)
+                )
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO observations (annonce_id, jour, prix) VALUES (?, ?, ?)",
+                    (annonce_id, jour, annonce['prix'])
+                )
+
+            if criteres is not None:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO recherches (cle, date, nb_resultats) VALUES (?, ?, ?)",
+                    (self._cle_recherche(modele, criteres['annee_min'], criteres['annee_max'],
+                                         criteres['km_min'], criteres['km_max']), date, len(annonces))
+                )
+            self.conn.commit()
+            self.version += 1
+        return nouvelles
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    def annonces(self, modele: str, annee_min: int = 0, annee_max: int = 9999,
+                 km_min: int = 0, km_max: int = 10 ** 9, jours: Optional[float] = None,
+                 limite: Optional[int] = None) -> List[Dict]:
+        """Annonces d'un modèle dans les critères, vues dans les N derniers jours (les plus récentes d'abord)"""
+        depuis = 0 if jours is None else time.time() - jours * SECONDES_PAR_JOUR
+        requete = (
+            "SELECT a.titre, a.prix, a.annee, a.kilometrage, a.lien, a.derniere_vue "
+            "FROM annonces_modeles m JOIN annonces a ON a.id = m.annonce_id "
+            "WHERE m.modele = ? AND m.annee BETWEEN ? AND ? "
+            "AND a.kilometrage BETWEEN ? AND ? AND a.derniere_vue >= ? "
+            "ORDER BY a.derniere_vue DESC"
+        )
+        params = [normaliser_modele(modele), annee_min, annee_max, km_min, km_max, depuis]
+        if limite is not None:
+            requete += " LIMIT ?"
+            params.append(limite)
+        with self.lock:
+            lignes = self.conn.execute(requete, params).fetchall()
+        return [
+            {'titre': titre, 'prix': prix, 'annee': annee, 'kilometrage': km,
+             'lien': "" if lien.startswith("sans-lien:") else lien, 'date_recuperation': vue}
+            for titre, prix, annee, km, lien, vue in lignes
+        ]
+
+    def recherche_recente(self, modele: str, annee_min: int, annee_max: int, km_min: int, km_max: int,
+                          nb_annonces: int, fraicheur: float) -> Optional[List[Dict]]:
+        """
+        Répond à une recherche depuis l'historique s'il est assez frais
+
+        L'historique suffit si la même recherche a été faite il y a moins de
+        'fraicheur' secondes, ou s'il contient au moins nb_annonces annonces
+        vues dans ce délai.
+
+        Returns:
+            Annonces (au plus nb_annonces) ou None s'il faut interroger Leboncoin
+        """
+        cle = self._cle_recherche(modele, annee_min, annee_max, km_min, km_max)
+        with self.lock:
+            ligne = self.conn.execute("SELECT date FROM recherches WHERE cle = ?", (cle,)).fetchone()
+        recherche_fraiche = ligne is not None and time.time() - ligne[0] <= fraicheur
+
+        annonces = self.annonces(modele, annee_min, annee_max, km_min, km_max,
+                                 jours=fraicheur / SECONDES_PAR_JOUR, limite=nb_annonces)
+        if recherche_fraiche or len(annonces) >= nb_annonces:
+            return annonces
+        return None
+
+    def mediane_par_tranche(self, modele: str, jours: float = 30, tranche_annees: int = 2,
+                            tranche_km: int = 25000) -> List[Dict]:
+        """
+        Prix médian d'un modèle par tranche d'années et de kilométrage sur N jours
+
+        Returns:
+            Liste de {'annee_min', 'annee_max', 'km_min', 'km_max', 'nombre', 'mediane', 'moyenne'}
+        """
+        depuis = time.time() - jours * SECONDES_PAR_JOUR
+        with self.lock:
+            lignes = self.conn.execute(
+                "SELECT m.annee / ? AS ta, a.kilometrage / ? AS tk, a.prix "
+                "FROM annonces_modeles m JOIN annonces a ON a.id = m.annonce_id "
+                "WHERE m.modele = ? AND a.derniere_vue >= ? "
+                "ORDER BY ta, tk, a.prix",
+                (tranche_annees, tranche_km, normaliser_modele(modele), depuis)
+            ).fetchall()
+
+        tranches = []
+        for (ta, tk), groupe in groupby(lignes, key=lambda l: (l[0], l[1])):
+            prix = [l[2] for l in groupe]
+            tranches.append({
+                'annee_min': ta * tranche_annees,
+                'annee_max': ta * tranche_annees + tranche_annees - 1,
+                'km_min': tk * tranche_km,
+                'km_max': tk * tranche_km + tranche_km - 1,
+                'nombre': len(prix),
+                'mediane': _mediane(prix),
+                'moyenne': int(sum(prix) / len(prix))
+            })
+        return tranches
+
+    def serie_temporelle(self, modele: str, annee_min: int = 0, annee_max: int = 9999,
+                         jours: float = 90, pas_jours: int = 7) -> List[Dict]:
+        """
+        Évolution du prix médian d'un modèle (une valeur par période de pas_jours)
+
+        Returns:
+            Liste de {'date' (timestamp du début de période), 'nombre', 'mediane'}
+        """
+        premier_jour = int((time.time() - jours * SECONDES_PAR_JOUR) // SECONDES_PAR_JOUR)
+        with self.lock:
+            lignes = self.conn.execute(
+                "SELECT o.jour / ? AS periode, o.prix "
+                "FROM annonces_modeles m JOIN observations o ON o.annonce_id = m.annonce_id "
+                "WHERE m.modele = ? AND m.annee BETWEEN ? AND ? AND o.jour >= ? "
+                "ORDER BY periode, o.prix",
+                (pas_jours, normaliser_modele(modele), annee_min, annee_max, premier_jour)
+            ).fetchall()
+
+        serie = []
+        for periode, groupe in groupby(lignes, key=lambda l: l[0]):
+            prix = [l[1] for l in groupe]
+            serie.append({
+                'date': periode * pas_jours * SECONDES_PAR_JOUR,
+                'nombre': len(prix),
+                'mediane': _mediane(prix)
+            })
+        return serie
+
+    def get_stats(self) -> Dict:
+        """Volume de l'historique"""
+        with self.lock:
+            nb_annonces = self.conn.execute("SELECT COUNT(*) FROM annonces").fetchone()[0]
+            nb_observations = self.conn.execute("SELECT COUNT(*) FROM observations").fetchone()[0]
+            nb_modeles = self.conn.execute("SELECT COUNT(DISTINCT modele) FROM annonces_modeles").fetchone()[0]
+        return {'annonces': nb_annonces, 'observations': nb_observations, 'modeles': nb_modeles}
+
+    def fermer(self):
+        """Ferme la base"""
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache persistant des pages de résultats Leboncoin
+
+Les pages sont indexées par URL de recherche normalisée (paramètres triés, texte
+en minuscules, numéro de page explicite), expirent après un TTL et sont évincées
+par ordre d'accès (LRU) quand la taille totale dépasse la limite.
+Stockage : base SQLite (bibliothèque standard), contenu compressé zlib.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit, quote
+
+class ResponseCache:
+    """Cache disque des réponses HTTP avec TTL et éviction LRU bornée en taille"""
+
+    def __init__(self, chemin: str = os.path.join("cache_recherche", "reponses.sqlite"),
+                 ttl: float = 6 * 3600, taille_max: int = 50 * 1024 * 1024):
+        """
+        Args:
+            chemin: Fichier SQLite du cache
+            ttl: Durée de validité d'une page (secondes)
+            taille_max: Taille maximale du contenu stocké (octets, après compression)
+        """
+        self.chemin = chemin
+        self.ttl = ttl
+        self.taille_max = taille_max
+        self.stats = {'hits': 0, 'misses': 0, 'ecritures': 0, 'evictions': 0}
+        self.lock = threading.Lock()
+
+        dossier = os.path.dirname(chemin)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+
+        self.conn = sqlite3.connect(chemin, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS reponses (
+                cle TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                contenu BLOB NOT NULL,
+                taille INTEGER NOT NULL,
+                date_recuperation REAL NOT NULL,
+                dernier_acces REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_reponses_acces ON reponses(dernier_acces)")
+        self.conn.commit()
+
+    @staticmethod
+    def normaliser_url(url: str) -> str:
+        """
+        Normalise une URL de recherche : même requête => même clé
+
+        - schéma et hôte en minuscules
+        - paramètres triés, 'text' en minuscules sans espaces superflus
+        - 'page' toujours présent (page=1 par défaut)
+        """
+        parties = urlsplit(url)
+        params = []
+        page = "1"
+        for cle, valeur in parse_qsl(parties.query, keep_blank_values=True):
+            if cle == "page":
+                page = valeur.strip() or "1"
+                continue
+            if cle == "text":
+                valeur = " ".join(valeur.lower().split())
+            params.append((cle, valeur.strip()))
+        params.append(("page", page))
+        params.sort()
+        return urlunsplit((
+            parties.scheme.lower(),
+            parties.netloc.lower(),
+            parties.path.rstrip("/") or "/",
+            urlencode(params, quote_via=quote),
+            ""
+        ))
+
+    def _cle(self, url: str) -> str:
+        return hashlib.sha1(self.normaliser_url(url).encode("utf-8")).hexdigest()
+
+    def get(self, url: str) -> Optional[bytes]:
+        """Retourne le contenu en cache (None si absent ou expiré)"""
+        cle = self._cle(url)
+        maintenant = time.time()
+        with self.lock:
+            ligne = self.conn.execute(
+                "SELECT contenu, date_recuperation FROM reponses WHERE cle = ?", (cle,)
+            ).fetchone()
+            if ligne is None or maintenant - ligne[1] > self.ttl:
+                if ligne is not None:
+                    self.conn.execute("DELETE FROM reponses WHERE cle = ?", (cle,))
+                    self.conn.commit()
+                self.stats['misses'] += 1
+                return None
+            self.conn.execute("UPDATE reponses SET dernier_acces = ? WHERE cle = ?", (maintenant, cle))
+            self.conn.commit()
+            self.stats['hits'] += 1
+        return zlib.decompress(ligne[0])
+
+    def put(self, url: str, contenu: bytes):
+        """Enregistre une réponse puis évince les plus anciennes si nécessaire"""
+        compresse = zlib.compress(contenu, 6)
+        maintenant = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO reponses (cle, url, contenu, taille, date_recuperation, dernier_acces) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self._cle(url), self.normaliser_url(url), compresse, len(compresse), maintenant, maintenant)
+            )
+            self.stats['ecritures'] += 1
+            self._evincer()
+            self.conn.commit()
+
+    def _evincer(self):
+        """Supprime les entrées expirées puis les moins récemment utilisées au-delà de la taille max"""
+        self.conn.execute("DELETE FROM reponses WHERE date_recuperation < ?", (time.time() - self.ttl,))
+        total = self.conn.execute("SELECT COALESCE(SUM(taille), 0) FROM reponses").fetchone()[0]
+        if total <= self.taille_max:
+            return
+        for cle, taille in self.conn.execute(
+            "SELECT cle, taille FROM reponses ORDER BY dernier_acces ASC"
+        ).fetchall():
+            if total <= self.taille_max:
+                break
+            self.conn.execute("DELETE FROM reponses WHERE cle = ?", (cle,))
+            total -= taille
+            self.stats['evictions'] += 1
+
+    def invalider(self, url: str):
+        """Retire une page du cache"""
+        with self.lock:
+            self.conn.execute("DELETE FROM reponses WHERE cle = ?", (self._cle(url),))
+            self.conn.commit()
+
+    def vider(self):
+        """Vide complètement le cache"""
+        with self.lock:
+            self.conn.execute("DELETE FROM reponses")
+            self.conn.commit()
+
+    def get_stats(self) -> Dict:
+        """Statistiques d'utilisation (copie)"""
+        with self.lock:
+            stats = dict(self.stats)
+            ligne = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(taille), 0) FROM reponses").fetchone()
+        stats['entrees'], stats['taille'] = ligne
+        return stats
+
+    def fermer(self):
+        """Ferme la base"""
+        with self.lock:
+            self.conn.close()
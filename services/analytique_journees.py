@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Analyses transversales de toutes les journées d'enchères
+
+Chaque fichier de journees_data est lu une seule fois : ses agrégats partiels
+(par marque, modèle, mois et lieu) sont conservés avec sa date de modification,
+en mémoire et dans un cache disque. Une actualisation ne relit que les fichiers
+ajoutés ou modifiés depuis, puis additionne les agrégats partiels.
+
+Indicateurs par groupe :
+- lots      : véhicules repérés ou achetés
+- achetes   : véhicules achetés, taux de réussite = achetes / lots
+- depense   : somme des prix d'achat
+- marge     : marge complète réalisée (véhicules vendus, formule de calculer_marge_complete)
+- ecart     : écart moyen Prix max - Prix achat sur les achats avec prix max
+"""
+
+import glob
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+from models.journee_enchere import JourneeEnchere
+from services.codecs_journee import lire_fichier_journee
+from services.moteur_prix import MoteurPrix
+
+# Regroupements proposés (clé -> libellé)
+DIMENSIONS = {
+    'marque': "Marque",
+    'modele': "Modèle",
+    'mois': "Mois",
+    'lieu': "Lieu"
+}
+
+# Sommes conservées par groupe (les moyennes et taux en sont dérivés)
+CHAMPS_SOMMES = ('lots', 'achetes', 'depense', 'vendus', 'marge', 'nb_ecart', 'somme_ecart')
+
+VERSION_CACHE = 1
+
+def _cle_groupes(journee: JourneeEnchere, vehicule) -> Dict[str, str]:
+    """Groupe d'un véhicule pour chaque dimension"""
+    marque = (vehicule.marque or "").strip().title() or "Non renseignée"
+    modele = (vehicule.modele or "").strip()
+    date = journee.date or journee.date_creation or ""
+    return {
+        'marque': marque,
+        'modele': f"{marque} {modele}".strip() if modele else marque,
+        'mois': date[:7] if len(date) >= 7 else "Sans date",
+        'lieu': (journee.lieu or "").strip() or "Non renseigné"
+    }
+
+def agreger_journee(journee: JourneeEnchere) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Agrégats partiels d'une journée : {dimension: {groupe: {champ: somme}}}"""
+    moteur = MoteurPrix(journee.parametres)
+    agregats = {dimension: {} for dimension in DIMENSIONS}
+
+    def ajouter(vehicule, sommes):
+        for dimension, groupe in _cle_groupes(journee, vehicule).items():
+            cible = agregats[dimension].setdefault(groupe, dict.fromkeys(CHAMPS_SOMMES, 0.0))
+            for champ, valeur in sommes.items():
+                cible[champ] += valeur
+
+    for vehicule in journee.vehicules_reperage:
+        ajouter(vehicule, {'lots': 1})
+
+    for vehicule in journee.vehicules_achetes:
+        prix_achat = vehicule.get_prix_numerique('prix_achat')
+        prix_max = vehicule.get_prix_numerique('prix_max_achat')
+        prix_vente_final = vehicule.get_prix_numerique('prix_vente_final')
+        sommes = {'lots': 1, 'achetes': 1, 'depense': prix_achat}
+        if prix_vente_final > 0:
+            sommes['vendus'] = 1
+            sommes['marge'] = moteur.marge_complete(
+                prix_vente_final, prix_achat,
+                vehicule.get_prix_numerique('cout_reparations'), vehicule.get_prix_numerique('temps_reparations')
+            )
+        if prix_max > 0 and prix_achat > 0:
+            sommes['nb_ecart'] = 1
+            sommes['somme_ecart'] = prix_max - prix_achat
+        ajouter(vehicule, sommes)
+
+    return agregats
+
+def charger_journee(chemin: str) -> JourneeEnchere:
+    """Journée d'un fichier, avec les achats du mode direct pas encore sauvegardés"""
+    journee = JourneeEnchere(lire_fichier_journee(chemin))
+    journal = f"{chemin}.journal"
+    if os.path.exists(journal):
+        with open(journal, 'r', encoding='utf-8') as f:
+            for ligne in f:
+                try:
+                    journee.appliquer_operation(json.loads(ligne))
+                except ValueError:
+                    continue
+    return journee
+
+def signature_fichier(chemin: str) -> List[int]:
+    """Date de modification et taille du fichier et de son journal éventuel"""
+    signature = []
+    for fichier in (chemin, f"{chemin}.journal"):
+        try:
+            stat = os.stat(fichier)
+            signature += [stat.st_mtime_ns, stat.st_size]
+        except OSError:
+            signature += [0, 0]
+    return signature
+
+class AnalytiqueJournees:
+    """Tables d'agrégats de toutes les journées, actualisées fichier par fichier"""
+
+    def __init__(self, dossier: str = "journees_data", chemin_cache: Optional[str] = None):
+        self.dossier = dossier
+        self.chemin_cache = chemin_cache or os.path.join(dossier, "analytique.cache")
+        self.fichiers = {}      # nom -> {'signature': [...], 'agregats': {...}}
+        self.tables = None      # agrégats totaux, recalculés après un changement
+        self.verrou = threading.Lock()
+        self.charger_cache()
+
+    def charger_cache(self):
+        """Reprend les agrégats partiels enregistrés (ignorés s'ils sont illisibles)"""
+        try:
+            with open(self.chemin_cache, 'r', encoding='utf-8') as f:
+                donnees = json.load(f)
+            if donnees.get('version') == VERSION_CACHE:
+                self.fichiers = donnees.get('fichiers', {})
+        except (OSError, ValueError):
+            self.fichiers = {}
+
+    def sauvegarder_cache(self):
+        """Enregistre les agrégats partiels (remplacement atomique du fichier)"""
+        try:
+            temporaire = f"{self.chemin_cache}.tmp"
+            with open(temporaire, 'w', encoding='utf-8') as f:
+                json.dump({'version': VERSION_CACHE, 'fichiers': self.fichiers}, f, ensure_ascii=False)
+            os.replace(temporaire, self.chemin_cache)
+        except OSError as e:
+            print(f"⚠️ Cache des analyses non enregistré: {e}")
+
+    def actualiser(self) -> int:
+        """
+        Relit les journées ajoutées ou modifiées depuis le dernier passage
+
+        Returns:
+            Nombre de fichiers relus ou retirés
+        """
+        with self.verrou:
+            presents = {os.path.basename(c): c for c in glob.glob(os.path.join(self.dossier, "*.json"))}
+            changements = 0
+
+            for nom in list(self.fichiers):
+                if nom not in presents:
+                    del self.fichiers[nom]
+                    changements += 1
+
+            for nom, chemin in presents.items():
+                signature = signature_fichier(chemin)
+                entree = self.fichiers.get(nom)
+                if entree and entree['signature'] == signature:
+                    continue
+                try:
+                    self.fichiers[nom] = {'signature': signature, 'agregats': agreger_journee(charger_journee(chemin))}
+                except (OSError, ValueError) as e:
+                    print(f"⚠️ Journée ignorée par les analyses ({nom}): {e}")
+                    self.fichiers.pop(nom, None)
+                changements += 1
+
+            if changements or self.tables is None:
+                self.tables = self._additionner()
+            if changements:
+                self.sauvegarder_cache()
+                print(f"📊 Analyses : {changements} journée(s) relue(s) sur {len(presents)}")
+            return changements
+
+    def _additionner(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Somme des agrégats partiels de tous les fichiers"""
+        tables = {dimension: {} for dimension in DIMENSIONS}
+        for entree in self.fichiers.values():
+            for dimension, groupes in entree['agregats'].items():
+                for groupe, sommes in groupes.items():
+                    cible = tables[dimension].setdefault(groupe, dict.fromkeys(CHAMPS_SOMMES, 0.0))
+                    for champ in CHAMPS_SOMMES:
+                        cible[champ] += sommes.get(champ, 0.0)
+        return tables
+
+    def table(self, dimension: str) -> List[Dict]:
+        """
+        Lignes d'une dimension, triées par marge réalisée décroissante
+
+        Returns:
+            [{'groupe', 'lots', 'achetes', 'taux_reussite', 'depense', 'vendus',
+              'marge', 'marge_moyenne', 'ecart_moyen'}]
+        """
+        if self.tables is None:
+            self.actualiser()
+        lignes = []
+        for groupe, s in self.tables.get(dimension, {}).items():
+            lignes.append({
+                'groupe': groupe,
+                'lots': int(s['lots']),
+                'achetes': int(s['achetes']),
+                'taux_reussite': s['achetes'] / s['lots'] if s['lots'] else 0.0,
+                'depense': s['depense'],
+                'vendus': int(s['vendus']),
+                'marge': s['marge'],
+                'marge_moyenne': s['marge'] / s['vendus'] if s['vendus'] else 0.0,
+                'ecart_moyen': s['somme_ecart'] / s['nb_ecart'] if s['nb_ecart'] else 0.0
+            })
+        lignes.sort(key=lambda l: (l['marge'], l['depense']), reverse=True)
+        return lignes
+
+# Instance partagée par l'application (les tables restent en mémoire entre deux ouvertures)
+_analytique_partagee: Optional[AnalytiqueJournees] = None
+_verrou_partage = threading.Lock()
+
+def get_analytique_partagee(dossier: str = "journees_data") -> AnalytiqueJournees:
+    """Retourne l'instance partagée des analyses"""
+    global _analytique_partagee
+    with _verrou_partage:
+        if _analytique_partagee is None or _analytique_partagee.dossier != dossier:
+            _analytique_partagee = AnalytiqueJournees(dossier)
+        return _analytique_partagee
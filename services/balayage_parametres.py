@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Balayage de sensibilité des paramètres de prix sur toute une journée
+
+Pour chaque combinaison (tarif horaire, commission, marge de sécurité) d'une
+grille, calcule le nombre de lots encore intéressants (prix max > 0) et le
+budget total nécessaire (somme des prix max), avec les formules de MoteurPrix.
+
+Le prix max d'un lot s'écrit  v - marge  avec  v = Prix revente × (1 - Commission)
+- Coût réparations - Temps × Tarif. Pour chaque couple (commission, tarif), les v
+sont triés une seule fois avec leurs sommes cumulées : chaque marge de sécurité
+se résout ensuite par une recherche dichotomique, sans repasser sur les lots.
+"""
+
+from bisect import bisect_right
+from itertools import accumulate, product
+from typing import Dict, List, Sequence
+
+from services.moteur_prix import valeur_numerique
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Nombre de valeurs triées ensemble par NumPy (limite la mémoire des grandes grilles)
+TAILLE_BLOC_NUMPY = 1_000_000
+
+# Limite de combinaisons d'une grille (garde-fou contre une saisie erronée)
+MAX_COMBINAISONS = 200_000
+
+def plage_valeurs(debut: float, fin: float, pas: float) -> List[float]:
+    """
+    Valeurs de debut à fin (incluse) par pas
+
+    Raises:
+        ValueError: Si le pas est négatif ou nul alors que debut != fin
+    """
+    if fin < debut:
+        debut, fin = fin, debut
+    if debut == fin:
+        return [float(debut)]
+    if pas <= 0:
+        raise ValueError("Le pas doit être strictement positif")
+    nombre = int(round((fin - debut) / pas + 1e-9)) + 1
+    return [round(debut + i * pas, 6) for i in range(nombre)]
+
+def colonnes_lots(vehicules: Sequence) -> Dict[str, List[float]]:
+    """Prix de revente, coûts et temps des lots estimés (prix de revente > 0)"""
+    colonnes = {'prix_revente': [], 'cout_reparations': [], 'temps_reparations': []}
+    for vehicule in vehicules:
+        prix_revente = valeur_numerique(vehicule.prix_revente)
+        if prix_revente <= 0:
+            continue
+        colonnes['prix_revente'].append(prix_revente)
+        colonnes['cout_reparations'].append(valeur_numerique(vehicule.cout_reparations))
+        colonnes['temps_reparations'].append(valeur_numerique(vehicule.temps_reparations))
+    return colonnes
+
+def balayer(colonnes: Dict[str, Sequence[float]], tarifs: Sequence[float],
+            commissions: Sequence[float], marges: Sequence[float]) -> Dict[str, List[float]]:
+    """
+    Évalue toutes les combinaisons de la grille tarifs × commissions × marges
+
+    Args:
+        colonnes: Colonnes 'prix_revente', 'cout_reparations', 'temps_reparations'
+                  (voir colonnes_lots)
+        tarifs: Tarifs horaires (€/h)
+        commissions: Commissions de vente (%)
+        marges: Marges de sécurité (€)
+
+    Returns:
+        Colonnes 'tarif_horaire', 'commission_vente', 'marge_securite',
+        'lots_viables' et 'budget_total', une ligne par combinaison (ordre
+        commission, puis tarif, puis marge)
+
+    Raises:
+        ValueError: Si la grille dépasse MAX_COMBINAISONS
+    """
+    nb_combinaisons = len(tarifs) * len(commissions) * len(marges)
+    if nb_combinaisons > MAX_COMBINAISONS:
+        raise ValueError(f"Grille trop grande : {nb_combinaisons:,} combinaisons (maximum {MAX_COMBINAISONS:,})")
+
+    couples = list(product(commissions, tarifs))
+    if np is not None:
+        comptes, budgets = _balayer_numpy(colonnes, couples, marges)
+    else:
+        comptes, budgets = _balayer_python(colonnes, couples, marges)
+
+    resultats = {'tarif_horaire': [], 'commission_vente': [], 'marge_securite': []}
+    for commission, tarif in couples:
+        resultats['tarif_horaire'].extend([tarif] * len(marges))
+        resultats['commission_vente'].extend([commission] * len(marges))
+        resultats['marge_securite'].extend(marges)
+    resultats['lots_viables'] = comptes
+    resultats['budget_total'] = budgets
+    return resultats
+
+def _balayer_python(colonnes, couples, marges):
+    """Un tri et des sommes cumulées par couple (commission, tarif), bisect par marge"""
+    prix_revente = colonnes['prix_revente']
+    couts = colonnes['cout_reparations']
+    temps = colonnes['temps_reparations']
+    nombre = len(prix_revente)
+
+    comptes, budgets = [], []
+    for commission, tarif in couples:
+        facteur = 1 - commission / 100
+        valeurs = sorted([r * facteur - c - t * tarif for r, c, t in zip(prix_revente, couts, temps)])
+        cumuls = list(accumulate(valeurs, initial=0.0))
+        total = cumuls[-1]
+        for marge in marges:
+            # Lots viables : v - marge > 0, soit les valeurs après bisect_right(marge)
+            debut = bisect_right(valeurs, marge)
+            viables = nombre - debut
+            comptes.append(viables)
+            budgets.append(total - cumuls[debut] - marge * viables)
+    return comptes, budgets
+
+def _balayer_numpy(colonnes, couples, marges):
+    """Même principe, tris et sommes cumulées vectorisés par blocs de couples"""
+    prix_revente = np.asarray(colonnes['prix_revente'], dtype=float)
+    couts = np.asarray(colonnes['cout_reparations'], dtype=float)
+    temps = np.asarray(colonnes['temps_reparations'], dtype=float)
+    nombre = len(prix_revente)
+    marges = np.asarray(marges, dtype=float)
+
+    comptes = np.empty((len(couples), len(marges)), dtype=np.int64)
+    budgets = np.empty((len(couples), len(marges)))
+    bloc = max(1, TAILLE_BLOC_NUMPY // max(1, nombre))
+    parametres = np.asarray(couples, dtype=float).reshape(-1, 2)
+
+    for debut_bloc in range(0, len(couples), bloc):
+        commissions = parametres[debut_bloc:debut_bloc + bloc, 0:1]
+        tarifs = parametres[debut_bloc:debut_bloc + bloc, 1:2]
+        valeurs = np.sort(prix_revente * (1 - commissions / 100) - couts - temps * tarifs, axis=1)
+        cumuls = np.zeros((len(valeurs), nombre + 1))
+        np.cumsum(valeurs, axis=1, out=cumuls[:, 1:])
+        for ligne in range(len(valeurs)):
+            debuts = np.searchsorted(valeurs[ligne], marges, side='right')
+            viables = nombre - debuts
+            comptes[debut_bloc + ligne] = viables
+            budgets[debut_bloc + ligne] = cumuls[ligne, -1] - cumuls[ligne, debuts] - marges * viables
+
+    return comptes.ravel().tolist(), budgets.ravel().tolist()
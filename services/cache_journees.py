@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache des journées récemment ouvertes
+
+Repasser du sélecteur à une journée déjà ouverte (vente en cours, vente
+comparable du mois dernier) ne relit pas son fichier : la JourneeEnchere
+chargée est gardée en mémoire, avec sa version de référence pour la fusion
+des sauvegardes. Une entrée n'est valable que si le fichier et son journal
+n'ont pas changé depuis (date de modification et taille) ; au-delà du nombre
+de journées ou de la mémoire autorisés, la moins récemment ouverte est retirée.
+
+La journée retournée est l'objet modifié par l'interface : le cache n'est
+utilisé que par le sélecteur de l'application (JourneesManager(cache=...)),
+jamais par deux postes ou deux fenêtres d'un même processus.
+"""
+
+import glob
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from models.journee_enchere import JourneeEnchere
+from services.analytique_journees import signature_fichier
+from services.codecs_journee import decoder_journee, taille_json
+
+# Mémoire d'une journée chargée (objets + version de référence) par octet de JSON, mesurée
+FACTEUR_MEMOIRE = 5.5
+
+class CacheJournees:
+    """Cache LRU de journées chargées, borné en nombre et en mémoire estimée"""
+
+    def __init__(self, nombre_max: int = 5, memoire_max_mo: float = 200.0):
+        self.nombre_max = nombre_max
+        self.memoire_max = memoire_max_mo * 1024 * 1024
+        # chemin -> (signature, journée, version de référence, mémoire estimée)
+        self.entrees: "OrderedDict[str, Tuple[list, JourneeEnchere, tuple, int]]" = OrderedDict()
+        self.memoire = 0
+        self.succes = 0
+        self.echecs = 0
+        self.lock = threading.Lock()
+
+    def obtenir(self, chemin: str) -> Optional[Tuple[JourneeEnchere, tuple]]:
+        """(journée, version de référence) si le fichier n'a pas changé depuis, sinon None"""
+        chemin = os.path.abspath(chemin)
+        with self.lock:
+            entree = self.entrees.get(chemin)
+            if entree is None or entree[0] != signature_fichier(chemin):
+                if entree is not None:
+                    self._retirer(chemin)
+                self.echecs += 1
+                return None
+            self.entrees.move_to_end(chemin)
+            self.succes += 1
+            return entree[1], entree[2]
+
+    def memoriser(self, chemin: str, journee: JourneeEnchere, base: tuple, remplacer: bool = True,
+                  signature: Optional[list] = None):
+        """
+        Garde une journée tout juste chargée ou sauvegardée
+
+        Args:
+            base: (révision, contenu du fichier), version de référence pour la fusion
+            remplacer: False pour un préchargement (ne remplace pas la journée déjà ouverte)
+            signature: Signature relevée avant la lecture (défaut : signature actuelle)
+        """
+        chemin = os.path.abspath(chemin)
+        signature = signature or signature_fichier(chemin)
+        # Taille en JSON : un fichier compressé ou binaire est bien plus petit que la journée chargée
+        memoire = int(max(signature[1], taille_json(base[1])) * FACTEUR_MEMOIRE)
+        with self.lock:
+            if chemin in self.entrees:
+                if not remplacer:
+                    return
+                self._retirer(chemin)
+            if self.nombre_max <= 0 or memoire > self.memoire_max:
+                return
+            self.entrees[chemin] = (signature, journee, base, memoire)
+            self.memoire += memoire
+            while len(self.entrees) > self.nombre_max or self.memoire > self.memoire_max:
+                self._retirer(next(iter(self.entrees)))
+
+    def retirer(self, chemin: str):
+        """Oublie une journée (supprimée)"""
+        with self.lock:
+            self._retirer(os.path.abspath(chemin))
+
+    def _retirer(self, chemin: str):
+        entree = self.entrees.pop(chemin, None)
+        if entree is not None:
+            self.memoire -= entree[3]
+
+    def vider(self):
+        with self.lock:
+            self.entrees.clear()
+            self.memoire = 0
+
+    def precharger(self, chemin: str) -> bool:
+        """Charge une journée dans le cache sans la rendre active (thread d'arrière-plan)"""
+        # Un journal en attente est rejoué et sauvegardé par l'ouverture normale
+        if not os.path.exists(chemin) or os.path.exists(f"{chemin}.journal"):
+            return False
+        with self.lock:
+            if os.path.abspath(chemin) in self.entrees:
+                return False
+        try:
+            # Relevée avant la lecture : une sauvegarde pendant le chargement invalide l'entrée
+            signature = signature_fichier(chemin)
+            with open(chemin, 'rb') as f:
+                contenu = f.read()
+            donnees = decoder_journee(contenu)
+            base = (donnees.get('revision', 0), contenu)
+            self.memoriser(chemin, JourneeEnchere(donnees), base, remplacer=False, signature=signature)
+            return True
+        except Exception as e:
+            print(f"⚠️ Préchargement impossible {os.path.basename(chemin)}: {e}")
+            return False
+
+    def precharger_recente(self, dossier: str) -> Optional[threading.Thread]:
+        """Précharge en arrière-plan la dernière journée modifiée du dossier"""
+        fichiers = glob.glob(os.path.join(dossier, "*.json"))
+        if not fichiers or self.nombre_max <= 0:
+            return None
+        thread = threading.Thread(target=self.precharger, args=(max(fichiers, key=os.path.getmtime),), daemon=True)
+        thread.start()
+        return thread
+
+# Instance partagée par l'application (survit au retour au sélecteur)
+_cache_partage: Optional[CacheJournees] = None
+_verrou_partage = threading.Lock()
+
+def get_cache_partage(nombre_max: int = 5, memoire_max_mo: float = 200.0) -> CacheJournees:
+    """Retourne le cache partagé, limites mises à jour"""
+    global _cache_partage
+    with _verrou_partage:
+        if _cache_partage is None:
+            _cache_partage = CacheJournees(nombre_max, memoire_max_mo)
+        else:
+            _cache_partage.nombre_max = nombre_max
+            _cache_partage.memoire_max = memoire_max_mo * 1024 * 1024
+        return _cache_partage
@@ -1,10 +1,11 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-Service de calcul des prix maximums et marges
+Service de calcul des prix maximums et marges (formules : services/moteur_prix.py)
 """
 
 from config.settings import AppSettings
+from services.moteur_prix import MoteurPrix
 
 class PriceCalculator:
     """Calculateur de prix pour les véhicules"""
@@ -18,44 +19,15 @@ class PriceCalculator:
         - Prix de revente estimé
         - Coût des réparations
         - Temps de réparations (converti en coût main d'œuvre)
-        - Commission de la maison d'enchères
-        - Frais fixes
-        - Marge minimale souhaitée
+        - Commission sur la vente
+        - Marge de sécurité
         """
         try:
-            # Conversion en float
-            prix_rev = float(prix_revente or 0)
-            cout_rep = float(cout_reparations or 0)
-            temps_rep = float(temps_reparations or 0)
-            
-            # Calcul du coût main d'œuvre
-            cout_main_oeuvre = temps_rep * self.settings.parametres['tarif_horaire']
-            
-            # Coût total des réparations
-            cout_total_reparations = cout_rep + cout_main_oeuvre
-            
-            # Prix net après réparations
-            prix_net = prix_rev - cout_total_reparations
-            
-            # Commission de la maison d'enchères
-            commission = prix_net * (self.settings.parametres['commission_enchere'] / 100)
-            
-            # Prix après commission et frais fixes
-            prix_apres_commission = prix_net - commission - self.settings.parametres['frais_fixes']
-            
-            # Calcul de la marge
-            if self.settings.parametres['marge_type'] == 'pourcentage':
-                marge = prix_apres_commission * (self.settings.parametres['marge_valeur'] / 100)
-            else:
-                marge = self.settings.parametres['marge_valeur']
-            
-            # Prix maximum d'achat
-            prix_max = prix_apres_commission - marge
-            
-            # Formater le résultat
-            return f"{max(0, prix_max):.0f}€"
-            
-        except (ValueError, ZeroDivisionError, TypeError):
+            prix_max = MoteurPrix(self.settings.parametres).prix_max(
+                float(prix_revente or 0), float(cout_reparations or 0), float(temps_reparations or 0)
+            )
+            return f"{prix_max:.0f}€"
+        except (ValueError, TypeError):
             return "0€"
     
     def calculer_details_prix(self, prix_revente: str, cout_reparations: str, temps_reparations: str) -> dict:
@@ -64,53 +36,32 @@ class PriceCalculator:
         Retourne un dictionnaire avec toutes les étapes de calcul
         """
         try:
-            # Conversion en float
             prix_rev = float(prix_revente or 0)
             cout_rep = float(cout_reparations or 0)
             temps_rep = float(temps_reparations or 0)
-            
-            # Calculs étape par étape
-            cout_main_oeuvre = temps_rep * self.settings.parametres['tarif_horaire']
-            cout_total_reparations = cout_rep + cout_main_oeuvre
-            prix_net = prix_rev - cout_total_reparations
-            commission = prix_net * (self.settings.parametres['commission_enchere'] / 100)
-            prix_apres_commission = prix_net - commission - self.settings.parametres['frais_fixes']
-            
-            if self.settings.parametres['marge_type'] == 'pourcentage':
-                marge = prix_apres_commission * (self.settings.parametres['marge_valeur'] / 100)
-                marge_type = f"{self.settings.parametres['marge_valeur']}%"
-            else:
-                marge = self.settings.parametres['marge_valeur']
-                marge_type = f"{marge}€"
-            
-            prix_max = prix_apres_commission - marge
-            
-            return {
-                'prix_revente': prix_rev,
-                'cout_reparations': cout_rep,
-                'temps_reparations': temps_rep,
-                'tarif_horaire': self.settings.parametres['tarif_horaire'],
-                'cout_main_oeuvre': cout_main_oeuvre,
-                'cout_total_reparations': cout_total_reparations,
-                'prix_net': prix_net,
-                'commission_taux': self.settings.parametres['commission_enchere'],
-                'commission_montant': commission,
-                'frais_fixes': self.settings.parametres['frais_fixes'],
-                'prix_apres_commission': prix_apres_commission,
-                'marge_type': marge_type,
-                'marge_montant': marge,
-                'prix_max': max(0, prix_max),
-                'rentable': prix_max > 0
-            }
-            
-        except (ValueError, ZeroDivisionError, TypeError):
-            return {
-                'prix_revente': 0, 'cout_reparations': 0, 'temps_reparations': 0,
-                'tarif_horaire': 0, 'cout_main_oeuvre': 0, 'cout_total_reparations': 0,
-                'prix_net': 0, 'commission_taux': 0, 'commission_montant': 0,
-                'frais_fixes': 0, 'prix_apres_commission': 0, 'marge_type': 'N/A',
-                'marge_montant': 0, 'prix_max': 0, 'rentable': False
-            }
+        except (ValueError, TypeError):
+            prix_rev = cout_rep = temps_rep = 0.0
+        
+        moteur = MoteurPrix(self.settings.parametres)
+        calcul = moteur.calculer(prix_rev, cout_rep, temps_rep)
+        cout_total_reparations = cout_rep + calcul['main_oeuvre']
+        
+        return {
+            'prix_revente': prix_rev,
+            'cout_reparations': cout_rep,
+            'temps_reparations': temps_rep,
+            'tarif_horaire': moteur.tarif_horaire,
+            'cout_main_oeuvre': calcul['main_oeuvre'],
+            'cout_total_reparations': cout_total_reparations,
+            'prix_net': prix_rev - cout_total_reparations,
+            'commission_taux': moteur.taux_commission * 100,
+            'commission_montant': calcul['commission_vente'],
+            'prix_apres_commission': prix_rev - cout_total_reparations - calcul['commission_vente'],
+            'marge_type': f"{moteur.marge_securite:.0f}€",
+            'marge_montant': moteur.marge_securite,
+            'prix_max': calcul['prix_max'],
+            'rentable': calcul['prix_max'] > 0
+        }
     
     def formater_kilometrage(self, valeur: str) -> str:
         """Formate automatiquement le kilométrage"""
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Formats d'enregistrement des journées
+
+- lisible : JSON indenté, un véhicule par ligne (défaut, diffable)
+- compact : JSON sans espaces
+- gzip / zstd : JSON compact compressé (zstd si le module zstandard est installé)
+- binaire : enregistrements type-longueur-valeur, véhicules par colonnes
+
+Le fichier garde son extension .json quel que soit le format (listes des
+journées, motifs de la ligne de commande) : le format est reconnu à la
+lecture par les premiers octets, et une journée est réenregistrée dans le
+format de son fichier. JourneesManager.convertir_journee change le format
+d'une journée existante ; le format des nouvelles journées est celui du
+gestionnaire (paramètre « codec_journees » de l'application).
+"""
+
+import gzip
+import json
+import struct
+import zlib
+from typing import Any, Dict, List
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CODECS = ('lisible', 'compact', 'gzip', 'zstd', 'binaire')
+CODEC_DEFAUT = 'lisible'
+LISTES_VEHICULES = ('vehicules_reperage', 'vehicules_achetes')
+
+MAGIE_GZIP = b'\x1f\x8b'
+MAGIE_ZSTD = b'\x28\xb5\x2f\xfd'
+MAGIE_BINAIRE = b'MATJ\x01'  # « Midnight Auction Tool, Journée », version 1
+
+# Enregistrements du format binaire : type (1 octet), longueur (4 octets), valeur
+_ENTETE_ENREGISTREMENT = struct.Struct('<cI')
+_INFOS, _LISTE, _COLONNE_TEXTE, _COLONNE_JSON, _LISTE_JSON = b'I', b'L', b'S', b'J', b'V'
+
+# Encodeur compact (module C) pour les lignes de véhicules
+_ENCODEUR_VEHICULE = json.JSONEncoder(ensure_ascii=False)
+_ENCODEUR_COMPACT = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+def codecs_disponibles() -> List[str]:
+    """Formats utilisables avec les modules installés"""
+    return [codec for codec in CODECS if codec != 'zstd' or zstandard is not None]
+
+def detecter_codec(contenu: bytes) -> str:
+    """Format d'un contenu d'après ses premiers octets"""
+    if contenu.startswith(MAGIE_GZIP):
+        return 'gzip'
+    if contenu.startswith(MAGIE_ZSTD):
+        return 'zstd'
+    if contenu.startswith(MAGIE_BINAIRE[:4]):
+        return 'binaire'
+    return 'lisible' if contenu.lstrip(b'\xef\xbb\xbf')[:2] == b'{\n' else 'compact'
+
+def encoder_journee(donnees: Dict[str, Any], codec: str = CODEC_DEFAUT) -> bytes:
+    """
+    Contenu du fichier d'une journée (dictionnaire de JourneeEnchere.to_dict)
+
+    Raises:
+        ValueError: Format inconnu ou module manquant
+    """
+    if codec == 'lisible':
+        return _encoder_lisible(donnees)
+    if codec == 'compact':
+        return _ENCODEUR_COMPACT.encode(donnees).encode('utf-8')
+    if codec == 'gzip':
+        # mtime=0 : même journée, même contenu (comparaison avec la version de référence)
+        return gzip.compress(_ENCODEUR_COMPACT.encode(donnees).encode('utf-8'), compresslevel=6, mtime=0)
+    if codec == 'zstd':
+        if zstandard is None:
+            raise ValueError("Format zstd indisponible (pip install zstandard)")
+        return zstandard.ZstdCompressor(level=3).compress(_ENCODEUR_COMPACT.encode(donnees).encode('utf-8'))
+    if codec == 'binaire':
+        return _encoder_binaire(donnees)
+    raise ValueError(f"Format de journée inconnu: {codec} (formats: {', '.join(CODECS)})")
+
+def decoder_journee(contenu: bytes) -> Dict[str, Any]:
+    """
+    Dictionnaire d'une journée, quel que soit son format
+
+    Raises:
+        ValueError: Contenu illisible ou module manquant
+    """
+    codec = detecter_codec(contenu)
+    try:
+        if codec == 'gzip':
+            contenu = gzip.decompress(contenu)
+        elif codec == 'zstd':
+            if zstandard is None:
+                raise ValueError("Journée au format zstd : module zstandard non installé")
+            contenu = zstandard.ZstdDecompressor().decompress(contenu)
+        elif codec == 'binaire':
+            return _decoder_binaire(contenu)
+    except (OSError, EOFError, zlib.error, struct.error, IndexError) as e:
+        raise ValueError(f"Journée {codec} illisible: {e}") from e
+    except Exception as e:
+        if zstandard is not None and isinstance(e, zstandard.ZstdError):
+            raise ValueError(f"Journée zstd illisible: {e}") from e
+        raise
+    return json.loads(contenu)
+
+def taille_json(contenu: bytes) -> int:
+    """Taille approximative en JSON d'un contenu, sans le décoder (estimation de la mémoire)"""
+    codec = detecter_codec(contenu)
+    if codec == 'gzip' and len(contenu) >= 4:
+        # Taille décompressée (modulo 4 Go) dans les 4 derniers octets
+        return struct.unpack('<I', contenu[-4:])[0]
+    if codec == 'zstd' and zstandard is not None:
+        taille = zstandard.frame_content_size(contenu)
+        return taille if taille > 0 else len(contenu)
+    if codec != 'binaire':
+        return len(contenu)
+    # Binaire : les noms de champs, guillemets et séparateurs omis à chaque véhicule
+    taille, position = len(contenu), len(MAGIE_BINAIRE)
+    try:
+        while position < len(contenu):
+            type_enregistrement, longueur = _ENTETE_ENREGISTREMENT.unpack_from(contenu, position)
+            position += _ENTETE_ENREGISTREMENT.size
+            if type_enregistrement == _LISTE:
+                description = json.loads(contenu[position:position + longueur])
+                taille += description['nombre'] * sum(len(champ) + 6 for champ in description['champs'])
+            position += longueur
+    except (struct.error, ValueError, KeyError):
+        pass
+    return taille
+
+def lire_fichier_journee(chemin: str) -> Dict[str, Any]:
+    """Dictionnaire de la journée d'un fichier, quel que soit son format"""
+    with open(chemin, 'rb') as f:
+        return decoder_journee(f.read())
+
+# ----------------------------------------------------------------------
+# Lisible
+# ----------------------------------------------------------------------
+
+def _encoder_lisible(donnees: Dict[str, Any]) -> bytes:
+    """
+    JSON d'une journée : informations indentées, puis un véhicule par ligne
+
+    json.dumps(indent=2) passe par l'encodeur Python pur, trois fois plus lent sur
+    un catalogue de plusieurs milliers de lots ; le fichier reste lisible et diffable.
+    """
+    entete = {cle: valeur for cle, valeur in donnees.items() if cle not in LISTES_VEHICULES}
+    morceaux = [json.dumps(entete, indent=2, ensure_ascii=False)[:-2] if entete else "{"]
+    for liste in LISTES_VEHICULES:
+        if liste not in donnees:
+            continue
+        separateur = ",\n" if len(morceaux) > 1 or entete else "\n"
+        vehicules = ",\n    ".join(_ENCODEUR_VEHICULE.encode(v) for v in donnees[liste])
+        morceaux.append(f'{separateur}  "{liste}": [\n    {vehicules}\n  ]' if vehicules else f'{separateur}  "{liste}": []')
+    morceaux.append("\n}")
+    return "".join(morceaux).encode('utf-8')
+
+# ----------------------------------------------------------------------
+# Binaire
+# ----------------------------------------------------------------------
+
+def _enregistrement(morceaux: list, type_enregistrement: bytes, valeur: bytes):
+    morceaux.append(_ENTETE_ENREGISTREMENT.pack(type_enregistrement, len(valeur)))
+    morceaux.append(valeur)
+
+def _encoder_binaire(donnees: Dict[str, Any]) -> bytes:
+    """
+    Informations de la journée en JSON compact, puis chaque liste de véhicules
+    par colonnes : les champs texte (presque tous) sont joints par un octet nul,
+    sans guillemets ni noms de champs répétés à chaque véhicule.
+    """
+    morceaux = [MAGIE_BINAIRE]
+    infos = {cle: valeur for cle, valeur in donnees.items() if cle not in LISTES_VEHICULES}
+    _enregistrement(morceaux, _INFOS, _ENCODEUR_COMPACT.encode(infos).encode('utf-8'))
+    for liste in LISTES_VEHICULES:
+        if liste not in donnees:
+            continue
+        vehicules = donnees[liste]
+        champs = tuple(vehicules[0]) if vehicules and isinstance(vehicules[0], dict) else ()
+        # Colonnes seulement si tous les véhicules ont les mêmes champs dans le même ordre
+        if not champs or not all(isinstance(v, dict) and tuple(v) == champs for v in vehicules):
+            _enregistrement(morceaux, _LISTE_JSON,
+                            _ENCODEUR_COMPACT.encode({'nom': liste, 'vehicules': vehicules}).encode('utf-8'))
+            continue
+        _enregistrement(morceaux, _LISTE, _ENCODEUR_COMPACT.encode(
+            {'nom': liste, 'nombre': len(vehicules), 'champs': champs}).encode('utf-8'))
+        for colonne in zip(*(v.values() for v in vehicules)):
+            if all(type(valeur) is str for valeur in colonne):
+                texte = "\0".join(colonne)
+                if texte.count("\0") == len(colonne) - 1:
+                    _enregistrement(morceaux, _COLONNE_TEXTE, texte.encode('utf-8'))
+                    continue
+            _enregistrement(morceaux, _COLONNE_JSON, _ENCODEUR_COMPACT.encode(colonne).encode('utf-8'))
+    return b"".join(morceaux)
+
+def _decoder_binaire(contenu: bytes) -> Dict[str, Any]:
+    if not contenu.startswith(MAGIE_BINAIRE):
+        raise ValueError(f"Version du format binaire non reconnue ({contenu[4:5].hex()})")
+    donnees: Dict[str, Any] = {}
+    position = len(MAGIE_BINAIRE)
+    liste, champs, nombre, colonnes = None, (), 0, []
+
+    def terminer_liste():
+        if liste is None:
+            return
+        if len(colonnes) != len(champs):
+            raise ValueError(f"{liste}: {len(colonnes)} colonnes pour {len(champs)} champs")
+        donnees[liste] = [dict(zip(champs, ligne)) for ligne in zip(*colonnes)] if champs else []
+        if len(donnees[liste]) != nombre:
+            raise ValueError(f"{liste}: {len(donnees[liste])} véhicules au lieu de {nombre}")
+
+    while position < len(contenu):
+        type_enregistrement, longueur = _ENTETE_ENREGISTREMENT.unpack_from(contenu, position)
+        position += _ENTETE_ENREGISTREMENT.size
+        valeur = contenu[position:position + longueur]
+        if len(valeur) != longueur:
+            raise ValueError("Journée binaire tronquée")
+        position += longueur
+
+        if type_enregistrement == _COLONNE_TEXTE:
+            colonnes.append(valeur.decode('utf-8').split("\0") if nombre else [])
+        elif type_enregistrement == _COLONNE_JSON:
+            colonnes.append(json.loads(valeur))
+        elif type_enregistrement == _INFOS:
+            donnees.update(json.loads(valeur))
+        elif type_enregistrement in (_LISTE, _LISTE_JSON):
+            terminer_liste()
+            description = json.loads(valeur)
+            if type_enregistrement == _LISTE_JSON:
+                liste = None
+                donnees[description['nom']] = description['vehicules']
+            else:
+                liste, champs, nombre, colonnes = description['nom'], description['champs'], description['nombre'], []
+        # Type inconnu (version plus récente) : enregistrement ignoré
+    terminer_liste()
+    return donnees
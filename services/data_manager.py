@@ -2,16 +2,19 @@
 # -*- coding: utf-8 -*-
 """
 Service de gestion des données véhicules
+
+Aucune boîte de dialogue : les opérations retournent leur résultat (et le
+message d'erreur éventuel), affichés par l'interface ou la ligne de commande.
 """
 
-import json
-import csv
 import os
 from typing import List, Optional
-from tkinter import filedialog, messagebox
 
 from models.vehicule import Vehicule
 from config.settings import AppSettings
+from services.codecs_journee import decoder_journee, detecter_codec, encoder_journee
+from services.exports_journee import exporter_csv_reperage
+from services.moteur_prix import MoteurPrix
 
 class DataManager:
     """Gestionnaire des données véhicules"""
@@ -20,6 +23,7 @@ class DataManager:
         self.settings = settings
         self.vehicules_reperage: List[Vehicule] = []
         self.vehicules_achetes: List[Vehicule] = []
+        self.derniere_erreur = ""
     
     def charger_donnees(self) -> bool:
         """Charge les données depuis le fichier JSON"""
@@ -27,8 +31,8 @@ class DataManager:
             if not os.path.exists(self.settings.fichier_donnees):
                 return True  # Pas de fichier = première utilisation
             
-            with open(self.settings.fichier_donnees, 'r', encoding='utf-8') as f:
-                donnees = json.load(f)
+            with open(self.settings.fichier_donnees, 'rb') as f:
+                donnees = decoder_journee(f.read())
             
             # Charger véhicules de repérage
             vehicules_rep_data = donnees.get('vehicules_reperage', [])
@@ -53,27 +57,35 @@ class DataManager:
                 'vehicules_achetes': [v.to_dict() for v in self.vehicules_achetes]
             }
             
-            with open(self.settings.fichier_donnees, 'w', encoding='utf-8') as f:
-                json.dump(donnees, f, indent=2, ensure_ascii=False)
+            # Le fichier garde son format (JSON lisible par défaut, voir services/codecs_journee.py)
+            codec = 'lisible'
+            if os.path.exists(self.settings.fichier_donnees):
+                with open(self.settings.fichier_donnees, 'rb') as f:
+                    codec = detecter_codec(f.read(8))
+            with open(self.settings.fichier_donnees, 'wb') as f:
+                f.write(encoder_journee(donnees, codec))
             
             return True
             
         except Exception as e:
             print(f"❌ Erreur sauvegarde données: {e}")
-            messagebox.showerror("Erreur", f"Sauvegarde impossible: {e}")
+            self.derniere_erreur = f"Sauvegarde impossible: {e}"
             return False
     
-    def ajouter_vehicule_reperage(self, vehicule: Vehicule) -> bool:
-        """Ajoute un véhicule en repérage"""
+    def ajouter_vehicule_reperage(self, vehicule: Vehicule) -> tuple[bool, str]:
+        """
+        Ajoute un véhicule en repérage
+        
+        Returns:
+            tuple[bool, str]: (succès, message)
+        """
         valide, message = vehicule.valider()
         if not valide:
-            messagebox.showerror("Erreur", message)
-            return False
+            return False, message
         
         # Vérifier unicité du lot
         if self.vehicule_existe(vehicule.lot):
-            messagebox.showerror("Erreur", f"Le lot {vehicule.lot} existe déjà")
-            return False
+            return False, f"Le lot {vehicule.lot} existe déjà"
         
         self.vehicules_reperage.append(vehicule)
         
@@ -82,7 +94,9 @@ class DataManager:
             vehicule.marquer_achete()
             self.transferer_vers_achetes(vehicule)
         
-        return self.sauvegarder_donnees()
+        if not self.sauvegarder_donnees():
+            return False, self.derniere_erreur
+        return True, f"Lot {vehicule.lot} ajouté"
     
     def vehicule_existe(self, lot: str) -> bool:
         """Vérifie si un véhicule avec ce lot existe déjà"""
@@ -161,54 +175,23 @@ class DataManager:
         
         return False
     
-    def exporter_csv(self) -> bool:
-        """Exporte les données vers un fichier CSV"""
-        if not self.vehicules_reperage:
-            messagebox.showwarning("Attention", "Aucun véhicule à exporter")
-            return False
-        
-        try:
-            fichier = filedialog.asksaveasfilename(
-                defaultextension=".csv",
-                filetypes=[("Fichier CSV", "*.csv"), ("Tous les fichiers", "*.*")],
-                title="Enregistrer le tableau"
-            )
-            
-            if not fichier:
-                return False
-            
-            with open(fichier, 'w', newline='', encoding='utf-8-sig') as csvfile:
-                writer = csv.writer(csvfile, delimiter=';')
-                
-                # En-têtes
-                headers = [
-                    "N° Lot", "Marque", "Modèle", "Année", "Kilométrage", 
-                    "À Faire", "Coût Réparations", "Temps Réparations", 
-                    "Prix Revente", "Prix Max Achat", "Prix Achat", "Statut", "Marge"
-                ]
-                writer.writerow(headers)
-                
-                # Données
-                for vehicule in self.vehicules_reperage:
-                    writer.writerow(vehicule.to_csv_row())
-            
-            messagebox.showinfo(
-                "📄 Export réussi", 
-                f"Tableau exporté vers:\n{fichier}\n\nPrêt pour impression !"
-            )
-            return True
-            
-        except Exception as e:
-            messagebox.showerror("❌ Erreur", f"Erreur lors de l'export: {e}")
-            return False
+    def exporter_csv(self, chemin: str) -> tuple[bool, str]:
+        """Exporte le tableau de repérage vers un fichier CSV"""
+        return exporter_csv_reperage(chemin, self.vehicules_reperage, self.settings.parametres)
+    
+    def calculer_marges(self, vehicules: List[Vehicule]) -> List[float]:
+        """Marges complètes des véhicules (0 tant qu'un véhicule n'est pas vendu)"""
+        calculs = MoteurPrix(self.settings.parametres).calculer_vehicules(vehicules)
+        return [float(marge) for marge in calculs['marge_complete']]
     
     def get_statistiques(self) -> dict:
         """Retourne les statistiques des véhicules"""
         total_reperage = len(self.vehicules_reperage)
         total_achetes = len(self.vehicules_achetes)
         
-        # Calculer marges
-        marges = [v.calculer_marge() for v in self.vehicules_achetes if v.a_prix_achat()]
+        # Calculer marges (complètes, en un lot)
+        achetes = [v for v in self.vehicules_achetes if v.a_prix_achat()]
+        marges = self.calculer_marges(achetes)
         marge_totale = sum(marges) if marges else 0
         marge_moyenne = marge_totale / len(marges) if marges else 0
         
@@ -221,7 +204,7 @@ class DataManager:
             'vehicules_a_perte': len([v for v in self.vehicules_achetes if not v.est_rentable() and v.a_prix_achat()])
         }
 
-    def ajouter_vehicule(self, vehicule: Vehicule) -> bool:
+    def ajouter_vehicule(self, vehicule: Vehicule) -> tuple[bool, str]:
         """Alias pour ajouter_vehicule_reperage"""
         return self.ajouter_vehicule_reperage(vehicule)
 
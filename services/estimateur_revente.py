@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Estimation du prix de revente par plus proches voisins
+
+Les annonces de l'historique sont indexées par modèle dans une grille
+(année × tranche de kilométrage). Le prix d'un véhicule est estimé à partir
+des k annonces les plus proches en année et en kilométrage, avec un
+intervalle de prédiction déduit de la dispersion de ces voisins.
+Une grille est construite une fois par modèle puis réutilisée, ce qui permet
+d'estimer à chaque frappe dans le formulaire de saisie.
+"""
+
+import heapq
+import math
+import os
+import re
+import sys
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# Ajouter le chemin du script de scraping (historique des prix)
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'script_scraping_leboncoin'))
+
+from price_history import PriceHistory, normaliser_modele
+
+# Un an d'écart « vaut » autant que KM_PAR_ANNEE km d'écart
+KM_PAR_ANNEE = 15000
+# Quantile normal de l'intervalle de prédiction à 90 %
+Z_90 = 1.645
+# Au-delà de cette distance (en années équivalentes), une annonce n'est plus comparable
+DISTANCE_MAX = 3.0
+
+_RE_ANNEE = re.compile(r'(19|20)\d{2}')
+_RE_NON_CHIFFRE = re.compile(r'[^\d]')
+
+class GrilleAnnonces:
+    """Index spatial (année, kilométrage) des annonces d'un modèle"""
+
+    def __init__(self, annonces: List[Dict], km_par_annee: int = KM_PAR_ANNEE):
+        """
+        Args:
+            annonces: Annonces {'annee', 'kilometrage', 'prix'}
+            km_par_annee: Largeur d'une cellule en kilométrage (une cellule = un an)
+        """
+        self.km_par_annee = km_par_annee
+        self.cellules: Dict[Tuple[int, int], List[Tuple[float, float, int]]] = {}
+        self.nombre = 0
+        for annonce in annonces:
+            x = float(annonce['annee'])
+            y = annonce['kilometrage'] / km_par_annee
+            self.cellules.setdefault((int(x), int(y)), []).append((x, y, annonce['prix']))
+            self.nombre += 1
+
+        if self.cellules:
+            xs = [c[0] for c in self.cellules]
+            ys = [c[1] for c in self.cellules]
+            self.bornes = (min(xs), max(xs), min(ys), max(ys))
+
+    def voisins(self, annee: float, kilometrage: float, k: int,
+                distance_max: Optional[float] = None) -> List[Tuple[float, int]]:
+        """
+        k plus proches annonces (distance en « années équivalentes »)
+
+        Parcours en anneaux de cellules autour du point : on s'arrête dès que
+        l'anneau suivant ne peut plus contenir d'annonce plus proche que la k-ième
+        (ou que distance_max).
+
+        Returns:
+            Liste de (distance, prix) triée par distance croissante
+        """
+        if not self.nombre:
+            return []
+        x, y = float(annee), kilometrage / self.km_par_annee
+        cx, cy = int(math.floor(x)), int(math.floor(y))
+        x_min, x_max, y_min, y_max = self.bornes
+        rayon_max = max(abs(cx - x_min), abs(cx - x_max), abs(cy - y_min), abs(cy - y_max))
+        if distance_max is not None:
+            rayon_max = min(rayon_max, int(distance_max) + 1)
+
+        meilleurs: List[Tuple[float, int]] = []  # tas max (distance négative)
+        for rayon in range(rayon_max + 1):
+            # Toute annonce d'un anneau de rayon r est à une distance >= r - 1
+            if len(meilleurs) >= k and -meilleurs[0][0] <= rayon - 1:
+                break
+            for i in range(cx - rayon, cx + rayon + 1):
+                for j in range(cy - rayon, cy + rayon + 1):
+                    if max(abs(i - cx), abs(j - cy)) != rayon:
+                        continue
+                    for ax, ay, prix in self.cellules.get((i, j), ()):
+                        distance = math.hypot(ax - x, ay - y)
+                        if distance_max is not None and distance > distance_max:
+                            continue
+                        if len(meilleurs) < k:
+                            heapq.heappush(meilleurs, (-distance, prix))
+                        elif distance < -meilleurs[0][0]:
+                            heapq.heapreplace(meilleurs, (-distance, prix))
+        return sorted((-d, prix) for d, prix in meilleurs)
+
+def estimer_depuis_voisins(voisins: List[Tuple[float, int]]) -> Optional[Dict]:
+    """
+    Prix estimé (moyenne pondérée par la proximité) et intervalle de prédiction à 90 %
+
+    Returns:
+        {'prix', 'bas', 'haut', 'nombre', 'distance_max'} ou None sans voisin
+    """
+    if not voisins:
+        return None
+    poids = [1.0 / (0.5 + distance) for distance, _ in voisins]
+    total = sum(poids)
+    moyenne = sum(p * prix for p, (_, prix) in zip(poids, voisins)) / total
+
+    n = len(voisins)
+    if n > 1:
+        variance = sum(p * (prix - moyenne) ** 2 for p, (_, prix) in zip(poids, voisins)) / total
+        # Intervalle de prédiction d'un nouveau véhicule : dispersion + incertitude sur la moyenne
+        demi_largeur = Z_90 * math.sqrt(variance * n / (n - 1)) * math.sqrt(1 + 1 / n)
+    else:
+        demi_largeur = moyenne * 0.25  # Un seul comparable : intervalle large par défaut
+
+    return {
+        'prix': int(round(moyenne)),
+        'bas': int(max(0, round(moyenne - demi_largeur))),
+        'haut': int(round(moyenne + demi_largeur)),
+        'nombre': n,
+        'distance_max': round(voisins[-1][0], 2)
+    }
+
+class EstimateurRevente:
+    """Estimateur de prix de revente par modèle, à partir de l'historique des annonces"""
+
+    # Nombre maximal de grilles de modèles gardées en mémoire
+    MAX_GRILLES = 64
+
+    def __init__(self, historique: PriceHistory, k: int = 15, jours: float = 180,
+                 distance_max: float = DISTANCE_MAX):
+        """
+        Args:
+            historique: Historique des annonces
+            k: Nombre de comparables utilisés
+            jours: Ancienneté maximale des annonces prises en compte
+            distance_max: Distance maximale d'un comparable (années équivalentes)
+        """
+        self.historique = historique
+        self.k = k
+        self.jours = jours
+        self.distance_max = distance_max
+        self.grilles: Dict[str, Tuple[int, GrilleAnnonces]] = {}  # modèle -> (version, grille)
+        self.lock = threading.Lock()
+
+    def _grille(self, modele: str) -> GrilleAnnonces:
+        """Grille du modèle, reconstruite seulement si l'historique a changé"""
+        cle = normaliser_modele(modele)
+        version = self.historique.version
+        with self.lock:
+            entree = self.grilles.get(cle)
+            if entree is not None and entree[0] == version:
+                return entree[1]
+        grille = GrilleAnnonces(self.historique.annonces(modele, jours=self.jours))
+        with self.lock:
+            # Borne le nombre de grilles (la saisie crée des clés intermédiaires)
+            while len(self.grilles) >= self.MAX_GRILLES:
+                del self.grilles[next(iter(self.grilles))]
+            self.grilles[cle] = (version, grille)
+        return grille
+
+    def estimer(self, modele: str, annee, kilometrage) -> Optional[Dict]:
+        """
+        Estime le prix de revente d'un véhicule
+
+        Args:
+            modele: Texte du modèle (ex: "Renault Clio")
+            annee: Année (texte ou nombre)
+            kilometrage: Kilométrage (texte ou nombre, ex: "120,000km")
+
+        Returns:
+            {'prix', 'bas', 'haut', 'nombre', 'distance_max'} ou None si
+            l'année est inconnue ou si aucun comparable n'existe
+        """
+        if not normaliser_modele(modele):
+            return None
+        match = _RE_ANNEE.search(str(annee or ''))
+        if not match:
+            return None
+        chiffres = _RE_NON_CHIFFRE.sub('', str(kilometrage or ''))
+        if not chiffres:
+            return None
+
+        grille = self._grille(modele)
+        return estimer_depuis_voisins(grille.voisins(int(match.group(0)), int(chiffres), self.k, self.distance_max))
+
+    def estimer_vehicule(self, vehicule) -> Optional[Dict]:
+        """Estime le prix de revente d'un véhicule du repérage"""
+        return self.estimer(f"{vehicule.marque} {vehicule.modele}", vehicule.annee, vehicule.kilometrage)
+
+# Historique et estimateur partagés par l'application
+_historique_partage: Optional[PriceHistory] = None
+_estimateur_partage: Optional[EstimateurRevente] = None
+_verrou_partage = threading.Lock()
+
+def get_historique_partage() -> Optional[PriceHistory]:
+    """Retourne l'historique des prix partagé (None s'il ne peut pas être ouvert)"""
+    global _historique_partage
+    with _verrou_partage:
+        if _historique_partage is None:
+            try:
+                _historique_partage = PriceHistory()
+            except Exception as e:
+                print(f"⚠️ Historique des prix indisponible: {e}")
+                return None
+        return _historique_partage
+
+def get_estimateur_partage() -> Optional[EstimateurRevente]:
+    """Retourne l'estimateur partagé (None sans historique)"""
+    global _estimateur_partage
+    historique = get_historique_partage()
+    if historique is None:
+        return None
+    with _verrou_partage:
+        if _estimateur_partage is None:
+            _estimateur_partage = EstimateurRevente(historique)
+        return _estimateur_partage
@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Exports d'une journée (CSV, PDF, JSON) sans interface graphique
+
+Utilisés par les onglets, après le choix du fichier, et par la ligne de commande
+(cli.py). Chaque export retourne (succès, message) : c'est à l'appelant de
+l'afficher dans une boîte de dialogue ou dans la console.
+"""
+
+import csv
+import re
+from datetime import datetime
+from typing import Dict, Sequence
+
+from services.codecs_journee import encoder_journee
+from services.moteur_prix import MoteurPrix
+
+try:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib import colors
+    from reportlab.lib.units import inch
+except ImportError:
+    SimpleDocTemplate = None
+
+# Colonnes de Vehicule.to_csv_row
+ENTETES_CSV_REPERAGE = [
+    "N° Lot", "Marque", "Modèle", "Année", "Kilométrage", "Motorisation", "À Faire", "Coût Réparations",
+    "Temps Réparations", "Prix Revente", "Prix Max Achat", "Prix Achat", "Statut", "Marge", "Champ libre",
+    "Réservé pros", "Couleur"
+]
+
+def _extraire_numero_lot(lot: str) -> int:
+    """Extrait le numéro du lot pour le tri (gère les lots numériques et alphanumériques)"""
+    # Chercher un nombre dans le lot
+    match = re.search(r'\d+', str(lot))
+    if match:
+        return int(match.group())
+    # Si pas de nombre, retourner 0 pour les lots sans numéro
+    return 0
+
+def _get_couleur_symbole(couleur: str) -> str:
+    """Retourne un symbole coloré pour la colonne couleur"""
+    symboles = {
+        'turquoise': '●',
+        'vert': '●', 
+        'orange': '●',
+        'rouge': '●'
+    }
+    return symboles.get(couleur, '●')
+
+def _get_couleur_bg(couleur: str):
+    """Retourne la couleur de fond correspondante pour le PDF"""
+    couleurs_bg = {
+        'turquoise': colors.HexColor('#1ABC9C'),
+        'vert': colors.HexColor('#2ECC71'),
+        'orange': colors.HexColor('#F39C12'), 
+        'rouge': colors.HexColor('#E74C3C')
+    }
+    return couleurs_bg.get(couleur, colors.HexColor('#1ABC9C'))
+
+def exporter_csv_reperage(chemin: str, vehicules: Sequence, parametres: Dict) -> tuple[bool, str]:
+    """Exporte le tableau de repérage en CSV (séparateur ;)"""
+    if not vehicules:
+        return False, "Aucun véhicule à exporter"
+    try:
+        with open(chemin, 'w', newline='', encoding='utf-8-sig') as csvfile:
+            writer = csv.writer(csvfile, delimiter=';')
+            writer.writerow(ENTETES_CSV_REPERAGE)
+            for vehicule in vehicules:
+                writer.writerow(vehicule.to_csv_row(parametres))
+        return True, f"Tableau exporté vers:\n{chemin}"
+    except Exception as e:
+        return False, f"Erreur lors de l'export: {e}"
+
+def exporter_csv_achetes(chemin: str, vehicules: Sequence, parametres: Dict) -> tuple[bool, str]:
+    """Exporte les véhicules achetés en CSV (marges complètes, mêmes calculs que le tableau)"""
+    try:
+        with open(chemin, 'w', newline='', encoding='utf-8-sig') as csvfile:
+            writer = csv.writer(csvfile, delimiter=';')
+            
+            # En-têtes
+            writer.writerow([
+                "N° LOT", "MARQUE", "MODÈLE", "ANNÉE", "PRIX ACHAT", 
+                "PRIX MAX", "PRIX VENTE", "MARGE €", "MARGE %", "DATE ACHAT", "KM", "MOTORISATION"
+            ])
+            
+            calculs = MoteurPrix(parametres).calculer_vehicules(vehicules)
+            for index, vehicule in enumerate(vehicules):
+                marge_euros = float(calculs['marge_complete'][index])
+                marge_pourcentage = float(calculs['marge_pourcentage'][index])
+                
+                writer.writerow([
+                    vehicule.lot,
+                    vehicule.marque,
+                    vehicule.modele,
+                    vehicule.annee,
+                    vehicule.prix_achat,
+                    vehicule.prix_max_achat,
+                    vehicule.prix_revente,
+                    f"{marge_euros:+.0f}",
+                    f"{marge_pourcentage:+.1f}",
+                    vehicule.date_achat if vehicule.date_achat else "",
+                    vehicule.kilometrage,
+                    vehicule.motorisation
+                ])
+        return True, f"Export réussi vers:\n{chemin}"
+    except Exception as e:
+        return False, f"Erreur lors de l'export: {e}"
+
+def exporter_pdf_reperage(chemin: str, vehicules: Sequence, parametres: Dict, nom_journee: str = "") -> tuple[bool, str]:
+    """Exporte les véhicules en repérage vers un fichier PDF professionnel"""
+    if SimpleDocTemplate is None:
+        return False, "Export PDF impossible : la bibliothèque 'reportlab' n'est pas installée"
+    try:
+        # Créer le document PDF avec marges
+        doc = SimpleDocTemplate(
+            chemin, 
+            pagesize=A4,
+            rightMargin=50,
+            leftMargin=50,
+            topMargin=50,
+            bottomMargin=50
+        )
+        elements = []
+        styles = getSampleStyleSheet()
+
+        # Style personnalisé pour le titre
+        title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=18,
+            textColor=colors.HexColor('#2196F3'),
+            spaceAfter=30,
+            alignment=1  # Centré
+        )
+
+        # Récupérer le nom de la journée
+        journee_nom = nom_journee or "Enchère"
+
+        # Titre principal
+        titre = f"🔍 RAPPORT VÉHICULES EN REPÉRAGE - {journee_nom.upper()}"
+        elements.append(Paragraph(titre, title_style))
+
+        # Date du rapport
+        date_rapport = datetime.now().strftime("%d/%m/%Y à %H:%M")
+        date_style = ParagraphStyle(
+            'DateStyle',
+            parent=styles['Normal'],
+            fontSize=10,
+            textColor=colors.grey,
+            alignment=1,
+            spaceAfter=20
+        )
+        elements.append(Paragraph(f"Rapport généré le {date_rapport}", date_style))
+
+        # Récupérer la marge de sécurité
+        marge_securite = parametres.get('marge_securite', 200.0)
+
+        # Statistiques avec marge de sécurité en rouge
+        nb_reperage = len(vehicules)
+        prix_max_total = sum(v.get_prix_numerique('prix_max_achat') for v in vehicules)
+        prix_revente_total = sum(v.get_prix_numerique('prix_revente') for v in vehicules if v.prix_revente and v.prix_revente.strip())
+        marge_potentielle_total = sum(
+            v.get_prix_numerique('prix_revente') - v.get_prix_numerique('prix_max_achat') 
+            for v in vehicules 
+            if v.prix_revente and v.prix_revente.strip() and v.prix_max_achat and v.prix_max_achat.strip()
+        )
+
+        stats_text = f"""
+        <b>📊 STATISTIQUES DE REPÉRAGE</b><br/>
+        • Nombre de véhicules en repérage : <b>{nb_reperage}</b><br/>
+        • Budget maximum total : <b>{prix_max_total:,.0f}€</b><br/>
+        • Potentiel de revente total : <b>{prix_revente_total:,.0f}€</b><br/>
+        • Marge potentielle totale : <b>{marge_potentielle_total:+,.0f}€</b><br/>
+        <br/>
+        <font color="red" size="14"><b>🛡️ MARGE DE SÉCURITÉ : {marge_securite:,.0f}€</b></font>
+        """
+
+        stats_style = ParagraphStyle(
+            'StatsStyle',
+            parent=styles['Normal'],
+            fontSize=12,
+            spaceAfter=30,
+            backColor=colors.HexColor('#F5F5F5'),
+            borderColor=colors.HexColor('#2196F3'),
+            borderWidth=1,
+            borderPadding=10
+        )
+        elements.append(Paragraph(stats_text, stats_style))
+        elements.append(Spacer(1, 20))
+
+        # Titre du tableau
+        table_title = Paragraph("<b>📋 DÉTAIL DES VÉHICULES EN REPÉRAGE</b>", styles['Heading2'])
+        elements.append(table_title)
+        elements.append(Spacer(1, 10))
+
+        # Trier les véhicules par numéro de lot (du plus petit au plus grand)
+        vehicules_tries = sorted(
+            vehicules, 
+            key=lambda v: _extraire_numero_lot(v.lot)
+        )
+
+        # Données du tableau avec nouvelle colonne couleur et réservé pro
+        data = [
+            ["LOT", "COULEUR", "MARQUE", "MODÈLE", "ANNÉE", "KM", "MOTORISATION", "PRIX REV", "COÛT RÉP", "TEMPS (h)", "PRIX MAX", "PRO"]
+        ]
+
+        for vehicule in vehicules_tries:
+            prix_revente = vehicule.get_prix_numerique('prix_revente')
+            prix_max = vehicule.get_prix_numerique('prix_max_achat')
+            cout_reparations = vehicule.get_prix_numerique('cout_reparations')
+            temps_reparations = vehicule.get_prix_numerique('temps_reparations')
+
+            # Formater les données avec retour à la ligne si nécessaire
+            def formater_cellule(texte, max_chars=15):
+                """Formate une cellule en ajoutant des retours à la ligne"""
+                if not texte or len(str(texte)) <= max_chars:
+                    return str(texte)
+
+                mots = str(texte).split()
+                lignes = []
+                ligne_actuelle = ""
+
+                for mot in mots:
+                    if len(ligne_actuelle + " " + mot) <= max_chars:
+                        ligne_actuelle = ligne_actuelle + " " + mot if ligne_actuelle else mot
+                    else:
+                        if ligne_actuelle:
+                            lignes.append(ligne_actuelle)
+                        ligne_actuelle = mot
+
+                if ligne_actuelle:
+                    lignes.append(ligne_actuelle)
+
+                return "\n".join(lignes)
+
+            # Créer case couleur (carré unicode coloré)
+            couleur_symbole = _get_couleur_symbole(vehicule.couleur)
+
+            # Réservé aux pros
+            reserve_pro = "OUI" if vehicule.reserve_professionnels else "NON"
+
+            data.append([
+                vehicule.lot,
+                couleur_symbole,
+                formater_cellule(vehicule.marque, 10),
+                formater_cellule(vehicule.modele, 10),
+                vehicule.annee,
+                formater_cellule(vehicule.kilometrage, 8),
+                formater_cellule(vehicule.motorisation, 10),
+                f"{prix_revente:.0f}€" if prix_revente > 0 else "-",
+                f"{cout_reparations:.0f}€" if cout_reparations > 0 else "-",
+                f"{temps_reparations:.0f}h" if temps_reparations > 0 else "-",
+                f"{prix_max:.0f}€" if prix_max > 0 else "-",
+                reserve_pro
+            ])
+
+        # Créer le tableau avec largeurs adaptées
+        table = Table(data, colWidths=[
+            0.5*inch,  # LOT
+            0.4*inch,  # COULEUR
+            0.7*inch,  # MARQUE  
+            0.7*inch,  # MODÈLE
+            0.4*inch,  # ANNÉE
+            0.6*inch,  # KM
+            0.7*inch,  # MOTORISATION
+            0.6*inch,  # PRIX REV
+            0.6*inch,  # COÛT RÉP
+            0.5*inch,  # TEMPS
+            0.6*inch,  # PRIX MAX
+            0.4*inch   # PRO
+        ])
+
+        # Style du tableau
+        table_style = [
+            # En-tête
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2196F3')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 7),  # Police plus petite pour en-têtes
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+
+            # Corps du tableau
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 6),  # Police plus petite pour contenu
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),  # Grille plus fine
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),  # Alignement vertical en haut
+
+            # Alternance de couleurs pour les lignes
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F8F9FA')])
+        ]
+
+        # Ajouter les couleurs de fond pour les cases couleur
+        for i, vehicule in enumerate(vehicules_tries):
+            row_idx = i + 1  # +1 car la première ligne est l'en-tête
+            couleur_bg = _get_couleur_bg(vehicule.couleur)
+            table_style.append(('BACKGROUND', (1, row_idx), (1, row_idx), couleur_bg))
+
+        table.setStyle(TableStyle(table_style))
+        elements.append(table)
+
+        # Section descriptions si présentes
+        descriptions_avec_vehicules = [
+            (v, v.chose_a_faire) for v in vehicules_tries  # Utiliser la liste triée
+            if v.chose_a_faire and v.chose_a_faire.strip()
+        ]
+
+        if descriptions_avec_vehicules:
+            elements.append(Spacer(1, 30))
+            desc_title = Paragraph("<b>🔧 DESCRIPTIONS DES RÉPARATIONS</b>", styles['Heading2'])
+            elements.append(desc_title)
+            elements.append(Spacer(1, 10))
+
+            for vehicule, description in descriptions_avec_vehicules:
+                desc_text = f"<b>Lot {vehicule.lot} ({vehicule.marque} {vehicule.modele}):</b> {description}"
+                desc_para = Paragraph(desc_text, styles['Normal'])
+                elements.append(desc_para)
+                elements.append(Spacer(1, 5))
+
+        # Pied de page
+        elements.append(Spacer(1, 30))
+        footer_style = ParagraphStyle(
+            'FooterStyle',
+            parent=styles['Normal'],
+            fontSize=8,
+            textColor=colors.grey,
+            alignment=1
+        )
+        footer_text = f"Gestionnaire d'Enchères - Rapport de repérage généré automatiquement - {date_rapport}"
+        elements.append(Paragraph(footer_text, footer_style))
+
+        # Construire le document
+        # Construire le document
+        doc.build(elements)
+        return True, f"Export PDF réussi vers:\n{chemin}"
+    except Exception as e:
+        return False, f"Erreur lors de l'export PDF: {e}"
+
+def exporter_pdf_achetes(chemin: str, vehicules: Sequence, parametres: Dict, nom_journee: str = "") -> tuple[bool, str]:
+    """Exporte les véhicules achetés vers un fichier PDF professionnel"""
+    if SimpleDocTemplate is None:
+        return False, "Export PDF impossible : la bibliothèque 'reportlab' n'est pas installée"
+    try:
+        # Créer le document PDF avec marges
+        doc = SimpleDocTemplate(
+            chemin, 
+            pagesize=A4,
+            rightMargin=50,
+            leftMargin=50,
+            topMargin=50,
+            bottomMargin=50
+        )
+        elements = []
+        styles = getSampleStyleSheet()
+
+        # Style personnalisé pour le titre
+        title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=18,
+            textColor=colors.HexColor('#2E86AB'),
+            spaceAfter=30,
+            alignment=1  # Centré
+        )
+
+        # Récupérer le nom de la journée
+        journee_nom = nom_journee or "Enchère"
+
+        # Titre principal
+        titre = f"🏆 RAPPORT VÉHICULES ACHETÉS - {journee_nom.upper()}"
+        elements.append(Paragraph(titre, title_style))
+
+        # Date du rapport
+        date_rapport = datetime.now().strftime("%d/%m/%Y à %H:%M")
+        date_style = ParagraphStyle(
+            'DateStyle',
+            parent=styles['Normal'],
+            fontSize=10,
+            textColor=colors.grey,
+            alignment=1,
+            spaceAfter=20
+        )
+        elements.append(Paragraph(f"Rapport généré le {date_rapport}", date_style))
+
+        # Statistiques
+        nb_achetes = len(vehicules)
+        total_investissement = sum(v.get_prix_numerique('prix_achat') for v in vehicules)
+        # Marge réelle si vendu, sinon marge prévue sur le prix de revente estimé
+        calculs = MoteurPrix(parametres).calculer_vehicules(vehicules)
+        marges = [
+            float(calculs['marge_complete'][i]) if v.get_prix_numerique('prix_vente_final') > 0
+            else float(calculs['marge_prevue'][i])
+            for i, v in enumerate(vehicules)
+        ]
+        total_marge = sum(marges)
+        marge_moyenne = total_marge / nb_achetes if nb_achetes > 0 else 0
+
+        stats_text = f"""
+        <b>📊 STATISTIQUES</b><br/>
+        • Nombre de véhicules achetés : <b>{nb_achetes}</b><br/>
+        • Investissement total : <b>{total_investissement:,.0f}€</b><br/>
+        • Marge totale : <b>{total_marge:+,.0f}€</b><br/>
+        • Marge moyenne : <b>{marge_moyenne:+,.0f}€</b>
+        """
+
+        stats_style = ParagraphStyle(
+            'StatsStyle',
+            parent=styles['Normal'],
+            fontSize=12,
+            spaceAfter=30,
+            backColor=colors.HexColor('#F5F5F5'),
+            borderColor=colors.HexColor('#2E86AB'),
+            borderWidth=1,
+            borderPadding=10
+        )
+        elements.append(Paragraph(stats_text, stats_style))
+        elements.append(Spacer(1, 20))
+
+        # Titre du tableau
+        table_title = Paragraph("<b>📋 DÉTAIL DES VÉHICULES</b>", styles['Heading2'])
+        elements.append(table_title)
+        elements.append(Spacer(1, 10))
+
+        # Données du tableau
+        data = [
+            ["LOT", "MARQUE", "MODÈLE", "ANNÉE", "PRIX ACHAT", "PRIX VENTE", "MARGE", "DATE"]
+        ]
+
+        for vehicule, marge in zip(vehicules, marges):
+            prix_achat = vehicule.get_prix_numerique('prix_achat')
+            prix_revente = vehicule.get_prix_numerique('prix_vente_final') or vehicule.get_prix_numerique('prix_revente')
+
+            # Fonction pour formater avec retour à la ligne
+            def formater_cellule(texte, max_chars=12):
+                """Formate une cellule en ajoutant des retours à la ligne"""
+                if not texte or len(str(texte)) <= max_chars:
+                    return str(texte)
+
+                mots = str(texte).split()
+                lignes = []
+                ligne_actuelle = ""
+
+                for mot in mots:
+                    if len(ligne_actuelle + " " + mot) <= max_chars:
+                        ligne_actuelle = ligne_actuelle + " " + mot if ligne_actuelle else mot
+                    else:
+                        if ligne_actuelle:
+                            lignes.append(ligne_actuelle)
+                        ligne_actuelle = mot
+
+                if ligne_actuelle:
+                    lignes.append(ligne_actuelle)
+
+                return "\n".join(lignes)
+
+            # Marge (calculée par le moteur de prix)
+            if prix_revente > 0:
+                marge_str = f"{marge:+.0f}€"
+                prix_revente_str = f"{prix_revente:.0f}€"
+            else:
+                marge_str = "En attente"
+                prix_revente_str = "-"
+
+            # Formater la date
+            date_formatee = vehicule.date_achat if vehicule.date_achat else "N/A"
+            if len(date_formatee) > 8:
+                date_formatee = date_formatee[:8] + "..."
+
+            data.append([
+                vehicule.lot,
+                formater_cellule(vehicule.marque, 10),
+                formater_cellule(vehicule.modele, 10),
+                vehicule.annee,
+                f"{prix_achat:.0f}€",
+                prix_revente_str,
+                marge_str,
+                date_formatee
+            ])
+
+        # Créer le tableau avec largeurs adaptées
+        table = Table(data, colWidths=[
+            0.6*inch,  # LOT
+            0.9*inch,  # MARQUE  
+            0.9*inch,  # MODÈLE
+            0.6*inch,  # ANNÉE
+            0.8*inch,  # PRIX ACHAT
+            0.8*inch,  # PRIX VENTE
+            0.8*inch,  # MARGE
+            0.7*inch   # DATE
+        ])
+
+        # Style du tableau
+        table.setStyle(TableStyle([
+            # En-tête
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E86AB')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 8),  # Police plus petite pour en-têtes
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+
+            # Corps du tableau
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 7),  # Police plus petite pour contenu
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),  # Grille plus fine
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),  # Alignement vertical en haut
+
+            # Alternance de couleurs pour les lignes
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F8F9FA')])
+        ]))
+
+        elements.append(table)
+
+        # Pied de page
+        elements.append(Spacer(1, 30))
+        footer_style = ParagraphStyle(
+            'FooterStyle',
+            parent=styles['Normal'],
+            fontSize=8,
+            textColor=colors.grey,
+            alignment=1
+        )
+        footer_text = f"Gestionnaire d'Enchères - Rapport généré automatiquement - {date_rapport}"
+        elements.append(Paragraph(footer_text, footer_style))
+
+        # Construire le document
+        # Construire le document
+        doc.build(elements)
+        return True, f"Export PDF réussi vers:\n{chemin}"
+    except Exception as e:
+        return False, f"Erreur lors de l'export PDF: {e}"
+
+def exporter_json(chemin: str, journee) -> tuple[bool, str]:
+    """Exporte une journée complète en JSON (format des fichiers de journees_data)"""
+    try:
+        with open(chemin, 'wb') as f:
+            f.write(encoder_journee(journee.to_dict(), 'lisible'))
+        return True, f"Journée exportée avec succès vers :\n{chemin}"
+    except Exception as e:
+        return False, f"Erreur lors de l'export : {e}"
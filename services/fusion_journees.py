@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fusion à trois voies de deux versions d'une même journée
+
+Quand une journée a été réécrite par un autre poste depuis qu'on l'a chargée,
+la sauvegarde fusionne :
+- base    : la version chargée (ancêtre commun),
+- locale  : la version à sauvegarder,
+- disque  : la version réécrite par l'autre poste.
+
+Les véhicules sont appariés par numéro de lot (la liste repérage / achetés fait
+partie du véhicule). Un changement d'un seul côté est repris tel quel ; si les
+deux côtés ont changé le même véhicule, la fusion se fait champ par champ et
+seul un champ modifié différemment des deux côtés est un conflit, tranché en
+faveur de la version locale. Un véhicule supprimé d'un côté et modifié de
+l'autre est conservé.
+
+fusionner_catalogue met à jour une journée avec un catalogue réédité par la
+maison de vente, sans toucher à nos estimations.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from models.vehicule import Vehicule
+from services.moteur_prix import MoteurPrix
+
+LISTES = ('vehicules_reperage', 'vehicules_achetes')
+CHAMPS_JOURNEE = ('nom', 'date', 'lieu', 'description')
+
+# Champs fournis par la maison de vente (remplacés quand le catalogue change)
+CHAMPS_CATALOGUE = ('marque', 'modele', 'annee', 'kilometrage', 'motorisation')
+# Champs saisis par nous (seulement complétés s'ils sont vides)
+CHAMPS_ESTIMATIONS = ('prix_revente', 'cout_reparations', 'temps_reparations', 'chose_a_faire', 'champ_libre')
+CHAMPS_PRIX_MAX = ('prix_revente', 'cout_reparations', 'temps_reparations')
+
+def _vehicules_par_lot(donnees: Optional[Dict]) -> Dict[str, Dict]:
+    """{clé: véhicule avec sa liste} ; un lot présent plusieurs fois est numéroté (« 12#2 »)"""
+    vehicules = {}
+    for liste in LISTES:
+        for vehicule in (donnees or {}).get(liste, []):
+            lot = str(vehicule.get('lot', '')).strip()
+            cle, numero = lot, 1
+            while cle in vehicules:
+                numero += 1
+                cle = f"{lot}#{numero}"
+            vehicules[cle] = {**vehicule, '_liste': liste}
+    return vehicules
+
+def _fusionner_valeur(base: Any, locale: Any, disque: Any) -> Tuple[Any, bool]:
+    """Valeur fusionnée et conflit éventuel"""
+    if locale == base:
+        return disque, False
+    if disque == base or disque == locale:
+        return locale, False
+    return locale, True
+
+def _fusionner_dict(base: Dict, locale: Dict, disque: Dict) -> Tuple[Dict, List[str]]:
+    """Fusion clé par clé, champs en conflit"""
+    fusion, conflits = {}, []
+    for cle in list(locale) + [c for c in disque if c not in locale]:
+        valeur, conflit = _fusionner_valeur(base.get(cle), locale.get(cle), disque.get(cle))
+        # Clé retirée d'un côté et inchangée de l'autre : retirée
+        if valeur is not None or (cle in locale and cle in disque):
+            fusion[cle] = valeur
+        if conflit:
+            conflits.append(cle)
+    return fusion, conflits
+
+def fusionner_journees(base: Optional[Dict], locale: Dict, disque: Dict) -> Tuple[Dict, List[str]]:
+    """
+    Fusionne les modifications locales avec celles enregistrées par un autre poste
+
+    Args:
+        base: Journée telle que chargée (None : inconnue, la version locale l'emporte)
+        locale: Journée à sauvegarder (to_dict)
+        disque: Journée actuellement sur le disque
+
+    Returns:
+        (journée fusionnée, conflits lisibles « Lot 12 : prix_max_achat »)
+    """
+    if base is None:
+        base = disque
+    conflits = []
+
+    # Informations et paramètres de la journée
+    fusion = dict(locale)
+    for champ in CHAMPS_JOURNEE:
+        fusion[champ], conflit = _fusionner_valeur(base.get(champ), locale.get(champ), disque.get(champ))
+        if conflit:
+            conflits.append(f"Journée : {champ}")
+    fusion['parametres'], conflits_parametres = _fusionner_dict(
+        base.get('parametres') or {}, locale.get('parametres') or {}, disque.get('parametres') or {})
+    conflits += [f"Paramètres : {p}" for p in conflits_parametres]
+
+    # Véhicules, dans l'ordre local puis ceux ajoutés par l'autre poste
+    vehicules_base = _vehicules_par_lot(base)
+    vehicules_locaux = _vehicules_par_lot(locale)
+    vehicules_disque = _vehicules_par_lot(disque)
+    listes = {liste: [] for liste in LISTES}
+
+    for cle in list(vehicules_locaux) + [c for c in vehicules_disque if c not in vehicules_locaux]:
+        v_base, v_local, v_disque = vehicules_base.get(cle), vehicules_locaux.get(cle), vehicules_disque.get(cle)
+        if v_local == v_base:
+            vehicule = v_disque
+        elif v_disque == v_base or v_disque == v_local:
+            vehicule = v_local
+        elif v_local is None or v_disque is None:
+            # Supprimé d'un côté, modifié de l'autre : on garde la version modifiée
+            vehicule = v_local or v_disque
+        else:
+            vehicule, champs = _fusionner_dict(v_base or {}, v_local, v_disque)
+            conflits += [f"Lot {cle} : {champ}" for champ in champs]
+        if vehicule is not None:
+            vehicule = dict(vehicule)
+            listes[vehicule.pop('_liste')].append(vehicule)
+
+    fusion.update(listes)
+    return fusion, conflits
+
+def cle_lot(lot: Any) -> str:
+    """Clé d'appariement d'un numéro de lot (espaces, casse et zéros initiaux ignorés : « 012 » = « 12 »)"""
+    cle = str(lot).strip().upper()
+    return (cle.lstrip('0') or cle) if cle.isdigit() else cle
+
+def fusionner_catalogue(journee, catalogue: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Met à jour une journée (JourneeEnchere) avec un catalogue réédité, par numéro de lot
+
+    Les champs du catalogue qui ont changé sont remplacés ; nos estimations et
+    notes ne sont que complétées si elles sont vides ; couleurs, réserve pros,
+    achats et prix de vente ne sont jamais modifiés. Les nouveaux lots partent
+    en repérage, les lots retirés du catalogue sont gardés.
+
+    Une ligne sans vrai numéro de lot (« lot_genere » : numéro inventé d'après sa
+    position par la lecture d'un PDF sans colonne de lot) est ignorée : une ligne
+    décalée dans le catalogue réédité changerait sinon l'identité des véhicules.
+
+    Args:
+        journee: Journée à mettre à jour (modifiée sur place)
+        catalogue: Données des véhicules du catalogue (lire_catalogue_csv / lire_catalogue_pdf)
+
+    Returns:
+        {'inseres', 'mis_a_jour', 'inchanges', 'absents', 'ignores'}
+        (ignorés : sans lot, lot inventé ou lot en double)
+    """
+    # Index des véhicules de la journée par lot (le premier d'un lot en double)
+    index = {}
+    for vehicule in journee.vehicules_reperage + journee.vehicules_achetes:
+        index.setdefault(cle_lot(vehicule.lot), vehicule)
+
+    bilan = dict.fromkeys(('inseres', 'mis_a_jour', 'inchanges', 'absents', 'ignores'), 0)
+    vus = set()
+    a_recalculer = []
+    for donnees in catalogue:
+        cle = cle_lot(donnees.get('lot', ''))
+        if not cle or cle in vus or donnees.get('lot_genere'):
+            bilan['ignores'] += 1
+            continue
+        vus.add(cle)
+
+        vehicule = index.get(cle)
+        if vehicule is None:
+            nouveau = Vehicule({c: v for c, v in donnees.items()
+                                if c not in ('prix_achat', 'prix_max_achat', 'statut', 'date_achat')})
+            journee.vehicules_reperage.append(nouveau)
+            a_recalculer.append(nouveau)
+            bilan['inseres'] += 1
+            continue
+
+        modifie = recalcul = False
+        for champ in CHAMPS_CATALOGUE:
+            valeur = str(donnees.get(champ) or '').strip()
+            if valeur and valeur != str(getattr(vehicule, champ) or '').strip():
+                setattr(vehicule, champ, valeur)
+                modifie = True
+        for champ in CHAMPS_ESTIMATIONS:
+            valeur = str(donnees.get(champ) or '').strip()
+            if valeur and not str(getattr(vehicule, champ) or '').strip():
+                setattr(vehicule, champ, valeur)
+                modifie = True
+                recalcul |= champ in CHAMPS_PRIX_MAX
+        if recalcul and not vehicule.est_achete():
+            a_recalculer.append(vehicule)
+        bilan['mis_a_jour' if modifie else 'inchanges'] += 1
+
+    bilan['absents'] = len(index.keys() - vus)
+    if a_recalculer:
+        MoteurPrix(journee.parametres).mettre_a_jour_prix_max(a_recalculer)
+    return bilan
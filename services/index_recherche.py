@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Recherche plein texte dans toutes les journées d'enchères
+
+Chaque véhicule (repérage ou acheté) de chaque journée est un document dont
+les champs lot, marque, modèle, motorisation, « chose à faire » et champ libre
+sont découpés en termes (minuscules, sans accents). L'index inversé
+terme -> (document, occurrences) est conservé dans une base SQLite du dossier
+des journées et mis à jour à chaque sauvegarde : seule la journée sauvegardée
+est réindexée, et seulement si ses textes ont changé.
+
+Une requête renvoie les véhicules contenant tous ses mots, chaque mot pouvant
+être un début de terme (« embray » trouve « embrayage »), classés par BM25.
+
+Stockage : base SQLite (bibliothèque standard), comme l'historique des prix.
+"""
+
+import functools
+import glob
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from typing import Dict, List, Optional
+
+from models.journee_enchere import JourneeEnchere
+from services.analytique_journees import charger_journee, signature_fichier
+
+# Champs indexés de chaque véhicule
+CHAMPS_INDEXES = ('lot', 'marque', 'modele', 'motorisation', 'chose_a_faire', 'champ_libre')
+
+# Mots trop fréquents pour être discriminants
+MOTS_VIDES = {
+    'au', 'aux', 'avec', 'ce', 'de', 'des', 'du', 'en', 'et', 'la', 'le', 'les', 'ou', 'par',
+    'pas', 'pour', 'qui', 'sur', 'un', 'une'
+}
+
+# Paramètres BM25 usuels ; un début de terme compte un peu moins qu'un terme exact
+BM25_K1 = 1.2
+BM25_B = 0.75
+POIDS_PREFIXE = 0.8
+
+def normaliser_texte(texte: str) -> str:
+    """Minuscules sans accents (« Boîte » -> « boite »)"""
+    texte = unicodedata.normalize('NFKD', str(texte).lower())
+    return "".join(c for c in texte if not unicodedata.combining(c))
+
+def decouper_termes(texte: str) -> List[str]:
+    """Termes d'un texte (mots vides et lettres isolées retirés, nombres conservés)"""
+    return [t for t in re.findall(r"[a-z0-9]+", normaliser_texte(texte))
+            if t not in MOTS_VIDES and (len(t) > 1 or t.isdigit())]
+
+@functools.lru_cache(maxsize=65536)
+def _termes_champ(texte: str) -> tuple:
+    """Termes d'un champ, mémorisés : marques, modèles et notes reviennent à chaque sauvegarde"""
+    return tuple(decouper_termes(texte))
+
+def _documents_journee(journee: JourneeEnchere) -> List[Dict]:
+    """Documents d'une journée : un par véhicule, avec ses termes"""
+    documents = []
+    for statut, vehicules in (('Repérage', journee.vehicules_reperage), ('Acheté', journee.vehicules_achetes)):
+        for position, vehicule in enumerate(vehicules):
+            termes = []
+            for champ in CHAMPS_INDEXES:
+                termes += _termes_champ(str(getattr(vehicule, champ, "") or ""))
+            extrait = " — ".join(str(t).strip() for t in (vehicule.chose_a_faire, vehicule.champ_libre) if str(t or "").strip())
+            documents.append({
+                'statut': statut,
+                'position': position,
+                'lot': str(vehicule.lot),
+                'libelle': f"{vehicule.marque} {vehicule.modele}".strip(),
+                'extrait': extrait,
+                'termes': termes
+            })
+    return documents
+
+def _empreinte(journee: JourneeEnchere, documents: List[Dict]) -> str:
+    """Empreinte des textes indexés (une sauvegarde qui ne change que des prix ne réindexe rien)"""
+    contenu = [journee.nom, journee.date]
+    for doc in documents:
+        contenu += [doc['statut'], doc['lot'], doc['libelle'], doc['extrait'], " ".join(doc['termes'])]
+    return hashlib.sha1("\x1f".join(str(c) for c in contenu).encode("utf-8")).hexdigest()
+
+class IndexRecherche:
+    """Index inversé persistant des textes de toutes les journées"""
+
+    def __init__(self, dossier: str = "journees_data", chemin: Optional[str] = None):
+        """
+        Args:
+            dossier: Dossier des journées
+            chemin: Fichier SQLite de l'index (recherche.sqlite du dossier par défaut)
+        """
+        self.dossier = dossier
+        self.chemin = chemin or os.path.join(dossier, "recherche.sqlite")
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.chemin) or ".", exist_ok=True)
+        # Attente généreuse : plusieurs processus (cli.py --jobs) peuvent sauvegarder en même temps
+        self.conn = sqlite3.connect(self.chemin, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS fichiers (
+                nom TEXT PRIMARY KEY,
+                signature TEXT NOT NULL,
+                empreinte TEXT NOT NULL,
+                nom_journee TEXT NOT NULL,
+                date TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS documents (
+                id INTEGER PRIMARY KEY,
+                fichier TEXT NOT NULL,
+                statut TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                lot TEXT NOT NULL,
+                libelle TEXT NOT NULL,
+                extrait TEXT NOT NULL,
+                longueur INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS documents_fichier ON documents (fichier);
+            CREATE TABLE IF NOT EXISTS postings (
+                terme TEXT NOT NULL,
+                document_id INTEGER NOT NULL,
+                occurrences INTEGER NOT NULL,
+                longueur INTEGER NOT NULL,
+                PRIMARY KEY (terme, document_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_document ON postings (document_id);
+            CREATE TABLE IF NOT EXISTS statistiques (
+                cle TEXT PRIMARY KEY,
+                valeur INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO statistiques VALUES ('nb_documents', 0), ('longueur_totale', 0);
+            CREATE TEMP TABLE IF NOT EXISTS poids_requete (
+                terme TEXT NOT NULL,
+                mot INTEGER NOT NULL,
+                poids REAL NOT NULL,
+                PRIMARY KEY (terme, mot)
+            );
+        """)
+        self.conn.commit()
+
+    # ------------------------------------------------------------------
+    # Écriture
+    # ------------------------------------------------------------------
+
+    def _retirer(self, nom_fichier: str):
+        """Retire les documents d'un fichier (dans la transaction en cours)"""
+        lignes = self.conn.execute("SELECT id, longueur FROM documents WHERE fichier = ?", (nom_fichier,)).fetchall()
+        if lignes:
+            self.conn.executemany("DELETE FROM postings WHERE document_id = ?", [(doc_id,) for doc_id, _ in lignes])
+            self.conn.execute("DELETE FROM documents WHERE fichier = ?", (nom_fichier,))
+            self._ajuster_statistiques(-len(lignes), -sum(longueur for _, longueur in lignes))
+        self.conn.execute("DELETE FROM fichiers WHERE nom = ?", (nom_fichier,))
+
+    def _ajuster_statistiques(self, documents: int, longueur: int):
+        self.conn.execute("UPDATE statistiques SET valeur = valeur + ? WHERE cle = 'nb_documents'", (documents,))
+        self.conn.execute("UPDATE statistiques SET valeur = valeur + ? WHERE cle = 'longueur_totale'", (longueur,))
+
+    def indexer_journee(self, nom_fichier: str, journee: JourneeEnchere) -> bool:
+        """
+        Met à jour l'index d'une journée (après sa sauvegarde)
+
+        Returns:
+            True si la journée a été réindexée, False si ses textes n'avaient pas changé
+        """
+        documents = _documents_journee(journee)
+        empreinte = _empreinte(journee, documents)
+        signature = " ".join(map(str, signature_fichier(os.path.join(self.dossier, nom_fichier))))
+
+        with self.lock, self.conn:
+            ligne = self.conn.execute("SELECT empreinte FROM fichiers WHERE nom = ?", (nom_fichier,)).fetchone()
+            if ligne and ligne[0] == empreinte:
+                self.conn.execute("UPDATE fichiers SET signature = ? WHERE nom = ?", (signature, nom_fichier))
+                return False
+
+            self._retirer(nom_fichier)
+            postings = []
+            for doc in documents:
+                curseur = self.conn.execute(
+                    "INSERT INTO documents (fichier, statut, position, lot, libelle, extrait, longueur) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (nom_fichier, doc['statut'], doc['position'], doc['lot'], doc['libelle'], doc['extrait'],
+                     len(doc['termes']))
+                )
+                occurrences = {}
+                for terme in doc['termes']:
+                    occurrences[terme] = occurrences.get(terme, 0) + 1
+                postings += [(terme, curseur.lastrowid, n, len(doc['termes'])) for terme, n in occurrences.items()]
+            self.conn.executemany("INSERT INTO postings VALUES (?, ?, ?, ?)", postings)
+            self.conn.execute(
+                "INSERT INTO fichiers VALUES (?, ?, ?, ?, ?)",
+                (nom_fichier, signature, empreinte, journee.nom or nom_fichier, journee.date or "")
+            )
+            self._ajuster_statistiques(len(documents), sum(len(doc['termes']) for doc in documents))
+        return True
+
+    def retirer_journee(self, nom_fichier: str):
+        """Retire une journée supprimée de l'index"""
+        with self.lock, self.conn:
+            self._retirer(nom_fichier)
+
+    def synchroniser(self) -> int:
+        """
+        Rattrape les journées ajoutées, modifiées ou supprimées hors de l'application
+        (import, copie, autre poste) d'après leur date de modification et leur taille
+
+        Returns:
+            Nombre de journées réindexées ou retirées
+        """
+        presents = {os.path.basename(c): c for c in glob.glob(os.path.join(self.dossier, "*.json"))}
+        with self.lock:
+            connus = dict(self.conn.execute("SELECT nom, signature FROM fichiers").fetchall())
+
+        changements = 0
+        for nom in connus.keys() - presents.keys():
+            self.retirer_journee(nom)
+            changements += 1
+        for nom, chemin in presents.items():
+            if connus.get(nom) == " ".join(map(str, signature_fichier(chemin))):
+                continue
+            try:
+                self.indexer_journee(nom, charger_journee(chemin))
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Journée non indexée ({nom}): {e}")
+                continue
+            changements += 1
+
+        if changements:
+            print(f"🔎 Index de recherche : {changements} journée(s) mise(s) à jour sur {len(presents)}")
+        return changements
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    def rechercher(self, requete: str, limite: int = 100) -> List[Dict]:
+        """
+        Véhicules de toutes les journées contenant tous les mots de la requête
+
+        Args:
+            requete: Mots recherchés (chacun peut être un début de mot)
+            limite: Nombre maximum de résultats
+
+        Returns:
+            [{'score', 'fichier', 'nom_journee', 'date', 'statut', 'position', 'lot', 'libelle', 'extrait'}]
+            par score BM25 décroissant
+        """
+        mots = list(dict.fromkeys(decouper_termes(requete)))
+        if not mots:
+            return []
+
+        with self.lock:
+            statistiques = dict(self.conn.execute("SELECT cle, valeur FROM statistiques").fetchall())
+            nb_documents = max(1, statistiques['nb_documents'])
+            longueur_moyenne = max(1.0, statistiques['longueur_totale'] / nb_documents)
+
+            # Poids (idf) de chaque terme de l'index commençant par un mot de la requête :
+            # comptage sur la clé primaire, sans lire les postings
+            poids = []
+            for numero, mot in enumerate(mots):
+                termes = self.conn.execute(
+                    "SELECT terme, COUNT(*) FROM postings WHERE terme >= ? AND terme < ? GROUP BY terme",
+                    (mot, mot + "\uffff")
+                ).fetchall()
+                if not termes:
+                    return []
+                for terme, frequence in termes:
+                    idf = math.log(1 + (nb_documents - frequence + 0.5) / (frequence + 0.5))
+                    poids.append((terme, numero, idf * (1.0 if terme == mot else POIDS_PREFIXE)))
+            self.conn.execute("DELETE FROM poids_requete")
+            self.conn.executemany("INSERT INTO poids_requete VALUES (?, ?, ?)", poids)
+
+            # Score BM25 calculé par SQLite : meilleur terme par mot, somme sur les mots,
+            # documents contenant tous les mots, meilleurs scores seulement
+            lignes = self.conn.execute("""
+                SELECT s.score, d.fichier, f.nom_journee, f.date, d.statut, d.position, d.lot, d.libelle, d.extrait
+                FROM (
+                    SELECT document_id, SUM(score_mot) AS score FROM (
+                        SELECT p.document_id, w.mot,
+                               MAX(w.poids * p.occurrences * :k1_plus_1
+                                   / (p.occurrences + :k1 * (1 - :b + :b * p.longueur / :longueur_moyenne))) AS score_mot
+                        FROM poids_requete w CROSS JOIN postings p ON p.terme = w.terme
+                        GROUP BY p.document_id, w.mot
+                    )
+                    GROUP BY document_id HAVING COUNT(*) = :nb_mots
+                    ORDER BY score DESC LIMIT :limite
+                ) s
+                JOIN documents d ON d.id = s.document_id
+                JOIN fichiers f ON f.nom = d.fichier
+                ORDER BY s.score DESC
+            """, {
+                'k1_plus_1': BM25_K1 + 1, 'k1': BM25_K1, 'b': BM25_B, 'longueur_moyenne': longueur_moyenne,
+                'nb_mots': len(mots), 'limite': limite
+            }).fetchall()
+
+        colonnes = ('score', 'fichier', 'nom_journee', 'date', 'statut', 'position', 'lot', 'libelle', 'extrait')
+        return [dict(zip(colonnes, ligne)) for ligne in lignes]
+
+    def fermer(self):
+        """Ferme la base"""
+        with self.lock:
+            self.conn.close()
+
+# Index partagé par l'application (une seule connexion SQLite)
+_index_partage: Optional[IndexRecherche] = None
+_verrou_partage = threading.Lock()
+
+def get_index_partage(dossier: str = "journees_data") -> IndexRecherche:
+    """Retourne l'index de recherche partagé"""
+    global _index_partage
+    with _verrou_partage:
+        if _index_partage is None or _index_partage.dossier != dossier:
+            _index_partage = IndexRecherche(dossier)
+        return _index_partage
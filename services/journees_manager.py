@@ -7,28 +7,56 @@ Gestionnaire des journées d'enchères - Version fichiers séparés
 import json
 import os
 import glob
+import time
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from models.journee_enchere import JourneeEnchere
-
+from services.cache_journees import CacheJournees
+from services.codecs_journee import (
+    CODEC_DEFAUT, codecs_disponibles, decoder_journee, detecter_codec, encoder_journee, lire_fichier_journee
+)
+from services.fusion_journees import cle_lot, fusionner_catalogue, fusionner_journees
+from services.migration_donnees import mettre_a_jour_manifeste, verification_demarrage_faite
+from services.verrou_fichier import VerrouFichier, ecrire_atomique
 
 class JourneesManager:
     """Gestionnaire pour journées d'enchères avec fichiers séparés"""
     
-    def __init__(self):
-        self.dossier_journees = "journees_data"
+    def __init__(self, dossier_journees: str = "journees_data", migrer: bool = True,
+                 cache: Optional[CacheJournees] = None, codec: Optional[str] = None):
+        self.dossier_journees = dossier_journees
+        # Format des nouvelles journées ; une journée existante garde celui de son fichier
+        self.codec = codec or CODEC_DEFAUT
+        if self.codec not in codecs_disponibles():
+            print(f"⚠️ Format de journée {self.codec} indisponible, format {CODEC_DEFAUT} utilisé")
+            self.codec = CODEC_DEFAUT
+        # Journées déjà chargées (sélecteur de l'application seulement, voir services/cache_journees.py)
+        self.cache = cache
         self.journee_active: Optional[JourneeEnchere] = None
         self.fichier_actif = ""
+        # (révision, contenu) de chaque fichier au dernier chargement / sauvegarde (ancêtre commun des fusions)
+        self.bases: Dict[str, tuple] = {}
+        self.derniers_conflits: List[str] = []
         
         # Créer le dossier s'il n'existe pas
         if not os.path.exists(self.dossier_journees):
             os.makedirs(self.dossier_journees)
         
-        # Migrer les anciennes données si nécessaire
-        self.migrer_anciennes_donnees()
+        # Migrer les anciennes données si nécessaire (une seule fois par dossier, voir services/migration_donnees.py)
+        if migrer and not verification_demarrage_faite(self.dossier_journees):
+            if self.migrer_anciennes_donnees():
+                try:
+                    mettre_a_jour_manifeste(self.dossier_journees, verification_demarrage=True)
+                except (OSError, TimeoutError) as e:
+                    print(f"⚠️ Manifeste de migration non écrit: {e}")
     
-    def migrer_anciennes_donnees(self):
-        """Migre les anciennes données vers une première journée"""
+    def migrer_anciennes_donnees(self) -> bool:
+        """
+        Migre les anciennes données vers une première journée
+
+        Returns:
+            True si rien n'était à migrer ou si la migration a réussi
+        """
         try:
             # Vérifier si l'ancien fichier unique existe
             ancien_fichier = "journees_encheres.json"
@@ -82,9 +110,11 @@ class JourneesManager:
                 # Renommer l'ancien fichier
                 os.rename(ancien_donnees, f"{ancien_donnees}.backup")
                 print(f"✅ Données migrées: {len(journee.vehicules_reperage)} repérage, {len(journee.vehicules_achetes)} achetés")
+            return True
                 
         except Exception as e:
             print(f"⚠️ Erreur migration: {e}")
+            return False
     
     def get_journees_disponibles(self) -> List[Dict[str, Any]]:
         """Retourne la liste des journées disponibles"""
@@ -96,8 +126,7 @@ class JourneesManager:
         
         for fichier in fichiers:
             try:
-                with open(fichier, 'r', encoding='utf-8') as f:
-                    donnees = json.load(f)
+                donnees = lire_fichier_journee(fichier)
                 
                 # Récupérer les infos de base
                 info = {
@@ -156,12 +185,68 @@ class JourneesManager:
         return nom_fichier
     
     def sauvegarder_journee_fichier(self, journee: JourneeEnchere, nom_fichier: str) -> bool:
-        """Sauvegarde une journée dans son fichier"""
+        """
+        Sauvegarde une journée dans son fichier
+        
+        Sous verrou, le fichier est relu : si un autre poste ou une autre fenêtre l'a
+        réécrit depuis le chargement (numéro de révision différent), ses modifications
+        sont fusionnées avec les nôtres au lieu d'être écrasées, et la journée en
+        mémoire est mise à jour avec le résultat.
+        """
         try:
             chemin = os.path.join(self.dossier_journees, nom_fichier)
+            donnees = journee.to_dict()
+            a_recharger = False
             
-            with open(chemin, 'w', encoding='utf-8') as f:
-                json.dump(journee.to_dict(), f, indent=2, ensure_ascii=False)
+            with VerrouFichier(f"{chemin}.lock"):
+                contenu_disque = None
+                if os.path.exists(chemin):
+                    with open(chemin, 'rb') as f:
+                        contenu_disque = f.read()
+                
+                base = self.bases.get(nom_fichier)
+                if contenu_disque is None:
+                    revision_disque = 0
+                elif base is not None and contenu_disque == base[1]:
+                    # Fichier inchangé depuis notre chargement (cas courant) : rien à relire
+                    revision_disque = base[0]
+                else:
+                    disque = decoder_journee(contenu_disque)
+                    revision_disque = disque.get('revision', 0)
+                    if base is not None:
+                        donnees, conflits = fusionner_journees(decoder_journee(base[1]), donnees, disque)
+                        a_recharger = True
+                        print(f"🔀 {nom_fichier} modifiée ailleurs (révision {base[0]} -> {revision_disque}) : "
+                              f"modifications fusionnées" + (f", {len(conflits)} conflit(s) gardé(s) en local: "
+                                                               f"{', '.join(conflits[:5])}" if conflits else ""))
+                        self.derniers_conflits = conflits
+                
+                # Achats du mode direct journalisés (ici ou sur un autre poste) pas encore sauvegardés
+                if os.path.exists(self.chemin_journal(nom_fichier)):
+                    fusionnee = JourneeEnchere(donnees)
+                    if self.rejouer_journal(fusionnee, nom_fichier):
+                        donnees = fusionnee.to_dict()
+                        a_recharger = True
+                
+                donnees['revision'] = revision_disque + 1
+                # Le fichier garde son format (converti seulement par convertir_journee)
+                codec = detecter_codec(contenu_disque) if contenu_disque else self.codec
+                contenu = encoder_journee(donnees, codec)
+                ecrire_atomique(chemin, contenu)
+                
+                # La sauvegarde complète contient les opérations journalisées
+                self.vider_journal(nom_fichier)
+            
+            self.bases[nom_fichier] = (donnees['revision'], contenu)
+            if a_recharger:
+                # Même objet (référencé par l'interface), contenu fusionné
+                self._actualiser_sur_place(journee, donnees)
+            else:
+                journee.revision = donnees['revision']
+            if self.cache is not None:
+                self.cache.memoriser(chemin, journee, self.bases[nom_fichier])
+            
+            self.indexer_recherche(journee, nom_fichier)
             
             return True
             
@@ -169,6 +254,33 @@ class JourneesManager:
             print(f"❌ Erreur sauvegarde {nom_fichier}: {e}")
             return False
     
+    @staticmethod
+    def _actualiser_sur_place(journee: JourneeEnchere, donnees: Dict[str, Any]):
+        """
+        Remplace le contenu d'une journée par des données fusionnées, en gardant ses
+        objets : les véhicules sont mis à jour par lot, pas remplacés (onglets,
+        fenêtres d'édition et mode direct gardent des références sur eux)
+        """
+        nouvelle = JourneeEnchere(donnees)
+        existants = {}
+        for vehicule in journee.vehicules_reperage + journee.vehicules_achetes:
+            existants.setdefault(cle_lot(vehicule.lot), []).append(vehicule)
+        
+        listes = {}
+        for liste in ('vehicules_reperage', 'vehicules_achetes'):
+            listes[liste] = []
+            for vehicule in getattr(nouvelle, liste):
+                memes_lots = existants.get(cle_lot(vehicule.lot))
+                if memes_lots:
+                    ancien = memes_lots.pop(0)
+                    ancien.__dict__.update(vehicule.__dict__)
+                    vehicule = ancien
+                listes[liste].append(vehicule)
+        
+        journee.__dict__.update({cle: valeur for cle, valeur in nouvelle.__dict__.items() if cle not in listes})
+        for liste, vehicules in listes.items():
+            getattr(journee, liste)[:] = vehicules
+    
     def charger_journee_fichier(self, nom_fichier: str) -> Optional[JourneeEnchere]:
         """Charge une journée depuis son fichier"""
         try:
@@ -178,10 +290,28 @@ class JourneesManager:
                 print(f"❌ Fichier non trouvé: {nom_fichier}")
                 return None
             
-            with open(chemin, 'r', encoding='utf-8') as f:
-                donnees = json.load(f)
+            en_cache = self.cache.obtenir(chemin) if self.cache is not None else None
+            if en_cache:
+                journee, self.bases[nom_fichier] = en_cache
+                self.journee_active = journee
+                self.fichier_actif = nom_fichier
+                print(f"⚡ Journée en mémoire: {journee.nom} ({nom_fichier})")
+                return journee
+            
+            with open(chemin, 'rb') as f:
+                contenu = f.read()
+            donnees = decoder_journee(contenu)
             
+            # Version de référence pour fusionner une écriture concurrente à la sauvegarde
+            self.bases[nom_fichier] = (donnees.get('revision', 0), contenu)
             journee = JourneeEnchere(donnees)
+            
+            # Achats du mode direct enregistrés après la dernière sauvegarde complète
+            if self.rejouer_journal(journee, nom_fichier):
+                self.sauvegarder_journee_fichier(journee, nom_fichier)
+            elif self.cache is not None:
+                self.cache.memoriser(chemin, journee, self.bases[nom_fichier])
+            
             self.journee_active = journee
             self.fichier_actif = nom_fichier
             
@@ -199,6 +329,13 @@ class JourneesManager:
             
             if os.path.exists(chemin):
                 os.remove(chemin)
+                self.vider_journal(nom_fichier)
+                self.bases.pop(nom_fichier, None)
+                if self.cache is not None:
+                    self.cache.retirer(chemin)
+                if os.path.exists(f"{chemin}.lock"):
+                    os.remove(f"{chemin}.lock")
+                self.indexer_recherche(None, nom_fichier)
                 print(f"✅ Journée supprimée: {nom_fichier}")
                 return True
             else:
@@ -226,6 +363,108 @@ class JourneesManager:
             journee.description = description
         
         return self.sauvegarder_journee_fichier(journee, nom_fichier)
+
+    def convertir_journee(self, nom_fichier: str, codec: str) -> tuple[bool, str]:
+        """
+        Réenregistre une journée dans un autre format (voir services/codecs_journee.py)
+
+        Le contenu et la révision ne changent pas : un autre poste qui l'a ouverte
+        sauvegarde normalement, dans le nouveau format.
+        """
+        try:
+            chemin = os.path.join(self.dossier_journees, nom_fichier)
+            if not os.path.exists(chemin):
+                return False, f"Fichier non trouvé : {nom_fichier}"
+
+            with VerrouFichier(f"{chemin}.lock"):
+                with open(chemin, 'rb') as f:
+                    contenu_disque = f.read()
+                ancien_codec = detecter_codec(contenu_disque)
+                if ancien_codec == codec:
+                    return True, f"{nom_fichier} : déjà au format {codec}"
+                contenu = encoder_journee(decoder_journee(contenu_disque), codec)
+                ecrire_atomique(chemin, contenu)
+
+            base = self.bases.get(nom_fichier)
+            if base is not None and base[1] == contenu_disque:
+                self.bases[nom_fichier] = (base[0], contenu)
+            if self.cache is not None:
+                self.cache.retirer(chemin)
+            return True, (f"{nom_fichier} : {ancien_codec} -> {codec}, "
+                          f"{len(contenu_disque) / 1024:.0f} Ko -> {len(contenu) / 1024:.0f} Ko")
+
+        except Exception as e:
+            return False, f"{nom_fichier} : conversion impossible ({e})"
+
+    def indexer_recherche(self, journee: Optional[JourneeEnchere], nom_fichier: str):
+        """Met à jour l'index de recherche plein texte (journée None = supprimée)"""
+        try:
+            from services.index_recherche import get_index_partage
+            index = get_index_partage(self.dossier_journees)
+            if journee is None:
+                index.retirer_journee(nom_fichier)
+            else:
+                index.indexer_journee(nom_fichier, journee)
+        except Exception as e:
+            # L'index se rattrape à la prochaine recherche (synchroniser)
+            print(f"⚠️ Index de recherche non mis à jour ({nom_fichier}): {e}")
+    
+    def chemin_journal(self, nom_fichier: str) -> str:
+        """Journal des opérations du mode direct d'une journée (hors motif *.json)"""
+        return os.path.join(self.dossier_journees, f"{nom_fichier}.journal")
+    
+    def journaliser_operation(self, operation: Dict[str, Any]) -> bool:
+        """
+        Ajoute une opération au journal de la journée active, écrite sur disque (fsync)
+        avant de rendre la main : seule la ligne est écrite, pas la journée entière.
+        
+        Sous le verrou de la journée : une sauvegarde (ici ou sur un autre poste)
+        rejoue puis supprime le journal, une ligne ajoutée entre les deux serait perdue.
+        """
+        if not self.fichier_actif:
+            return False
+        try:
+            ligne = (json.dumps(operation, ensure_ascii=False) + "\n").encode('utf-8')
+            chemin = os.path.join(self.dossier_journees, self.fichier_actif)
+            with VerrouFichier(f"{chemin}.lock"):
+                descripteur = os.open(self.chemin_journal(self.fichier_actif),
+                                      os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o644)
+                try:
+                    os.write(descripteur, ligne)
+                    os.fsync(descripteur)
+                finally:
+                    os.close(descripteur)
+            return True
+        except OSError as e:
+            print(f"❌ Erreur journal {self.fichier_actif}: {e}")
+            return False
+    
+    def rejouer_journal(self, journee: JourneeEnchere, nom_fichier: str) -> int:
+        """Applique à la journée les opérations de son journal, retourne le nombre appliqué"""
+        chemin = self.chemin_journal(nom_fichier)
+        if not os.path.exists(chemin):
+            return 0
+        
+        appliquees = 0
+        with open(chemin, 'r', encoding='utf-8') as f:
+            for ligne in f:
+                try:
+                    operation = json.loads(ligne)
+                except ValueError:
+                    # Dernière ligne incomplète (arrêt pendant l'écriture)
+                    continue
+                if journee.appliquer_operation(operation):
+                    appliquees += 1
+        
+        if appliquees:
+            print(f"♻️ {appliquees} opération(s) du mode direct rejouée(s) ({nom_fichier})")
+        return appliquees
+    
+    def vider_journal(self, nom_fichier: str):
+        """Supprime le journal d'une journée (après une sauvegarde complète)"""
+        chemin = self.chemin_journal(nom_fichier)
+        if os.path.exists(chemin):
+            os.remove(chemin)
     
     def sauvegarder_journee_active(self) -> bool:
         """Sauvegarde la journée actuellement active"""
@@ -248,9 +487,9 @@ class JourneesManager:
             if not os.path.exists(chemin_fichier):
                 return False, f"Fichier non trouvé : {chemin_fichier}"
             
-            # Lire le fichier JSON
-            with open(chemin_fichier, 'r', encoding='utf-8') as f:
-                donnees = json.load(f)
+            # Lire le fichier JSON (ou une journée enregistrée dans un autre format)
+            with open(chemin_fichier, 'rb') as f:
+                donnees = decoder_journee(f.read())
             
             # Valider la structure de base
             champs_requis = ['nom', 'vehicules_reperage', 'vehicules_achetes']
@@ -319,9 +558,9 @@ class JourneesManager:
             if not journee:
                 return False, f"Impossible de charger la journée : {nom_fichier}"
             
-            # Exporter vers le fichier de destination
-            with open(chemin_export, 'w', encoding='utf-8') as f:
-                json.dump(journee.to_dict(), f, indent=2, ensure_ascii=False)
+            # Exporter vers le fichier de destination (JSON lisible, quel que soit le format du fichier)
+            with open(chemin_export, 'wb') as f:
+                f.write(encoder_journee(journee.to_dict(), 'lisible'))
             
             return True, f"Journée exportée avec succès vers :\n{chemin_export}"
             
@@ -366,6 +605,111 @@ class JourneesManager:
         except Exception as e:
             return False, f"Erreur lors de l'export de toutes les journées : {e}"
     
+    def lire_catalogue_csv(self, chemin_fichier: str, mapping_colonnes: dict = None) -> List[Dict[str, Any]]:
+        """
+        Lit les véhicules d'un catalogue CSV
+        
+        Args:
+            chemin_fichier: Chemin vers le fichier CSV
+            mapping_colonnes: Dictionnaire de mapping des colonnes CSV vers les champs
+            
+        Returns:
+            Données de chaque véhicule (champs reconnus, prix nettoyés)
+            
+        Raises:
+            ValueError: Fichier sans en-têtes ou sans données
+        """
+        import csv
+        
+        # Mapping par défaut des colonnes
+        if not mapping_colonnes:
+            mapping_colonnes = {
+                'lot': ['lot', 'n°lot', 'numero lot', 'LOT', 'N° LOT'],
+                'marque': ['marque', 'MARQUE', 'Marque'],
+                'modele': ['modele', 'modèle', 'MODELE', 'MODÈLE', 'Modèle'],
+                'annee': ['annee', 'année', 'ANNEE', 'ANNÉE', 'Année'],
+                'kilometrage': ['kilometrage', 'kilométrage', 'km', 'KM', 'Kilométrage'],
+                'motorisation': ['motorisation', 'MOTORISATION', 'Motorisation', 'moteur'],
+                'prix_revente': ['prix_revente', 'prix revente', 'PRIX REVENTE', 'prix de revente'],
+                'cout_reparations': ['cout_reparations', 'coût réparations', 'COUT REPARATIONS', 'cout reparations'],
+                'temps_reparations': ['temps_reparations', 'temps réparations', 'TEMPS REPARATIONS', 'temps (h)'],
+                'prix_max_achat': ['prix_max_achat', 'prix max', 'PRIX MAX', 'prix maximum'],
+                'prix_achat': ['prix_achat', 'prix achat', 'PRIX ACHAT', 'prix d\'achat'],
+                'chose_a_faire': ['chose_a_faire', 'description', 'DESCRIPTION', 'travaux', 'réparations'],
+                'champ_libre': ['champ_libre', 'notes', 'NOTES', 'commentaires'],
+                'statut': ['statut', 'STATUT', 'Statut'],
+                'date_achat': ['date_achat', 'date achat', 'DATE ACHAT']
+            }
+        
+        # Lire le fichier CSV
+        with open(chemin_fichier, 'r', encoding='utf-8-sig', newline='') as csvfile:
+            # Détecter le délimiteur
+            sample = csvfile.read(1024)
+            csvfile.seek(0)
+            
+            delimiter = ';' if ';' in sample else ','
+            reader = csv.DictReader(csvfile, delimiter=delimiter)
+            
+            # Récupérer les en-têtes
+            headers = reader.fieldnames
+            if not headers:
+                raise ValueError("Le fichier CSV ne contient pas d'en-têtes valides")
+            
+            # Lire toutes les lignes
+            lignes = list(reader)
+        
+        if not lignes:
+            raise ValueError("Le fichier CSV est vide ou ne contient aucune donnée")
+        
+        def trouver_colonne(champ, headers):
+            """Trouve la colonne correspondant au champ dans les headers"""
+            if champ in mapping_colonnes:
+                for possible in mapping_colonnes[champ]:
+                    for header in headers:
+                        if header.lower().strip() == possible.lower().strip():
+                            return header
+            # Fallback : correspondance partielle
+            for header in headers:
+                if champ.lower() in header.lower() or header.lower() in champ.lower():
+                    return header
+            return None
+        
+        # Colonnes résolues une fois pour tout le fichier (catalogues de plusieurs milliers de lignes)
+        colonnes = []
+        for champ in ['lot', 'marque', 'modele', 'annee', 'kilometrage', 'motorisation',
+                      'prix_revente', 'cout_reparations', 'temps_reparations', 'prix_max_achat',
+                      'prix_achat', 'chose_a_faire', 'champ_libre', 'statut', 'date_achat']:
+            colonne = trouver_colonne(champ, headers)
+            if colonne:
+                colonnes.append((champ, colonne, champ in ('prix_revente', 'cout_reparations',
+                                                           'temps_reparations', 'prix_achat')))
+        
+        vehicules = []
+        for ligne in lignes:
+            # Extraire les données selon le mapping
+            donnees_vehicule = {}
+            for champ, colonne, numerique in colonnes:
+                valeur = ligne.get(colonne)
+                if valeur is None:
+                    continue
+                valeur = valeur.strip()
+                
+                # Nettoyage des valeurs numériques
+                if numerique:
+                    valeur = valeur.replace('€', '').replace(',', '.').replace(' ', '')
+                    # Garder seulement les chiffres et le point décimal
+                    valeur = ''.join(c for c in valeur if c.isdigit() or c == '.')
+                
+                donnees_vehicule[champ] = valeur
+            
+            # Valeurs par défaut
+            donnees_vehicule.setdefault('couleur', 'turquoise')
+            donnees_vehicule.setdefault('reserve_professionnels', False)
+            donnees_vehicule.setdefault('prix_vente_final', '')
+            vehicules.append(donnees_vehicule)
+        
+        return vehicules
+    
     def importer_donnees_csv(self, chemin_fichier: str, nom_journee: str = None, mapping_colonnes: dict = None) -> tuple[bool, str]:
         """
         Importe des données depuis un fichier CSV et crée une nouvelle journée
@@ -379,8 +723,6 @@ class JourneesManager:
             tuple[bool, str]: (succès, message)
         """
         try:
-            import csv
-            
             # Vérifier que le fichier existe
             if not os.path.exists(chemin_fichier):
                 return False, f"Fichier non trouvé : {chemin_fichier}"
@@ -389,61 +731,7 @@ class JourneesManager:
             if not nom_journee:
                 nom_journee = f"Import CSV - {os.path.basename(chemin_fichier).replace('.csv', '')}"
             
-            # Mapping par défaut des colonnes
-            if not mapping_colonnes:
-                mapping_colonnes = {
-                    'lot': ['lot', 'n°lot', 'numero lot', 'LOT', 'N° LOT'],
-                    'marque': ['marque', 'MARQUE', 'Marque'],
-                    'modele': ['modele', 'modèle', 'MODELE', 'MODÈLE', 'Modèle'],
-                    'annee': ['annee', 'année', 'ANNEE', 'ANNÉE', 'Année'],
-                    'kilometrage': ['kilometrage', 'kilométrage', 'km', 'KM', 'Kilométrage'],
-                    'motorisation': ['motorisation', 'MOTORISATION', 'Motorisation', 'moteur'],
-                    'prix_revente': ['prix_revente', 'prix revente', 'PRIX REVENTE', 'prix de revente'],
-                    'cout_reparations': ['cout_reparations', 'coût réparations', 'COUT REPARATIONS', 'cout reparations'],
-                    'temps_reparations': ['temps_reparations', 'temps réparations', 'TEMPS REPARATIONS', 'temps (h)'],
-                    'prix_max_achat': ['prix_max_achat', 'prix max', 'PRIX MAX', 'prix maximum'],
-                    'prix_achat': ['prix_achat', 'prix achat', 'PRIX ACHAT', 'prix d\'achat'],
-                    'chose_a_faire': ['chose_a_faire', 'description', 'DESCRIPTION', 'travaux', 'réparations'],
-                    'champ_libre': ['champ_libre', 'notes', 'NOTES', 'commentaires'],
-                    'statut': ['statut', 'STATUT', 'Statut'],
-                    'date_achat': ['date_achat', 'date achat', 'DATE ACHAT']
-                }
-            
-            # Lire le fichier CSV
-            lignes = []
-            with open(chemin_fichier, 'r', encoding='utf-8-sig', newline='') as csvfile:
-                # Détecter le délimiteur
-                sample = csvfile.read(1024)
-                csvfile.seek(0)
-                
-                delimiter = ';' if ';' in sample else ','
-                reader = csv.DictReader(csvfile, delimiter=delimiter)
-                
-                # Récupérer les en-têtes
-                headers = reader.fieldnames
-                if not headers:
-                    return False, "Le fichier CSV ne contient pas d'en-têtes valides"
-                
-                # Lire toutes les lignes
-                for ligne in reader:
-                    lignes.append(ligne)
-            
-            if not lignes:
-                return False, "Le fichier CSV est vide ou ne contient aucune donnée"
-            
-            # Créer la fonction de mapping des colonnes
-            def trouver_colonne(champ, headers):
-                """Trouve la colonne correspondant au champ dans les headers"""
-                if champ in mapping_colonnes:
-                    for possible in mapping_colonnes[champ]:
-                        for header in headers:
-                            if header.lower().strip() == possible.lower().strip():
-                                return header
-                # Fallback : correspondance partielle
-                for header in headers:
-                    if champ.lower() in header.lower() or header.lower() in champ.lower():
-                        return header
-                return None
+            lignes = self.lire_catalogue_csv(chemin_fichier, mapping_colonnes)
             
             # Créer la nouvelle journée
             from models.journee_enchere import JourneeEnchere
@@ -458,32 +746,8 @@ class JourneesManager:
             vehicules_reperage = []
             vehicules_achetes = []
             
-            for i, ligne in enumerate(lignes):
+            for i, donnees_vehicule in enumerate(lignes):
                 try:
-                    # Extraire les données selon le mapping
-                    donnees_vehicule = {}
-                    
-                    for champ in ['lot', 'marque', 'modele', 'annee', 'kilometrage', 'motorisation',
-                                'prix_revente', 'cout_reparations', 'temps_reparations', 'prix_max_achat',
-                                'prix_achat', 'chose_a_faire', 'champ_libre', 'statut', 'date_achat']:
-                        
-                        colonne = trouver_colonne(champ, headers)
-                        if colonne and colonne in ligne:
-                            valeur = ligne[colonne].strip()
-                            
-                            # Nettoyage des valeurs numériques
-                            if champ in ['prix_revente', 'cout_reparations', 'temps_reparations', 'prix_achat']:
-                                valeur = valeur.replace('€', '').replace(',', '.').replace(' ', '')
-                                # Garder seulement les chiffres et le point décimal
-                                valeur = ''.join(c for c in valeur if c.isdigit() or c == '.')
-                            
-                            donnees_vehicule[champ] = valeur
-                    
-                    # Valeurs par défaut
-                    donnees_vehicule.setdefault('couleur', 'turquoise')
-                    donnees_vehicule.setdefault('reserve_professionnels', False)
-                    donnees_vehicule.setdefault('prix_vente_final', '')
-                    
                     # Créer le véhicule
                     vehicule = Vehicule(donnees_vehicule)
                     
@@ -528,9 +792,59 @@ class JourneesManager:
                 
         except UnicodeDecodeError:
             return False, "Erreur d'encodage du fichier CSV. Assurez-vous qu'il est encodé en UTF-8."
+        except ValueError as e:
+            return False, str(e)
         except Exception as e:
             return False, f"Erreur lors de l'import CSV : {e}"
     
+    def lire_catalogue_pdf(self, chemin_fichier: str) -> List[Dict[str, Any]]:
+        """
+        Lit les véhicules d'un catalogue PDF (tableaux, sinon texte brut)
+        
+        Raises:
+            ValueError: pdfplumber absent ou aucun véhicule détecté
+        """
+        # Importer pdfplumber
+        try:
+            import pdfplumber
+        except ImportError:
+            raise ValueError("La bibliothèque 'pdfplumber' n'est pas installée.\nInstallez-la avec: pip install pdfplumber")
+        
+        # Ouvrir le PDF
+        with pdfplumber.open(chemin_fichier) as pdf:
+            # Extraire le texte et les tableaux de toutes les pages
+            vehicules_data = []
+            texte_complet = ""
+            
+            for page_num, page in enumerate(pdf.pages):
+                # Extraire le texte de la page
+                texte_page = page.extract_text()
+                if texte_page:
+                    texte_complet += texte_page + "\n"
+                
+                # Essayer d'extraire des tableaux
+                tableaux = page.extract_tables()
+                
+                for table_num, tableau in enumerate(tableaux):
+                    if tableau and len(tableau) > 1:  # Au moins une ligne d'en-tête + données
+                        vehicules_tableau = self._analyser_tableau_pdf(tableau, page_num, table_num)
+                        vehicules_data.extend(vehicules_tableau)
+            
+            # Si aucun tableau trouvé, essayer d'analyser le texte brut
+            if not vehicules_data:
+                vehicules_data = self._analyser_texte_pdf(texte_complet)
+            
+            # Si toujours aucune donnée, retourner une erreur
+            if not vehicules_data:
+                raise ValueError(f"Aucune donnée de véhicule détectée dans le PDF.\nTexte extrait ({len(texte_complet)} caractères):\n{texte_complet[:500]}...")
+        
+        for donnees in vehicules_data:
+            # Valeurs par défaut
+            donnees.setdefault('couleur', 'turquoise')
+            donnees.setdefault('reserve_professionnels', False)
+            donnees.setdefault('prix_vente_final', '')
+        return vehicules_data
+    
     def importer_donnees_pdf(self, chemin_fichier: str, nom_journee: str = None) -> tuple[bool, str]:
         """
         Importe des données depuis un fichier PDF et crée une nouvelle journée
@@ -551,103 +865,123 @@ class JourneesManager:
             if not nom_journee:
                 nom_journee = f"Import PDF - {os.path.basename(chemin_fichier).replace('.pdf', '')}"
             
-            # Importer pdfplumber
             try:
-                import pdfplumber
-            except ImportError:
-                return False, "La bibliothèque 'pdfplumber' n'est pas installée.\nInstallez-la avec: pip install pdfplumber"
-            
-            # Ouvrir le PDF
-            with pdfplumber.open(chemin_fichier) as pdf:
-                # Extraire le texte et les tableaux de toutes les pages
-                vehicules_data = []
-                texte_complet = ""
-                
-                for page_num, page in enumerate(pdf.pages):
-                    # Extraire le texte de la page
-                    texte_page = page.extract_text()
-                    if texte_page:
-                        texte_complet += texte_page + "\n"
-                    
-                    # Essayer d'extraire des tableaux
-                    tableaux = page.extract_tables()
+                vehicules_data = self.lire_catalogue_pdf(chemin_fichier)
+            except ValueError as e:
+                return False, str(e)
+            
+            # Créer la nouvelle journée
+            from models.journee_enchere import JourneeEnchere
+            from models.vehicule import Vehicule
+            
+            journee = JourneeEnchere()
+            journee.nom = nom_journee
+            journee.date = datetime.now().strftime("%Y-%m-%d")
+            journee.description = f"Journée créée depuis import PDF : {os.path.basename(chemin_fichier)}"
+            
+            # Convertir les données en véhicules
+            vehicules_reperage = []
+            vehicules_achetes = []
+            
+            for donnees in vehicules_data:
+                try:
+                    # Créer le véhicule
+                    vehicule = Vehicule(donnees)
                     
-                    for table_num, tableau in enumerate(tableaux):
-                        if tableau and len(tableau) > 1:  # Au moins une ligne d'en-tête + données
-                            vehicules_tableau = self._analyser_tableau_pdf(tableau, page_num, table_num)
-                            vehicules_data.extend(vehicules_tableau)
-                
-                # Si aucun tableau trouvé, essayer d'analyser le texte brut
-                if not vehicules_data:
-                    vehicules_data = self._analyser_texte_pdf(texte_complet)
-                
-                # Si toujours aucune donnée, retourner une erreur
-                if not vehicules_data:
-                    return False, f"Aucune donnée de véhicule détectée dans le PDF.\nTexte extrait ({len(texte_complet)} caractères):\n{texte_complet[:500]}..."
-                
-                # Créer la nouvelle journée
-                from models.journee_enchere import JourneeEnchere
-                from models.vehicule import Vehicule
-                
-                journee = JourneeEnchere()
-                journee.nom = nom_journee
-                journee.date = datetime.now().strftime("%Y-%m-%d")
-                journee.description = f"Journée créée depuis import PDF : {os.path.basename(chemin_fichier)}"
-                
-                # Convertir les données en véhicules
-                vehicules_reperage = []
-                vehicules_achetes = []
-                
-                for donnees in vehicules_data:
-                    try:
-                        # Valeurs par défaut
-                        donnees.setdefault('couleur', 'turquoise')
-                        donnees.setdefault('reserve_professionnels', False)
-                        donnees.setdefault('prix_vente_final', '')
-                        
-                        # Créer le véhicule
-                        vehicule = Vehicule(donnees)
+                    # Déterminer s'il est acheté ou en repérage
+                    prix_achat = donnees.get('prix_achat', '').strip()
+                    if prix_achat and prix_achat != '0':
+                        vehicule.statut = "Acheté"
+                        if not vehicule.date_achat:
+                            vehicule.date_achat = datetime.now().strftime("%d/%m/%Y")
+                        vehicules_achetes.append(vehicule)
+                    else:
+                        vehicule.statut = "Repérage"
+                        vehicules_reperage.append(vehicule)
                         
-                        # Déterminer s'il est acheté ou en repérage
-                        prix_achat = donnees.get('prix_achat', '').strip()
-                        if prix_achat and prix_achat != '0':
-                            vehicule.statut = "Acheté"
-                            if not vehicule.date_achat:
-                                vehicule.date_achat = datetime.now().strftime("%d/%m/%Y")
-                            vehicules_achetes.append(vehicule)
-                        else:
-                            vehicule.statut = "Repérage"
-                            vehicules_reperage.append(vehicule)
-                            
-                    except Exception as e:
-                        print(f"⚠️ Erreur véhicule: {e}")
-                        continue
-                
-                # Assigner les véhicules à la journée
-                journee.vehicules_reperage = vehicules_reperage
-                journee.vehicules_achetes = vehicules_achetes
-                
-                # Générer un nom de fichier unique
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                nom_securise = "".join(c for c in nom_journee if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                nom_securise = nom_securise.replace(' ', '_')[:20]
-                nom_fichier = f"pdf_import_{timestamp}_{nom_securise}.json"
-                
-                # Sauvegarder la journée
-                if self.sauvegarder_journee_fichier(journee, nom_fichier):
-                    message = f"✅ Import PDF réussi !\n"
-                    message += f"📄 Fichier créé : {nom_fichier}\n"
-                    message += f"📊 Données importées :\n"
-                    message += f"   • {len(vehicules_reperage)} véhicules en repérage\n"
-                    message += f"   • {len(vehicules_achetes)} véhicules achetés\n"
-                    message += f"   • Total : {len(vehicules_data)} véhicules traités"
-                    return True, message
-                else:
-                    return False, "Erreur lors de la sauvegarde de la journée"
-                    
+                except Exception as e:
+                    print(f"⚠️ Erreur véhicule: {e}")
+                    continue
+            
+            # Assigner les véhicules à la journée
+            journee.vehicules_reperage = vehicules_reperage
+            journee.vehicules_achetes = vehicules_achetes
+            
+            # Générer un nom de fichier unique
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            nom_securise = "".join(c for c in nom_journee if c.isalnum() or c in (' ', '-', '_')).rstrip()
+            nom_securise = nom_securise.replace(' ', '_')[:20]
+            nom_fichier = f"pdf_import_{timestamp}_{nom_securise}.json"
+            
+            # Sauvegarder la journée
+            if self.sauvegarder_journee_fichier(journee, nom_fichier):
+                message = f"✅ Import PDF réussi !\n"
+                message += f"📄 Fichier créé : {nom_fichier}\n"
+                message += f"📊 Données importées :\n"
+                message += f"   • {len(vehicules_reperage)} véhicules en repérage\n"
+                message += f"   • {len(vehicules_achetes)} véhicules achetés\n"
+                message += f"   • Total : {len(vehicules_data)} véhicules traités"
+                return True, message
+            else:
+                return False, "Erreur lors de la sauvegarde de la journée"
+                
         except Exception as e:
             return False, f"Erreur lors de l'import PDF : {e}"
     
+    def mettre_a_jour_catalogue(self, journee: JourneeEnchere, nom_fichier: str, chemin_fichier: str,
+                                mapping_colonnes: dict = None) -> tuple[bool, str]:
+        """
+        Met à jour une journée existante avec un catalogue réédité (CSV ou PDF), par numéro de lot
+        
+        Seuls les champs du catalogue qui ont changé sont mis à jour : estimations,
+        notes, couleurs et achats sont conservés (voir fusionner_catalogue).
+        
+        Args:
+            journee: Journée à mettre à jour (celle affichée, modifiée sur place)
+            nom_fichier: Fichier de la journée
+            chemin_fichier: Catalogue CSV ou PDF
+            mapping_colonnes: Mapping des colonnes CSV (voir lire_catalogue_csv)
+            
+        Returns:
+            tuple[bool, str]: (succès, message)
+        """
+        try:
+            if not os.path.exists(chemin_fichier):
+                return False, f"Fichier non trouvé : {chemin_fichier}"
+            
+            debut = time.perf_counter()
+            if chemin_fichier.lower().endswith('.pdf'):
+                catalogue = self.lire_catalogue_pdf(chemin_fichier)
+            else:
+                catalogue = self.lire_catalogue_csv(chemin_fichier, mapping_colonnes)
+            if catalogue and all(donnees.get('lot_genere') for donnees in catalogue):
+                return False, ("Le catalogue n'indique pas les numéros de lot : impossible de le rapprocher "
+                               "de la journée.\nImportez-le plutôt comme une nouvelle journée.")
+            bilan = fusionner_catalogue(journee, catalogue)
+            
+            if (bilan['inseres'] or bilan['mis_a_jour']) and not self.sauvegarder_journee_fichier(journee, nom_fichier):
+                return False, "Erreur lors de la sauvegarde de la journée"
+            
+            message = f"✅ Catalogue mis à jour : {journee.nom}\n"
+            message += f"📊 {len(catalogue)} lignes du catalogue :\n"
+            message += f"   • {bilan['inseres']} nouveaux lots ajoutés en repérage\n"
+            message += f"   • {bilan['mis_a_jour']} lots mis à jour\n"
+            message += f"   • {bilan['inchanges']} lots inchangés\n"
+            if bilan['absents']:
+                message += f"   • {bilan['absents']} lots absents du catalogue (conservés)\n"
+            if bilan['ignores']:
+                message += f"   • {bilan['ignores']} lignes ignorées (sans numéro de lot ou en double)\n"
+            print(f"🔄 Catalogue {os.path.basename(chemin_fichier)} fusionné dans {nom_fichier} "
+                  f"en {(time.perf_counter() - debut) * 1000:.0f} ms")
+            return True, message
+            
+        except UnicodeDecodeError:
+            return False, "Erreur d'encodage du fichier CSV. Assurez-vous qu'il est encodé en UTF-8."
+        except ValueError as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"Erreur lors de la mise à jour du catalogue : {e}"
+    
     def _analyser_tableau_pdf(self, tableau: list, page_num: int, table_num: int) -> list:
         """
         Analyse un tableau extrait du PDF et convertit en données de véhicules
@@ -710,9 +1044,10 @@ class JourneesManager:
                         
                         donnees_vehicule[champ] = valeur
                 
-                # Ajouter des valeurs par défaut si pas de lot
+                # Ajouter des valeurs par défaut si pas de lot (numéro de position, pas un vrai lot)
                 if 'lot' not in donnees_vehicule:
                     donnees_vehicule['lot'] = f"P{page_num}T{table_num}L{ligne_num}"
+                    donnees_vehicule['lot_genere'] = True
                 
                 # Ne garder que les lignes avec au moins marque OU modèle
                 if donnees_vehicule.get('marque') or donnees_vehicule.get('modele'):
@@ -775,7 +1110,8 @@ class JourneesManager:
                 # Extraire les informations de cette ligne
                 donnees_vehicule = {
                     'marque': marque_trouvee,
-                    'lot': f"L{i+1}"
+                    'lot': f"L{i+1}",
+                    'lot_genere': True  # Numéro de ligne du texte, pas un vrai lot
                 }
                 
                 # Extraire le modèle (tout après la marque jusqu'au premier nombre)
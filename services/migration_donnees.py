@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Migration en lot des données de l'ancienne version
+
+Parcourt une arborescence (sauvegardes, dossiers récupérés chez les
+utilisateurs) à la recherche des anciens fichiers « donnees_encheres*.json »
+(une base unique) et « journees_encheres*.json » (plusieurs journées dans un
+fichier), les valide et les convertit en journées, un fichier par processus.
+
+Le manifeste (.migrations.json du dossier des journées) garde pour chaque
+fichier source son empreinte, les journées créées et le bilan : un fichier
+déjà migré et inchangé est sauté. Il mémorise aussi que la vérification
+automatique au démarrage (JourneesManager.migrer_anciennes_donnees) a été
+faite, pour ne plus la refaire à chaque ouverture.
+"""
+
+import fnmatch
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from services.codecs_journee import lire_fichier_journee
+from services.verrou_fichier import VerrouFichier, ecrire_atomique
+
+# Fichier caché : les listes de journées ne prennent que les « *.json » visibles
+NOM_MANIFESTE = ".migrations.json"
+MOTIFS_ANCIENS = ("donnees_encheres*.json", "journees_encheres*.json")
+CHAMPS_PRIX = ('prix_revente', 'cout_reparations', 'temps_reparations', 'prix_achat', 'prix_vente_final')
+
+# ----------------------------------------------------------------------
+# Manifeste
+# ----------------------------------------------------------------------
+
+def chemin_manifeste(dossier_journees: str) -> str:
+    return os.path.join(dossier_journees, NOM_MANIFESTE)
+
+def lire_manifeste(dossier_journees: str) -> Dict[str, Any]:
+    """{'verification_demarrage': date ou None, 'fichiers': {source: bilan}}"""
+    try:
+        with open(chemin_manifeste(dossier_journees), 'r', encoding='utf-8') as f:
+            manifeste = json.load(f)
+    except (OSError, ValueError):
+        manifeste = {}
+    manifeste.setdefault('verification_demarrage', None)
+    manifeste.setdefault('fichiers', {})
+    return manifeste
+
+def mettre_a_jour_manifeste(dossier_journees: str, bilans: Optional[List[Dict[str, Any]]] = None,
+                            verification_demarrage: bool = False):
+    """Ajoute des bilans de migration et/ou marque la vérification de démarrage comme faite"""
+    chemin = chemin_manifeste(dossier_journees)
+    with VerrouFichier(f"{chemin}.lock"):
+        manifeste = lire_manifeste(dossier_journees)
+        for bilan in bilans or []:
+            manifeste['fichiers'][bilan['source']] = {c: v for c, v in bilan.items() if c != 'source'}
+        if verification_demarrage:
+            manifeste['verification_demarrage'] = datetime.now().isoformat(timespec='seconds')
+        ecrire_atomique(chemin, json.dumps(manifeste, indent=2, ensure_ascii=False).encode('utf-8'))
+
+def verification_demarrage_faite(dossier_journees: str) -> bool:
+    """True si la migration automatique au démarrage a déjà été vérifiée pour ce dossier"""
+    # Lecture d'un petit fichier à chaque JourneesManager, au lieu de chercher les anciens fichiers
+    return bool(lire_manifeste(dossier_journees)['verification_demarrage'])
+
+# ----------------------------------------------------------------------
+# Recherche et validation
+# ----------------------------------------------------------------------
+
+def trouver_fichiers_anciens(racines: List[str], dossier_journees: str) -> List[str]:
+    """Anciens fichiers de données sous les racines (chemins absolus, sans le dossier des journées)"""
+    exclu = os.path.abspath(dossier_journees)
+    fichiers = []
+    for racine in racines:
+        if os.path.isfile(racine):
+            fichiers.append(os.path.abspath(racine))
+            continue
+        for dossier, sous_dossiers, noms in os.walk(racine):
+            sous_dossiers[:] = [d for d in sous_dossiers if os.path.abspath(os.path.join(dossier, d)) != exclu]
+            for nom in noms:
+                if any(fnmatch.fnmatch(nom, motif) for motif in MOTIFS_ANCIENS):
+                    fichiers.append(os.path.abspath(os.path.join(dossier, nom)))
+    return sorted(set(fichiers))
+
+def empreinte_fichier(chemin: str) -> str:
+    with open(chemin, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def valider_vehicules(vehicules: Any, liste: str) -> tuple[List[Dict[str, Any]], List[str]]:
+    """Véhicules utilisables d'une liste et avertissements (lignes rejetées, lots manquants ou en double)"""
+    if not isinstance(vehicules, list):
+        return [], [f"{liste} : liste attendue, {type(vehicules).__name__} trouvé"]
+    valides, avertissements, lots = [], [], set()
+    for i, vehicule in enumerate(vehicules):
+        if not isinstance(vehicule, dict):
+            avertissements.append(f"{liste} ligne {i + 1} : ignorée (pas un véhicule)")
+            continue
+        lot = str(vehicule.get('lot', '')).strip()
+        if not lot:
+            avertissements.append(f"{liste} ligne {i + 1} : sans numéro de lot")
+        elif lot in lots:
+            avertissements.append(f"{liste} ligne {i + 1} : lot {lot} en double")
+        lots.add(lot)
+        for champ in CHAMPS_PRIX:
+            valeur = str(vehicule.get(champ, '') or '').replace('€', '').replace(',', '.').replace(' ', '')
+            try:
+                if valeur:
+                    float(valeur)
+            except ValueError:
+                avertissements.append(f"{liste} lot {lot or '?'} : {champ} non numérique ({vehicule.get(champ)!r})")
+        valides.append(vehicule)
+    return valides, avertissements
+
+# ----------------------------------------------------------------------
+# Conversion (exécutée dans un processus séparé)
+# ----------------------------------------------------------------------
+
+def migrer_fichier(chemin: str, dossier_journees: str, empreinte: str) -> Dict[str, Any]:
+    """
+    Convertit un ancien fichier en journée(s) du dossier des journées
+
+    Les journées créées sont nommées d'après le chemin du fichier source : remigrer
+    un fichier modifié depuis remplace ses journées au lieu de les dupliquer.
+
+    Returns:
+        Bilan {'source', 'empreinte', 'statut' ('migre' ou 'erreur'), 'journees', 'reperage',
+        'achetes', 'avertissements', 'erreur', 'date'}
+    """
+    from models.journee_enchere import JourneeEnchere
+    from models.vehicule import Vehicule
+    from services.journees_manager import JourneesManager
+
+    bilan = {'source': chemin, 'empreinte': empreinte, 'statut': 'erreur', 'journees': [], 'reperage': 0,
+             'achetes': 0, 'avertissements': [], 'erreur': '', 'date': datetime.now().isoformat(timespec='seconds')}
+    try:
+        anciennes_donnees = lire_fichier_journee(chemin)
+    except (OSError, ValueError) as e:
+        bilan['erreur'] = f"Lecture impossible : {e}"
+        return bilan
+
+    # Ancien fichier multi-journées ou base unique
+    if isinstance(anciennes_donnees, dict) and isinstance(anciennes_donnees.get('journees'), list):
+        sources = [j for j in anciennes_donnees['journees'] if isinstance(j, dict)]
+    elif isinstance(anciennes_donnees, dict) and ('vehicules_reperage' in anciennes_donnees
+                                                  or 'vehicules_achetes' in anciennes_donnees):
+        sources = [anciennes_donnees]
+    else:
+        bilan['erreur'] = "Structure non reconnue (ni 'journees', ni 'vehicules_reperage' / 'vehicules_achetes')"
+        return bilan
+
+    # Paramètres de l'ancienne version à côté du fichier
+    parametres = {}
+    chemin_parametres = os.path.join(os.path.dirname(chemin), "parametres_encheres.json")
+    if os.path.exists(chemin_parametres):
+        try:
+            with open(chemin_parametres, 'r', encoding='utf-8') as f:
+                parametres = json.load(f)
+        except (OSError, ValueError) as e:
+            bilan['avertissements'].append(f"parametres_encheres.json ignoré : {e}")
+
+    manager = JourneesManager(dossier_journees, migrer=False)
+    prefixe = f"migration_{hashlib.sha1(chemin.encode('utf-8')).hexdigest()[:12]}"
+    dossier_source = os.path.basename(os.path.dirname(chemin)) or os.path.basename(chemin)
+    for i, donnees in enumerate(sources):
+        reperage, avertissements_reperage = valider_vehicules(donnees.get('vehicules_reperage', []), "repérage")
+        achetes, avertissements_achetes = valider_vehicules(donnees.get('vehicules_achetes', []), "achetés")
+        bilan['avertissements'] += avertissements_reperage + avertissements_achetes
+
+        if 'nom' in donnees:
+            journee = JourneeEnchere({**donnees, 'vehicules_reperage': [], 'vehicules_achetes': []})
+        else:
+            journee = JourneeEnchere()
+            journee.nom = f"Migration - {dossier_source}"
+            journee.description = f"Journée migrée depuis {chemin}"
+            journee.parametres.update(parametres)
+        journee.vehicules_reperage = [Vehicule(v) for v in reperage]
+        journee.vehicules_achetes = [Vehicule(v) for v in achetes]
+
+        suffixe = f"_{i + 1}" if len(sources) > 1 else ""
+        nom_fichier = f"{prefixe}{suffixe}.json"
+        if not manager.sauvegarder_journee_fichier(journee, nom_fichier):
+            bilan['erreur'] = f"Sauvegarde impossible : {nom_fichier}"
+            return bilan
+        bilan['journees'].append(nom_fichier)
+        bilan['reperage'] += len(journee.vehicules_reperage)
+        bilan['achetes'] += len(journee.vehicules_achetes)
+
+    bilan['statut'] = 'migre'
+    return bilan
+
+def migrer_arborescence(racines: List[str], dossier_journees: str = "journees_data", processus: int = 1,
+                        forcer: bool = False) -> List[Dict[str, Any]]:
+    """
+    Migre tous les anciens fichiers trouvés sous les racines, en parallèle
+
+    Args:
+        racines: Dossiers (parcourus récursivement) ou fichiers
+        dossier_journees: Dossier des journées (destination et manifeste)
+        processus: Processus en parallèle (0 = nombre de cœurs)
+        forcer: Migre aussi les fichiers déjà migrés et inchangés
+
+    Returns:
+        Bilans dans l'ordre des fichiers ; les fichiers sautés ont le statut 'deja_migre'
+    """
+    from services.service_journees import executer_en_parallele
+
+    os.makedirs(dossier_journees, exist_ok=True)
+    deja_migres = lire_manifeste(dossier_journees)['fichiers']
+    bilans, appels = {}, []
+    for chemin in trouver_fichiers_anciens(racines, dossier_journees):
+        try:
+            empreinte = empreinte_fichier(chemin)
+        except OSError as e:
+            bilans[chemin] = {'source': chemin, 'statut': 'erreur', 'erreur': f"Lecture impossible : {e}"}
+            continue
+        precedent = deja_migres.get(chemin)
+        if (not forcer and precedent and precedent.get('statut') == 'migre' and precedent.get('empreinte') == empreinte
+                and all(os.path.exists(os.path.join(dossier_journees, nom)) for nom in precedent.get('journees', []))):
+            bilans[chemin] = {'source': chemin, **precedent, 'statut': 'deja_migre'}
+            continue
+        appels.append((chemin, dossier_journees, empreinte))
+
+    for bilan in executer_en_parallele(migrer_fichier, appels, processus):
+        bilans[bilan['source']] = bilan
+    # Seul le processus principal écrit le manifeste
+    mettre_a_jour_manifeste(dossier_journees, [b for b in bilans.values() if b['statut'] != 'deja_migre'])
+    return [bilans[chemin] for chemin in sorted(bilans)]
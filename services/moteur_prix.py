@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Moteur de calcul des prix : source unique des formules
+
+- Main d'œuvre      = Temps réparations × Tarif horaire
+- Commission vente  = Prix revente × Commission (%)
+- Prix max          = Prix revente - (Coût réparations + Main d'œuvre) - Commission vente - Marge sécurité
+- Commission achat  = Prix achat × Commission (%)
+- Marge complète    = Prix vente final - (Prix achat + Coût réparations + Main d'œuvre + Commission achat)
+- Marge prévue      = idem avec le prix de revente estimé (véhicule acheté, pas encore vendu)
+- Écart budget      = Prix max - Prix achat
+
+Deux API :
+- scalaire : calculer(...) / calculer_vehicule(vehicule) pour un véhicule ;
+- en lot   : calculer_lot(colonnes) / calculer_vehicules(vehicules) sur des
+  colonnes de valeurs, vectorisé avec NumPy s'il est installé.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Paramètres de calcul et valeurs par défaut (identiques aux paramètres de journée)
+PARAMETRES_PRIX_DEFAUT = {
+    'tarif_horaire': 45.0,
+    'commission_vente': 8.5,
+    'marge_securite': 200.0
+}
+
+# Colonnes d'entrée (champs numériques du véhicule)
+COLONNES_ENTREE = ('prix_revente', 'cout_reparations', 'temps_reparations', 'prix_achat', 'prix_vente_final')
+
+# Colonnes calculées
+COLONNES_SORTIE = ('main_oeuvre', 'commission_vente', 'prix_max', 'commission_achat',
+                   'marge_complete', 'marge_prevue', 'marge_pourcentage', 'ecart_budget')
+
+def valeur_numerique(valeur) -> float:
+    """Convertit un champ saisi ("12500€", "4,5", "") en nombre (0.0 si invalide)"""
+    if isinstance(valeur, (int, float)):
+        return float(valeur)
+    try:
+        texte = str(valeur or '').replace('€', '').replace(',', '.').strip()
+        return float(texte) if texte else 0.0
+    except ValueError:
+        return 0.0
+
+def formater_prix_max(prix_revente: float, prix_max: float) -> str:
+    """Texte du prix max stocké sur le véhicule ("" sans prix de revente)"""
+    if prix_revente <= 0:
+        return ""
+    return f"{prix_max:.0f}€" if prix_max > 0 else "0€"
+
+class MoteurPrix:
+    """Calculs de prix pour un jeu de paramètres (journée ou paramètres globaux)"""
+
+    def __init__(self, parametres: Optional[Dict] = None):
+        parametres = parametres or {}
+        self.tarif_horaire = valeur_numerique(parametres.get('tarif_horaire', PARAMETRES_PRIX_DEFAUT['tarif_horaire']))
+        self.taux_commission = valeur_numerique(
+            parametres.get('commission_vente', PARAMETRES_PRIX_DEFAUT['commission_vente'])) / 100
+        self.marge_securite = valeur_numerique(
+            parametres.get('marge_securite', PARAMETRES_PRIX_DEFAUT['marge_securite']))
+
+    # ------------------------------------------------------------------
+    # API scalaire
+    # ------------------------------------------------------------------
+
+    def prix_max(self, prix_revente: float, cout_reparations: float, temps_reparations: float) -> float:
+        """Prix maximum d'achat (jamais négatif)"""
+        main_oeuvre = temps_reparations * self.tarif_horaire
+        commission = prix_revente * self.taux_commission
+        return max(0.0, prix_revente - (cout_reparations + main_oeuvre) - commission - self.marge_securite)
+
+    def marge_complete(self, prix_vente_final: float, prix_achat: float,
+                       cout_reparations: float, temps_reparations: float) -> float:
+        """Marge réelle avec tous les coûts (0 si non acheté ou non vendu)"""
+        if prix_achat <= 0 or prix_vente_final <= 0:
+            return 0.0
+        main_oeuvre = temps_reparations * self.tarif_horaire
+        commission = prix_achat * self.taux_commission
+        return prix_vente_final - (prix_achat + cout_reparations + main_oeuvre + commission)
+
+    def calculer(self, prix_revente: float, cout_reparations: float = 0.0, temps_reparations: float = 0.0,
+                 prix_achat: float = 0.0, prix_vente_final: float = 0.0,
+                 prix_max_reference: Optional[float] = None) -> Dict[str, float]:
+        """
+        Tous les montants d'un véhicule
+
+        Args:
+            prix_max_reference: Prix max servant à l'écart budget (celui enregistré
+                                sur le véhicule) ; le prix max calculé par défaut
+
+        Returns:
+            Dictionnaire des COLONNES_SORTIE
+        """
+        main_oeuvre = temps_reparations * self.tarif_horaire
+        commission_vente = prix_revente * self.taux_commission
+        prix_max = max(0.0, prix_revente - (cout_reparations + main_oeuvre) - commission_vente - self.marge_securite)
+        commission_achat = prix_achat * self.taux_commission
+        couts = prix_achat + cout_reparations + main_oeuvre + commission_achat
+
+        achete = prix_achat > 0
+        marge_complete = prix_vente_final - couts if achete and prix_vente_final > 0 else 0.0
+        marge_prevue = prix_revente - couts if achete and prix_revente > 0 else 0.0
+        reference = prix_max if prix_max_reference is None else prix_max_reference
+
+        return {
+            'main_oeuvre': main_oeuvre,
+            'commission_vente': commission_vente,
+            'prix_max': prix_max,
+            'commission_achat': commission_achat,
+            'marge_complete': marge_complete,
+            'marge_prevue': marge_prevue,
+            'marge_pourcentage': marge_complete / prix_achat * 100 if achete else 0.0,
+            'ecart_budget': reference - prix_achat if achete else 0.0
+        }
+
+    def calculer_vehicule(self, vehicule) -> Dict[str, float]:
+        """Tous les montants d'un véhicule (écart budget sur son prix max enregistré)"""
+        return self.calculer(
+            *(vehicule.get_prix_numerique(champ) for champ in COLONNES_ENTREE),
+            prix_max_reference=vehicule.get_prix_numerique('prix_max_achat')
+        )
+
+    # ------------------------------------------------------------------
+    # API en lot
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def colonnes_vehicules(vehicules: Sequence) -> Dict[str, List[float]]:
+        """Colonnes d'entrée (et prix max enregistrés) d'une liste de véhicules"""
+        colonnes = {champ: [v.get_prix_numerique(champ) for v in vehicules] for champ in COLONNES_ENTREE}
+        colonnes['prix_max_reference'] = [v.get_prix_numerique('prix_max_achat') for v in vehicules]
+        return colonnes
+
+    def calculer_lot(self, colonnes: Dict[str, Sequence[float]]) -> Dict[str, Sequence[float]]:
+        """
+        Calcule toutes les colonnes de sortie pour un lot de véhicules
+
+        Args:
+            colonnes: Colonnes de même longueur parmi COLONNES_ENTREE (absentes = 0)
+                      et 'prix_max_reference' (absente = prix max calculé)
+
+        Returns:
+            Dictionnaire des COLONNES_SORTIE (tableaux NumPy si disponible, sinon listes)
+        """
+        taille = max((len(c) for c in colonnes.values()), default=0)
+        if np is not None:
+            return self._calculer_lot_numpy(colonnes, taille)
+        return self._calculer_lot_python(colonnes, taille)
+
+    def _calculer_lot_python(self, colonnes: Dict[str, Sequence[float]], taille: int) -> Dict[str, List[float]]:
+        """Mêmes formules que calculer(), en une boucle sans objet intermédiaire par véhicule"""
+        zeros = [0.0] * taille
+        entrees = [colonnes.get(champ) or zeros for champ in COLONNES_ENTREE]
+        references = colonnes.get('prix_max_reference') or [None] * taille
+        tarif, taux, marge_securite = self.tarif_horaire, self.taux_commission, self.marge_securite
+
+        resultats = {nom: [] for nom in COLONNES_SORTIE}
+        (main_oeuvres, commissions_vente, prix_maxs, commissions_achat,
+         marges_completes, marges_prevues, pourcentages, ecarts) = (resultats[nom] for nom in COLONNES_SORTIE)
+        for prix_revente, cout_reparations, temps, prix_achat, prix_vente_final, reference in zip(*entrees, references):
+            main_oeuvre = temps * tarif
+            commission_vente = prix_revente * taux
+            prix_max = prix_revente - (cout_reparations + main_oeuvre) - commission_vente - marge_securite
+            if prix_max < 0:
+                prix_max = 0.0
+            commission_achat = prix_achat * taux
+            main_oeuvres.append(main_oeuvre)
+            commissions_vente.append(commission_vente)
+            prix_maxs.append(prix_max)
+            commissions_achat.append(commission_achat)
+            if prix_achat > 0:
+                couts = prix_achat + cout_reparations + main_oeuvre + commission_achat
+                marge_complete = prix_vente_final - couts if prix_vente_final > 0 else 0.0
+                marges_completes.append(marge_complete)
+                marges_prevues.append(prix_revente - couts if prix_revente > 0 else 0.0)
+                pourcentages.append(marge_complete / prix_achat * 100)
+                ecarts.append((prix_max if reference is None else reference) - prix_achat)
+            else:
+                marges_completes.append(0.0)
+                marges_prevues.append(0.0)
+                pourcentages.append(0.0)
+                ecarts.append(0.0)
+        return resultats
+
+    def _calculer_lot_numpy(self, colonnes: Dict[str, Sequence[float]], taille: int) -> Dict:
+        """Mêmes formules que calculer(), vectorisées"""
+        def colonne(nom):
+            valeurs = colonnes.get(nom)
+            return np.asarray(valeurs, dtype=float) if valeurs is not None else np.zeros(taille)
+
+        prix_revente = colonne('prix_revente')
+        cout_reparations = colonne('cout_reparations')
+        prix_achat = colonne('prix_achat')
+        prix_vente_final = colonne('prix_vente_final')
+
+        main_oeuvre = colonne('temps_reparations') * self.tarif_horaire
+        commission_vente = prix_revente * self.taux_commission
+        prix_max = np.maximum(0.0, prix_revente - (cout_reparations + main_oeuvre) - commission_vente - self.marge_securite)
+        commission_achat = prix_achat * self.taux_commission
+        couts = prix_achat + cout_reparations + main_oeuvre + commission_achat
+
+        achete = prix_achat > 0
+        marge_complete = np.where(achete & (prix_vente_final > 0), prix_vente_final - couts, 0.0)
+        marge_prevue = np.where(achete & (prix_revente > 0), prix_revente - couts, 0.0)
+        reference = colonne('prix_max_reference') if 'prix_max_reference' in colonnes else prix_max
+        with np.errstate(divide='ignore', invalid='ignore'):
+            marge_pourcentage = np.where(achete, marge_complete / prix_achat * 100, 0.0)
+
+        return {
+            'main_oeuvre': main_oeuvre,
+            'commission_vente': commission_vente,
+            'prix_max': prix_max,
+            'commission_achat': commission_achat,
+            'marge_complete': marge_complete,
+            'marge_prevue': marge_prevue,
+            'marge_pourcentage': marge_pourcentage,
+            'ecart_budget': np.where(achete, reference - prix_achat, 0.0)
+        }
+
+    def calculer_vehicules(self, vehicules: Sequence) -> Dict[str, Sequence[float]]:
+        """Toutes les colonnes de sortie pour une liste de véhicules (dans le même ordre)"""
+        return self.calculer_lot(self.colonnes_vehicules(vehicules))
+
+    def mettre_a_jour_prix_max(self, vehicules: Sequence):
+        """Recalcule en un lot le prix max enregistré de chaque véhicule"""
+        colonnes = {champ: [v.get_prix_numerique(champ) for v in vehicules]
+                    for champ in ('prix_revente', 'cout_reparations', 'temps_reparations')}
+        prix_max = self.calculer_lot(colonnes)['prix_max']
+        for vehicule, prix_revente, valeur in zip(vehicules, colonnes['prix_revente'], prix_max):
+            vehicule.prix_max_achat = formater_prix_max(prix_revente, float(valeur))
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Choix des lots à viser sous contrainte de budget et d'heures d'atelier
+
+Pour chaque lot en repérage :
+- prix attendu   = Prix max × E[r | r ≤ 1], r étant la loi d'adjudication ajustée
+  sur les journées passées (services/simulation_enchere.py), tronquée à notre
+  prix max comme dans la simulation ;
+- marge attendue = Prix revente - Coût réparations - Main d'œuvre - Prix attendu × (1 + Commission) ;
+- engagement     = Prix max × (1 + Commission) : trésorerie à prévoir si le lot
+  part à notre prix max, ce qui garantit le budget même dans le pire cas.
+
+Le choix est un sac à dos à deux contraintes (engagement ≤ budget, heures ≤
+capacité) résolu par séparation et évaluation : exploration en profondeur par
+ordre de rentabilité, élagage par la relaxation fractionnaire d'une contrainte
+de substitution combinant les deux.
+"""
+
+import math
+import sys
+from typing import Dict, List, Optional, Sequence
+
+from services.moteur_prix import MoteurPrix
+from services.simulation_enchere import esperance_ratio, loi_vehicule
+
+# Nœuds explorés au-delà desquels la meilleure sélection trouvée est renvoyée
+LIMITE_NOEUDS = 500_000
+
+def preparer_candidats(vehicules: Sequence, parametres: Dict, modele: Dict) -> List[Dict]:
+    """Lots candidats (prix max > 0 et marge attendue > 0), index = position dans vehicules"""
+    moteur = MoteurPrix(parametres)
+    candidats = []
+    for index, vehicule in enumerate(vehicules):
+        prix_max = vehicule.get_prix_numerique('prix_max_achat')
+        if prix_max <= 0:
+            continue
+        prix_attendu = prix_max * esperance_ratio(loi_vehicule(modele, vehicule))
+        heures = vehicule.get_prix_numerique('temps_reparations')
+        marge_attendue = (vehicule.get_prix_numerique('prix_revente') - vehicule.get_prix_numerique('cout_reparations')
+                          - heures * moteur.tarif_horaire - prix_attendu * (1 + moteur.taux_commission))
+        if marge_attendue <= 0:
+            continue
+        candidats.append({
+            'index': index,
+            'lot': vehicule.lot,
+            'libelle': f"{vehicule.marque} {vehicule.modele}".strip(),
+            'prix_max': prix_max,
+            'prix_attendu': prix_attendu,
+            'engagement': prix_max * (1 + moteur.taux_commission),
+            'marge_attendue': marge_attendue,
+            'heures': heures
+        })
+    return candidats
+
+def _borne_fractionnaire(debut: int, valeurs: List[float], poids: List[float], capacite: float) -> float:
+    """Marge maximale (relaxée) des objets debut.. (déjà triés par valeur / poids décroissante)"""
+    total = 0.0
+    for i in range(debut, len(valeurs)):
+        if poids[i] <= capacite:
+            capacite -= poids[i]
+            total += valeurs[i]
+        else:
+            return total + valeurs[i] * capacite / poids[i]
+    return total
+
+def _borne_substitution(objets: Sequence[Dict], budget: float, heures_max: float, lambda_heures: float) -> float:
+    """Majorant de la marge totale pour un multiplicateur λ donné"""
+    poids = [c['engagement'] + lambda_heures * c['heures'] for c in objets]
+    ordre = sorted(range(len(objets)), key=lambda i: objets[i]['marge_attendue'] / poids[i], reverse=True)
+    return _borne_fractionnaire(0, [objets[i]['marge_attendue'] for i in ordre], [poids[i] for i in ordre],
+                                budget + lambda_heures * heures_max)
+
+def _meilleur_lambda(objets: Sequence[Dict], budget: float, heures_max: float, iterations: int = 40) -> float:
+    """λ minimisant le majorant de substitution (recherche par section dorée, fonction quasi convexe)"""
+    if not objets or heures_max <= 0:
+        return 0.0
+    # Bornes de recherche : de 0 à 1000 fois le « prix » moyen d'une heure dans le budget
+    bas, haut = 0.0, 1000 * budget / heures_max
+    ratio = (math.sqrt(5) - 1) / 2
+    gauche, droite = haut - ratio * (haut - bas), bas + ratio * (haut - bas)
+    borne_gauche = _borne_substitution(objets, budget, heures_max, gauche)
+    borne_droite = _borne_substitution(objets, budget, heures_max, droite)
+    for _ in range(iterations):
+        if borne_gauche <= borne_droite:
+            haut, droite, borne_droite = droite, gauche, borne_gauche
+            gauche = haut - ratio * (haut - bas)
+            borne_gauche = _borne_substitution(objets, budget, heures_max, gauche)
+        else:
+            bas, gauche, borne_gauche = gauche, droite, borne_droite
+            droite = bas + ratio * (haut - bas)
+            borne_droite = _borne_substitution(objets, budget, heures_max, droite)
+    return (bas + haut) / 2
+
+def optimiser_selection(candidats: Sequence[Dict], budget: float, heures_max: Optional[float] = None,
+                        limite_noeuds: int = LIMITE_NOEUDS) -> Dict:
+    """
+    Sélection des lots maximisant la marge attendue totale
+
+    Args:
+        candidats: Lots de preparer_candidats
+        budget: Engagement total maximum (€)
+        heures_max: Capacité d'atelier en heures (None = pas de contrainte)
+
+    Returns:
+        {'selection': candidats retenus classés par marge attendue, 'marge_totale',
+         'engagement_total', 'heures_totales', 'optimal': False si limite_noeuds atteinte,
+         'noeuds': nœuds explorés}
+    """
+    heures_max = math.inf if heures_max is None else heures_max
+    objets = [c for c in candidats if c['engagement'] <= budget and c['heures'] <= heures_max]
+
+    # Relaxation de substitution : engagement + λ × heures ≤ budget + λ × heures_max.
+    # Toute sélection admissible l'est aussi pour cette contrainte unique, dont la
+    # relaxation fractionnaire majore donc la marge atteignable ; λ est choisi à la
+    # racine pour rendre ce majorant le plus serré possible.
+    lambda_heures = _meilleur_lambda(objets, budget, heures_max) if heures_max < math.inf else 0.0
+
+    def poids_substitution(c):
+        return c['engagement'] + lambda_heures * c['heures']
+
+    # Ordre d'exploration : marge attendue par unité de poids décroissante
+    objets.sort(key=lambda c: c['marge_attendue'] / poids_substitution(c), reverse=True)
+    nombre = len(objets)
+    valeurs = [c['marge_attendue'] for c in objets]
+    engagements = [c['engagement'] for c in objets]
+    heures = [c['heures'] for c in objets]
+    poids = [poids_substitution(c) for c in objets]
+
+    # Une profondeur de récursion par lot
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), nombre + 100))
+
+    meilleure = {'marge': 0.0, 'choix': []}
+    noeuds = 0
+    choix = []
+
+    def explorer(k, marge, budget_restant, heures_restantes):
+        nonlocal noeuds
+        noeuds += 1
+        if marge > meilleure['marge']:
+            meilleure['marge'] = marge
+            meilleure['choix'] = list(choix)
+        if k == nombre or noeuds > limite_noeuds:
+            return
+
+        capacite = budget_restant + lambda_heures * heures_restantes if lambda_heures else budget_restant
+        if marge + _borne_fractionnaire(k, valeurs, poids, capacite) <= meilleure['marge'] + 1e-6:
+            return
+
+        if engagements[k] <= budget_restant and heures[k] <= heures_restantes:
+            choix.append(k)
+            explorer(k + 1, marge + valeurs[k], budget_restant - engagements[k], heures_restantes - heures[k])
+            choix.pop()
+        explorer(k + 1, marge, budget_restant, heures_restantes)
+
+    explorer(0, 0.0, budget, heures_max)
+
+    selection = sorted((objets[i] for i in meilleure['choix']), key=lambda c: c['marge_attendue'], reverse=True)
+    return {
+        'selection': selection,
+        'marge_totale': sum(c['marge_attendue'] for c in selection),
+        'engagement_total': sum(c['engagement'] for c in selection),
+        'heures_totales': sum(c['heures'] for c in selection),
+        'optimal': noeuds <= limite_noeuds,
+        'noeuds': noeuds
+    }
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Opérations sur les journées sans interface graphique
+
+Chaque opération prend le dossier des journées et un nom de fichier, et
+retourne (succès, message) ou un dictionnaire de résultats : elle peut tourner
+dans un processus séparé (traitements de nuit, cli.py --jobs) sans affichage.
+"""
+
+import fnmatch
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from services.exports_journee import (
+    exporter_csv_achetes, exporter_csv_reperage, exporter_json, exporter_pdf_achetes, exporter_pdf_reperage
+)
+from services.journees_manager import JourneesManager
+from services.moteur_prix import MoteurPrix
+
+FORMATS_EXPORT = ('csv', 'pdf', 'json')
+LISTES_EXPORT = ('reperage', 'achetes')
+
+def _manager(dossier: str) -> JourneesManager:
+    """Gestionnaire sans migration (les anciennes données sont migrées par l'application)"""
+    return JourneesManager(dossier, migrer=False)
+
+def resoudre_journees(dossier: str, motifs: Sequence[str]) -> List[str]:
+    """
+    Fichiers de journées désignés par des noms, des chemins ou des motifs (« 2025*.json », « * »)
+
+    Returns:
+        Noms de fichiers du dossier, sans doublon, dans l'ordre des motifs
+    """
+    disponibles = sorted(f for f in os.listdir(dossier) if f.endswith('.json')) if os.path.isdir(dossier) else []
+    noms = []
+    for motif in motifs:
+        motif = os.path.basename(motif)
+        trouves = fnmatch.filter(disponibles, motif) or fnmatch.filter(disponibles, f"{motif}.json")
+        if not trouves:
+            print(f"⚠️ Aucune journée ne correspond à « {motif} »")
+        noms += [nom for nom in trouves if nom not in noms]
+    return noms
+
+def importer_fichier(dossier: str, chemin: str, nom_journee: Optional[str] = None,
+                     dans: Optional[str] = None) -> tuple[bool, str]:
+    """Importe un fichier CSV ou PDF dans une nouvelle journée, ou met à jour la journée dans par lot"""
+    manager = _manager(dossier)
+    if dans:
+        journee = manager.charger_journee_fichier(dans)
+        if not journee:
+            return False, f"Impossible de charger la journée : {dans}"
+        return manager.mettre_a_jour_catalogue(journee, dans, chemin)
+    if chemin.lower().endswith('.pdf'):
+        return manager.importer_donnees_pdf(chemin, nom_journee)
+    return manager.importer_donnees_csv(chemin, nom_journee)
+
+def recalculer_prix_max(dossier: str, nom_fichier: str) -> tuple[bool, str]:
+    """Recalcule les prix max des véhicules en repérage avec les paramètres de la journée, puis sauvegarde"""
+    manager = _manager(dossier)
+    journee = manager.charger_journee_fichier(nom_fichier)
+    if not journee:
+        return False, f"Impossible de charger la journée : {nom_fichier}"
+
+    avant = [v.prix_max_achat for v in journee.vehicules_reperage]
+    MoteurPrix(journee.parametres).mettre_a_jour_prix_max(journee.vehicules_reperage)
+    modifies = sum(1 for v, ancien in zip(journee.vehicules_reperage, avant) if v.prix_max_achat != ancien)
+
+    if modifies and not manager.sauvegarder_journee_fichier(journee, nom_fichier):
+        return False, f"Sauvegarde impossible : {nom_fichier}"
+    return True, f"{journee.nom} : {modifies} prix max modifié(s) sur {len(avant)}"
+
+def convertir_journee(dossier: str, nom_fichier: str, codec: str) -> tuple[bool, str]:
+    """Réenregistre une journée dans un autre format (lisible, compact, gzip, zstd, binaire)"""
+    return _manager(dossier).convertir_journee(nom_fichier, codec)
+
+def exporter_journee(dossier: str, nom_fichier: str, format_export: str, dossier_sortie: str,
+                     liste: str = 'reperage') -> tuple[bool, str]:
+    """
+    Exporte une journée dans dossier_sortie (nom du fichier de la journée, extension du format)
+
+    Args:
+        format_export: 'csv', 'pdf' ou 'json' (journée complète)
+        liste: 'reperage' ou 'achetes' (exports CSV et PDF)
+    """
+    if format_export not in FORMATS_EXPORT:
+        return False, f"Format inconnu : {format_export}"
+    if liste not in LISTES_EXPORT:
+        return False, f"Liste inconnue : {liste}"
+
+    journee = _manager(dossier).charger_journee_fichier(nom_fichier)
+    if not journee:
+        return False, f"Impossible de charger la journée : {nom_fichier}"
+
+    os.makedirs(dossier_sortie, exist_ok=True)
+    base = os.path.splitext(nom_fichier)[0]
+    if format_export == 'json':
+        return exporter_json(os.path.join(dossier_sortie, f"{base}.json"), journee)
+
+    chemin = os.path.join(dossier_sortie, f"{base}_{liste}.{format_export}")
+    vehicules = journee.vehicules_reperage if liste == 'reperage' else journee.vehicules_achetes
+    if format_export == 'csv':
+        exporter = exporter_csv_reperage if liste == 'reperage' else exporter_csv_achetes
+        return exporter(chemin, vehicules, journee.parametres)
+    exporter = exporter_pdf_reperage if liste == 'reperage' else exporter_pdf_achetes
+    return exporter(chemin, vehicules, journee.parametres, journee.nom)
+
+def statistiques_journee(dossier: str, nom_fichier: str) -> Dict[str, Any]:
+    """
+    Chiffres clés d'une journée
+
+    Returns:
+        {'fichier', 'nom', 'date', 'reperage', 'achetes', 'vendus', 'investissement',
+         'marge_realisee', 'marge_prevue', 'budget_prix_max'} ; {'fichier', 'erreur'} en cas d'échec
+    """
+    journee = _manager(dossier).charger_journee_fichier(nom_fichier)
+    if not journee:
+        return {'fichier': nom_fichier, 'erreur': "Impossible de charger la journée"}
+
+    moteur = MoteurPrix(journee.parametres)
+    calculs = moteur.calculer_vehicules(journee.vehicules_achetes)
+    vendus = [i for i, v in enumerate(journee.vehicules_achetes) if v.get_prix_numerique('prix_vente_final') > 0]
+    return {
+        'fichier': nom_fichier,
+        'nom': journee.nom,
+        'date': journee.date,
+        'reperage': len(journee.vehicules_reperage),
+        'achetes': len(journee.vehicules_achetes),
+        'vendus': len(vendus),
+        'investissement': journee.get_total_investissement(),
+        'marge_realisee': float(sum(calculs['marge_complete'][i] for i in vendus)),
+        'marge_prevue': float(sum(calculs['marge_prevue'][i] for i in range(len(journee.vehicules_achetes))
+                                  if i not in vendus)),
+        'budget_prix_max': sum(v.get_prix_numerique('prix_max_achat') for v in journee.vehicules_reperage)
+    }
+
+def executer_en_parallele(fonction: Callable, appels: Sequence[tuple], processus: int = 1) -> List[Any]:
+    """
+    Exécute fonction(*arguments) pour chaque appel, dans des processus séparés si processus > 1
+
+    Returns:
+        Résultats dans l'ordre des appels
+    """
+    processus = min(processus or os.cpu_count() or 1, len(appels))
+    if processus > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=processus) as executor:
+                return list(executor.map(fonction, *zip(*appels)))
+        except (OSError, RuntimeError) as e:
+            print(f"⚠️ Traitement sans processus séparés: {e}")
+    return [fonction(*arguments) for arguments in appels]
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Simulation Monte Carlo d'une journée d'enchères à venir
+
+Modèle tiré des journées passées :
+- probabilité de remporter un lot = lots achetés / lots repérés avec un prix max ;
+- prix d'adjudication = Prix max × r, avec r lognormal ajusté sur les ratios
+  Prix achat / Prix max des véhicules achetés (par marque si l'échantillon
+  suffit, sinon sur toutes les marques) ;
+- un lot dont le ratio tiré dépasse 1 part au-dessus de notre prix max : il
+  est perdu, aucune dépense n'est comptée au-delà du prix max.
+
+Chaque scénario tire, pour chaque lot en repérage, s'il est remporté et à quel
+prix ; la dépense et la marge prévue (formules de MoteurPrix) sont sommées par
+scénario. Les scénarios sont répartis en blocs à graine fixe, simulés dans des
+processus séparés : le résultat ne dépend que de la graine, pas du nombre de
+processus.
+"""
+
+import glob
+import math
+import os
+import random
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from statistics import NormalDist
+from typing import Dict, List, Optional, Sequence
+
+from services.codecs_journee import lire_fichier_journee
+from services.moteur_prix import MoteurPrix, valeur_numerique
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Scénarios par bloc (unité de parallélisation et de graine)
+TAILLE_BLOC = 5000
+
+# Ratios minimum pour ajuster une loi propre à une marque
+MIN_ECHANTILLON_MARQUE = 8
+
+# Écart-type minimum du log-ratio (évite une loi dégénérée sur un petit historique)
+SIGMA_MIN = 0.02
+
+# Modèle utilisé sans historique : adjudication vers 90 % du prix max, un lot sur deux
+MODELE_DEFAUT = {'mu': math.log(0.9), 'sigma': 0.15, 'p_gain': 0.5, 'echantillon': 0}
+
+def charger_historique(dossier: str, fichier_exclu: str = "") -> List[Dict]:
+    """Données brutes des journées enregistrées (sauf fichier_exclu, la journée simulée)"""
+    journees = []
+    for chemin in sorted(glob.glob(os.path.join(dossier, "*.json"))):
+        if os.path.basename(chemin) == fichier_exclu:
+            continue
+        try:
+            journees.append(lire_fichier_journee(chemin))
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Historique ignoré ({os.path.basename(chemin)}): {e}")
+    return journees
+
+def ajuster_lognormal(ratios: Sequence[float]) -> Dict[str, float]:
+    """Paramètres (mu, sigma) de la loi lognormale des ratios (estimateur du maximum de vraisemblance)"""
+    logs = [math.log(r) for r in ratios if r > 0]
+    if not logs:
+        return {'mu': MODELE_DEFAUT['mu'], 'sigma': MODELE_DEFAUT['sigma']}
+    mu = statistics.fmean(logs)
+    sigma = statistics.pstdev(logs, mu) if len(logs) > 1 else MODELE_DEFAUT['sigma']
+    return {'mu': mu, 'sigma': max(SIGMA_MIN, sigma)}
+
+def construire_modele(journees: Sequence[Dict]) -> Dict:
+    """
+    Ajuste le modèle d'adjudication sur des journées passées
+
+    Returns:
+        {'global': loi, 'marques': {marque: loi}} où loi = {'mu', 'sigma', 'p_gain', 'echantillon'}
+    """
+    ratios_globaux, ratios_marques = [], {}
+    nb_achetes = nb_reperes = 0
+
+    for journee in journees:
+        for vehicule in journee.get('vehicules_achetes', []):
+            prix_achat = valeur_numerique(vehicule.get('prix_achat'))
+            prix_max = valeur_numerique(vehicule.get('prix_max_achat'))
+            if prix_achat <= 0 or prix_max <= 0:
+                continue
+            nb_achetes += 1
+            ratio = prix_achat / prix_max
+            ratios_globaux.append(ratio)
+            marque = str(vehicule.get('marque', '')).strip().lower()
+            if marque:
+                ratios_marques.setdefault(marque, []).append(ratio)
+        # Lots repérés non achetés (perdus ou non enchéris)
+        nb_reperes += sum(1 for v in journee.get('vehicules_reperage', [])
+                          if valeur_numerique(v.get('prix_max_achat')) > 0)
+
+    if not ratios_globaux:
+        return {'global': dict(MODELE_DEFAUT), 'marques': {}}
+
+    p_gain = nb_achetes / (nb_achetes + nb_reperes)
+    modele = {'global': {**ajuster_lognormal(ratios_globaux), 'p_gain': p_gain, 'echantillon': len(ratios_globaux)},
+              'marques': {}}
+    for marque, ratios in ratios_marques.items():
+        if len(ratios) >= MIN_ECHANTILLON_MARQUE:
+            modele['marques'][marque] = {**ajuster_lognormal(ratios), 'p_gain': p_gain, 'echantillon': len(ratios)}
+    return modele
+
+def loi_vehicule(modele: Dict, vehicule) -> Dict:
+    """Loi d'adjudication d'un véhicule (celle de sa marque si ajustée, sinon la loi globale)"""
+    return modele['marques'].get(str(vehicule.marque).strip().lower(), modele['global'])
+
+def esperance_ratio(loi: Dict) -> float:
+    """Espérance de r sachant r ≤ 1 (lot remporté au plus au prix max), loi lognormale tronquée à 1"""
+    mu, sigma = loi['mu'], loi['sigma']
+    p_sous_max = NormalDist().cdf(-mu / sigma)
+    if p_sous_max <= 0:
+        return 1.0
+    return math.exp(mu + sigma ** 2 / 2) * NormalDist().cdf(-mu / sigma - sigma) / p_sous_max
+
+def preparer_lots(vehicules: Sequence, parametres: Dict, modele: Dict) -> Dict[str, List[float]]:
+    """
+    Colonnes des lots simulés (véhicules avec un prix max > 0)
+
+    'valeur_nette' = Prix revente - Coût réparations - Main d'œuvre : la marge
+    prévue d'un lot remporté au prix p vaut valeur_nette - p × (1 + Commission).
+    """
+    moteur = MoteurPrix(parametres)
+    lots = {'lot': [], 'prix_max': [], 'valeur_nette': [], 'mu': [], 'sigma': [], 'p_gain': []}
+    for vehicule in vehicules:
+        prix_max = vehicule.get_prix_numerique('prix_max_achat')
+        if prix_max <= 0:
+            continue
+        loi = loi_vehicule(modele, vehicule)
+        lots['lot'].append(vehicule.lot)
+        lots['prix_max'].append(prix_max)
+        lots['valeur_nette'].append(
+            vehicule.get_prix_numerique('prix_revente') - vehicule.get_prix_numerique('cout_reparations')
+            - vehicule.get_prix_numerique('temps_reparations') * moteur.tarif_horaire
+        )
+        lots['mu'].append(loi['mu'])
+        lots['sigma'].append(loi['sigma'])
+        lots['p_gain'].append(loi['p_gain'])
+    return lots
+
+def _simuler_bloc(lots: Dict[str, List[float]], taux_commission: float, nb_scenarios: int,
+                  graine: int, index_bloc: int):
+    """Dépenses, marges et lots remportés de nb_scenarios scénarios (exécuté dans un processus)"""
+    facteur = 1 + taux_commission
+    if np is not None:
+        generateur = np.random.default_rng([graine, index_bloc])
+        taille = (nb_scenarios, len(lots['prix_max']))
+        ratios = np.exp(np.asarray(lots['mu']) + np.asarray(lots['sigma']) * generateur.standard_normal(taille))
+        # Lot perdu si l'adjudication dépasse notre prix max
+        gagnes = (generateur.random(taille) < np.asarray(lots['p_gain'])) & (ratios <= 1)
+        prix = np.asarray(lots['prix_max']) * ratios
+        depenses = np.where(gagnes, prix, 0.0).sum(axis=1)
+        marges = np.where(gagnes, np.asarray(lots['valeur_nette']) - prix * facteur, 0.0).sum(axis=1)
+        return depenses.tolist(), marges.tolist(), int(gagnes.sum())
+
+    generateur = random.Random(f"{graine}-{index_bloc}")
+    tirage, gauss, exp = generateur.random, generateur.gauss, math.exp
+    colonnes = list(zip(lots['prix_max'], lots['valeur_nette'], lots['mu'], lots['sigma'], lots['p_gain']))
+    depenses, marges, nb_gagnes = [], [], 0
+    for _ in range(nb_scenarios):
+        depense = marge = 0.0
+        for prix_max, valeur_nette, mu, sigma, p_gain in colonnes:
+            if tirage() < p_gain:
+                ratio = exp(gauss(mu, sigma))
+                if ratio > 1:
+                    continue
+                prix = prix_max * ratio
+                depense += prix
+                marge += valeur_nette - prix * facteur
+                nb_gagnes += 1
+        depenses.append(depense)
+        marges.append(marge)
+    return depenses, marges, nb_gagnes
+
+def _centile(valeurs_triees: List[float], q: float) -> float:
+    """Centile q (0-100) par interpolation linéaire"""
+    if not valeurs_triees:
+        return 0.0
+    position = (len(valeurs_triees) - 1) * q / 100
+    bas = int(position)
+    haut = min(bas + 1, len(valeurs_triees) - 1)
+    return valeurs_triees[bas] + (valeurs_triees[haut] - valeurs_triees[bas]) * (position - bas)
+
+def simuler_journee(lots: Dict[str, List[float]], parametres: Dict, budget: float,
+                    nb_scenarios: int = 20000, graine: Optional[int] = None,
+                    processus: Optional[int] = None) -> Dict:
+    """
+    Simule nb_scenarios déroulements de la journée
+
+    Args:
+        lots: Colonnes de preparer_lots
+        parametres: Paramètres de la journée (commission)
+        budget: Trésorerie disponible (€)
+        graine: Graine aléatoire (tirée au hasard si None, renvoyée dans le résultat)
+        processus: Nombre de processus (défaut : nombre de cœurs, 1 = sans processus)
+
+    Returns:
+        Dictionnaire des indicateurs (moyennes, centiles 5/95, probabilités)
+    """
+    if graine is None:
+        graine = random.SystemRandom().randrange(2 ** 32)
+    taux_commission = MoteurPrix(parametres).taux_commission
+    blocs = [(i, min(TAILLE_BLOC, nb_scenarios - debut)) for i, debut in enumerate(range(0, nb_scenarios, TAILLE_BLOC))]
+    processus = min(processus or os.cpu_count() or 1, len(blocs))
+
+    resultats_blocs = None
+    if processus > 1 and lots['prix_max']:
+        try:
+            with ProcessPoolExecutor(max_workers=processus) as executor:
+                indices, tailles = zip(*blocs)
+                resultats_blocs = list(executor.map(
+                    _simuler_bloc, repeat(lots), repeat(taux_commission), tailles, repeat(graine), indices
+                ))
+        except (OSError, RuntimeError) as e:
+            print(f"⚠️ Simulation sans processus séparés: {e}")
+    if resultats_blocs is None:
+        resultats_blocs = [_simuler_bloc(lots, taux_commission, taille, graine, index) for index, taille in blocs]
+
+    depenses = sorted(d for bloc in resultats_blocs for d in bloc[0])
+    marges = sorted(m for bloc in resultats_blocs for m in bloc[1])
+    nb_gagnes = sum(bloc[2] for bloc in resultats_blocs)
+    total = max(1, len(depenses))
+
+    return {
+        'nb_scenarios': len(depenses),
+        'nb_lots': len(lots['prix_max']),
+        'graine': graine,
+        'budget': budget,
+        'depense_moyenne': sum(depenses) / total,
+        'depense_p5': _centile(depenses, 5),
+        'depense_p95': _centile(depenses, 95),
+        'marge_moyenne': sum(marges) / total,
+        'marge_p5': _centile(marges, 5),
+        'marge_p95': _centile(marges, 95),
+        'lots_gagnes_moyen': nb_gagnes / total,
+        'proba_depassement': sum(1 for d in depenses if d > budget) / total,
+        'proba_perte': sum(1 for m in marges if m < 0) / total
+    }
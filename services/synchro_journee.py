@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Synchronisation d'une journée entre plusieurs postes en temps réel
+
+Un poste lance le serveur (python cli.py serveur <journée>) : il détient la
+journée de référence et la sauvegarde régulièrement. Chaque repéreur s'y
+connecte avec ClientSynchro : ses modifications sont appliquées tout de suite
+en local, regroupées (plusieurs champs d'un même lot = une opération) et
+envoyées par paquets ; celles des autres arrivent par long-polling.
+
+Seule la bibliothèque standard est utilisée (HTTP, pas de WebSocket) : les
+opérations sont celles du journal du mode direct (JourneeEnchere.appliquer_operation)
+et les échanges sont compressés en gzip au-delà de quelques centaines d'octets,
+pour rester léger sur le Wi-Fi d'une salle de vente.
+
+Protocole :
+    GET  /journee                          -> {'sequence', 'journee'}
+    GET  /operations?depuis=N&attente=S    -> {'sequence', 'operations'} (attend jusqu'à S s une
+                                              opération après N) ou {'sequence', 'journee'} si N est
+                                              trop ancien
+    POST /operations {'operations': [...]} -> {'sequence', 'appliquees', 'sequences'} (numéro attribué à
+                                              chaque opération, None si elle ne changeait rien)
+
+Chaque opération d'un poste porte un identifiant unique ('id') : un poste
+reconnaît ainsi ses propres opérations dans celles qu'il reçoit, et le serveur
+ignore une opération renvoyée après une réponse perdue.
+"""
+
+import gzip
+import itertools
+import json
+import threading
+import time
+import urllib.request
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from models.journee_enchere import JourneeEnchere
+from models.vehicule import Vehicule
+from services.journees_manager import JourneesManager
+
+PORT_DEFAUT = 8765
+ATTENTE_MAX = 30.0  # Durée maximale d'un long-polling (s)
+TAILLE_MIN_COMPRESSION = 512  # En dessous, gzip coûte plus qu'il ne rapporte (octets)
+MAX_HISTORIQUE = 10000  # Opérations gardées pour les clients en retard, au-delà : journée complète
+
+def _encoder(donnees: Dict[str, Any]) -> bytes:
+    return json.dumps(donnees, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class ServeurSynchro:
+    """Serveur de synchronisation d'une journée (journée de référence en mémoire)"""
+
+    def __init__(self, dossier: str, nom_fichier: str, hote: str = "0.0.0.0", port: int = PORT_DEFAUT,
+                 intervalle_sauvegarde: float = 5.0):
+        """
+        Args:
+            dossier: Dossier des journées
+            nom_fichier: Journée partagée
+            hote, port: Adresse d'écoute (port 0 : port libre choisi par le système)
+            intervalle_sauvegarde: Délai entre deux sauvegardes de la journée modifiée (s)
+        """
+        self.manager = JourneesManager(dossier, migrer=False)
+        self.nom_fichier = nom_fichier
+        self.journee = self.manager.charger_journee_fichier(nom_fichier)
+        if self.journee is None:
+            raise FileNotFoundError(f"Journée introuvable : {nom_fichier}")
+        self.intervalle_sauvegarde = intervalle_sauvegarde
+
+        # Opérations appliquées : l'opération numéro n est historique[n - debut_historique - 1]
+        self.condition = threading.Condition()
+        self.sequence = 0
+        self.debut_historique = 0
+        self.historique: List[Dict[str, Any]] = []
+        # Identifiant d'opération -> numéro attribué (opérations renvoyées par un poste)
+        self.sequences_ids: Dict[str, int] = {}
+        self.modifiee = False
+        self.verrou_sauvegarde = threading.Lock()
+        self.arret = threading.Event()
+
+        self.serveur = ThreadingHTTPServer((hote, port), _GestionnaireRequetes)
+        self.serveur.daemon_threads = True
+        self.serveur.synchro = self
+
+    @property
+    def port(self) -> int:
+        return self.serveur.server_address[1]
+
+    def appliquer(self, operations: List[Dict[str, Any]]) -> tuple[int, List[Optional[int]]]:
+        """
+        Applique des opérations envoyées par un poste
+
+        Returns:
+            (séquence, numéro attribué à chaque opération ou None si elle ne changeait rien)
+        """
+        with self.condition:
+            sequences = []
+            for operation in operations:
+                identifiant = operation.get('id') if isinstance(operation, dict) else None
+                if identifiant in self.sequences_ids:
+                    # Déjà reçue (réponse perdue, envoi recommencé)
+                    sequences.append(self.sequences_ids[identifiant])
+                elif isinstance(operation, dict) and self.journee.appliquer_operation(operation) is not None:
+                    self.sequence += 1
+                    self.historique.append(operation)
+                    if identifiant:
+                        self.sequences_ids[identifiant] = self.sequence
+                    sequences.append(self.sequence)
+                else:
+                    sequences.append(None)
+
+            if len(self.historique) > MAX_HISTORIQUE:
+                retirees = len(self.historique) - MAX_HISTORIQUE // 2
+                del self.historique[:retirees]
+                self.debut_historique += retirees
+                self.sequences_ids = {op['id']: self.debut_historique + i + 1
+                                      for i, op in enumerate(self.historique) if op.get('id')}
+
+            if any(sequences):
+                self.modifiee = True
+                self.condition.notify_all()
+            return self.sequence, sequences
+
+    def etat(self) -> Dict[str, Any]:
+        """Journée complète et numéro de la dernière opération"""
+        with self.condition:
+            return {'sequence': self.sequence, 'journee': self.journee.to_dict()}
+
+    def operations_depuis(self, depuis: int, attente: float = 0.0) -> Dict[str, Any]:
+        """Opérations postérieures à depuis, en attendant jusqu'à attente secondes s'il n'y en a pas"""
+        limite = time.monotonic() + attente
+        with self.condition:
+            while self.sequence == depuis and not self.arret.is_set():
+                reste = limite - time.monotonic()
+                if reste <= 0:
+                    break
+                self.condition.wait(reste)
+
+            if not self.debut_historique <= depuis <= self.sequence:
+                return self.etat()
+            return {'sequence': self.sequence, 'operations': self.historique[depuis - self.debut_historique:]}
+
+    def sauvegarder(self) -> bool:
+        """
+        Sauvegarde la journée si elle a été modifiée depuis la dernière sauvegarde
+
+        L'écriture se fait sur une copie, hors du verrou : les postes continuent
+        d'envoyer et de recevoir pendant la sauvegarde.
+        """
+        with self.verrou_sauvegarde:
+            with self.condition:
+                if not self.modifiee:
+                    return True
+                avant = self.journee.to_dict()
+                sequence_copie = self.sequence
+                self.modifiee = False
+            copie = JourneeEnchere(avant)
+            if not self.manager.sauvegarder_journee_fichier(copie, self.nom_fichier):
+                with self.condition:
+                    self.modifiee = True
+                return False
+
+            apres = copie.to_dict()
+            avant.pop('revision')
+            apres.pop('revision')
+            with self.condition:
+                self.journee.revision = copie.revision
+                if avant == apres:
+                    return True
+                # Modifications faites hors synchronisation (autre fenêtre) fusionnées à la sauvegarde :
+                # la copie sauvegardée, plus les opérations reçues pendant l'écriture, devient la référence
+                # et les postes repartent de la journée complète
+                if sequence_copie < self.debut_historique:
+                    print("⚠️ Trop d'opérations pendant la sauvegarde, modifications extérieures ignorées")
+                    return True
+                for operation in self.historique[sequence_copie - self.debut_historique:]:
+                    copie.appliquer_operation(operation)
+                self.journee = copie
+                self.sequence += 1
+                self.historique = []
+                self.debut_historique = self.sequence
+                self.condition.notify_all()
+            return True
+
+    def _sauvegarde_periodique(self):
+        while not self.arret.wait(self.intervalle_sauvegarde):
+            self.sauvegarder()
+
+    def demarrer(self):
+        """Démarre le serveur et la sauvegarde périodique en arrière-plan"""
+        threading.Thread(target=self.serveur.serve_forever, daemon=True).start()
+        threading.Thread(target=self._sauvegarde_periodique, daemon=True).start()
+        print(f"🌐 Synchronisation de « {self.journee.nom} » sur le port {self.port}")
+
+    def arreter(self):
+        """Arrête le serveur (les long-pollings en cours reçoivent une réponse) et sauvegarde"""
+        self.arret.set()
+        with self.condition:
+            self.condition.notify_all()
+        self.serveur.shutdown()
+        self.serveur.server_close()
+        self.sauvegarder()
+        print(f"🛑 Synchronisation arrêtée, journée sauvegardée ({self.nom_fichier})")
+
+
+class _GestionnaireRequetes(BaseHTTPRequestHandler):
+    """Requêtes HTTP du serveur de synchronisation"""
+
+    protocol_version = "HTTP/1.1"  # Connexions gardées ouvertes entre deux requêtes
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        synchro = self.server.synchro
+        if url.path == '/journee':
+            self._repondre(synchro.etat())
+        elif url.path == '/operations':
+            parametres = parse_qs(url.query)
+            try:
+                depuis = int(parametres.get('depuis', ['0'])[0])
+                attente = min(max(float(parametres.get('attente', ['0'])[0]), 0.0), ATTENTE_MAX)
+            except ValueError:
+                self._repondre({'erreur': "Paramètres invalides"}, 400)
+                return
+            self._repondre(synchro.operations_depuis(depuis, attente))
+        else:
+            self._repondre({'erreur': f"Chemin inconnu : {url.path}"}, 404)
+
+    def do_POST(self):
+        if urlparse(self.path).path != '/operations':
+            self._repondre({'erreur': f"Chemin inconnu : {self.path}"}, 404)
+            return
+        try:
+            corps = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            if self.headers.get('Content-Encoding') == 'gzip':
+                corps = gzip.decompress(corps)
+            operations = json.loads(corps).get('operations', [])
+        except (ValueError, OSError, AttributeError):
+            self._repondre({'erreur': "Corps de requête invalide"}, 400)
+            return
+        sequence, sequences = self.server.synchro.appliquer(operations if isinstance(operations, list) else [])
+        self._repondre({'sequence': sequence, 'appliquees': sum(1 for s in sequences if s), 'sequences': sequences})
+
+    def _repondre(self, donnees: Dict[str, Any], code: int = 200):
+        corps = _encoder(donnees)
+        compresse = len(corps) > TAILLE_MIN_COMPRESSION and 'gzip' in self.headers.get('Accept-Encoding', '')
+        if compresse:
+            corps = gzip.compress(corps, compresslevel=6)
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        if compresse:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(corps)))
+        self.end_headers()
+        self.wfile.write(corps)
+
+    def log_message(self, format, *args):
+        # Une ligne par long-polling noierait la console
+        pass
+
+
+class ClientSynchro:
+    """Poste connecté à un serveur de synchronisation"""
+
+    def __init__(self, url: str, delai_envoi: float = 0.3, attente: float = 25.0):
+        """
+        Args:
+            url: Adresse du serveur (« http://192.168.1.20:8765 »)
+            delai_envoi: Regroupement des modifications locales avant envoi (s)
+            attente: Durée d'un long-polling (s)
+        """
+        self.url = url.rstrip('/')
+        self.delai_envoi = delai_envoi
+        self.attente = min(attente, ATTENTE_MAX)
+        self.journee: Optional[JourneeEnchere] = None
+        self.sequence = 0
+        self.identifiant = uuid.uuid4().hex[:12]
+        self.compteur = itertools.count(1)
+
+        # Protège la journée et les opérations pas encore confirmées par le serveur :
+        # en_attente pas encore envoyées, en_cours envoyées mais pas encore reçues en retour
+        self.verrou = threading.Lock()
+        self.en_attente: List[Dict[str, Any]] = []
+        self.en_cours: List[Dict[str, Any]] = []
+        self.on_changement: Optional[Callable[[Optional[List[Dict[str, Any]]]], None]] = None
+        self.arret = threading.Event()
+        self.octets_envoyes = 0
+        self.octets_recus = 0
+
+    def _requete(self, chemin: str, donnees: Optional[Dict[str, Any]] = None, delai: float = 10.0) -> Dict[str, Any]:
+        entetes = {'Accept-Encoding': 'gzip'}
+        corps = None
+        if donnees is not None:
+            corps = _encoder(donnees)
+            entetes['Content-Type'] = 'application/json; charset=utf-8'
+            if len(corps) > TAILLE_MIN_COMPRESSION:
+                corps = gzip.compress(corps, compresslevel=6)
+                entetes['Content-Encoding'] = 'gzip'
+            self.octets_envoyes += len(corps)
+
+        requete = urllib.request.Request(self.url + chemin, data=corps, headers=entetes,
+                                         method='POST' if corps is not None else 'GET')
+        with urllib.request.urlopen(requete, timeout=delai) as reponse:
+            contenu = reponse.read()
+            self.octets_recus += len(contenu)
+            if reponse.headers.get('Content-Encoding') == 'gzip':
+                contenu = gzip.decompress(contenu)
+        return json.loads(contenu)
+
+    def charger(self) -> JourneeEnchere:
+        """Récupère la journée complète du serveur"""
+        self._remplacer(self._requete('/journee'))
+        return self.journee
+
+    def _remplacer(self, etat: Dict[str, Any]):
+        with self.verrou:
+            journee = JourneeEnchere(etat['journee'])
+            if self.journee is None:
+                self.journee = journee
+            else:
+                # Même objet (référencé par l'interface), contenu du serveur
+                self.journee.__dict__.update(journee.__dict__)
+            # Les opérations envoyées sont déjà dans cette journée ou arriveront dans l'ordre du serveur :
+            # les réappliquer pourrait écraser une modification d'un autre poste arrivée après
+            for operation in self.en_attente:
+                self.journee.appliquer_operation(operation)
+            self.sequence = etat['sequence']
+
+    def _reappliquer_locales(self):
+        # Les modifications locales pas encore reçues en retour restent visibles
+        for operation in self.en_cours + self.en_attente:
+            self.journee.appliquer_operation(operation)
+
+    # Modifications locales
+
+    def modifier(self, lot: str, **champs):
+        """Modifie des champs d'un véhicule (prix_revente='5000', champ_libre='rayure')"""
+        self._appliquer_locale({'op': 'modification', 'lot': lot, 'champs': champs})
+
+    def ajouter(self, vehicule: Vehicule):
+        """Ajoute un véhicule en repérage"""
+        self._appliquer_locale({'op': 'ajout', 'vehicule': vehicule.to_dict()})
+
+    def supprimer(self, lot: str):
+        """Supprime un véhicule"""
+        self._appliquer_locale({'op': 'suppression', 'lot': lot})
+
+    def acheter(self, lot: str, prix_achat: str):
+        """Passe un véhicule en repérage dans les achetés"""
+        self._appliquer_locale({'op': 'achat', 'lot': lot, 'prix_achat': prix_achat,
+                                'date_achat': datetime.now().strftime("%Y-%m-%d")})
+
+    def _appliquer_locale(self, operation: Dict[str, Any]):
+        with self.verrou:
+            self.journee.appliquer_operation(operation)
+            dernier = self.en_attente[-1] if self.en_attente else None
+            if (operation['op'] == 'modification' and dernier and dernier['op'] == 'modification'
+                    and dernier['lot'] == operation['lot']):
+                # Saisie champ par champ sur le même véhicule : une seule opération
+                dernier['champs'].update(operation['champs'])
+            else:
+                operation = {**operation, 'id': f"{self.identifiant}-{next(self.compteur)}"}
+                if operation['op'] == 'modification':
+                    operation['champs'] = dict(operation['champs'])
+                self.en_attente.append(operation)
+
+    # Échanges avec le serveur
+
+    def envoyer(self) -> int:
+        """Envoie les modifications locales en attente, retourne le nombre envoyé"""
+        with self.verrou:
+            if not self.en_attente or self.en_cours:
+                return 0
+            envoi = self.en_cours = self.en_attente
+            self.en_attente = []
+        try:
+            self._requete('/operations', {'operations': envoi})
+            with self.verrou:
+                # Numérotées par le serveur (reçues en retour dans son ordre) ou sans effet
+                self.en_cours = []
+            return len(envoi)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Envoi impossible, nouvel essai plus tard: {e}")
+            with self.verrou:
+                # Renvoyées avec le même identifiant : le serveur ignore celles déjà reçues
+                self.en_attente, self.en_cours = self.en_cours + self.en_attente, []
+            return 0
+
+    def recevoir(self, attente: float = 0.0) -> Optional[List[Dict[str, Any]]]:
+        """
+        Applique les opérations des autres postes (et l'écho des nôtres, dans l'ordre du serveur)
+
+        Returns:
+            Opérations appliquées, None si la journée a été remplacée en entier
+        """
+        etat = self._requete(f"/operations?depuis={self.sequence}&attente={attente}", delai=attente + 10)
+        if 'journee' in etat:
+            self._remplacer(etat)
+            operations = None
+        else:
+            operations = etat['operations']
+            with self.verrou:
+                for operation in operations:
+                    self.journee.appliquer_operation(operation)
+                # Nos opérations reçues en retour ont leur place dans l'ordre du serveur : ne plus les réappliquer
+                recues = {operation.get('id') for operation in operations}
+                self.en_cours = [operation for operation in self.en_cours if operation['id'] not in recues]
+                if operations:
+                    self._reappliquer_locales()
+                self.sequence = etat['sequence']
+            if not operations:
+                return operations
+        if self.on_changement:
+            self.on_changement(operations)
+        return operations
+
+    def _boucle_envoi(self):
+        while not self.arret.wait(self.delai_envoi):
+            self.envoyer()
+
+    def _boucle_reception(self):
+        while not self.arret.is_set():
+            try:
+                self.recevoir(self.attente)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Serveur de synchronisation injoignable: {e}")
+                self.arret.wait(2.0)
+
+    def demarrer(self, on_changement: Optional[Callable] = None):
+        """
+        Charge la journée puis synchronise en arrière-plan
+
+        Args:
+            on_changement: Appelé depuis un thread à chaque réception (opérations, None si journée
+                           remplacée) ; une interface tkinter doit repasser par une queue
+        """
+        self.on_changement = on_changement
+        if self.journee is None:
+            self.charger()
+        threading.Thread(target=self._boucle_envoi, daemon=True).start()
+        threading.Thread(target=self._boucle_reception, daemon=True).start()
+
+    def arreter(self):
+        """Arrête la synchronisation après un dernier envoi"""
+        self.arret.set()
+        self.envoyer()
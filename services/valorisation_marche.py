@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Valorisation marché en lot des véhicules d'une journée
+
+Pour chaque véhicule en repérage, des critères de recherche Leboncoin sont
+déduits de la marque, du modèle, de l'année et du kilométrage, puis les
+recherches passent par le scraper partagé (débit limité, requêtes parallèles
+bornées, cache disque, historique). Le prix suggéré est l'estimation par plus
+proches voisins (année, kilométrage) sur l'historique, ou à défaut le prix médian
+des annonces ; l'application se fait après revue par l'utilisateur.
+"""
+
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional
+
+# Ajouter le chemin du script de scraping
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'script_scraping_leboncoin'))
+
+from leboncoin_scraper import LeboncoinScraper, DataAnalyzer
+from response_cache import ResponseCache
+
+from models.vehicule import Vehicule
+from services.estimateur_revente import EstimateurRevente, get_historique_partage, get_estimateur_partage
+
+# Tolérances des critères dérivés du véhicule
+ECART_ANNEES = 1
+ECART_KILOMETRAGE = 0.20
+KILOMETRAGE_MAX = 500000
+
+_RE_ANNEE = re.compile(r'(19|20)\d{2}')
+_RE_NON_CHIFFRE = re.compile(r'[^\d]')
+
+# Scraper partagé par l'onglet Recherche et la valorisation en lot : un seul
+# limiteur de débit et un seul cache pour toute l'application
+_scraper_partage: Optional[LeboncoinScraper] = None
+_verrou_scraper = threading.Lock()
+
+def get_scraper_partage() -> LeboncoinScraper:
+    """Retourne le scraper partagé (créé avec son cache disque et son historique à la première utilisation)"""
+    global _scraper_partage
+    with _verrou_scraper:
+        if _scraper_partage is None:
+            try:
+                cache = ResponseCache()
+            except Exception as e:
+                print(f"⚠️ Cache des recherches indisponible: {e}")
+                cache = None
+            _scraper_partage = LeboncoinScraper(cache=cache, history=get_historique_partage())
+        return _scraper_partage
+
+def criteres_recherche(vehicule: Vehicule) -> Optional[Dict]:
+    """
+    Déduit les critères de recherche d'un véhicule
+
+    Returns:
+        Dictionnaire {modele, annee_min, annee_max, km_min, km_max} ou None
+        si le véhicule n'a ni marque ni modèle
+    """
+    texte = " ".join(f"{vehicule.marque or ''} {vehicule.modele or ''}".split())
+    if not texte:
+        return None
+
+    match = _RE_ANNEE.search(str(vehicule.annee or ''))
+    if match:
+        annee = int(match.group(0))
+        annee_min, annee_max = annee - ECART_ANNEES, annee + ECART_ANNEES
+    else:
+        annee_min, annee_max = 1990, 2030
+
+    chiffres = _RE_NON_CHIFFRE.sub('', str(vehicule.kilometrage or ''))
+    if chiffres and int(chiffres) > 0:
+        km = int(chiffres)
+        km_min = int(km * (1 - ECART_KILOMETRAGE))
+        km_max = min(KILOMETRAGE_MAX, int(km * (1 + ECART_KILOMETRAGE)))
+    else:
+        km_min, km_max = 0, KILOMETRAGE_MAX
+
+    return {
+        'modele': texte,
+        'annee_min': annee_min,
+        'annee_max': annee_max,
+        'km_min': km_min,
+        'km_max': km_max
+    }
+
+def valoriser_vehicule(scraper: LeboncoinScraper, vehicule: Vehicule, nb_annonces: int = 30,
+                       force_refresh: bool = False,
+                       stop_event: Optional[threading.Event] = None,
+                       estimateur: Optional[EstimateurRevente] = None) -> Dict:
+    """
+    Recherche les annonces comparables d'un véhicule et calcule la suggestion
+
+    Returns:
+        Résultat {'lot', 'libelle', 'criteres', 'prix_suggere', 'echantillon', 'annonces',
+        'minimum', 'maximum', 'bas', 'haut', 'methode', 'erreur'}
+        (prix_suggere None si aucune annonce ; echantillon : annonces sur lesquelles
+        repose le prix suggéré, annonces : annonces récupérées par la recherche)
+    """
+    resultat = {
+        'lot': vehicule.lot,
+        'libelle': f"{vehicule.marque} {vehicule.modele}".strip(),
+        'criteres': None,
+        'prix_suggere': None,
+        'echantillon': 0,
+        'annonces': 0,
+        'minimum': None,
+        'maximum': None,
+        'bas': None,
+        'haut': None,
+        'methode': "",
+        'erreur': ""
+    }
+
+    criteres = criteres_recherche(vehicule)
+    if criteres is None:
+        resultat['erreur'] = "Marque et modèle absents"
+        return resultat
+    resultat['criteres'] = criteres
+
+    if stop_event is not None and stop_event.is_set():
+        resultat['erreur'] = "Annulé"
+        return resultat
+
+    annonces = scraper.search_ads(
+        criteres['modele'],
+        criteres['annee_min'],
+        criteres['annee_max'],
+        criteres['km_min'],
+        criteres['km_max'],
+        nb_annonces,
+        force_refresh=force_refresh,
+        stop_event=stop_event
+    )
+
+    stats = DataAnalyzer.analyze_prices(annonces)
+    if not stats:
+        annule = stop_event is not None and stop_event.is_set()
+        resultat['erreur'] = "Annulé" if annule else "Aucune annonce comparable"
+        return resultat
+
+    resultat['prix_suggere'] = stats['mediane']
+    resultat['echantillon'] = resultat['annonces'] = stats['nombre']
+    resultat['minimum'] = stats['minimum']
+    resultat['maximum'] = stats['maximum']
+    resultat['bas'], resultat['haut'] = stats['minimum'], stats['maximum']
+    resultat['methode'] = "médiane"
+
+    # Les annonces viennent d'être ajoutées à l'historique : estimation au plus près
+    # de l'année et du kilométrage du véhicule
+    if estimateur is not None:
+        estimation = estimateur.estimer_vehicule(vehicule)
+        if estimation is not None:
+            resultat['prix_suggere'] = estimation['prix']
+            resultat['bas'], resultat['haut'] = estimation['bas'], estimation['haut']
+            resultat['echantillon'] = estimation['nombre']
+            resultat['methode'] = f"{estimation['nombre']} plus proches"
+    return resultat
+
+def valoriser_vehicules(vehicules: List[Vehicule], scraper: Optional[LeboncoinScraper] = None,
+                        nb_annonces: int = 30, vehicules_paralleles: int = 2,
+                        force_refresh: bool = False,
+                        on_progress: Optional[Callable[[int, int, Dict], None]] = None,
+                        stop_event: Optional[threading.Event] = None) -> List[Dict]:
+    """
+    Valorise une liste de véhicules
+
+    Plusieurs véhicules sont traités simultanément ; toutes les requêtes passent
+    par le même limiteur de débit et le même cache que l'onglet Recherche, et
+    partagent les max_workers places du planificateur (taille du pool de
+    connexions) : plus de véhicules en parallèle ne multiplie pas les connexions.
+
+    Args:
+        vehicules: Véhicules à valoriser
+        scraper: Scraper à utiliser (scraper partagé par défaut ; un scraper
+                 pointant vers un serveur local permet de tester sans Leboncoin)
+        nb_annonces: Nombre maximal d'annonces par véhicule
+        vehicules_paralleles: Nombre de véhicules recherchés en même temps
+        force_refresh: Ignorer le cache des pages
+        on_progress: Rappel (nb terminés, total, résultat) après chaque véhicule
+        stop_event: Annulation ; les véhicules non encore traités sont marqués "Annulé"
+
+    Returns:
+        Résultats dans l'ordre des véhicules (index ajouté à chaque résultat)
+    """
+    if scraper is None:
+        scraper = get_scraper_partage()
+        estimateur = get_estimateur_partage()
+    else:
+        estimateur = EstimateurRevente(scraper.history) if scraper.history is not None else None
+
+    total = len(vehicules)
+    resultats: List[Optional[Dict]] = [None] * total
+    termines = 0
+
+    with ThreadPoolExecutor(max_workers=max(1, vehicules_paralleles), thread_name_prefix="valorisation") as pool:
+        futures = {
+            pool.submit(valoriser_vehicule, scraper, vehicule, nb_annonces, force_refresh,
+                        stop_event, estimateur): index
+            for index, vehicule in enumerate(vehicules)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                resultat = future.result()
+            except Exception as e:
+                vehicule = vehicules[index]
+                resultat = {
+                    'lot': vehicule.lot,
+                    'libelle': f"{vehicule.marque} {vehicule.modele}".strip(),
+                    'criteres': None, 'prix_suggere': None, 'echantillon': 0, 'annonces': 0,
+                    'minimum': None, 'maximum': None, 'bas': None, 'haut': None,
+                    'methode': "", 'erreur': str(e)
+                }
+            resultat['index'] = index
+            resultats[index] = resultat
+            termines += 1
+            if on_progress is not None:
+                on_progress(termines, total, resultat)
+
+    return [r for r in resultats if r is not None]
+
+def appliquer_valorisation(vehicule: Vehicule, resultat: Dict, parametres: Optional[Dict] = None):
+    """Écrit le prix suggéré et la taille d'échantillon sur le véhicule (prix max recalculé)"""
+    if resultat.get('prix_suggere') is None:
+        return
+    vehicule.prix_revente = str(resultat['prix_suggere'])
+    vehicule.prix_marche_suggere = str(resultat['prix_suggere'])
+    vehicule.echantillon_marche = resultat['echantillon']
+    if parametres is not None:
+        vehicule.mettre_a_jour_prix_max_avec_parametres(parametres)
+
+def main():
+    """Valorisation en ligne de commande d'un fichier de journée (sans modification)"""
+    import argparse
+
+    from models.journee_enchere import JourneeEnchere
+    from services.codecs_journee import lire_fichier_journee
+
+    arguments = argparse.ArgumentParser(description="Valorisation marché des véhicules d'une journée")
+    arguments.add_argument("journee", help="Fichier JSON de la journée")
+    arguments.add_argument("--base-url", help="URL de recherche (ex: serveur local de test)")
+    arguments.add_argument("--nb-annonces", type=int, default=30)
+    arguments.add_argument("--sans-cache", action="store_true", help="Ne pas utiliser le cache disque")
+    args = arguments.parse_args()
+
+    journee = JourneeEnchere(lire_fichier_journee(args.journee))
+
+    if args.base_url or args.sans_cache:
+        scraper = LeboncoinScraper(base_url=args.base_url, cache=None if args.sans_cache else ResponseCache())
+    else:
+        scraper = get_scraper_partage()
+
+    def afficher(termines, total, resultat):
+        if resultat['prix_suggere'] is not None:
+            print(f"✅ [{termines}/{total}] Lot {resultat['lot']} {resultat['libelle']}: "
+                  f"{resultat['prix_suggere']:,} € [{resultat['bas']:,} – {resultat['haut']:,}] "
+                  f"({resultat['annonces']} annonces, {resultat['methode']})")
+        else:
+            print(f"⚠️ [{termines}/{total}] Lot {resultat['lot']} {resultat['libelle']}: {resultat['erreur']}")
+
+    valoriser_vehicules(journee.vehicules_reperage, scraper, nb_annonces=args.nb_annonces, on_progress=afficher)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Verrou consultatif entre processus et écriture atomique d'un fichier
+
+Le verrou porte sur un fichier compagnon (« fichier.json.lock ») : il n'est tenu
+que le temps de relire, fusionner et réécrire une journée, jamais pendant
+toute une session. Fonctionne entre fenêtres, processus et postes partageant
+un dossier réseau (msvcrt sous Windows, fcntl ailleurs).
+"""
+
+import os
+import time
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+    import fcntl
+
+class VerrouFichier:
+    """Verrou exclusif consultatif (utilisable avec with)"""
+
+    def __init__(self, chemin: str, delai: float = 10.0):
+        """
+        Args:
+            chemin: Fichier de verrou (créé s'il n'existe pas, jamais supprimé)
+            delai: Attente maximale en secondes avant TimeoutError
+        """
+        self.chemin = chemin
+        self.delai = delai
+        self.fichier = None
+
+    def __enter__(self):
+        self.fichier = open(self.chemin, 'a+b')
+        limite = time.monotonic() + self.delai
+        while True:
+            try:
+                if msvcrt:
+                    self.fichier.seek(0)
+                    msvcrt.locking(self.fichier.fileno(), msvcrt.LK_NBLCK, 1)
+                else:
+                    fcntl.flock(self.fichier.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return self
+            except OSError:
+                if time.monotonic() >= limite:
+                    self.fichier.close()
+                    self.fichier = None
+                    raise TimeoutError(f"Fichier verrouillé par un autre poste : {self.chemin}")
+                time.sleep(0.05)
+
+    def __exit__(self, *exc):
+        try:
+            if msvcrt:
+                self.fichier.seek(0)
+                msvcrt.locking(self.fichier.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self.fichier.fileno(), fcntl.LOCK_UN)
+        finally:
+            self.fichier.close()
+            self.fichier = None
+        return False
+
+def ecrire_atomique(chemin: str, contenu: bytes):
+    """Écrit un fichier complet ou pas du tout (fichier temporaire puis remplacement)"""
+    temporaire = f"{chemin}.{os.getpid()}.tmp"
+    try:
+        with open(temporaire, 'wb') as f:
+            f.write(contenu)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporaire, chemin)
+    finally:
+        if os.path.exists(temporaire):
+            os.remove(temporaire)
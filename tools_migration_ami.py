@@ -3,6 +3,8 @@
 """
 Outil de migration pour convertir les anciennes données vers le nouveau système de journées
 Usage: python tools_migration_ami.py [chemin_vers_donnees_encheres.json]
+
+Pour un dossier entier (plusieurs postes, sauvegardes) : python cli.py migrer <dossier>
 """
 
 import json
@@ -180,6 +182,15 @@ def main():
             print("   Spécifiez le chemin vers votre fichier en paramètre.")
         return
     
+    # Dossier : migration en lot (voir services/migration_donnees.py)
+    if os.path.isdir(sys.argv[1]):
+        from services.migration_donnees import migrer_arborescence
+        bilans = migrer_arborescence([sys.argv[1]], 'journees_data')
+        for bilan in bilans:
+            print(f"{'❌' if bilan['statut'] == 'erreur' else '✅'} {bilan['source']} : "
+                  f"{bilan.get('erreur') or ', '.join(bilan.get('journees', []))}")
+        return
+    
     # Paramètres fournis
     ancien_fichier = sys.argv[1]
     nom_journee = sys.argv[2] if len(sys.argv) > 2 else None
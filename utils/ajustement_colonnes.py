@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ajustement automatique de la largeur des colonnes d'un Treeview
+
+Chaque texte distinct n'est mesuré qu'une fois par police (cache), chaque colonne
+tient un maximum courant mis à jour à l'ajout / au retrait des lignes, et la
+largeur n'est reconfigurée que lorsque ce maximum change.
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from utils.polices import registre_polices
+
+# Cache des mesures : clé de police -> {texte: largeur en pixels}
+_cache_mesures: Dict[Tuple, Dict[str, int]] = {}
+
+def _cle_police(police) -> Tuple:
+    """Clé identifiant une police dans son état courant (nom + taille)"""
+    return (str(police), police.cget('size'))
+
+def _cle_registre(element_type: str) -> Tuple:
+    """Clé d'une police du registre, sans appel à Tk"""
+    return (str(registre_polices.police(element_type)), registre_polices.get_taille(element_type))
+
+def mesurer_texte(police, texte: str, cle: Optional[Tuple] = None) -> int:
+    """
+    Largeur d'un texte dans une police, mesurée une seule fois
+
+    Args:
+        police: Police tkinter (tkfont.Font)
+        texte: Texte à mesurer
+        cle: Clé de la police si déjà connue (évite d'interroger Tk)
+
+    Returns:
+        Largeur en pixels
+    """
+    if cle is None:
+        cle = _cle_police(police)
+    cache = _cache_mesures.get(cle)
+    if cache is None:
+        # Nouvelle taille pour cette police : oublier les mesures obsolètes
+        for ancienne in [c for c in _cache_mesures if c[0] == cle[0]]:
+            del _cache_mesures[ancienne]
+        cache = _cache_mesures[cle] = {}
+    largeur = cache.get(texte)
+    if largeur is None:
+        largeur = cache[texte] = police.measure(texte)
+    return largeur
+
+class AjusteurColonnes:
+    """Moteur d'ajustement automatique des colonnes texte d'un tableau"""
+
+    # Marge intérieure ajoutée au texte le plus large (px)
+    MARGE = 20
+
+    def __init__(self, treeview, colonnes: Sequence[str], colonnes_auto: Iterable[str],
+                 largeur_min: Optional[Dict[str, int]] = None, largeur_max: int = 450):
+        """
+        Args:
+            treeview: Widget Treeview à ajuster
+            colonnes: Ordre complet des colonnes (celui des valeurs insérées)
+            colonnes_auto: Colonnes dont la largeur suit le contenu
+            largeur_min: Largeur minimale par colonne (largeur configurée d'origine)
+            largeur_max: Largeur maximale d'une colonne ajustée
+        """
+        self.treeview = treeview
+        self.largeur_max = largeur_max
+        self.largeur_min = dict(largeur_min or {})
+        self.actif = True
+
+        colonnes_auto = set(colonnes_auto)
+        # Index dans le tuple de valeurs -> nom de colonne
+        self.index_colonnes = [(i, col) for i, col in enumerate(colonnes) if col in colonnes_auto]
+
+        # Par colonne : occurrences de chaque texte, occurrences de chaque largeur
+        self.textes: Dict[str, Counter] = {col: Counter() for _, col in self.index_colonnes}
+        self.largeurs: Dict[str, Counter] = {col: Counter() for _, col in self.index_colonnes}
+        self.maximum: Dict[str, int] = {col: 0 for _, col in self.index_colonnes}
+        self.largeur_appliquee: Dict[str, int] = {}
+        self._police_cle: Optional[Tuple] = None
+
+    # ------------------------------------------------------------------
+    # Événements de modification
+    # ------------------------------------------------------------------
+
+    def vider(self):
+        """Toutes les lignes ont été retirées du tableau"""
+        for col in self.textes:
+            self.textes[col].clear()
+            self.largeurs[col].clear()
+            self.maximum[col] = 0
+
+    def ajouter_ligne(self, valeurs: Sequence):
+        """Une ligne a été insérée"""
+        police = self._police()
+        for index, col in self.index_colonnes:
+            self._ajouter_texte(col, self._texte(valeurs, index), police)
+
+    def retirer_ligne(self, valeurs: Sequence):
+        """Une ligne a été supprimée"""
+        police = self._police()
+        for index, col in self.index_colonnes:
+            self._retirer_texte(col, self._texte(valeurs, index), police)
+
+    def modifier_cellule(self, colonne: str, ancien_texte, nouveau_texte):
+        """Une cellule a été modifiée"""
+        if colonne not in self.textes:
+            return
+        police = self._police()
+        self._retirer_texte(colonne, str(ancien_texte or ""), police)
+        self._ajouter_texte(colonne, str(nouveau_texte or ""), police)
+
+    # ------------------------------------------------------------------
+    # Application
+    # ------------------------------------------------------------------
+
+    def appliquer(self) -> int:
+        """
+        Reconfigure les colonnes dont le maximum a changé
+
+        Returns:
+            Nombre de colonnes reconfigurées
+        """
+        if not self.actif:
+            return 0
+
+        # Une modification de la police invalide toutes les largeurs
+        self._police()
+
+        police_entetes = registre_polices.police('entetes')
+        cle_entetes = _cle_registre('entetes')
+        nb = 0
+        for _, col in self.index_colonnes:
+            entete = mesurer_texte(police_entetes, self.treeview.heading(col, 'text'), cle_entetes)
+            largeur = max(self.maximum[col], entete) + self.MARGE
+            largeur = max(self.largeur_min.get(col, 0), min(self.largeur_max, largeur))
+            if self.largeur_appliquee.get(col) != largeur:
+                self.treeview.column(col, width=largeur)
+                self.largeur_appliquee[col] = largeur
+                nb += 1
+        return nb
+
+    def reinitialiser_largeurs(self):
+        """Oublie les largeurs appliquées (elles seront reconfigurées au prochain appliquer)"""
+        self.largeur_appliquee.clear()
+
+    # ------------------------------------------------------------------
+    # Interne
+    # ------------------------------------------------------------------
+
+    def _police(self):
+        """Police du tableau ; remesure tout si sa taille a changé"""
+        police = registre_polices.police('tableau')
+        cle = _cle_registre('tableau')
+        if cle != self._police_cle:
+            self._recalculer_largeurs(police, cle)
+        return police
+
+    @staticmethod
+    def _texte(valeurs: Sequence, index: int) -> str:
+        if index < len(valeurs):
+            valeur = valeurs[index]
+            return "" if valeur is None else str(valeur)
+        return ""
+
+    def _ajouter_texte(self, col: str, texte: str, police):
+        self.textes[col][texte] += 1
+        largeur = mesurer_texte(police, texte, self._police_cle)
+        self.largeurs[col][largeur] += 1
+        if largeur > self.maximum[col]:
+            self.maximum[col] = largeur
+
+    def _retirer_texte(self, col: str, texte: str, police):
+        textes = self.textes[col]
+        if textes[texte] <= 0:
+            return
+        textes[texte] -= 1
+        if textes[texte] == 0:
+            del textes[texte]
+
+        largeur = mesurer_texte(police, texte, self._police_cle)
+        largeurs = self.largeurs[col]
+        largeurs[largeur] -= 1
+        if largeurs[largeur] <= 0:
+            del largeurs[largeur]
+            # Le maximum ne change que si c'était la dernière occurrence de la plus grande largeur
+            if largeur == self.maximum[col]:
+                self.maximum[col] = max(largeurs) if largeurs else 0
+
+    def _recalculer_largeurs(self, police, cle: Tuple):
+        """Remesure les textes distincts de chaque colonne avec la nouvelle police"""
+        self._police_cle = cle
+        for col, textes in self.textes.items():
+            largeurs = Counter()
+            for texte, nb in textes.items():
+                largeurs[mesurer_texte(police, texte, cle)] += nb
+            self.largeurs[col] = largeurs
+            self.maximum[col] = max(largeurs) if largeurs else 0
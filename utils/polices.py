@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registre des polices nommées partagées par toute l'interface
+
+Chaque type d'élément (tableau, entêtes, titres, boutons, labels, champs, tooltips)
+correspond à UN objet police partagé par tous les widgets qui l'utilisent.
+Changer une taille revient donc à un seul appel configure() par police, sans
+parcourir l'arbre des widgets.
+"""
+
+import tkinter as tk
+import tkinter.font as tkfont
+from typing import Dict, Optional
+
+# Famille utilisée par les tableaux ttk et les tooltips
+FAMILLE_POLICE = "Segoe UI"
+
+# Types d'éléments : (taille par défaut, gras, police CustomTkinter ?)
+TYPES_POLICES = {
+    'tableau': (14, False, False),
+    'entetes': (16, True, False),
+    'titres': (20, True, True),
+    'boutons': (12, True, True),
+    'labels': (12, True, True),
+    'champs': (12, False, True),
+    'tooltips': (11, False, False),
+}
+
+# Noms Tk des polices nommées utilisées dans les styles ttk
+NOMS_POLICES_TK = {
+    'tableau': "MidnightTableau",
+    'entetes': "MidnightEntetes",
+    'tooltips': "MidnightTooltips",
+}
+
+class RegistrePolices:
+    """Registre des polices et styles ttk partagés"""
+
+    def __init__(self):
+        self.polices: Dict[str, tkfont.Font] = {}
+        self.tailles: Dict[str, int] = {t: d[0] for t, d in TYPES_POLICES.items()}
+        self.hauteur_lignes = 30
+        self._interpreteur = None
+        self._theme_lie = None
+
+    def _verifier_interpreteur(self):
+        """Réinitialise les polices si l'application Tk a été recréée"""
+        racine = tk._default_root
+        interp = id(racine.tk) if racine is not None else None
+        if interp != self._interpreteur:
+            self.polices.clear()
+            self._theme_lie = None
+            self._interpreteur = interp
+
+    def _creer_police(self, element_type: str) -> tkfont.Font:
+        """Crée la police partagée d'un type d'élément"""
+        _, gras, police_ctk = TYPES_POLICES[element_type]
+        taille = self.tailles[element_type]
+        weight = "bold" if gras else "normal"
+
+        if police_ctk:
+            try:
+                import customtkinter as ctk
+                return ctk.CTkFont(size=taille, weight=weight)
+            except ImportError:
+                pass  # Fallback vers une police Tk classique
+
+        nom = NOMS_POLICES_TK.get(element_type)
+        if nom and nom in tkfont.names():
+            police = tkfont.nametofont(nom)
+            police.configure(family=FAMILLE_POLICE, size=taille, weight=weight)
+            return police
+        return tkfont.Font(name=nom, family=FAMILLE_POLICE, size=taille, weight=weight)
+
+    def police(self, element_type: str) -> tkfont.Font:
+        """
+        Retourne la police partagée d'un type d'élément
+
+        Args:
+            element_type: 'tableau', 'entetes', 'titres', 'boutons', 'labels', 'champs' ou 'tooltips'
+
+        Returns:
+            Police partagée (CTkFont pour les widgets CustomTkinter, tkfont.Font sinon)
+        """
+        if element_type not in TYPES_POLICES:
+            element_type = 'labels'
+        self._verifier_interpreteur()
+        if element_type not in self.polices:
+            self.polices[element_type] = self._creer_police(element_type)
+        return self.polices[element_type]
+
+    def lier_styles_ttk(self):
+        """Fait référencer les polices nommées par les styles ttk des tableaux (une fois par thème)"""
+        self._verifier_interpreteur()
+        from tkinter import ttk
+        style = ttk.Style()
+        theme = style.theme_use()
+        if theme == self._theme_lie:
+            return
+        style.configure("Treeview",
+                       font=self.police('tableau').name,
+                       rowheight=self.hauteur_lignes)
+        style.configure("Treeview.Heading",
+                       font=self.police('entetes').name)
+        self._theme_lie = theme
+
+    def appliquer(self, parametres: Dict) -> int:
+        """
+        Applique les tailles de police et la hauteur des lignes
+
+        Seules les valeurs présentes et modifiées donnent lieu à un appel configure().
+
+        Args:
+            parametres: Paramètres de la journée (ou paramètres temporaires d'aperçu)
+
+        Returns:
+            Nombre d'appels configure() effectués
+        """
+        self._verifier_interpreteur()
+        nb_modifications = 0
+
+        for element_type in TYPES_POLICES:
+            valeur = parametres.get(f'taille_police_{element_type}')
+            if valeur is None:
+                continue
+            taille = int(valeur)
+            if taille == self.tailles[element_type]:
+                continue
+            self.tailles[element_type] = taille
+            police = self.polices.get(element_type)
+            if police is not None:
+                police.configure(size=taille)
+                nb_modifications += 1
+
+        hauteur = int(parametres.get('hauteur_lignes_tableau', self.hauteur_lignes))
+        if hauteur != self.hauteur_lignes:
+            self.hauteur_lignes = hauteur
+            if self._theme_lie is not None:
+                from tkinter import ttk
+                ttk.Style().configure("Treeview", rowheight=hauteur)
+                nb_modifications += 1
+
+        return nb_modifications
+
+    def get_taille(self, element_type: str) -> int:
+        """Retourne la taille courante d'un type d'élément"""
+        return self.tailles.get(element_type, 12)
+
+# Instance unique partagée par toute l'application
+registre_polices = RegistrePolices()
+
+def get_police(element_type: str) -> tkfont.Font:
+    """Raccourci vers la police partagée d'un type d'élément"""
+    return registre_polices.police(element_type)
+
+def appliquer_parametres_polices(parametres: Optional[Dict]) -> int:
+    """Raccourci pour appliquer les tailles de police d'un jeu de paramètres"""
+    if not parametres:
+        return 0
+    return registre_polices.appliquer(parametres)
@@ -2,11 +2,14 @@
 # -*- coding: utf-8 -*-
 """
 Système de tooltips amélioré avec détection d'inactivité et tooltips contextuels
+
+Un gestionnaire unique (GestionnaireTooltips) gère tous les tooltips de l'application.
 """
 
 import tkinter as tk
-from typing import Optional, Dict
-import time
+from typing import Optional, Dict, Callable
+
+from utils.polices import registre_polices
 
 # Variable globale pour la taille de police des tooltips
 TOOLTIP_FONT_SIZE = 11
@@ -15,520 +18,486 @@ def set_tooltip_font_size(size: int):
     """Définit la taille de police globale pour tous les tooltips"""
     global TOOLTIP_FONT_SIZE
     TOOLTIP_FONT_SIZE = max(8, min(20, size))  # Limiter entre 8 et 20
+    registre_polices.appliquer({'taille_police_tooltips': TOOLTIP_FONT_SIZE})
 
 def get_tooltip_font_size() -> int:
     """Retourne la taille de police actuelle des tooltips"""
     return TOOLTIP_FONT_SIZE
 
-class AdvancedToolTip:
+class GestionnaireTooltips:
     """
-    Classe pour tooltips avancés avec détection d'inactivité et contexte dynamique
+    Contrôleur unique des tooltips de l'application
+    
+    Une seule fenêtre Toplevel est réutilisée pour tous les tooltips, les
+    événements souris/clavier sont captés une fois pour toute l'application
+    (bind_all) puis dispatchés vers le widget enregistré concerné, et un seul
+    timer regroupe les mouvements de souris (throttle) et l'attente d'inactivité.
     """
     
-    def __init__(self, widget, text: str = "", delay: int = 1000, wraplength: int = 350, 
-                 font_size: Optional[int] = None, inactivity_delay: int = 500):
-        """
-        Initialise un tooltip avancé
-        
-        Args:
-            widget: Widget auquel attacher le tooltip
-            text: Texte à afficher (peut être une fonction pour contenu dynamique)
-            delay: Délai en millisecondes avant affichage (défaut: 1000ms)
-            wraplength: Largeur maximale du texte (défaut: 350px)
-            font_size: Taille de police (défaut: utilise la taille globale)
-            inactivity_delay: Délai d'inactivité requis en ms (défaut: 500ms)
-        """
-        self.widget = widget
-        self.text = text
-        self.delay = delay
-        self.wraplength = wraplength
-        self.font_size = font_size or TOOLTIP_FONT_SIZE
-        self.inactivity_delay = inactivity_delay
-        
-        self.tooltip_window: Optional[tk.Toplevel] = None
-        self.after_id: Optional[str] = None
-        self.inactivity_check_id: Optional[str] = None
-        
-        # Variables pour détecter l'inactivité
-        self.last_mouse_x = 0
-        self.last_mouse_y = 0
-        self.last_activity_time = 0
-        self.is_mouse_in_widget = False
-        self.key_pressed = False
-        self.app_has_focus = True  # Nouveau: pour gérer Alt+Tab
-        
-        # Bind les événements seulement si nécessaire (pas pour tooltips contextuels)
-        self._auto_bind = True
-        if hasattr(widget, '_tooltip_manual_mode'):
-            self._auto_bind = False
-        
-        if self._auto_bind:
-            self.widget.bind("<Enter>", self.on_enter)
-            self.widget.bind("<Leave>", self.on_leave)
-            self.widget.bind("<Motion>", self.on_motion)
-            
-            # Bind global pour les touches clavier
-            try:
-                self.widget.winfo_toplevel().bind("<KeyPress>", self.on_key_press, add=True)
-                self.widget.winfo_toplevel().bind("<KeyRelease>", self.on_key_release, add=True)
-                self.widget.winfo_toplevel().bind("<FocusIn>", self.on_app_focus_in, add=True)
-                self.widget.winfo_toplevel().bind("<FocusOut>", self.on_app_focus_out, add=True)
-            except:
-                pass  # Ignore si impossible
-    
-    def on_enter(self, event):
-        """Quand la souris entre dans le widget"""
-        self.is_mouse_in_widget = True
-        self.last_mouse_x = event.x_root
-        self.last_mouse_y = event.y_root
-        self.last_activity_time = time.time()
-        self.start_inactivity_check(event)
-    
-    def on_leave(self, event):
-        """Quand la souris quitte le widget"""
-        self.is_mouse_in_widget = False
-        self.cancel_all()
-        self.hide_tooltip()
-    
-    def on_motion(self, event):
-        """Quand la souris bouge"""
-        # Vérifier si la souris a vraiment bougé (éviter les micro-mouvements)
-        if abs(event.x_root - self.last_mouse_x) > 2 or abs(event.y_root - self.last_mouse_y) > 2:
-            self.last_mouse_x = event.x_root
-            self.last_mouse_y = event.y_root
-            self.last_activity_time = time.time()
-            
-            # Redémarrer la vérification d'inactivité
-            self.cancel_all()
-            self.hide_tooltip()
-            if self.is_mouse_in_widget:
-                self.start_inactivity_check(event)
-    
-    def on_key_press(self, event):
-        """Quand une touche est pressée"""
-        self.key_pressed = True
-        self.last_activity_time = time.time()
-        self.cancel_all()
-        self.hide_tooltip()
-    
-    def on_key_release(self, event):
-        """Quand une touche est relâchée"""
-        self.key_pressed = False
-        self.last_activity_time = time.time()
-        # Redémarrer la vérification si on est toujours dans le widget
-        if self.is_mouse_in_widget:
+    _instance = None
+    
+    # Intervalle de regroupement des mouvements de souris (ms)
+    INTERVALLE_MOUVEMENT = 50
+    # Déplacement minimal (px) considéré comme une activité
+    SEUIL_MOUVEMENT = 2
+    
+    @classmethod
+    def get(cls) -> "GestionnaireTooltips":
+        """Retourne l'instance unique du gestionnaire"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+    
+    def __init__(self):
+        # Registre des widgets : chemin Tk -> entrée (texte ou fonction)
+        self.widgets: Dict[str, Dict] = {}
+        # Registre des tableaux : chemin Tk -> fournisseur de texte par colonne
+        self.colonnes: Dict[str, Callable[[str], Optional[str]]] = {}
+        
+        self.fenetre: Optional[tk.Toplevel] = None
+        self.label: Optional[tk.Label] = None
+        self._interpreteurs_lies = set()
+        
+        # État courant
+        self.cible: Optional[str] = None      # Chemin du widget survolé
+        self.colonne: Optional[str] = None    # Colonne survolée (tableaux)
+        self.position = (0, 0)                # Dernière position significative
+        self.position_brute = (0, 0)          # Dernière position reçue
+        self.visible = False
+        
+        # Timers (un pour l'affichage, un pour le throttle des mouvements)
+        self.after_affichage: Optional[str] = None
+        self.after_mouvement: Optional[str] = None
+    
+    # ------------------------------------------------------------------
+    # Enregistrement
+    # ------------------------------------------------------------------
+    
+    def enregistrer(self, widget, text, delay: int = 1000, wraplength: int = 350,
+                    font_size: Optional[int] = None):
+        """Enregistre (ou met à jour) le tooltip d'un widget"""
+        self._lier(widget)
+        self.widgets[str(widget)] = {
+            'widget': widget,
+            'text': text,
+            'delay': delay,
+            'wraplength': wraplength,
+            'font_size': font_size
+        }
+    
+    def enregistrer_colonnes(self, treeview, fournisseur: Callable[[str], Optional[str]]):
+        """Enregistre un fournisseur de textes par colonne pour un Treeview"""
+        self._lier(treeview)
+        self.colonnes[str(treeview)] = fournisseur
+        # Conserver une référence au widget pour identifier les colonnes
+        self.widgets.setdefault(str(treeview), {
+            'widget': treeview,
+            'text': None,
+            'delay': 800,
+            'wraplength': 400,
+            'font_size': None
+        })
+    
+    def retirer(self, widget):
+        """Retire le tooltip d'un widget du registre"""
+        cle = str(widget)
+        if cle == self.cible:
+            self.reinitialiser()
+        self.widgets.pop(cle, None)
+        self.colonnes.pop(cle, None)
+    
+    def retirer_colonnes(self, treeview):
+        """Retire les tooltips de colonnes d'un Treeview (garde le tooltip du widget)"""
+        cle = str(treeview)
+        if cle == self.cible:
+            self.reinitialiser()
+        self.colonnes.pop(cle, None)
+        entree = self.widgets.get(cle)
+        if entree and entree['text'] is None:
+            del self.widgets[cle]
+    
+    def _lier(self, widget):
+        """Installe les bindings globaux une seule fois par interpréteur Tk"""
+        interp = id(widget.tk)
+        if interp in self._interpreteurs_lies:
+            return
+        self._interpreteurs_lies.add(interp)
+        widget.bind_all("<Enter>", self._on_enter, add="+")
+        widget.bind_all("<Leave>", self._on_leave, add="+")
+        widget.bind_all("<Motion>", self._on_motion, add="+")
+        widget.bind_all("<KeyPress>", self._on_activite, add="+")
+        widget.bind_all("<ButtonPress>", self._on_activite, add="+")
+        widget.bind_all("<FocusOut>", self._on_activite, add="+")
+    
+    def _resoudre(self, widget) -> Optional[str]:
+        """Remonte la hiérarchie jusqu'au premier widget enregistré"""
+        # Certains widgets internes (popdown des Combobox) ne sont connus que par leur nom
+        if isinstance(widget, str):
+            return None
+        while widget is not None:
+            cle = str(widget)
+            if cle in self.widgets:
+                entree = self.widgets[cle]
+                try:
+                    if entree['widget'].winfo_exists():
+                        return cle
+                except tk.TclError:
+                    pass
+                # Widget détruit : purger l'entrée
+                self.widgets.pop(cle, None)
+                self.colonnes.pop(cle, None)
+                return None
+            widget = getattr(widget, 'master', None)
+        return None
+    
+    # ------------------------------------------------------------------
+    # Événements
+    # ------------------------------------------------------------------
+    
+    def _on_enter(self, event):
+        """Entrée dans un widget"""
+        cle = self._resoudre(event.widget)
+        if cle is None or cle == self.cible:
+            return
+        self.reinitialiser()
+        self.cible = cle
+        self.position = self.position_brute = (event.x_root, event.y_root)
+        self._planifier_affichage()
+    
+    def _on_leave(self, event):
+        """Sortie d'un widget : vérifier après coup si la souris a réellement quitté la cible"""
+        if self.cible is None or self._resoudre(event.widget) != self.cible:
+            return
+        try:
+            event.widget.after_idle(self._verifier_sortie)
+        except tk.TclError:
+            self.reinitialiser()
+    
+    def _verifier_sortie(self):
+        """Cache le tooltip si le pointeur n'est plus au-dessus de la cible"""
+        if self.cible is None:
+            return
+        entree = self.widgets.get(self.cible)
+        try:
+            widget = entree['widget']
+            x, y = widget.winfo_pointerxy()
+            sous_pointeur = widget.winfo_containing(x, y)
+        except (tk.TclError, KeyError, TypeError):
+            sous_pointeur = None
+        if sous_pointeur is None or self._resoudre(sous_pointeur) != self.cible:
+            self.reinitialiser()
+    
+    def _on_motion(self, event):
+        """Mouvement de souris : mémorisé puis traité par le throttle"""
+        if self.cible is None:
+            return
+        self.position_brute = (event.x_root, event.y_root)
+        if self.after_mouvement is None:
+            widget = self.widgets[self.cible]['widget'] if self.cible in self.widgets else event.widget
             try:
-                # Créer un événement fictif avec la dernière position connue
-                fake_event = type('Event', (), {
-                    'x_root': self.last_mouse_x,
-                    'y_root': self.last_mouse_y
-                })()
-                self.start_inactivity_check(fake_event)
-            except:
-                pass
+                self.after_mouvement = widget.after(self.INTERVALLE_MOUVEMENT, self._traiter_mouvement)
+            except tk.TclError:
+                self.after_mouvement = None
+    
+    def _traiter_mouvement(self):
+        """Traite le dernier mouvement reçu (au plus une fois par intervalle)"""
+        self.after_mouvement = None
+        if self.cible is None:
+            return
+        
+        x, y = self.position_brute
+        bouge = (abs(x - self.position[0]) > self.SEUIL_MOUVEMENT or
+                 abs(y - self.position[1]) > self.SEUIL_MOUVEMENT)
+        
+        # Changement de colonne dans un tableau
+        colonne = self._colonne_sous_pointeur()
+        if colonne != self.colonne:
+            self.colonne = colonne
+            bouge = True
+        
+        if bouge:
+            self.position = self.position_brute
+            self.cacher()
+            self._planifier_affichage()
     
-    def start_inactivity_check(self, event):
-        """Démarre la vérification d'inactivité"""
-        self.cancel_all()
-        self.inactivity_check_id = self.widget.after(50, lambda: self.check_inactivity(event))
-    
-    def check_inactivity(self, event):
-        """Vérifie si l'utilisateur est inactif"""
-        current_time = time.time()
-        time_since_activity = (current_time - self.last_activity_time) * 1000  # En millisecondes
-        
-        # Vérifier les conditions d'inactivité
-        if (self.is_mouse_in_widget and 
-            not self.key_pressed and 
-            time_since_activity >= self.inactivity_delay):
-            
-            # L'utilisateur est inactif, afficher le tooltip après le délai normal
-            self.after_id = self.widget.after(self.delay, lambda: self.show_tooltip(event))
-        else:
-            # Continuer à vérifier l'inactivité
-            if self.is_mouse_in_widget:
-                self.inactivity_check_id = self.widget.after(50, lambda: self.check_inactivity(event))
+    def _on_activite(self, event=None):
+        """Touche, clic ou perte de focus : cacher et attendre une nouvelle inactivité"""
+        if self.cible is None:
+            return
+        self.cacher()
+        self._planifier_affichage()
+    
+    # ------------------------------------------------------------------
+    # Affichage
+    # ------------------------------------------------------------------
+    
+    def _colonne_sous_pointeur(self) -> Optional[str]:
+        """Nom de la colonne survolée si la cible est un tableau enregistré"""
+        if self.cible not in self.colonnes:
+            return None
+        treeview = self.widgets[self.cible]['widget']
+        try:
+            x_local = self.position_brute[0] - treeview.winfo_rootx()
+            colonne = treeview.identify_column(x_local)
+            if not colonne or colonne == "#0":
+                return None
+            index = int(colonne.replace('#', '')) - 1
+            colonnes = list(treeview['columns'])
+            if 0 <= index < len(colonnes):
+                return colonnes[index]
+        except (tk.TclError, ValueError):
+            pass
+        return None
     
-    def cancel_all(self):
-        """Annule tous les timers"""
-        if self.after_id:
-            try:
-                self.widget.after_cancel(self.after_id)
-            except:
-                pass
-            self.after_id = None
-        if self.inactivity_check_id:
+    def _planifier_affichage(self):
+        """(Re)démarre l'unique timer d'affichage"""
+        self._annuler_affichage()
+        entree = self.widgets.get(self.cible)
+        if not entree:
+            return
+        if self.cible in self.colonnes and self.colonne is None:
+            self.colonne = self._colonne_sous_pointeur()
+        try:
+            self.after_affichage = entree['widget'].after(entree['delay'], self.afficher)
+        except tk.TclError:
+            self.after_affichage = None
+    
+    def _annuler_affichage(self):
+        """Annule le timer d'affichage en attente"""
+        if self.after_affichage:
+            entree = self.widgets.get(self.cible)
             try:
-                self.widget.after_cancel(self.inactivity_check_id)
-            except:
+                if entree:
+                    entree['widget'].after_cancel(self.after_affichage)
+            except tk.TclError:
                 pass
-            self.inactivity_check_id = None
+            self.after_affichage = None
     
-    def get_text(self, event=None):
-        """Récupère le texte à afficher (peut être dynamique)"""
-        if callable(self.text):
+    def _texte_courant(self) -> Optional[str]:
+        """Texte à afficher pour la cible (colonne en priorité, généré à la demande)"""
+        entree = self.widgets.get(self.cible)
+        if not entree:
+            return None
+        
+        if self.cible in self.colonnes and self.colonne:
+            try:
+                texte = self.colonnes[self.cible](self.colonne)
+                if texte:
+                    return texte
+            except Exception as e:
+                print(f"Erreur tooltip colonne: {e}")
+        
+        texte = entree['text']
+        if callable(texte):
             try:
-                return self.text(event)
-            except:
+                return texte(None)
+            except Exception:
                 return "Erreur dans le tooltip dynamique"
-        return self.text
+        return texte
     
-    def show_tooltip(self, event):
-        """Affiche le tooltip avec police configurée"""
-        if self.tooltip_window or not self.is_mouse_in_widget:
-            return
-        
-        # Vérifier que le widget existe encore
+    def _fenetre_tooltip(self, widget) -> Optional[tk.Toplevel]:
+        """Retourne la fenêtre réutilisable (recréée si elle a été détruite)"""
         try:
-            if not self.widget.winfo_exists():
-                return
-        except:
-            # Le widget n'existe plus, ne pas créer le tooltip
-            return
-        
-        text_to_show = self.get_text(event)
-        if not text_to_show:
-            return
+            if self.fenetre is not None and self.fenetre.winfo_exists():
+                return self.fenetre
+        except tk.TclError:
+            pass
         
-        # Créer la fenêtre tooltip
         try:
-            self.tooltip_window = tk.Toplevel(self.widget)
+            self.fenetre = tk.Toplevel(widget._root())
         except tk.TclError:
-            # Le widget parent n'existe plus, abandonner
-            return
-        
-        self.tooltip_window.wm_overrideredirect(True)
-        self.tooltip_window.wm_attributes('-topmost', True)  # Toujours au dessus
-        
-        # Position du tooltip (légèrement décalé de la souris)
-        x = event.x_root + 15
-        y = event.y_root + 10
+            self.fenetre = None
+            return None
         
-        # Vérifier les bords de l'écran
-        screen_width = self.tooltip_window.winfo_screenwidth()
-        screen_height = self.tooltip_window.winfo_screenheight()
+        self.fenetre.withdraw()
+        self.fenetre.wm_overrideredirect(True)
+        self.fenetre.wm_attributes('-topmost', True)  # Toujours au dessus
         
-        # Créer le label avec le texte
-        label = tk.Label(
-            self.tooltip_window,
-            text=text_to_show,
+        self.label = tk.Label(
+            self.fenetre,
             background="#FFFFDD",
             foreground="#000000",
             relief="solid",
             borderwidth=1,
-            font=("Segoe UI", self.font_size),
-            wraplength=self.wraplength,
             justify="left",
             padx=12,
             pady=8
         )
-        label.pack()
+        self.label.pack()
+        return self.fenetre
+    
+    def afficher(self):
+        """Affiche le tooltip de la cible à la dernière position connue"""
+        self.after_affichage = None
+        entree = self.widgets.get(self.cible)
+        if not entree:
+            return
         
-        # Mettre à jour pour obtenir la taille réelle
-        self.tooltip_window.update_idletasks()
-        width = self.tooltip_window.winfo_reqwidth()
-        height = self.tooltip_window.winfo_reqheight()
+        texte = self._texte_courant()
+        if not texte:
+            return
         
-        # Ajuster la position si nécessaire
-        if x + width > screen_width:
-            x = event.x_root - width - 15
-        if y + height > screen_height:
-            y = event.y_root - height - 10
+        fenetre = self._fenetre_tooltip(entree['widget'])
+        if fenetre is None:
+            return
         
-        # Positionner la fenêtre
-        self.tooltip_window.wm_geometry(f"+{x}+{y}")
-    
-    def hide_tooltip(self):
-        """Cache le tooltip"""
-        if self.tooltip_window:
+        if entree['font_size']:
+            police = ("Segoe UI", entree['font_size'])
+        else:
+            police = registre_polices.police('tooltips')
+        self.label.configure(
+            text=texte,
+            font=police,
+            wraplength=entree['wraplength']
+        )
+        
+        # Position du tooltip (légèrement décalé de la souris)
+        x_souris, y_souris = self.position
+        x = x_souris + 15
+        y = y_souris + 10
+        
+        fenetre.update_idletasks()
+        width = fenetre.winfo_reqwidth()
+        height = fenetre.winfo_reqheight()
+        
+        # Ajuster la position si nécessaire (bords de l'écran)
+        if x + width > fenetre.winfo_screenwidth():
+            x = x_souris - width - 15
+        if y + height > fenetre.winfo_screenheight():
+            y = y_souris - height - 10
+        
+        fenetre.wm_geometry(f"+{x}+{y}")
+        fenetre.deiconify()
+        fenetre.lift()
+        self.visible = True
+    
+    def cacher(self):
+        """Cache le tooltip (la fenêtre est conservée pour être réutilisée)"""
+        self._annuler_affichage()
+        if self.visible and self.fenetre is not None:
+            try:
+                self.fenetre.withdraw()
+            except tk.TclError:
+                self.fenetre = None
+        self.visible = False
+    
+    def reinitialiser(self):
+        """Cache le tooltip et oublie la cible courante"""
+        self.cacher()
+        if self.after_mouvement:
+            entree = self.widgets.get(self.cible)
             try:
-                self.tooltip_window.destroy()
-            except:
-                pass  # Ignorer les erreurs si la fenêtre est déjà détruite
-            finally:
-                self.tooltip_window = None
+                if entree:
+                    entree['widget'].after_cancel(self.after_mouvement)
+            except tk.TclError:
+                pass
+            self.after_mouvement = None
+        self.cible = None
+        self.colonne = None
+
+class TooltipWidget:
+    """Poignée sur un tooltip enregistré auprès du gestionnaire global"""
+    
+    def __init__(self, widget, text, delay: int = 1000, wraplength: int = 350,
+                 font_size: Optional[int] = None):
+        self.widget = widget
+        self.text = text
+        self.delay = delay
+        self.wraplength = wraplength
+        self.font_size = font_size
+        GestionnaireTooltips.get().enregistrer(widget, text, delay, wraplength, font_size)
     
     def update_text(self, new_text):
         """Met à jour le texte du tooltip"""
         self.text = new_text
-        # Si un tooltip est déjà affiché, le cacher pour forcer un rafraîchissement
-        if self.tooltip_window:
-            self.hide_tooltip()
+        gestionnaire = GestionnaireTooltips.get()
+        entree = gestionnaire.widgets.get(str(self.widget))
+        if entree:
+            entree['text'] = new_text
+        if gestionnaire.cible == str(self.widget):
+            gestionnaire.cacher()
     
     def destroy(self):
-        """Détruit complètement le tooltip et nettoie les ressources"""
-        self.cancel_all()
-        self.hide_tooltip()
-        self.is_mouse_in_widget = False
-        
-        # Retirer les bindings si possible
-        try:
-            self.widget.unbind("<Enter>")
-            self.widget.unbind("<Leave>")
-            self.widget.unbind("<Motion>")
-        except:
-            pass
-        
-        # Nettoyer les variables
+        """Retire le tooltip du gestionnaire"""
+        if self.widget is not None:
+            GestionnaireTooltips.get().retirer(self.widget)
         self.text = None
         self.widget = None
-    
-    def on_app_focus_in(self, event):
-        """Quand l'application reprend le focus (après Alt+Tab)"""
-        # Réactiver les tooltips si la souris est dans le widget
-        if self.is_mouse_in_widget:
-            try:
-                self.key_pressed = False
-                self.last_activity_time = 0
-            except:
-                pass
-    
-    def on_app_focus_out(self, event):
-        """Quand l'application perd le focus (Alt+Tab)"""
-        # Cacher tous les tooltips
-        self.hide_tooltip()
 
-# Alias pour compatibilité avec l'ancien système
-ToolTip = AdvancedToolTip
-
-class TreeviewColumnTooltip:
+class TooltipsColonnes:
     """
-    Classe spécialisée pour les tooltips de colonnes de tableaux
-    Version simplifiée et robuste
+    Tooltips par colonne d'un Treeview
+    
+    Le fournisseur est appelé au moment de l'affichage avec le nom de la colonne :
+    les textes reflètent toujours les paramètres courants.
     """
     
-    def __init__(self, treeview, column_tooltips: Dict[str, str]):
+    def __init__(self, treeview, fournisseur: Callable[[str], Optional[str]]):
         """
-        Initialise les tooltips de colonnes
-        
         Args:
             treeview: Widget Treeview
-            column_tooltips: Dictionnaire {nom_colonne: texte_tooltip}
+            fournisseur: Fonction nom_colonne -> texte (ou None)
         """
         self.treeview = treeview
-        self.column_tooltips = column_tooltips
-        self.tooltips_by_column = {}  # Un tooltip par colonne
-        self.current_column = None
-        self.motion_after_id = None
-        self.is_mouse_in_treeview = False
-        
-        # Créer un tooltip pour chaque colonne
-        self._create_column_tooltips()
-        
-        # Bind les événements
-        self.treeview.bind("<Motion>", self.on_motion, add=True)
-        self.treeview.bind("<Leave>", self.on_leave, add=True)
-        self.treeview.bind("<Enter>", self.on_enter, add=True)
-        
-        # Bind pour gestion focus (pour problème Alt+Tab)
-        try:
-            self.treeview.winfo_toplevel().bind("<FocusIn>", self.on_app_focus_in, add=True)
-            self.treeview.winfo_toplevel().bind("<FocusOut>", self.on_app_focus_out, add=True)
-        except:
-            pass
-    
-    def _create_column_tooltips(self):
-        """Crée un tooltip indépendant pour chaque colonne"""
-        self.tooltips_by_column = {}
-        
-        for col_name, tooltip_text in self.column_tooltips.items():
-            # Créer un tooltip désactivé pour cette colonne
-            tooltip = AdvancedToolTip(
-                self.treeview,
-                text=tooltip_text,
-                delay=800,
-                inactivity_delay=300,
-                wraplength=400
-            )
-            # Désactiver le tooltip par défaut
-            tooltip.is_mouse_in_widget = False
-            self.tooltips_by_column[col_name] = tooltip
-    
-    def on_enter(self, event):
-        """Quand la souris entre dans le treeview"""
-        self.is_mouse_in_treeview = True
-        
-    def on_leave(self, event):
-        """Quand la souris quitte le treeview"""
-        self.is_mouse_in_treeview = False
-        self._hide_all_tooltips()
-        self.current_column = None
-        
-        if self.motion_after_id:
-            self.treeview.after_cancel(self.motion_after_id)
-            self.motion_after_id = None
-    
-    def on_motion(self, event):
-        """Gère le mouvement de souris avec délai"""
-        # Annuler le traitement précédent
-        if self.motion_after_id:
-            self.treeview.after_cancel(self.motion_after_id)
-        
-        # Programmer le traitement avec un délai pour éviter trop d'appels
-        self.motion_after_id = self.treeview.after(50, lambda: self._process_motion(event))
-    
-    def _process_motion(self, event):
-        """Traite le mouvement de souris"""
-        self.motion_after_id = None
-        
-        if not self.is_mouse_in_treeview:
-            return
-        
-        try:
-            # Identifier la colonne
-            column = self.treeview.identify_column(event.x)
-            
-            if not column or column == "#0":
-                # Pas sur une colonne valide
-                if self.current_column:
-                    self._hide_all_tooltips()
-                    self.current_column = None
-                return
-            
-            # Convertir le numéro de colonne en nom
-            try:
-                col_index = int(column.replace('#', '')) - 1
-                columns = list(self.treeview['columns'])
-                
-                if 0 <= col_index < len(columns):
-                    col_name = columns[col_index]
-                else:
-                    return
-            except:
-                return
-            
-            # Si on change de colonne
-            if col_name != self.current_column:
-                # Cacher tous les tooltips
-                self._hide_all_tooltips()
-                
-                # Activer le tooltip de la nouvelle colonne
-                if col_name in self.tooltips_by_column:
-                    self.current_column = col_name
-                    tooltip = self.tooltips_by_column[col_name]
-                    
-                    # Activer ce tooltip spécifique
-                    tooltip.is_mouse_in_widget = True
-                    tooltip.last_mouse_x = event.x_root
-                    tooltip.last_mouse_y = event.y_root
-                    tooltip.last_activity_time = 0  # Forcer la réinitialisation
-                    tooltip.key_pressed = False
-                    
-                    # Démarrer la détection d'inactivité pour ce tooltip
-                    tooltip.start_inactivity_check(event)
-                
-        except Exception as e:
-            print(f"Erreur _process_motion: {e}")
-    
-    def _hide_all_tooltips(self):
-        """Cache tous les tooltips de toutes les colonnes"""
-        for tooltip in self.tooltips_by_column.values():
-            try:
-                tooltip.is_mouse_in_widget = False
-                tooltip.cancel_all()
-                tooltip.hide_tooltip()
-            except:
-                pass
+        self.fournisseur = fournisseur
+        GestionnaireTooltips.get().enregistrer_colonnes(treeview, fournisseur)
     
-    def on_app_focus_in(self, event):
-        """Quand l'application reprend le focus (après Alt+Tab)"""
-        # Réactiver les tooltips si la souris est dans le treeview
-        if self.is_mouse_in_treeview and self.current_column:
-            try:
-                tooltip = self.tooltips_by_column.get(self.current_column)
-                if tooltip:
-                    tooltip.key_pressed = False
-                    tooltip.last_activity_time = 0
-            except:
-                pass
-    
-    def on_app_focus_out(self, event):
-        """Quand l'application perd le focus (Alt+Tab)"""
-        # Cacher tous les tooltips
-        self._hide_all_tooltips()
-    
-    def update_column_tooltips(self, new_tooltips: Dict[str, str]):
-        """Met à jour les tooltips des colonnes"""
-        self._hide_all_tooltips()
-        self.current_column = None
-        
-        # Détruire les anciens tooltips
-        for tooltip in self.tooltips_by_column.values():
-            try:
-                tooltip.destroy()
-            except:
-                pass
-        
-        # Recréer avec les nouveaux textes
-        self.column_tooltips = new_tooltips
-        self._create_column_tooltips()
+    def update_column_tooltips(self, new_tooltips):
+        """Remplace les textes (dictionnaire ou fournisseur)"""
+        if isinstance(new_tooltips, dict):
+            self.fournisseur = new_tooltips.get
+        else:
+            self.fournisseur = new_tooltips
+        gestionnaire = GestionnaireTooltips.get()
+        gestionnaire.cacher()
+        gestionnaire.enregistrer_colonnes(self.treeview, self.fournisseur)
     
     def cleanup(self):
-        """Nettoie complètement le gestionnaire de tooltips"""
-        self._hide_all_tooltips()
-        
-        # Annuler les tâches en attente
-        if self.motion_after_id:
-            try:
-                self.treeview.after_cancel(self.motion_after_id)
-            except:
-                pass
-            self.motion_after_id = None
-        
-        # Détruire tous les tooltips
-        for tooltip in self.tooltips_by_column.values():
-            try:
-                tooltip.destroy()
-            except:
-                pass
-        
-        self.tooltips_by_column.clear()
-        
-        # Supprimer les bindings
-        try:
-            self.treeview.unbind("<Motion>")
-            self.treeview.unbind("<Leave>")
-            self.treeview.unbind("<Enter>")
-        except:
-            pass
+        """Retire les tooltips de colonnes du gestionnaire"""
+        if self.treeview is not None:
+            GestionnaireTooltips.get().retirer_colonnes(self.treeview)
+        self.treeview = None
+
+def cacher_tooltips():
+    """Cache le tooltip éventuellement affiché"""
+    if GestionnaireTooltips._instance is not None:
+        GestionnaireTooltips._instance.cacher()
 
-def ajouter_tooltip(widget, text: str, delay: int = 1000, wraplength: int = 350, font_size: Optional[int] = None) -> AdvancedToolTip:
+def ajouter_tooltip(widget, text: str, delay: int = 1000, wraplength: int = 350, font_size: Optional[int] = None) -> TooltipWidget:
     """
-    Fonction utilitaire pour ajouter facilement un tooltip avancé à un widget
+    Fonction utilitaire pour ajouter facilement un tooltip à un widget
     
     Args:
         widget: Widget auquel attacher le tooltip
-        text: Texte à afficher
+        text: Texte à afficher (ou fonction pour un contenu dynamique)
         delay: Délai en millisecondes (défaut: 1000ms)
         wraplength: Largeur maximale du texte (défaut: 350px)
         font_size: Taille de police (défaut: utilise la taille globale)
     
     Returns:
-        Instance AdvancedToolTip créée
+        Instance TooltipWidget créée
     """
-    return AdvancedToolTip(widget, text, delay, wraplength, font_size)
+    return TooltipWidget(widget, text, delay, wraplength, font_size)
+
+def _parametres_adapter(data_adapter) -> Dict:
+    """Retourne les paramètres courants de la journée (ou un dict vide)"""
+    if data_adapter and hasattr(data_adapter, 'journee') and data_adapter.journee:
+        return data_adapter.journee.parametres
+    return {}
 
-def ajouter_tooltips_colonnes_tableau(treeview, data_adapter=None):
+def textes_colonnes_reperage(parametres: Dict) -> Dict[str, str]:
     """
-    Ajoute des tooltips contextuels aux colonnes du tableau de repérage
+    Construit les textes des tooltips de colonnes du tableau de repérage
     
     Args:
-        treeview: Widget Treeview
-        data_adapter: Adaptateur de données pour récupérer les paramètres
+        parametres: Paramètres de la journée (tarif, commission, marge)
     
     Returns:
-        Instance TreeviewColumnTooltip
+        Dictionnaire {nom_colonne: texte_tooltip}
     """
-    # Récupérer les paramètres pour afficher les formules
-    if data_adapter and hasattr(data_adapter, 'journee') and data_adapter.journee:
-        parametres = data_adapter.journee.parametres
-        tarif_horaire = parametres.get('tarif_horaire', 45.0)
-        commission = parametres.get('commission_vente', 8.5)
-        marge_securite = parametres.get('marge_securite', 200.0)
-    else:
-        tarif_horaire = 45.0
-        commission = 8.5
-        marge_securite = 200.0
+    tarif_horaire = parametres.get('tarif_horaire', 45.0)
+    commission = parametres.get('commission_vente', 8.5)
+    marge_securite = parametres.get('marge_securite', 200.0)
     
     # Définir les tooltips spécifiques par colonne
     column_tooltips = {
@@ -567,29 +536,21 @@ def ajouter_tooltips_colonnes_tableau(treeview, data_adapter=None):
         "couleur": "🎨 COULEUR D'AFFICHAGE\n• Double-clic pour modifier\n• Choisir parmi : Turquoise, Vert, Orange, Rouge\n• Permet d'organiser visuellement les véhicules\n• Facilite l'identification rapide"
     }
     
-    return TreeviewColumnTooltip(treeview, column_tooltips)
+    return column_tooltips
 
-def ajouter_tooltips_colonnes_achetes(treeview, data_adapter=None):
+def textes_colonnes_achetes(parametres: Dict) -> Dict[str, str]:
     """
-    Ajoute des tooltips contextuels aux colonnes du tableau véhicules achetés
+    Construit les textes des tooltips de colonnes du tableau véhicules achetés
     
     Args:
-        treeview: Widget Treeview
-        data_adapter: Adaptateur de données pour récupérer les paramètres
+        parametres: Paramètres de la journée (tarif, commission, marge)
     
     Returns:
-        Instance TreeviewColumnTooltip
+        Dictionnaire {nom_colonne: texte_tooltip}
     """
-    # Récupérer les paramètres pour afficher les formules
-    if data_adapter and hasattr(data_adapter, 'journee') and data_adapter.journee:
-        parametres = data_adapter.journee.parametres
-        tarif_horaire = parametres.get('tarif_horaire', 45.0)
-        commission = parametres.get('commission_vente', 8.5)
-        marge_securite = parametres.get('marge_securite', 200.0)
-    else:
-        tarif_horaire = 45.0
-        commission = 8.5
-        marge_securite = 200.0
+    tarif_horaire = parametres.get('tarif_horaire', 45.0)
+    commission = parametres.get('commission_vente', 8.5)
+    marge_securite = parametres.get('marge_securite', 200.0)
     
     # Définir les tooltips spécifiques par colonne pour l'onglet achetés
     column_tooltips = {
@@ -620,7 +581,42 @@ def ajouter_tooltips_colonnes_achetes(treeview, data_adapter=None):
         "couleur": "🎨 COULEUR D'AFFICHAGE\n• Double-clic pour modifier\n• Choisir parmi : Turquoise, Vert, Orange, Rouge\n• Permet d'organiser visuellement les véhicules\n• Facilite l'identification rapide"
     }
     
-    return TreeviewColumnTooltip(treeview, column_tooltips)
+    return column_tooltips
+
+def ajouter_tooltips_colonnes_tableau(treeview, data_adapter=None) -> "TooltipsColonnes":
+    """
+    Ajoute des tooltips contextuels aux colonnes du tableau de repérage
+    
+    Les textes sont générés à l'affichage avec les paramètres courants de la
+    journée : aucune reconstruction n'est nécessaire quand ils changent.
+    
+    Args:
+        treeview: Widget Treeview
+        data_adapter: Adaptateur de données pour récupérer les paramètres
+    
+    Returns:
+        Instance TooltipsColonnes
+    """
+    return TooltipsColonnes(
+        treeview,
+        lambda colonne: textes_colonnes_reperage(_parametres_adapter(data_adapter)).get(colonne)
+    )
+
+def ajouter_tooltips_colonnes_achetes(treeview, data_adapter=None) -> "TooltipsColonnes":
+    """
+    Ajoute des tooltips contextuels aux colonnes du tableau véhicules achetés
+    
+    Args:
+        treeview: Widget Treeview
+        data_adapter: Adaptateur de données pour récupérer les paramètres
+    
+    Returns:
+        Instance TooltipsColonnes
+    """
+    return TooltipsColonnes(
+        treeview,
+        lambda colonne: textes_colonnes_achetes(_parametres_adapter(data_adapter)).get(colonne)
+    )
 
 # Textes prédéfinis pour les tooltips (CONSERVÉS pour compatibilité)
 TOOLTIPS = {
@@ -647,6 +643,10 @@ TOOLTIPS = {
     'btn_supprimer': "Supprime le véhicule sélectionné définitivement.",
     'btn_marquer_achete': "Marque le véhicule comme acheté et demande le prix d'achat réel.",
     'btn_actualiser': "Met à jour l'affichage et sauvegarde les données.",
+    'estimation_marche': "Prix estimé d'après les annonces Leboncoin déjà récupérées les plus proches en année et kilométrage (intervalle à 90 %). Cliquez pour l'utiliser comme prix de revente.",
+    'btn_valorisation_marche': "Recherche sur Leboncoin le prix médian de chaque véhicule en repérage et propose de l'utiliser comme prix de revente.",
+    'btn_optimiseur_lots': "Classe les lots à viser pour maximiser la marge attendue sans dépasser le budget ni les heures d'atelier ; se recalcule à chaque achat pendant la vente.",
+    'btn_simulation_journee': "Simule des milliers de déroulements de la journée d'après les prix d'achat des journées passées : dépense et marge attendues, risque de dépasser le budget.",
     
     # Colonnes tableau (CONSERVÉS mais remplacés par le système contextuel pour les tableaux)
     'col_lot': "Numéro de lot - Double-clic pour modifier",
@@ -681,6 +681,7 @@ TOOLTIPS = {
     # Boutons paramètres
     'btn_sauvegarder_param': "Sauvegarde les paramètres dans le fichier de configuration.",
     'btn_reinitialiser_param': "Remet tous les paramètres aux valeurs par défaut.",
+    'btn_balayage_param': "Compare une grille de tarifs, commissions et marges sur tous les lots : lots encore rentables et budget total pour chaque combinaison.",
     'btn_aide_param': "Affiche l'aide détaillée sur les paramètres.",
     
     # Export